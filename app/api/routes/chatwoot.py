@@ -68,6 +68,11 @@ async def processar_conversation_updated(payload: dict):
 
     logger.info(f"Conversa {chatwoot_conversation_id} atualizada, labels: {labels}")
 
+    # Manter labels em cache alinhadas com o que o gestor fez no Chatwoot
+    from app.services.chatwoot import salvar_labels_cache
+
+    await salvar_labels_cache(chatwoot_conversation_id, labels)
+
     # Buscar nossa conversa pelo chatwoot_conversation_id
     response = (
         supabase.table("conversations")
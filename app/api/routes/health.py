@@ -3,13 +3,14 @@ Rotas de health check.
 
 Sprint 58 - Epic 3: Thin router delegando para app/services/health/.
 
-Endpoints (16):
+Endpoints (17):
 - /health: Liveness basico
 - /health/ready: Readiness (Redis + Supabase)
 - /health/deep: Deep check para CI/CD
 - /health/rate-limit: Rate limiter stats
 - /health/circuits: Circuit breaker status
 - /health/circuits/history: Circuit breaker history
+- /health/pos-envio: Pipeline post-send executor
 - /health/whatsapp: Evolution API connection
 - /health/grupos: Group processing status
 - /health/schema: Schema fingerprint
@@ -132,6 +133,14 @@ async def circuit_status():
     return {"circuits": obter_status_circuits(), "timestamp": agora_utc().isoformat()}
 
 
+@router.get("/health/pos-envio")
+async def pos_envio_status():
+    """Fila e contadores do executor pos-envio do pipeline."""
+    from app.pipeline.pos_envio import executor_pos_envio
+
+    return {"pos_envio": executor_pos_envio.estatisticas(), "timestamp": agora_utc().isoformat()}
+
+
 @router.get("/health/whatsapp")
 async def whatsapp_status():
     """Status da conexao WhatsApp com Evolution API."""
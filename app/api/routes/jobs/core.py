@@ -122,6 +122,37 @@ async def job_relatorio_diario():
     return {"status": "ok", "message": "Relatorio diario enviado", "relatorio": relatorio}
 
 
+@router.post("/atualizar-rollups")
+@job_endpoint("atualizar-rollups")
+async def job_atualizar_rollups():
+    """Atualiza os rollups de metricas (hora/dia) a partir do watermark de cada fonte."""
+    from app.workers.rollup_metricas import atualizar_rollups
+
+    resultado = await atualizar_rollups()
+    erros = [fonte for fonte, dados in resultado.items() if "erro" in dados]
+    return {
+        "status": "ok" if not erros else "parcial",
+        "message": f"Rollups atualizados ({len(resultado) - len(erros)}/{len(resultado)} fontes)",
+        "resultado": resultado,
+    }
+
+
+@router.post("/atualizar-snapshot-analitico")
+@job_endpoint("atualizar-snapshot-analitico")
+async def job_atualizar_snapshot_analitico():
+    """Exporta as tabelas analiticas para o snapshot DuckDB local (incremental)."""
+    from app.services.snapshot_analitico import atualizar_snapshot
+
+    resultado = await atualizar_snapshot()
+    erros = [tabela for tabela, dados in resultado.items() if "erro" in dados]
+    atualizadas = len(resultado) - len(erros)
+    return {
+        "status": "ok" if not erros else "parcial",
+        "message": f"Snapshot analitico atualizado ({atualizadas}/{len(resultado)} tabelas)",
+        "resultado": resultado,
+    }
+
+
 @router.post("/atualizar-prompt-feedback")
 @job_endpoint("atualizar-prompt-feedback")
 async def job_atualizar_prompt_feedback():
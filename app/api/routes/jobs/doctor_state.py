@@ -44,11 +44,11 @@ async def job_doctor_state_manutencao_semanal():
 
 @router.post("/doctor-state-decay")
 @job_endpoint("doctor-state-decay")
-async def job_doctor_state_decay(batch_size: int = 100):
+async def job_doctor_state_decay(batch_size: int = 1000):
     """
     Job especifico de decay de temperatura.
 
-    Decai temperatura de medicos inativos.
+    Decai temperatura de todos os medicos inativos, em lotes de batch_size.
     Idempotente: usa last_decay_at para evitar decay duplo.
     """
     from app.workers.temperature_decay import decay_all_temperatures
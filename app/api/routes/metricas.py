@@ -5,11 +5,19 @@ Sprint 17 - E06: Endpoints de funil
 """
 
 from fastapi import APIRouter, Query
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Optional
 import logging
 
 from app.core.timezone import agora_brasilia
+from app.services.rollups import (
+    DIMENSAO_TIPO,
+    FONTE_CONVERSAS,
+    FONTE_HANDOFFS,
+    FONTE_INTERACOES,
+    contar_por_dimensao,
+    contar_por_metrica,
+)
 from app.services.supabase import supabase
 from app.services.business_events.metrics import (
     get_funnel_metrics,
@@ -24,54 +32,26 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/resumo")
-async def obter_resumo(dias: int = 7):
+async def obter_resumo(dias: int = Query(7, ge=1, le=90, description="Número de dias")):
     """
     Retorna resumo de métricas dos últimos N dias.
+
+    - **dias**: Número de dias (default 7, max 90)
     """
-    data_inicio = (agora_brasilia() - timedelta(days=dias)).isoformat()
+    agora = agora_brasilia()
+    data_inicio = (agora - timedelta(days=dias)).isoformat()
 
     try:
-        # Total de conversas
-        conversas_response = (
-            supabase.table("conversations")
-            .select("id, status, created_at")
-            .gte("created_at", data_inicio)
-            .execute()
-        )
-        conversas = conversas_response.data or []
-
-        # Total de interações
-        interacoes_response = (
-            supabase.table("interacoes")
-            .select("id, direcao, origem, created_at")
-            .gte("created_at", data_inicio)
-            .execute()
-        )
-        interacoes = interacoes_response.data or []
-
-        # Handoffs
-        handoffs_response = (
-            supabase.table("handoffs")
-            .select("id, trigger_type, status, created_at")
-            .gte("created_at", data_inicio)
-            .execute()
-        )
-        handoffs = handoffs_response.data or []
-
-        # Calcular métricas
-        total_conversas = len(conversas)
-        conversas_ativas = len(
-            [c for c in conversas if c.get("status") == "active" or c.get("status") == "ativa"]
-        )
-
-        msgs_entrada = len([i for i in interacoes if i.get("direcao") == "entrada"])
-        msgs_saida = len([i for i in interacoes if i.get("direcao") == "saida"])
+        totais = await _totais_resumo_rollup(agora - timedelta(days=dias), agora)
+        if totais is None:
+            totais = _totais_resumo_brutos(data_inicio)
 
-        total_handoffs = len(handoffs)
-        handoffs_por_tipo = {}
-        for h in handoffs:
-            tipo = h.get("trigger_type", "desconhecido")
-            handoffs_por_tipo[tipo] = handoffs_por_tipo.get(tipo, 0) + 1
+        total_conversas = totais["conversas"]
+        conversas_ativas = totais["ativas"]
+        msgs_entrada = totais["entrada"]
+        msgs_saida = totais["saida"]
+        total_handoffs = sum(totais["handoffs_por_tipo"].values())
+        handoffs_por_tipo = totais["handoffs_por_tipo"]
 
         # Taxa de resposta (mensagens enviadas / recebidas)
         taxa_resposta = msgs_saida / msgs_entrada if msgs_entrada > 0 else 0
@@ -109,6 +89,74 @@ async def obter_resumo(dias: int = 7):
         }
 
 
+async def _totais_resumo_rollup(inicio: datetime, fim: datetime) -> Optional[dict]:
+    """Totais do resumo pelos rollups (None se indisponiveis)."""
+    conversas = await contar_por_metrica(FONTE_CONVERSAS, inicio, fim)
+    mensagens = await contar_por_metrica(FONTE_INTERACOES, inicio, fim)
+    handoffs = await contar_por_dimensao(FONTE_HANDOFFS, inicio, fim, DIMENSAO_TIPO)
+    if conversas is None or mensagens is None or handoffs is None:
+        return None
+
+    # Status atual nao entra em rollup: conta direto (count exato, sem linhas)
+    ativas_response = (
+        supabase.table("conversations")
+        .select("id", count="exact")
+        .in_("status", ["active", "ativa"])
+        .gte("created_at", inicio.isoformat())
+        .execute()
+    )
+
+    return {
+        "conversas": conversas.get("criadas", 0),
+        "ativas": ativas_response.count or 0,
+        "entrada": mensagens.get("entrada", 0),
+        "saida": mensagens.get("saida", 0),
+        "handoffs_por_tipo": {
+            tipo: contagens.get("criados", 0) for tipo, contagens in handoffs.items()
+        },
+    }
+
+
+def _totais_resumo_brutos(data_inicio: str) -> dict:
+    """Totais do resumo contando as linhas de origem."""
+    conversas_response = (
+        supabase.table("conversations")
+        .select("id, status, created_at")
+        .gte("created_at", data_inicio)
+        .execute()
+    )
+    conversas = conversas_response.data or []
+
+    interacoes_response = (
+        supabase.table("interacoes")
+        .select("id, direcao, origem, created_at")
+        .gte("created_at", data_inicio)
+        .execute()
+    )
+    interacoes = interacoes_response.data or []
+
+    handoffs_response = (
+        supabase.table("handoffs")
+        .select("id, trigger_type, status, created_at")
+        .gte("created_at", data_inicio)
+        .execute()
+    )
+    handoffs_por_tipo = {}
+    for h in handoffs_response.data or []:
+        tipo = h.get("trigger_type", "desconhecido")
+        handoffs_por_tipo[tipo] = handoffs_por_tipo.get(tipo, 0) + 1
+
+    return {
+        "conversas": len(conversas),
+        "ativas": len(
+            [c for c in conversas if c.get("status") == "active" or c.get("status") == "ativa"]
+        ),
+        "entrada": len([i for i in interacoes if i.get("direcao") == "entrada"]),
+        "saida": len([i for i in interacoes if i.get("direcao") == "saida"]),
+        "handoffs_por_tipo": handoffs_por_tipo,
+    }
+
+
 # =============================================================================
 # Sprint 17 - E06: Endpoints de Funil de Negócio
 # =============================================================================
@@ -311,3 +359,20 @@ async def medicos_com_app_enviado(
     except Exception as e:
         logger.error(f"Erro ao listar médicos com app enviado: {e}")
         return {"medicos": [], "erro": str(e)}
+
+
+# =============================================================================
+# Cache de respostas LLM
+# =============================================================================
+
+
+@router.get("/llm-cache")
+async def llm_cache():
+    """
+    Hit rate e economia do cache semântico de respostas, por intenção.
+
+    Kill switch por intenção: feature flag 'llm_cache_semantico'.
+    """
+    from app.services.llm.cache import obter_metricas_cache
+
+    return await obter_metricas_cache()
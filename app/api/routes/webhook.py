@@ -333,6 +333,18 @@ async def _processar_comando_slack(event: dict):
             from app.services.helena import AgenteHelena
 
             agente = AgenteHelena(user, channel)
+
+            # Com bot token, parciais e resposta final editam a mesma mensagem
+            if settings.SLACK_BOT_TOKEN:
+                from app.services.slack_comandos import RespostaProgressiva
+
+                saida = RespostaProgressiva(channel)
+                resposta = await agente.processar_mensagem(
+                    texto_para_helena, ao_parcial=saida.atualizar
+                )
+                await saida.atualizar(resposta)
+                return
+
             resposta = await agente.processar_mensagem(texto_para_helena)
 
             await _enviar_resposta_slack(channel, resposta)
@@ -371,9 +371,10 @@ async def _processar_status_mensagem(chip: dict, status_data: dict) -> None:
     """
     Processa atualização de status de mensagem (sent/delivered/read/failed).
 
-    Atualiza delivery_status na tabela interações.
+    Atualiza delivery_status na tabela interações (via lote da ingestão
+    de delivery status).
     """
-    from app.services.delivery_status import atualizar_delivery_status
+    from app.services.delivery_status import ingestao_delivery_status
 
     status = status_data.get("status", "")
     message_id = status_data.get("id")
@@ -383,7 +384,7 @@ async def _processar_status_mensagem(chip: dict, status_data: dict) -> None:
 
     try:
         if status in ("sent", "delivered", "read"):
-            await atualizar_delivery_status(
+            await ingestao_delivery_status.registrar(
                 provider_message_id=message_id,
                 status=status,
                 chip_id=chip["id"],
@@ -399,7 +400,7 @@ async def _processar_status_mensagem(chip: dict, status_data: dict) -> None:
                 f"code={error_code}, msg={error_msg}"
             )
 
-            await atualizar_delivery_status(
+            await ingestao_delivery_status.registrar(
                 provider_message_id=message_id,
                 status="failed",
                 chip_id=chip["id"],
@@ -265,8 +265,10 @@ async def processar_status_mensagem(chip: dict, payload: dict) -> dict:
     Processa atualizacao de status de mensagem (entregue, lido, etc).
 
     Sprint 41: Atualiza delivery_status na tabela interacoes.
+    O callback entra no lote da ingestao de delivery status (status da
+    interacao e metrica do chip aplicados juntos).
     """
-    from app.services.delivery_status import atualizar_delivery_status
+    from app.services.delivery_status import ingestao_delivery_status
 
     data = payload.get("data", {})
     status = data.get("status")
@@ -278,40 +280,22 @@ async def processar_status_mensagem(chip: dict, payload: dict) -> dict:
     message_id = key.get("id")
 
     if status == "DELIVERY_ACK":
-        # Mensagem entregue
-        supabase.table("chip_interactions").insert(
-            {
-                "chip_id": chip["id"],
-                "tipo": "msg_entregue",
-                "destinatario": telefone,
-            }
-        ).execute()
-
-        # Sprint 41: Atualizar delivery_status na interação
-        if message_id:
-            await atualizar_delivery_status(
-                provider_message_id=message_id,
-                status="delivered",
-                chip_id=chip["id"],
-            )
-
+        tipo, status_entrega = "msg_entregue", "delivered"
     elif status == "READ":
-        # Mensagem lida
-        supabase.table("chip_interactions").insert(
-            {
-                "chip_id": chip["id"],
-                "tipo": "msg_lida",
-                "destinatario": telefone,
-            }
-        ).execute()
-
-        # Sprint 41: Atualizar delivery_status na interação
-        if message_id:
-            await atualizar_delivery_status(
-                provider_message_id=message_id,
-                status="read",
-                chip_id=chip["id"],
-            )
+        tipo, status_entrega = "msg_lida", "read"
+    else:
+        return {"status": "ok", "message_status": status}
+
+    await ingestao_delivery_status.registrar(
+        provider_message_id=message_id,
+        status=status_entrega,
+        chip_id=chip["id"],
+        metrica_chip={
+            "chip_id": chip["id"],
+            "tipo": tipo,
+            "destinatario": telefone,
+        },
+    )
 
     return {"status": "ok", "message_status": status}
 
@@ -447,6 +447,8 @@ async def processar_status_mensagem(chip: dict, payload: dict) -> dict:
     Processa atualização de status de mensagem (entregue, lido, etc) via Z-API.
 
     Sprint 41: Atualiza delivery_status na tabela interacoes.
+    O callback entra no lote da ingestão de delivery status (status da
+    interação e métrica do chip aplicados juntos).
 
     Payload Z-API:
     {
@@ -456,68 +458,34 @@ async def processar_status_mensagem(chip: dict, payload: dict) -> dict:
         "instanceId": "xxxxx"
     }
     """
-    from app.services.delivery_status import atualizar_delivery_status
+    from app.services.delivery_status import ingestao_delivery_status
 
     status = payload.get("status", "").upper()
     telefone = payload.get("phone", "").replace("@c.us", "")
     message_id = payload.get("id")
 
-    try:
-        if status in ["DELIVERED", "DELIVERY_ACK"]:
-            supabase.table("chip_interactions").insert(
-                {
-                    "chip_id": chip["id"],
-                    "tipo": "msg_entregue",
-                    "destinatario": telefone,
-                    "metadata": {"message_id": message_id, "provider": "zapi"},
-                }
-            ).execute()
-
-            # Sprint 41: Atualizar delivery_status na interação
-            if message_id:
-                await atualizar_delivery_status(
-                    provider_message_id=message_id,
-                    status="delivered",
-                    chip_id=chip["id"],
-                )
-
-        elif status in ["READ", "VIEWED"]:
-            supabase.table("chip_interactions").insert(
-                {
-                    "chip_id": chip["id"],
-                    "tipo": "msg_lida",
-                    "destinatario": telefone,
-                    "metadata": {"message_id": message_id, "provider": "zapi"},
-                }
-            ).execute()
-
-            # Sprint 41: Atualizar delivery_status na interação
-            if message_id:
-                await atualizar_delivery_status(
-                    provider_message_id=message_id,
-                    status="read",
-                    chip_id=chip["id"],
-                )
-
-        elif status == "PLAYED":
-            # Áudio/vídeo reproduzido
-            supabase.table("chip_interactions").insert(
-                {
-                    "chip_id": chip["id"],
-                    "tipo": "msg_reproduzida",
-                    "destinatario": telefone,
-                    "metadata": {"message_id": message_id, "provider": "zapi"},
-                }
-            ).execute()
-
-            # Sprint 41: Atualizar delivery_status na interação (played = read)
-            if message_id:
-                await atualizar_delivery_status(
-                    provider_message_id=message_id,
-                    status="read",
-                    chip_id=chip["id"],
-                )
+    if status in ["DELIVERED", "DELIVERY_ACK"]:
+        tipo, status_entrega = "msg_entregue", "delivered"
+    elif status in ["READ", "VIEWED"]:
+        tipo, status_entrega = "msg_lida", "read"
+    elif status == "PLAYED":
+        # Áudio/vídeo reproduzido (played = read)
+        tipo, status_entrega = "msg_reproduzida", "read"
+    else:
+        return {"status": "ok", "message_status": status}
 
+    try:
+        await ingestao_delivery_status.registrar(
+            provider_message_id=message_id,
+            status=status_entrega,
+            chip_id=chip["id"],
+            metrica_chip={
+                "chip_id": chip["id"],
+                "tipo": tipo,
+                "destinatario": telefone,
+                "metadata": {"message_id": message_id, "provider": "zapi"},
+            },
+        )
     except Exception as e:
         logger.error(f"[WebhookZAPI] Erro ao registrar status: {e}")
 
@@ -44,6 +44,13 @@ class Settings(BaseSettings):
     # Sprint 44: Habilitado por padrão para rastreamento de origem das mensagens
     MULTI_CHIP_ENABLED: bool = True
 
+    # Ator de envio por chip (fila própria, presença e envio agendados)
+    # Evolution/Z-API: poucas mensagens em voo e espaçamento mínimo opcional entre envios do chip
+    # Meta Cloud API: requisições paralelas sobre o cliente HTTP/2 compartilhado
+    CHIP_ENVIO_MAX_EM_VOO: int = 2
+    CHIP_ENVIO_INTERVALO_MIN_SEGUNDOS: float = 0.0
+    CHIP_ENVIO_MAX_EM_VOO_META: int = 10
+
     # Modo Piloto (Sprint 32 E03)
     # Quando True, desabilita ações autônomas (Discovery, Oferta, Reativação, Feedback automáticos)
     # Mantém funcionando: campanhas manuais, respostas inbound, canal de ajuda, comandos Slack
@@ -304,12 +311,19 @@ class Settings(BaseSettings):
 
     # Pipeline Settings (Sprint 44 T02.6)
     PIPELINE_MAX_CONCURRENT: int = 10  # Semáforo de processamento webhook
+    PIPELINE_POS_ENVIO_MAX_CONCURRENT: int = 4  # Executor pós-envio (save/extraction/metrics)
+    PIPELINE_POS_ENVIO_MAX_PENDENTES: int = 1000  # Acima disso, quem submete espera
+    PIPELINE_POS_ENVIO_TENTATIVAS: int = 3  # Tentativas por tarefa (exceção)
 
     # Cache Settings (Sprint 44 T02.6)
     CACHE_TTL_LLM_RESPONSE: int = 3600  # 1 hora para respostas LLM
     CACHE_TTL_PROMPTS: int = 300  # 5 minutos para prompts
     CACHE_TTL_CONTEXTO: int = 60  # 1 minuto para contexto
 
+    # Snapshot analítico local (DuckDB) para as tools da Helena
+    ANALYTICS_SNAPSHOT_PATH: str = "data/snapshot_analitico.duckdb"
+    ANALYTICS_SNAPSHOT_DEFASAGEM_MAX_MIN: int = 60  # Acima disso, consulta a produção
+
     # Empresa
     NOME_EMPRESA: str = "Revoluna"
 
@@ -377,10 +391,13 @@ class DatabaseConfig:
     CACHE_TTL_CONTEXTO: int = 120  # 2 minutos - contexto de conversa
     CACHE_TTL_MEDICO: int = 300  # 5 minutos - dados de medico
     CACHE_TTL_VAGAS: int = 60  # 1 minuto - vagas mudam frequentemente
+    CACHE_TTL_INDICE_VAGAS: int = 60  # 1 minuto - recarga do indice em memoria de vagas
     CACHE_TTL_ABERTURA: int = 86400 * 30  # 30 dias - aberturas usadas
     CACHE_TTL_HOSPITAIS: int = 3600  # 1 hora - hospitais raramente mudam
     CACHE_TTL_PROMPTS: int = 300  # 5 minutos - prompts do sistema
     CACHE_TTL_DOCS: int = 300  # 5 minutos - cache Google Docs
+    CACHE_TTL_CHATWOOT_IDS: int = 86400 * 7  # 7 dias - contato do Chatwoot por telefone
+    CACHE_TTL_CHATWOOT_LABELS: int = 60  # 1 minuto - labels (operador muda pela UI)
 
     # Session timeouts
     SESSION_TIMEOUT_MINUTES: int = 30  # Sessao Slack
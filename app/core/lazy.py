@@ -0,0 +1,114 @@
+"""
+Servicos com inicializacao preguicosa.
+
+Singletons caros (cliente Supabase, cliente Redis, pipeline de mensagens,
+cliente Anthropic) sao registrados com uma fabrica e so construidos no
+primeiro acesso a um atributo. O proxy pode ser importado no topo dos
+modulos como antes:
+
+    # app/services/supabase.py
+    supabase = servico_lazy("supabase", get_supabase_client)
+
+    # qualquer modulo
+    from app.services.supabase import supabase
+    supabase.table("clientes").select("*").execute()  # cria o cliente aqui
+
+Assim importar app.main ou um worker nao paga conexao/bibliotecas de
+servicos que aquele processo talvez nem use.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List
+
+_NAO_INICIALIZADO = object()
+
+_registro: Dict[str, "ServicoLazy"] = {}
+
+
+class ServicoLazy:
+    """Proxy que constroi o servico no primeiro acesso."""
+
+    __slots__ = ("_nome", "_fabrica", "_instancia", "_lock")
+
+    def __init__(self, nome: str, fabrica: Callable[[], Any]):
+        """
+        Args:
+            nome: Nome no registro (ex: "supabase")
+            fabrica: Funcao sem argumentos que constroi o servico
+        """
+        self._nome = nome
+        self._fabrica = fabrica
+        self._instancia = _NAO_INICIALIZADO
+        self._lock = threading.Lock()
+
+    @property
+    def inicializado(self) -> bool:
+        """Se o servico ja foi construido."""
+        return self._instancia is not _NAO_INICIALIZADO
+
+    def obter(self) -> Any:
+        """Instancia real (constroi na primeira chamada, thread-safe)."""
+        instancia = self._instancia
+        if instancia is _NAO_INICIALIZADO:
+            # Clientes sync (Supabase) tambem sao usados de threads do executor
+            with self._lock:
+                if self._instancia is _NAO_INICIALIZADO:
+                    self._instancia = self._fabrica()
+                instancia = self._instancia
+        return instancia
+
+    def resetar(self) -> None:
+        """Descarta a instancia (proximo acesso constroi de novo)."""
+        with self._lock:
+            self._instancia = _NAO_INICIALIZADO
+
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self.obter(), nome)
+
+    # patch.object(supabase, "rpc", ...) atua na instancia real
+    def __setattr__(self, nome: str, valor: Any) -> None:
+        if nome in ServicoLazy.__slots__:
+            object.__setattr__(self, nome, valor)
+        else:
+            setattr(self.obter(), nome, valor)
+
+    def __delattr__(self, nome: str) -> None:
+        if nome in ServicoLazy.__slots__:
+            object.__delattr__(self, nome)
+        else:
+            delattr(self.obter(), nome)
+
+    def __repr__(self) -> str:
+        estado = repr(self._instancia) if self.inicializado else "nao inicializado"
+        return f"<ServicoLazy {self._nome}: {estado}>"
+
+
+def servico_lazy(nome: str, fabrica: Callable[[], Any]) -> Any:
+    """
+    Registra um servico preguicoso e devolve seu proxy.
+
+    Args:
+        nome: Nome unico no registro
+        fabrica: Funcao que constroi o servico
+
+    Returns:
+        ServicoLazy (tipado como Any para o uso ficar igual ao do objeto real)
+    """
+    proxy = ServicoLazy(nome, fabrica)
+    _registro[nome] = proxy
+    return proxy
+
+
+def obter_servico(nome: str) -> Any:
+    """Instancia real de um servico registrado (constroi se preciso)."""
+    return _registro[nome].obter()
+
+
+def servicos_registrados() -> Dict[str, bool]:
+    """Nome -> ja inicializado."""
+    return {nome: proxy.inicializado for nome, proxy in _registro.items()}
+
+
+def servicos_inicializados() -> List[str]:
+    """Servicos ja construidos neste processo."""
+    return [nome for nome, proxy in _registro.items() if proxy.inicializado]
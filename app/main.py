@@ -56,9 +56,55 @@ async def lifespan(app: FastAPI):
     """Gerencia startup e shutdown da aplicação."""
     # Startup
     print(f"🚀 Iniciando {settings.APP_NAME}...")
+    # Janelas Meta 24h vivem no Redis; carregar as ativas do log no banco
+    from app.core.tasks import safe_create_task
+    from app.services.meta.window_tracker import window_tracker
+
+    safe_create_task(window_tracker.reidratar_do_banco(), name="meta_window_reidratar")
+    # Interações/eventos de auditoria gravados em lote
+    from app.services.write_behind import write_behind
+
+    write_behind.iniciar()
+    # Callbacks de status de entrega aplicados em lote
+    from app.services.delivery_status import ingestao_delivery_status
+
+    ingestao_delivery_status.iniciar()
+    # Espelhamento Chatwoot fora do caminho da resposta
+    from app.services.chatwoot import espelho_chatwoot
+
+    espelho_chatwoot.iniciar()
+    # Save/extraction/metrics do pipeline depois do envio, fora do semáforo
+    from app.pipeline.pos_envio import executor_pos_envio
+
+    executor_pos_envio.iniciar()
     yield
     # Shutdown
     print(f"👋 Encerrando {settings.APP_NAME}...")
+    # Antes dos buffers: as tarefas pendentes ainda gravam neles
+    # Envios ainda agendados nos atores por chip: quem aguarda recebe falha
+    try:
+        from app.services.chips.ator_envio import atores_envio
+
+        await atores_envio.encerrar()
+    except Exception as e:
+        print(f"Erro ao encerrar atores de envio: {e}")
+    try:
+        await executor_pos_envio.parar()
+    except Exception as e:
+        print(f"Erro ao parar executor pós-envio: {e}")
+    try:
+        await espelho_chatwoot.parar()
+    except Exception as e:
+        print(f"Erro no flush do espelho Chatwoot: {e}")
+    try:
+        await ingestao_delivery_status.parar()
+    except Exception as e:
+        print(f"Erro no flush de delivery status: {e}")
+    # Flush final do write-behind (o que falhar vai para o spill no Redis)
+    try:
+        await write_behind.parar()
+    except Exception as e:
+        print(f"Erro no flush do write-behind: {e}")
     # Sprint 44 T06.2: Fechar HTTP client singleton
     try:
         from app.services.http_client import close_http_client
@@ -0,0 +1,245 @@
+"""
+Registros tipados das entidades do caminho quente.
+
+Medico, conversa e chip chegam do PostgREST como dicts de select("*") e
+circulam pelo pipeline inteiro. Aqui cada entidade vira uma dataclass com
+slots:
+- Colunas explicitas (os campos da dataclass; projecao() monta o select) -
+  o PostgREST so devolve o que o pipeline usa;
+- Acesso compativel com dict (registro["id"], registro.get("x"), **registro),
+  para os consumidores existentes nao mudarem;
+- Chaves fora das colunas (ex: especialidade_id resolvida na tool de vagas)
+  vao para um dict de extras criado sob demanda;
+- serializar()/desserializar() para cache no Redis: lista posicional JSON
+  compacta (sem nomes de coluna), prefixada pela assinatura das colunas -
+  mudou a projecao, o cache antigo vira miss.
+
+O cliente Redis compartilhado usa decode_responses=True, por isso a
+serializacao e texto e nao binaria.
+"""
+
+import dataclasses
+import json
+import zlib
+from functools import cache
+from typing import Any, Iterator, Optional, TypeVar
+
+R = TypeVar("R", bound="Registro")
+
+
+@cache
+def _campos(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in dataclasses.fields(cls))
+
+
+@cache
+def _colunas(cls: type) -> frozenset[str]:
+    return frozenset(_campos(cls))
+
+
+@cache
+def _assinatura(cls: type) -> int:
+    return zlib.crc32(",".join(_campos(cls)).encode())
+
+
+class Registro:
+    """Base dos registros: acesso estilo dict sobre slots."""
+
+    __slots__ = ("_extras",)
+
+    @classmethod
+    def projecao(cls) -> str:
+        """Colunas para o select do PostgREST."""
+        return ", ".join(_campos(cls))
+
+    @classmethod
+    def de_linha(cls: type[R], linha: dict) -> R:
+        """
+        Cria o registro a partir de uma linha do banco.
+
+        Colunas ausentes ficam None; chaves fora das colunas viram extras.
+        """
+        registro = cls(**{c: linha.get(c) for c in _campos(cls)})
+        colunas = _colunas(cls)
+        extras = {k: v for k, v in linha.items() if k not in colunas}
+        if extras:
+            registro._extras = extras
+        return registro
+
+    @classmethod
+    def de_linhas(cls: type[R], linhas: Optional[list[dict]]) -> list[R]:
+        """Converte o resultado de uma query."""
+        return [cls.de_linha(linha) for linha in linhas or []]
+
+    def _extras_ou_none(self) -> Optional[dict]:
+        return getattr(self, "_extras", None)
+
+    # ------------------------------------------------------------------
+    # Compatibilidade com dict
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave in _colunas(type(self)):
+            return getattr(self, chave)
+        extras = self._extras_ou_none()
+        if extras is not None and chave in extras:
+            return extras[chave]
+        raise KeyError(chave)
+
+    def __setitem__(self, chave: str, valor: Any) -> None:
+        if chave in _colunas(type(self)):
+            setattr(self, chave, valor)
+            return
+        extras = self._extras_ou_none()
+        if extras is None:
+            extras = self._extras = {}
+        extras[chave] = valor
+
+    def __contains__(self, chave: object) -> bool:
+        if chave in _colunas(type(self)):
+            return True
+        extras = self._extras_ou_none()
+        return extras is not None and chave in extras
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        """Igual a dict.get."""
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+
+    def keys(self) -> list[str]:
+        """Colunas seguidas das chaves extras."""
+        return [*_campos(type(self)), *(self._extras_ou_none() or ())]
+
+    def items(self) -> list[tuple[str, Any]]:
+        """Pares (chave, valor), como dict.items."""
+        return [(k, self[k]) for k in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, outro: object) -> bool:
+        if isinstance(outro, Registro):
+            return type(self) is type(outro) and self.para_dict() == outro.para_dict()
+        if isinstance(outro, dict):
+            return self.para_dict() == outro
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def para_dict(self) -> dict:
+        """Copia como dict (colunas + extras)."""
+        return dict(self.items())
+
+    def copy(self: R) -> R:
+        """Copia rasa, como dict.copy."""
+        novo = dataclasses.replace(self)
+        extras = self._extras_ou_none()
+        if extras:
+            novo._extras = dict(extras)
+        return novo
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def serializar(self) -> str:
+        """Lista posicional compacta para o Redis (extras nao vao)."""
+        cls = type(self)
+        valores = [getattr(self, c) for c in _campos(cls)]
+        return json.dumps(
+            [_assinatura(cls), *valores], ensure_ascii=False, separators=(",", ":"), default=str
+        )
+
+    @classmethod
+    def desserializar(cls: type[R], texto: Optional[str]) -> Optional[R]:
+        """
+        Reconstroi o registro serializado.
+
+        Returns:
+            Registro, ou None se vazio, invalido ou de outra versao das colunas
+        """
+        if not texto:
+            return None
+        try:
+            dados = json.loads(texto)
+        except (TypeError, ValueError):
+            return None
+        campos = _campos(cls)
+        if (
+            not isinstance(dados, list)
+            or len(dados) != len(campos) + 1
+            or dados[0] != _assinatura(cls)
+        ):
+            return None
+        return cls(*dados[1:])
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class Medico(Registro):
+    """Linha de clientes usada pelo pipeline."""
+
+    id: str
+    primeiro_nome: Optional[str] = None
+    sobrenome: Optional[str] = None
+    telefone: Optional[str] = None
+    especialidade: Optional[str] = None
+    crm: Optional[str] = None
+    status: Optional[str] = None
+    tags: Optional[list] = None
+    preferencias_detectadas: Optional[dict] = None
+    stage_jornada: Optional[str] = None
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class Conversa(Registro):
+    """Linha de conversations usada pelo pipeline."""
+
+    id: str
+    cliente_id: Optional[str] = None
+    status: Optional[str] = None
+    controlled_by: Optional[str] = None
+    chatwoot_conversation_id: Optional[str] = None
+    created_at: Optional[str] = None
+    campanha_id: Optional[int] = None
+    last_touch_campaign_id: Optional[int] = None
+    last_touch_at: Optional[str] = None
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class Chip(Registro):
+    """Linha de chips usada na selecao e no envio."""
+
+    id: str
+    telefone: Optional[str] = None
+    status: Optional[str] = None
+    tipo: Optional[str] = None
+    provider: Optional[str] = None
+    instance_name: Optional[str] = None
+    zapi_instance_id: Optional[str] = None
+    zapi_token: Optional[str] = None
+    zapi_client_token: Optional[str] = None
+    meta_phone_number_id: Optional[str] = None
+    meta_access_token: Optional[str] = None
+    meta_waba_id: Optional[str] = None
+    meta_quality_rating: Optional[str] = None
+    evolution_connected: Optional[bool] = None
+    trust_score: Optional[float] = None
+    trust_level: Optional[str] = None
+    fase_warmup: Optional[str] = None
+    pode_prospectar: Optional[bool] = None
+    pode_followup: Optional[bool] = None
+    pode_responder: Optional[bool] = None
+    limite_dia: Optional[int] = None
+    limite_hora: Optional[int] = None
+    msgs_enviadas_hoje: Optional[int] = None
+    msgs_recebidas_hoje: Optional[int] = None
+    cooldown_until: Optional[str] = None
+    connection_cooldown_until: Optional[str] = None
+    rampup_inicio: Optional[str] = None
+    rampup_fase: Optional[int] = None
+    rampup_motivo: Optional[str] = None
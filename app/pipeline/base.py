@@ -116,10 +116,23 @@ class PreProcessor(ABC):
     - Modificar a mensagem
     - Interromper o pipeline (retornando resposta)
     - Adicionar metadata ao contexto
+
+    Dependencias (ver app/pipeline/grafo.py):
+    - leituras/escritas: campos do contexto (ou efeitos externos) que o
+      processador le e escreve. None = nao declarado, roda como barreira
+      (sozinho, na ordem de prioridade).
+    - pode_interromper: se pode retornar should_continue=False ou falha.
+      Quem vem depois espera o resultado.
+
+    Processadores independentes rodam concorrentemente; a prioridade
+    continua definindo a ordem em que os resultados sao aplicados.
     """
 
     name: str = "base_preprocessor"
     priority: int = 100  # Menor = roda primeiro
+    leituras: Optional[frozenset[str]] = None
+    escritas: frozenset[str] = frozenset()
+    pode_interromper: bool = True
 
     @abstractmethod
     async def process(self, context: ProcessorContext) -> ProcessorResult:
@@ -151,10 +164,21 @@ class PostProcessor(ABC):
     - Modificar a resposta
     - Validar a resposta
     - Executar acoes (enviar, salvar)
+
+    leituras/escritas seguem a mesma regra dos pre-processadores. Quem pode
+    devolver uma resposta diferente da recebida declara "resposta" em
+    escritas.
+
+    pos_envio=True: nao critico para a resposta; com o executor pos-envio
+    ativo, roda em background depois dos demais (ver pos_envio.py). Nao
+    pode alterar a resposta nem escrever algo que os demais leiam.
     """
 
     name: str = "base_postprocessor"
     priority: int = 100
+    leituras: Optional[frozenset[str]] = None
+    escritas: frozenset[str] = frozenset()
+    pos_envio: bool = False
 
     @abstractmethod
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
@@ -0,0 +1,87 @@
+"""
+Grafo de dependencias entre processadores do pipeline.
+
+Cada processador declara o que le e o que escreve do contexto (ver
+PreProcessor/PostProcessor em base.py). Os nomes sao campos do contexto
+("telefone", "medico", "conversa.chatwoot_conversation_id",
+"metadata.chip_id", "resposta") ou efeitos externos que precisam de ordem
+("whatsapp"). Um nome com ponto e parte do nome sem ponto: "conversa"
+conflita com "conversa.id".
+
+O processador B (depois de A na ordem de prioridade) depende de A quando:
+- A ou B nao declarou leituras (processador legado = barreira);
+- A pode interromper o pipeline (B so roda se A deixar continuar);
+- A escreve algo que B le ou escreve, ou B escreve algo que A le.
+
+Processadores sao agrupados por nivel (1 + maior nivel das dependencias);
+cada nivel pode rodar concorrentemente. Dentro do nivel a ordem de
+prioridade e mantida, e e nela que os resultados sao aplicados.
+"""
+
+from typing import Iterable, Optional, Sequence, TypeVar
+
+P = TypeVar("P")
+
+
+def _sobrepoe(a: str, b: str) -> bool:
+    """True se os nomes se referem ao mesmo dado (ou um contem o outro)."""
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
+
+
+def _intersecta(xs: Iterable[str], ys: Iterable[str]) -> bool:
+    ys = tuple(ys)
+    return any(_sobrepoe(x, y) for x in xs for y in ys)
+
+
+def _leituras(processador) -> Optional[frozenset[str]]:
+    return getattr(processador, "leituras", None)
+
+
+def depende(anterior, posterior) -> bool:
+    """
+    Verifica se `posterior` precisa esperar `anterior` terminar.
+
+    Args:
+        anterior: Processador que vem antes na ordem de prioridade
+        posterior: Processador que vem depois
+
+    Returns:
+        True se existe dependencia
+    """
+    le_a, le_b = _leituras(anterior), _leituras(posterior)
+    if le_a is None or le_b is None:
+        return True
+    if getattr(anterior, "pode_interromper", False):
+        return True
+
+    escreve_a = getattr(anterior, "escritas", frozenset())
+    escreve_b = getattr(posterior, "escritas", frozenset())
+    return (
+        _intersecta(escreve_a, le_b)
+        or _intersecta(escreve_a, escreve_b)
+        or _intersecta(le_a, escreve_b)
+    )
+
+
+def montar_niveis(processadores: Sequence[P]) -> list[list[P]]:
+    """
+    Agrupa processadores (ja ordenados por prioridade) em niveis.
+
+    Args:
+        processadores: Lista na ordem de prioridade
+
+    Returns:
+        Niveis em ordem de execucao; cada nivel na ordem de prioridade
+    """
+    niveis_por_indice: list[int] = []
+    for j, posterior in enumerate(processadores):
+        nivel = 0
+        for i in range(j):
+            if niveis_por_indice[i] >= nivel and depende(processadores[i], posterior):
+                nivel = niveis_por_indice[i] + 1
+        niveis_por_indice.append(nivel)
+
+    niveis: list[list[P]] = [[] for _ in range(max(niveis_por_indice, default=-1) + 1)]
+    for processador, nivel in zip(processadores, niveis_por_indice):
+        niveis[nivel].append(processador)
+    return niveis
@@ -0,0 +1,285 @@
+"""
+Executor em background para o estagio pos-envio do pipeline.
+
+Depois que a resposta sai pelo WhatsApp, SaveInteraction, Extraction e
+Metrics nao precisam segurar o slot do pipeline (_semaforo_processamento).
+Pos-processadores com pos_envio=True viram tarefas deste executor:
+- Orcamento proprio de concorrencia (max_concorrencia workers);
+- Fila com prioridade (menor = antes, como PostProcessor.priority);
+- Backpressure: acima de max_pendentes, submeter() espera vaga;
+- Retry com backoff exponencial quando a tarefa levanta excecao;
+- Contadores para /health/pos-envio.
+
+Tarefas carregam uma chave (a conversa). O pipeline chama aguardar_chave()
+antes do LLM para que a proxima mensagem do mesmo medico veja as interacoes
+da anterior ja gravadas.
+
+So e usado quando iniciado (lifespan da API). Em workers e testes, o
+pipeline roda os pos-processadores inline, como antes.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.tasks import safe_create_task
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_INICIAL_S = 0.5
+TIMEOUT_AGUARDAR_CHAVE_S = 10
+TIMEOUT_PARAR_S = 15
+
+
+@dataclass(order=True)
+class _Tarefa:
+    prioridade: int
+    seq: int
+    nome: str = field(compare=False)
+    fabrica: Callable[[], Awaitable[Any]] = field(compare=False)
+    chave: Optional[str] = field(compare=False, default=None)
+    ao_finalizar: Optional[Callable[[], Awaitable[None]]] = field(compare=False, default=None)
+    reservou_vaga: bool = field(compare=False, default=True)
+    tentativa: int = field(compare=False, default=1)
+    enfileirada_em: float = field(compare=False, default_factory=time.monotonic)
+
+
+class ExecutorPosEnvio:
+    """Fila com prioridade e workers limitados."""
+
+    def __init__(
+        self,
+        max_concorrencia: int = settings.PIPELINE_POS_ENVIO_MAX_CONCURRENT,
+        max_pendentes: int = settings.PIPELINE_POS_ENVIO_MAX_PENDENTES,
+        tentativas: int = settings.PIPELINE_POS_ENVIO_TENTATIVAS,
+        backoff_s: float = BACKOFF_INICIAL_S,
+    ):
+        self.max_concorrencia = max_concorrencia
+        self.max_pendentes = max_pendentes
+        self.tentativas = tentativas
+        self.backoff_s = backoff_s
+        self._seq = itertools.count()
+        self._fila: Optional[asyncio.PriorityQueue] = None
+        self._vagas: Optional[asyncio.Semaphore] = None
+        self._workers: list[asyncio.Task] = []
+        self._pendentes = 0  # Submetidas e ainda nao finalizadas
+        self._ocioso: Optional[asyncio.Event] = None
+        self._por_chave: dict[str, int] = {}
+        self._chave_livre: dict[str, asyncio.Event] = {}
+        self._em_execucao = 0
+        self._contadores = {
+            "submetidas": 0,
+            "concluidas": 0,
+            "falhas": 0,
+            "retentativas": 0,
+            "esperas_backpressure": 0,
+        }
+        self._espera_total_s = 0.0
+        self._iniciadas = 0
+
+    @property
+    def ativo(self) -> bool:
+        """True enquanto os workers estao rodando."""
+        return any(not w.done() for w in self._workers)
+
+    def iniciar(self) -> None:
+        """Sobe os workers (chamar no startup, com event loop rodando)."""
+        if self.ativo:
+            return
+        self._fila = asyncio.PriorityQueue()
+        self._vagas = asyncio.Semaphore(self.max_pendentes)
+        self._ocioso = asyncio.Event()
+        self._ocioso.set()
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker(), name=f"pos_envio_worker_{i}")
+            for i in range(self.max_concorrencia)
+        ]
+        logger.info(
+            f"Executor pos-envio iniciado: {self.max_concorrencia} workers, "
+            f"ate {self.max_pendentes} pendentes"
+        )
+
+    async def parar(self, timeout: float = TIMEOUT_PARAR_S) -> None:
+        """Espera as tarefas pendentes (ate timeout) e derruba os workers."""
+        if self._ocioso and self._pendentes:
+            try:
+                await asyncio.wait_for(self._ocioso.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Executor pos-envio parado com {self._pendentes} pendente(s)")
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        logger.info("Executor pos-envio parado")
+
+    # ------------------------------------------------------------------
+    # Entrada
+    # ------------------------------------------------------------------
+
+    async def submeter(
+        self,
+        nome: str,
+        fabrica: Callable[[], Awaitable[Any]],
+        prioridade: int = 100,
+        chave: Optional[str] = None,
+        ao_finalizar: Optional[Callable[[], Awaitable[None]]] = None,
+        interna: bool = False,
+    ) -> None:
+        """
+        Enfileira uma tarefa.
+
+        Args:
+            nome: Nome para logs
+            fabrica: Cria a corrotina (chamada de novo a cada tentativa)
+            prioridade: Menor roda antes
+            chave: Agrupa tarefas (ex: conversa) para aguardar_chave()
+            ao_finalizar: Chamado apos sucesso ou ultima falha
+            interna: Continuacao de outra tarefa; nao espera vaga (evita
+                deadlock de worker esperando a propria fila)
+        """
+        if not self.ativo:
+            # Sem executor: roda inline, como antes
+            try:
+                await fabrica()
+            finally:
+                if ao_finalizar:
+                    await ao_finalizar()
+            return
+
+        if not interna:
+            if self._vagas.locked():
+                self._contadores["esperas_backpressure"] += 1
+            await self._vagas.acquire()
+
+        self._pendentes += 1
+        self._ocioso.clear()
+        if chave:
+            self._por_chave[chave] = self._por_chave.get(chave, 0) + 1
+            self._chave_livre.setdefault(chave, asyncio.Event()).clear()
+
+        self._contadores["submetidas"] += 1
+        self._fila.put_nowait(
+            _Tarefa(
+                prioridade=prioridade,
+                seq=next(self._seq),
+                nome=nome,
+                fabrica=fabrica,
+                chave=chave,
+                ao_finalizar=ao_finalizar,
+                reservou_vaga=not interna,
+            )
+        )
+
+    async def aguardar_chave(self, chave: str, timeout: float = TIMEOUT_AGUARDAR_CHAVE_S) -> None:
+        """
+        Espera as tarefas pendentes da chave terminarem.
+
+        Args:
+            chave: Chave usada em submeter()
+            timeout: Segundos; depois disso segue mesmo com pendencias
+        """
+        livre = self._chave_livre.get(chave)
+        if livre is None or livre.is_set():
+            return
+        try:
+            await asyncio.wait_for(livre.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Pos-envio da chave {chave} ainda pendente apos {timeout}s")
+
+    # ------------------------------------------------------------------
+    # Execucao
+    # ------------------------------------------------------------------
+
+    async def _worker(self) -> None:
+        while True:
+            tarefa = await self._fila.get()
+            try:
+                await self._executar(tarefa)
+            except Exception as e:
+                logger.error(f"Erro no worker pos-envio ({tarefa.nome}): {e}")
+            finally:
+                self._fila.task_done()
+
+    async def _executar(self, tarefa: _Tarefa) -> None:
+        if tarefa.tentativa == 1:
+            self._espera_total_s += time.monotonic() - tarefa.enfileirada_em
+            self._iniciadas += 1
+
+        self._em_execucao += 1
+        try:
+            await tarefa.fabrica()
+        except Exception as e:
+            if tarefa.tentativa < self.tentativas:
+                self._contadores["retentativas"] += 1
+                atraso = self.backoff_s * 2 ** (tarefa.tentativa - 1)
+                logger.warning(
+                    f"Pos-envio {tarefa.nome} falhou (tentativa {tarefa.tentativa}), "
+                    f"nova tentativa em {atraso:.1f}s: {e}"
+                )
+                tarefa.tentativa += 1
+                safe_create_task(self._reenfileirar(tarefa, atraso), name="pos_envio_retry")
+                return
+            self._contadores["falhas"] += 1
+            logger.error(f"Pos-envio {tarefa.nome} falhou apos {tarefa.tentativa} tentativas: {e}")
+        else:
+            self._contadores["concluidas"] += 1
+        finally:
+            self._em_execucao -= 1
+
+        await self._finalizar(tarefa)
+
+    async def _reenfileirar(self, tarefa: _Tarefa, atraso: float) -> None:
+        await asyncio.sleep(atraso)
+        tarefa.seq = next(self._seq)
+        self._fila.put_nowait(tarefa)
+
+    async def _finalizar(self, tarefa: _Tarefa) -> None:
+        if tarefa.ao_finalizar:
+            try:
+                await tarefa.ao_finalizar()
+            except Exception as e:
+                logger.error(f"Erro ao finalizar pos-envio {tarefa.nome}: {e}")
+
+        if tarefa.reservou_vaga:
+            self._vagas.release()
+        if tarefa.chave:
+            restantes = self._por_chave.get(tarefa.chave, 1) - 1
+            if restantes <= 0:
+                self._por_chave.pop(tarefa.chave, None)
+                livre = self._chave_livre.pop(tarefa.chave, None)
+                if livre:
+                    livre.set()
+            else:
+                self._por_chave[tarefa.chave] = restantes
+        self._pendentes -= 1
+        if self._pendentes == 0:
+            self._ocioso.set()
+
+    def estatisticas(self) -> dict:
+        """Estado da fila e contadores desde o startup."""
+        espera_media_ms = (
+            round(self._espera_total_s / self._iniciadas * 1000, 1) if self._iniciadas else 0.0
+        )
+        return {
+            "ativo": self.ativo,
+            "pendentes": self._pendentes,
+            "na_fila": self._fila.qsize() if self._fila else 0,
+            "em_execucao": self._em_execucao,
+            "max_concorrencia": self.max_concorrencia,
+            "max_pendentes": self.max_pendentes,
+            "espera_media_ms": espera_media_ms,
+            **self._contadores,
+        }
+
+
+# Singleton
+executor_pos_envio = ExecutorPosEnvio()
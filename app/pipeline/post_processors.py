@@ -39,6 +39,15 @@ class ValidateOutputProcessor(PostProcessor):
 
     name = "validate_output"
     priority = 5
+    leituras = frozenset({"resposta"})
+    escritas = frozenset(
+        {
+            "resposta",
+            "metadata.resposta_corrigida",
+            "metadata.resposta_bloqueada",
+            "metadata.resposta_original",
+        }
+    )
 
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         if not response:
@@ -77,6 +86,17 @@ class TimingProcessor(PostProcessor):
 
     name = "timing"
     priority = 10
+    # "whatsapp" ordena o delay antes do envio (SendMessageProcessor)
+    leituras = frozenset(
+        {
+            "resposta",
+            "mensagem_texto",
+            "telefone",
+            "metadata.tempo_inicio",
+            "metadata.outbound_ctx",
+        }
+    )
+    escritas = frozenset({"whatsapp"})
 
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         if not response:
@@ -127,6 +147,32 @@ class SendMessageProcessor(PostProcessor):
 
     name = "send_message"
     priority = 20
+    leituras = frozenset(
+        {
+            "resposta",
+            "mensagem_texto",
+            "telefone",
+            "message_id",
+            "medico",
+            "conversa",
+            "metadata.entrada_salva",
+            "metadata.policy_decision_id",
+            "metadata.fora_horario",
+            "metadata.registro_id",
+            "metadata.ack_template",
+        }
+    )
+    escritas = frozenset(
+        {
+            "whatsapp",
+            "metadata.entrada_salva",
+            "metadata.inbound_interaction_id",
+            "metadata.message_sent",
+            "metadata.enviado_em",
+            "metadata.sent_message_id",
+            "metadata.chip_id",
+        }
+    )
 
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         if not response:
@@ -183,6 +229,7 @@ class SendMessageProcessor(PostProcessor):
 
         # Sucesso
         context.metadata["message_sent"] = True
+        context.metadata["enviado_em"] = time.time()
         if hasattr(resultado, "evolution_response") and resultado.evolution_response:
             context.metadata["sent_message_id"] = resultado.evolution_response.get("key", {}).get(
                 "id"
@@ -264,11 +311,40 @@ class SaveInteractionProcessor(PostProcessor):
     """
     Salva interacoes no banco.
 
+    Erro ao gravar devolve falha: inline so e logado; no executor pos-envio
+    gera nova tentativa, que pula a entrada e a saida ja gravadas.
+
     Prioridade: 30
     """
 
     name = "save_interaction"
     priority = 30
+    pos_envio = True
+    leituras = frozenset(
+        {
+            "resposta",
+            "mensagem_texto",
+            "mensagem_raw",
+            "message_id",
+            "medico.id",
+            "conversa.id",
+            "metadata.entrada_salva",
+            "metadata.saida_salva",
+            "metadata.inbound_interaction_id",
+            "metadata.message_sent",
+            "metadata.sent_message_id",
+            "metadata.chip_id",
+            "metadata.policy_decision_id",
+        }
+    )
+    escritas = frozenset(
+        {
+            "metadata.entrada_salva",
+            "metadata.saida_salva",
+            "metadata.inbound_interaction_id",
+            "metadata.campanha_id",
+        }
+    )
 
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         try:
@@ -290,6 +366,7 @@ class SaveInteractionProcessor(PostProcessor):
                     autor_tipo="medico",
                     message_id=context.message_id,
                     chip_id=chip_id_entrada,  # Sprint 41
+                    levantar_erro=True,
                 )
                 context.metadata["entrada_salva"] = True
                 if interacao_entrada:
@@ -307,7 +384,11 @@ class SaveInteractionProcessor(PostProcessor):
                 )
 
             # Salvar interacao de saida (se enviou)
-            if response and context.metadata.get("message_sent"):
+            if (
+                response
+                and context.metadata.get("message_sent")
+                and not context.metadata.get("saida_salva")
+            ):
                 interacao = await salvar_interacao(
                     conversa_id=context.conversa["id"],
                     cliente_id=context.medico["id"],
@@ -316,7 +397,9 @@ class SaveInteractionProcessor(PostProcessor):
                     autor_tipo="julia",
                     message_id=context.metadata.get("sent_message_id"),
                     chip_id=context.metadata.get("chip_id"),  # Sprint 41
+                    levantar_erro=True,
                 )
+                context.metadata["saida_salva"] = True
 
                 # Sprint 16 - E08: Atualizar policy_event com interaction_id
                 policy_decision_id = context.metadata.get("policy_decision_id")
@@ -332,14 +415,28 @@ class SaveInteractionProcessor(PostProcessor):
                             f"Policy effect atualizado com interaction_id: {interaction_id}"
                         )
 
+                self._agendar_atualizacao_resumo(context)
+
             logger.debug("Interacoes salvas")
 
         except Exception as e:
             logger.error(f"Erro ao salvar interacoes: {e}")
-            # Nao para o pipeline por isso
+            # Nao para o pipeline por isso (o executor pos-envio tenta de novo)
+            return ProcessorResult(success=False, response=response, error=str(e))
 
         return ProcessorResult(success=True, response=response)
 
+    def _agendar_atualizacao_resumo(self, context: ProcessorContext) -> None:
+        """Atualiza o resumo incremental da conversa fora do caminho da resposta."""
+        from app.services.julia.summarizer import atualizar_resumo_conversa
+
+        conversa_id = context.conversa.get("id")
+        if conversa_id:
+            safe_create_task(
+                atualizar_resumo_conversa(conversa_id),
+                name=f"resumo_conversa_{conversa_id}",
+            )
+
     async def _atribuir_reply_campanha(
         self,
         interaction_id: int,
@@ -423,7 +520,10 @@ class ChatwootResponseProcessor(PostProcessor):
 
     A integracao automatica Evolution-Chatwoot pode ter bugs com LID format,
     entao enviamos diretamente para garantir que as mensagens aparecam
-    corretamente (usuario como incoming, Julia como outgoing).
+    corretamente (usuario como incoming, Julia como outgoing). O envio
+    passa pelo espelho Chatwoot (em lote, fora do caminho da resposta).
+    Em conversa nova (sincronizacao de IDs agendada pelo ChatwootSync), as
+    mensagens do turno esperam no espelho ate a conversa ser encontrada.
 
     Prioridade: 25 (logo apos SendMessage)
     """
@@ -434,19 +534,30 @@ class ChatwootResponseProcessor(PostProcessor):
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         # So sincroniza se tiver ID da conversa do Chatwoot
         chatwoot_conversation_id = context.metadata.get("chatwoot_conversation_id")
-        if not chatwoot_conversation_id:
+        aguardando_sync = not chatwoot_conversation_id and context.metadata.get(
+            "chatwoot_sincronizacao_agendada"
+        )
+        if not chatwoot_conversation_id and not aguardando_sync:
             return ProcessorResult(success=True, response=response)
 
         try:
-            from app.services.chatwoot import chatwoot_service
+            from app.services.chatwoot import espelho_chatwoot
+
+            async def espelhar(content: str, message_type: str) -> None:
+                if aguardando_sync:
+                    await espelho_chatwoot.enviar_mensagem_cliente(
+                        context.medico["id"], context.telefone, content, message_type
+                    )
+                else:
+                    await espelho_chatwoot.enviar_mensagem(
+                        conversation_id=chatwoot_conversation_id,
+                        content=content,
+                        message_type=message_type,
+                    )
 
             # 1. Enviar mensagem do usuario como incoming (se ainda nao foi sincronizada)
             if context.mensagem_texto and not context.metadata.get("chatwoot_incoming_sent"):
-                await chatwoot_service.enviar_mensagem(
-                    conversation_id=chatwoot_conversation_id,
-                    content=context.mensagem_texto,
-                    message_type="incoming",
-                )
+                await espelhar(context.mensagem_texto, "incoming")
                 context.metadata["chatwoot_incoming_sent"] = True
                 logger.info(
                     f"Mensagem do usuario sincronizada com Chatwoot conversa {chatwoot_conversation_id}"
@@ -454,11 +565,7 @@ class ChatwootResponseProcessor(PostProcessor):
 
             # 2. Enviar resposta da Julia como outgoing (se mensagem foi enviada)
             if response and context.metadata.get("message_sent"):
-                await chatwoot_service.enviar_mensagem(
-                    conversation_id=chatwoot_conversation_id,
-                    content=response,
-                    message_type="outgoing",
-                )
+                await espelhar(response, "outgoing")
                 logger.info(
                     f"Resposta sincronizada com Chatwoot conversa {chatwoot_conversation_id}"
                 )
@@ -479,11 +586,24 @@ class MetricsProcessor(PostProcessor):
 
     name = "metrics"
     priority = 40
+    pos_envio = True
+    # message_sent/enviado_em: tempo de resposta medido no envio
+    leituras = frozenset(
+        {
+            "resposta",
+            "conversa.id",
+            "metadata.tempo_inicio",
+            "metadata.message_sent",
+            "metadata.enviado_em",
+        }
+    )
 
     async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
         try:
-            tempo_inicio = context.metadata.get("tempo_inicio", time.time())
-            tempo_resposta = time.time() - tempo_inicio
+            # No executor pos-envio esta tarefa pode rodar bem depois do envio
+            fim = context.metadata.get("enviado_em") or time.time()
+            tempo_inicio = context.metadata.get("tempo_inicio", fim)
+            tempo_resposta = fim - tempo_inicio
 
             # Registrar mensagem do medico
             await metricas_service.registrar_mensagem(
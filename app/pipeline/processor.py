@@ -1,10 +1,20 @@
 """
 Processador principal de mensagens.
+
+Pre e pos-processadores rodam por nivel do grafo de dependencias
+(ver grafo.py): processadores independentes do mesmo nivel rodam
+concorrentemente. Pos-processadores pos_envio vao para o executor em
+background (ver pos_envio.py) quando ele esta ativo.
 """
 
+import asyncio
+import functools
 import logging
+from typing import Optional
 
 from .base import ProcessorContext, ProcessorResult, PreProcessor, PostProcessor
+from .grafo import montar_niveis
+from .pos_envio import executor_pos_envio
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +37,7 @@ class MessageProcessor:
         self.pre_processors: list[PreProcessor] = []
         self.post_processors: list[PostProcessor] = []
         self._core_processor = None
+        self._planos: dict[tuple, list[list]] = {}
 
     def add_pre_processor(self, processor: PreProcessor) -> "MessageProcessor":
         """Adiciona pre-processador e reordena por prioridade."""
@@ -45,35 +56,204 @@ class MessageProcessor:
         self._core_processor = processor
         return self
 
-    async def _run_post_processors_on_early_exit(
-        self, context: ProcessorContext, response: str
-    ) -> ProcessorResult:
-        """
-        Roda pos-processadores necessarios quando pipeline para cedo.
+    def _plano(self, processadores: list) -> list[list]:
+        """Niveis do grafo de dependencias (cache por composicao da lista)."""
+        chave = tuple(processadores)
+        plano = self._planos.get(chave)
+        if plano is None:
+            plano = self._planos[chave] = montar_niveis(processadores)
+        return plano
+
+    @staticmethod
+    def _filtrar(nivel: list, context: ProcessorContext, fase: str) -> list:
+        """Processadores do nivel que devem rodar."""
+        ativos = []
+        for processor in nivel:
+            if not processor.should_run(context):
+                logger.debug(f"Pulando {processor.name}")
+                continue
+            logger.debug(f"Rodando {fase}: {processor.name}")
+            ativos.append(processor)
+        return ativos
 
-        Usado quando um pre-processador retorna resposta (opt-out, media, etc).
-        Roda apenas: SendMessage, SaveInteraction.
+    @staticmethod
+    async def _rodar_nivel(chamadas: list) -> list[ProcessorResult]:
         """
-        logger.debug("Rodando pos-processadores para saida antecipada")
+        Roda as chamadas de um nivel concorrentemente.
 
-        for processor in self.post_processors:
-            # Pular processadores nao essenciais
-            if processor.name in ["timing", "metrics"]:
+        Espera todas terminarem; se alguma levantou excecao, a primeira na
+        ordem de prioridade e propagada.
+        """
+        if len(chamadas) == 1:
+            return [await chamadas[0]]
+        resultados = await asyncio.gather(*chamadas, return_exceptions=True)
+        for resultado in resultados:
+            if isinstance(resultado, BaseException):
+                raise resultado
+        return resultados
+
+    async def _completar_anteriores(
+        self, niveis: list[list], interruptor: PreProcessor, context: ProcessorContext
+    ) -> None:
+        """
+        Roda pre-processadores de prioridade menor que a do interruptor que
+        ficaram em niveis seguintes (como rodariam na execucao sequencial).
+        """
+        limite = self.pre_processors.index(interruptor)
+        for nivel in niveis:
+            pendentes = [p for p in nivel if self.pre_processors.index(p) < limite]
+            ativos = self._filtrar(pendentes, context, "pre")
+            if not ativos:
                 continue
+            resultados = await self._rodar_nivel([p.process(context) for p in ativos])
+            for processor, result in zip(ativos, resultados):
+                if not result.success:
+                    logger.warning(f"Pre-processor {processor.name} falhou: {result.error}")
 
-            if not processor.should_run(context):
+    async def _run_pre_processors(self, context: ProcessorContext) -> Optional[ProcessorResult]:
+        """
+        Roda pre-processadores por nivel do grafo de dependencias.
+
+        Returns:
+            Resultado que interrompeu o pipeline, ou None para seguir ao core
+        """
+        logger.debug(f"Iniciando {len(self.pre_processors)} pre-processadores")
+
+        niveis = self._plano(self.pre_processors)
+        for n, nivel in enumerate(niveis):
+            ativos = self._filtrar(nivel, context, "pre")
+            if not ativos:
                 continue
 
-            logger.debug(f"Rodando pos (early exit): {processor.name}")
-            result = await processor.process(context, response)
+            resultados = await self._rodar_nivel([p.process(context) for p in ativos])
+
+            # Resultados aplicados na ordem de prioridade: o primeiro que para vence
+            for processor, result in zip(ativos, resultados):
+                if not result.success:
+                    logger.warning(f"Pre-processor {processor.name} falhou: {result.error}")
+                    await self._completar_anteriores(niveis[n + 1 :], processor, context)
+                    return result
+
+                if not result.should_continue:
+                    logger.info(f"Pipeline interrompido por {processor.name}")
+                    await self._completar_anteriores(niveis[n + 1 :], processor, context)
+                    # Se tem resposta, rodar pos-processadores de envio
+                    if result.response:
+                        return await self._run_post_processors_on_early_exit(
+                            context, result.response
+                        )
+                    return result
+
+        return None
 
-            if not result.success:
-                logger.warning(f"Pos-processor {processor.name} falhou: {result.error}")
+    async def _run_post_processors(
+        self,
+        context: ProcessorContext,
+        response: str,
+        pular: tuple[str, ...] = (),
+        fase: str = "pos",
+    ) -> str:
+        """
+        Roda pos-processadores por nivel do grafo de dependencias.
+
+        Falhas nao param os demais. Todos do nivel recebem a mesma resposta;
+        respostas modificadas sao aplicadas na ordem de prioridade.
+
+        Returns:
+            Resposta final
+        """
+        processadores = [p for p in self.post_processors if p.name not in pular]
+        adiados = []
+        if executor_pos_envio.ativo:
+            adiados = [p for p in processadores if p.pos_envio]
+            processadores = [p for p in processadores if not p.pos_envio]
+
+        for nivel in self._plano(processadores):
+            ativos = self._filtrar(nivel, context, fase)
+            if not ativos:
                 continue
 
-            if result.response:
-                response = result.response
+            resultados = await self._rodar_nivel([p.process(context, response) for p in ativos])
+
+            for processor, result in zip(ativos, resultados):
+                if not result.success:
+                    logger.warning(f"Pos-processor {processor.name} falhou: {result.error}")
+                    # Pos-processors podem falhar sem parar tudo
+                    continue
+
+                # Atualizar resposta se modificada
+                if result.response:
+                    response = result.response
+
+        if adiados:
+            await self._agendar_pos_envio(self._plano(adiados), context, response)
+
+        return response
+
+    async def _agendar_pos_envio(
+        self,
+        niveis: list[list],
+        context: ProcessorContext,
+        response: str,
+        interna: bool = False,
+    ) -> None:
+        """
+        Submete o primeiro nivel de pos-processadores pos-envio ao executor.
+
+        Cada processador vira uma tarefa (retry individual); quando o nivel
+        inteiro termina, o proximo nivel e submetido.
+        """
+        if not niveis:
+            return
+
+        nivel, restantes = niveis[0], niveis[1:]
+        ativos = self._filtrar(nivel, context, "pos (background)")
+        if not ativos:
+            await self._agendar_pos_envio(restantes, context, response, interna)
+            return
+
+        chave = context.conversa.get("id") if context.conversa else None
+        faltam = len(ativos)
+
+        async def ao_finalizar() -> None:
+            nonlocal faltam
+            faltam -= 1
+            if faltam == 0:
+                await self._agendar_pos_envio(restantes, context, response, interna=True)
+
+        for processor in ativos:
+            await executor_pos_envio.submeter(
+                nome=processor.name,
+                fabrica=functools.partial(self._rodar_pos_envio, processor, context, response),
+                prioridade=processor.priority,
+                chave=chave,
+                ao_finalizar=ao_finalizar,
+                interna=interna,
+            )
+
+    @staticmethod
+    async def _rodar_pos_envio(
+        processor: PostProcessor, context: ProcessorContext, response: str
+    ) -> None:
+        """Tarefa do executor: falha (devolvida ou excecao) gera retry."""
+        result = await processor.process(context, response)
+        if not result.success:
+            raise RuntimeError(f"Pos-processor {processor.name} falhou: {result.error}")
 
+    async def _run_post_processors_on_early_exit(
+        self, context: ProcessorContext, response: str
+    ) -> ProcessorResult:
+        """
+        Roda pos-processadores necessarios quando pipeline para cedo.
+
+        Usado quando um pre-processador retorna resposta (opt-out, media, etc).
+        Pula os nao essenciais (timing, metrics).
+        """
+        logger.debug("Rodando pos-processadores para saida antecipada")
+
+        response = await self._run_post_processors(
+            context, response, pular=("timing", "metrics"), fase="pos (early exit)"
+        )
         return ProcessorResult(success=True, response=response, should_continue=False)
 
     async def process(self, mensagem_raw: dict) -> ProcessorResult:
@@ -96,28 +276,14 @@ class MessageProcessor:
 
         try:
             # FASE 1: Pre-processadores
-            logger.debug(f"Iniciando {len(self.pre_processors)} pre-processadores")
-
-            for processor in self.pre_processors:
-                if not processor.should_run(context):
-                    logger.debug(f"Pulando {processor.name}")
-                    continue
-
-                logger.debug(f"Rodando pre: {processor.name}")
-                result = await processor.process(context)
-
-                if not result.success:
-                    logger.warning(f"Pre-processor {processor.name} falhou: {result.error}")
-                    return result
+            interrupcao = await self._run_pre_processors(context)
+            if interrupcao is not None:
+                return interrupcao
 
-                if not result.should_continue:
-                    logger.info(f"Pipeline interrompido por {processor.name}")
-                    # Se tem resposta, rodar pos-processadores de envio
-                    if result.response:
-                        return await self._run_post_processors_on_early_exit(
-                            context, result.response
-                        )
-                    return result
+            # Pos-envio da mensagem anterior desta conversa ainda na fila
+            # (interacoes precisam estar gravadas antes de montar o contexto)
+            if context.conversa and executor_pos_envio.ativo:
+                await executor_pos_envio.aguardar_chave(context.conversa["id"])
 
             # FASE 2: Processador core (LLM)
             if self._core_processor is None:
@@ -135,23 +301,7 @@ class MessageProcessor:
 
             # FASE 3: Pos-processadores
             logger.debug(f"Iniciando {len(self.post_processors)} pos-processadores")
-
-            for processor in self.post_processors:
-                if not processor.should_run(context):
-                    logger.debug(f"Pulando {processor.name}")
-                    continue
-
-                logger.debug(f"Rodando pos: {processor.name}")
-                result = await processor.process(context, response)
-
-                if not result.success:
-                    logger.warning(f"Pos-processor {processor.name} falhou: {result.error}")
-                    # Pos-processors podem falhar sem parar tudo
-                    continue
-
-                # Atualizar resposta se modificada
-                if result.response:
-                    response = result.response
+            response = await self._run_post_processors(context, response)
 
             # Sucesso
             return ProcessorResult(success=True, response=response)
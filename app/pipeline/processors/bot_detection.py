@@ -20,6 +20,9 @@ class BotDetectionProcessor(PreProcessor):
 
     name = "bot_detection"
     priority = 35
+    leituras = frozenset({"mensagem_texto", "medico.id", "conversa.id"})
+    escritas = frozenset({"metadata.bot_detected"})
+    pode_interromper = False
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if not context.mensagem_texto:
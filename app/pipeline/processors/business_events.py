@@ -23,6 +23,8 @@ class BusinessEventInboundProcessor(PreProcessor):
 
     name = "business_event_inbound"
     priority = 22
+    leituras = frozenset({"medico.id", "conversa.id", "tipo_mensagem", "mensagem_texto"})
+    pode_interromper = False
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         from app.services.business_events import (
@@ -15,17 +15,36 @@ class ChatwootSyncProcessor(PreProcessor):
     """
     Sincroniza IDs do Chatwoot se nao existir.
 
+    Com o espelho Chatwoot ativo, so agenda a sincronizacao: a resolucao
+    via HTTP roda no worker, fora do caminho da resposta. O turno marca
+    metadata["chatwoot_sincronizacao_agendada"] e as mensagens dele sao
+    espelhadas pelo worker quando a conversa for encontrada.
+
     Prioridade: 25 (apos load entities)
     """
 
     name = "chatwoot_sync"
     priority = 25
+    leituras = frozenset({"telefone", "medico.id", "conversa.chatwoot_conversation_id"})
+    escritas = frozenset(
+        {"conversa.chatwoot_conversation_id", "metadata.chatwoot_sincronizacao_agendada"}
+    )
+    pode_interromper = False
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if context.conversa.get("chatwoot_conversation_id"):
             return ProcessorResult(success=True)
 
-        from app.services.chatwoot import sincronizar_ids_chatwoot
+        from app.services.chatwoot import espelho_chatwoot, sincronizar_ids_chatwoot
+
+        # Conversa sem ID do Chatwoot e conversa nova: o ID vem da sincronizacao
+        if espelho_chatwoot.ativo:
+            try:
+                await espelho_chatwoot.sincronizar_ids(context.medico["id"], context.telefone)
+                context.metadata["chatwoot_sincronizacao_agendada"] = True
+            except Exception as e:
+                logger.warning(f"Erro ao agendar sincronizacao Chatwoot: {e}")
+            return ProcessorResult(success=True)
 
         try:
             ids = await sincronizar_ids_chatwoot(context.medico["id"], context.telefone)
@@ -23,6 +23,9 @@ class ChipMappingProcessor(PreProcessor):
 
     name = "chip_mapping"
     priority = 21
+    leituras = frozenset({"mensagem_raw", "conversa.id", "telefone"})
+    escritas = frozenset({"metadata.chip_instance"})
+    pode_interromper = False
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         from app.core.config import settings
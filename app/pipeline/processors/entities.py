@@ -22,6 +22,8 @@ class LoadEntitiesProcessor(PreProcessor):
 
     name = "load_entities"
     priority = 20
+    leituras = frozenset({"telefone", "metadata.nome_contato"})
+    escritas = frozenset({"medico", "conversa"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         # Buscar/criar medico
@@ -12,6 +12,7 @@ import os
 
 from app.core.tasks import safe_create_task
 from app.pipeline.base import PostProcessor, ProcessorContext, ProcessorResult
+from app.pipeline.pos_envio import executor_pos_envio
 from app.services.extraction import (
     extrair_dados_conversa,
     ExtractionContext,
@@ -39,6 +40,19 @@ class ExtractionProcessor(PostProcessor):
 
     name = "extraction"
     priority = 35
+    pos_envio = True
+    leituras = frozenset(
+        {
+            "resposta",
+            "mensagem_texto",
+            "telefone",
+            "medico",
+            "conversa.id",
+            "metadata.campanha_id",
+            "metadata.tipo_campanha",
+            "metadata.inbound_interaction_id",
+        }
+    )
 
     def should_run(self, context: ProcessorContext) -> bool:
         """So roda se ha mensagem do medico, resposta da Julia e medico identificado."""
@@ -57,6 +71,11 @@ class ExtractionProcessor(PostProcessor):
         if not response:
             return ProcessorResult(success=True, response=response)
 
+        # Ja em background no executor pos-envio: roda dentro do orcamento dele
+        if executor_pos_envio.ativo:
+            await self._extrair_e_persistir(context, response)
+            return ProcessorResult(success=True, response=response)
+
         # Executar em background para nao atrasar resposta
         safe_create_task(
             self._extrair_e_persistir(context, response), name=f"extraction_{context.telefone[-4:]}"
@@ -22,6 +22,7 @@ class HandoffTriggerProcessor(PreProcessor):
 
     name = "handoff_trigger"
     priority = 50
+    leituras = frozenset({"mensagem_texto", "medico.id", "conversa.id"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if not context.mensagem_texto:
@@ -65,6 +66,7 @@ class HandoffKeywordProcessor(PreProcessor):
 
     name = "handoff_keyword"
     priority = 55
+    leituras = frozenset({"mensagem_texto", "telefone"})
 
     # Keywords de confirmacao (case insensitive)
     # Sprint 44 T06.6: Padrões pré-compilados no nível de classe
@@ -20,6 +20,15 @@ class HumanControlProcessor(PreProcessor):
 
     name = "human_control"
     priority = 60
+    leituras = frozenset(
+        {
+            "mensagem_texto",
+            "conversa",
+            "telefone",
+            "medico.id",
+            "metadata.chatwoot_sincronizacao_agendada",
+        }
+    )
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if context.conversa.get("controlled_by") == "ai":
@@ -28,15 +37,22 @@ class HumanControlProcessor(PreProcessor):
         logger.info("Conversa sob controle humano, nao gerando resposta")
 
         # Sincronizar com Chatwoot para gestor ver
-        from app.services.chatwoot import chatwoot_service
+        from app.services.chatwoot import chatwoot_service, espelho_chatwoot
 
-        if context.conversa.get("chatwoot_conversation_id") and chatwoot_service.configurado:
+        conteudo = context.mensagem_texto or "[midia]"
+        if chatwoot_service.configurado:
             try:
-                await chatwoot_service.enviar_mensagem(
-                    conversation_id=context.conversa["chatwoot_conversation_id"],
-                    content=context.mensagem_texto or "[midia]",
-                    message_type="incoming",
-                )
+                if context.conversa.get("chatwoot_conversation_id"):
+                    await espelho_chatwoot.enviar_mensagem(
+                        conversation_id=context.conversa["chatwoot_conversation_id"],
+                        content=conteudo,
+                        message_type="incoming",
+                    )
+                elif context.metadata.get("chatwoot_sincronizacao_agendada"):
+                    # Conversa nova: sai quando a sincronizacao achar a conversa
+                    await espelho_chatwoot.enviar_mensagem_cliente(
+                        context.medico["id"], context.telefone, conteudo, "incoming"
+                    )
             except Exception as e:
                 logger.warning(f"Erro ao sincronizar com Chatwoot: {e}")
 
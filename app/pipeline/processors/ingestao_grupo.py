@@ -24,6 +24,7 @@ class IngestaoGrupoProcessor(PreProcessor):
 
     name = "ingestao_grupo"
     priority = 5
+    leituras = frozenset({"mensagem_raw"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         data = context.mensagem_raw
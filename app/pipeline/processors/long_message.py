@@ -20,6 +20,8 @@ class LongMessageProcessor(PreProcessor):
 
     name = "long_message"
     priority = 45
+    leituras = frozenset({"mensagem_texto"})
+    escritas = frozenset({"mensagem_texto", "metadata.message_truncated"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if not context.mensagem_texto:
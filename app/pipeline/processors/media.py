@@ -20,6 +20,7 @@ class MediaProcessor(PreProcessor):
 
     name = "media"
     priority = 40
+    leituras = frozenset({"tipo_mensagem", "mensagem_texto"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         from app.services.respostas_especiais import (
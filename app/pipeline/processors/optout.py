@@ -21,6 +21,7 @@ class OptOutProcessor(PreProcessor):
 
     name = "optout"
     priority = 30
+    leituras = frozenset({"mensagem_texto", "telefone", "medico.id"})
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         if not context.mensagem_texto:
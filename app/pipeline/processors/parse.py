@@ -22,6 +22,19 @@ class ParseMessageProcessor(PreProcessor):
 
     name = "parse_message"
     priority = 10
+    leituras = frozenset({"mensagem_raw"})
+    escritas = frozenset(
+        {
+            "mensagem_texto",
+            "telefone",
+            "message_id",
+            "tipo_mensagem",
+            "metadata.nome_contato",
+            "metadata.remote_jid",
+            "metadata.chatwoot_conversation_id",
+            "metadata.chatwoot_inbox_id",
+        }
+    )
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         mensagem = parsear_mensagem(context.mensagem_raw)
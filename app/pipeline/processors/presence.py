@@ -21,6 +21,9 @@ class PresenceProcessor(PreProcessor):
 
     name = "presence"
     priority = 15
+    leituras = frozenset({"telefone", "message_id", "metadata.remote_jid"})
+    escritas = frozenset({"whatsapp"})
+    pode_interromper = False
 
     async def process(self, context: ProcessorContext) -> ProcessorResult:
         # Verificar se é mensagem Z-API (não usa Evolution para presença)
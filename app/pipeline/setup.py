@@ -2,6 +2,8 @@
 Configuracao do pipeline de mensagens.
 """
 
+from app.core.lazy import servico_lazy
+
 from .processor import MessageProcessor
 from .core import LLMCoreProcessor
 from .pre_processors import (
@@ -75,5 +77,5 @@ def criar_pipeline() -> MessageProcessor:
     return pipeline
 
 
-# Instancia global do pipeline
-message_pipeline = criar_pipeline()
+# Instancia global do pipeline (montada na primeira mensagem)
+message_pipeline = servico_lazy("message_pipeline", criar_pipeline)
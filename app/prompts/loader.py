@@ -6,13 +6,16 @@ import logging
 from typing import Optional
 
 from app.services.supabase import supabase
-from app.services.redis import cache_get, cache_set, cache_delete
+from app.services.redis import CacheNamespace, cache_get, cache_set
 
 logger = logging.getLogger(__name__)
 
 # TTL do cache em segundos
 CACHE_TTL_PROMPTS = 300  # 5 minutos
 
+# Tag por nome de prompt: invalidar descarta todas as versoes em cache
+_cache_prompts = CacheNamespace("prompt")
+
 # Fallback hardcoded (caso banco falhe) - versão mínima com sentinelas críticas
 FALLBACK_PROMPTS = {
     "julia_base": """[INVARIANT:INBOUND_ALWAYS_REPLY]
@@ -79,10 +82,10 @@ async def carregar_prompt(nome: str, versao: str = None) -> Optional[str]:
     Returns:
         Conteudo do prompt ou None
     """
-    cache_key = f"prompt:{nome}:{versao or 'ativo'}"
+    cache_key = await _cache_prompts.chave(f"{nome}:{versao or 'ativo'}", tags=[f"nome:{nome}"])
 
-    # Tentar cache
-    cached = await cache_get(cache_key)
+    # Tentar cache (sem chave = geracoes indisponiveis, vai direto ao banco)
+    cached = await cache_get(cache_key) if cache_key else None
     if cached:
         logger.debug(f"Prompt {nome} carregado do cache")
         return cached
@@ -102,7 +105,8 @@ async def carregar_prompt(nome: str, versao: str = None) -> Optional[str]:
             conteudo = response.data[0]["conteudo"]
 
             # Salvar no cache
-            await cache_set(cache_key, conteudo, CACHE_TTL_PROMPTS)
+            if cache_key:
+                await cache_set(cache_key, conteudo, CACHE_TTL_PROMPTS)
 
             logger.debug(f"Prompt {nome} carregado do banco")
             return conteudo
@@ -129,9 +133,11 @@ async def carregar_prompt_especialidade(especialidade_id: str) -> Optional[str]:
     if not especialidade_id:
         return None
 
-    cache_key = f"prompt:especialidade:{especialidade_id}"
+    cache_key = await _cache_prompts.chave(
+        f"especialidade:{especialidade_id}", tags=[f"especialidade:{especialidade_id}"]
+    )
 
-    cached = await cache_get(cache_key)
+    cached = await cache_get(cache_key) if cache_key else None
     if cached:
         return cached
 
@@ -148,7 +154,8 @@ async def carregar_prompt_especialidade(especialidade_id: str) -> Optional[str]:
 
         if response.data:
             conteudo = response.data[0]["conteudo"]
-            await cache_set(cache_key, conteudo, CACHE_TTL_PROMPTS)
+            if cache_key:
+                await cache_set(cache_key, conteudo, CACHE_TTL_PROMPTS)
             return conteudo
 
         return None
@@ -161,8 +168,10 @@ async def carregar_prompt_especialidade(especialidade_id: str) -> Optional[str]:
 async def invalidar_cache_prompt(nome: str):
     """
     Invalida cache de um prompt (chamar apos editar).
+
+    Descarta a versao ativa e as versoes especificas em cache.
     """
-    await cache_delete(f"prompt:{nome}:ativo")
+    await _cache_prompts.invalidar_tag(f"nome:{nome}")
     logger.info(f"Cache do prompt {nome} invalidado")
 
 
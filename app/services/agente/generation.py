@@ -11,6 +11,8 @@ afeta as chamadas feitas aqui, sem imports circulares.
 import asyncio
 import sys
 import logging
+import time
+from contextvars import ContextVar
 from typing import Optional
 
 from app.services.policy import PolicyDecision
@@ -47,6 +49,10 @@ from .types import _resposta_parece_incompleta
 
 logger = logging.getLogger(__name__)
 
+# Tools executadas no turno atual (só o cache semântico lê: resposta que
+# dependeu de tool não vira template)
+_tools_do_turno: ContextVar[Optional[list[str]]] = ContextVar("tools_do_turno", default=None)
+
 
 def _pkg():
     """Acessa o pacote pai para usar nomes que os testes patcham."""
@@ -96,7 +102,10 @@ async def processar_tool_call(
 async def _executar_tool_calls(tool_calls: list, medico: dict, conversa: dict) -> list[dict]:
     """Executa lista de tool calls e retorna tool_results formatados."""
     tool_results = []
+    executadas = _tools_do_turno.get()
     for tc in tool_calls:
+        if executadas is not None:
+            executadas.append(tc["name"])
         result = await processar_tool_call(tc["name"], tc["input"], medico, conversa)
         tool_results.append(
             {
@@ -144,12 +153,18 @@ async def gerar_resposta_julia(
     Sprint 44 T02.1: Wrapper com timeout global.
     Sprint 44 T02.2: Validação de resposta com guardrails.
     Sprint 44 T06.4: Cache de respostas LLM.
+    Turnos de template (saudação, "quem é", ok/obrigado) consultam o cache
+    semântico (llm/cache_semantico.py) antes do loop de tools; a resposta só
+    é salva se nenhuma tool foi executada no turno, porque aí ela depende do
+    resultado das tools (ex: buscar_vagas, reservar_plantao) e do médico.
+    O cache exato continua só para turnos sem tools.
     """
     from app.services.conversation_mode.response_validator import (
         validar_resposta_julia as validar_resposta,
         get_fallback_response,
     )
     from app.services.llm.cache import get_cached_response, cache_response
+    from app.services.llm import cache_semantico
 
     if not usar_tools:
         cached = await get_cached_response(mensagem, contexto)
@@ -157,7 +172,18 @@ async def gerar_resposta_julia(
             logger.debug(f"[Cache] Usando resposta cacheada para: {mensagem[:50]}...")
             return cached
 
+    template = cache_semantico.classificar_intencao(mensagem) is not None
+    if template:
+        cached = await cache_semantico.buscar_resposta(
+            mensagem, contexto, medico, mode_info=mode_info, policy_decision=policy_decision
+        )
+        if cached:
+            return cached
+
     pkg = _pkg()
+    inicio = time.monotonic()
+    tools_executadas: list[str] = []
+    token_tools = _tools_do_turno.set(tools_executadas)
 
     try:
         resposta = await asyncio.wait_for(
@@ -194,6 +220,16 @@ async def gerar_resposta_julia(
 
         if not usar_tools:
             await cache_response(mensagem, contexto, resposta)
+        if template and not tools_executadas:
+            await cache_semantico.salvar_resposta(
+                mensagem,
+                contexto,
+                medico,
+                resposta,
+                latencia_ms=int((time.monotonic() - inicio) * 1000),
+                mode_info=mode_info,
+                policy_decision=policy_decision,
+            )
 
         return resposta
 
@@ -203,6 +239,8 @@ async def gerar_resposta_julia(
             f"para mensagem: {mensagem[:50]}..."
         )
         return pkg.RESPOSTA_TIMEOUT_FALLBACK
+    finally:
+        _tools_do_turno.reset(token_tools)
 
 
 async def _gerar_resposta_julia_impl(
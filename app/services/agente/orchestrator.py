@@ -14,6 +14,7 @@ from typing import Optional, List
 from app.core.tasks import safe_create_task
 from app.services.policy import (
     PrimaryAction,
+    aplicar_updates_em_memoria,
 )
 
 from .types import ProcessamentoResult
@@ -207,9 +208,7 @@ async def processar_mensagem_completo(
         if inbound_updates:
             await pkg.save_doctor_state_updates(medico["id"], inbound_updates)
             # Aplicar updates no state em memória (evita 2o load_doctor_state)
-            for key, value in inbound_updates.items():
-                if hasattr(state, key):
-                    setattr(state, key, value)
+            aplicar_updates_em_memoria(state, inbound_updates)
             logger.debug(f"doctor_state atualizado in-memory: {list(inbound_updates.keys())}")
 
         # 5. PolicyDecide: decidir ação (Sprint 16: agora é async)
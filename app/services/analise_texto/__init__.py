@@ -0,0 +1,43 @@
+"""
+Analise de texto em uma passada para os detectores baseados em padroes.
+
+Uso:
+    from app.services.analise_texto import analisar, registrar_padroes
+
+    registrar_padroes("optout", PADROES_OPTOUT, normalizacao=SEM_ACENTO)
+    ocorrencia = analisar(texto).primeira("optout")
+"""
+
+from .automato import AutomatoAhoCorasick
+from .motor import (
+    MINUSCULO,
+    NORMALIZACOES,
+    ORIGINAL,
+    SEM_ACENTO,
+    AnaliseTexto,
+    MotorAnalise,
+    Ocorrencia,
+    analisar,
+    literais_obrigatorias,
+    motor_analise,
+    registrar_literais,
+    registrar_padroes,
+    remover_acentos,
+)
+
+__all__ = [
+    "AutomatoAhoCorasick",
+    "AnaliseTexto",
+    "MotorAnalise",
+    "Ocorrencia",
+    "analisar",
+    "literais_obrigatorias",
+    "motor_analise",
+    "registrar_literais",
+    "registrar_padroes",
+    "remover_acentos",
+    "MINUSCULO",
+    "NORMALIZACOES",
+    "ORIGINAL",
+    "SEM_ACENTO",
+]
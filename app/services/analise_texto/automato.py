@@ -0,0 +1,78 @@
+"""
+Automato Aho-Corasick para busca de varias literais numa unica passada.
+"""
+
+from collections import deque
+from typing import Iterable
+
+
+class AutomatoAhoCorasick:
+    """
+    Encontra quais literais aparecem num texto percorrendo-o uma vez.
+
+    O custo da busca depende do tamanho do texto, nao da quantidade de
+    literais. Literais sao comparadas caractere a caractere (sem
+    normalizacao): normalize texto e literais antes.
+    """
+
+    __slots__ = ("_goto", "_falha", "_saida", "literais")
+
+    def __init__(self, literais: Iterable[str]):
+        """
+        Args:
+            literais: Literais a buscar; o indice de cada uma e o id retornado
+        """
+        self.literais = list(literais)
+        self._goto: list[dict[str, int]] = [{}]
+        self._saida: list[tuple[int, ...]] = [()]
+
+        for id_literal, literal in enumerate(self.literais):
+            estado = 0
+            for ch in literal:
+                proximo = self._goto[estado].get(ch)
+                if proximo is None:
+                    proximo = len(self._goto)
+                    self._goto[estado][ch] = proximo
+                    self._goto.append({})
+                    self._saida.append(())
+                estado = proximo
+            self._saida[estado] += (id_literal,)
+
+        # Links de falha em largura; saidas herdam as do sufixo
+        self._falha = [0] * len(self._goto)
+        fila = deque(self._goto[0].values())
+        while fila:
+            estado = fila.popleft()
+            for ch, proximo in self._goto[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and ch not in self._goto[falha]:
+                    falha = self._falha[falha]
+                destino = self._goto[falha].get(ch, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                self._saida[proximo] += self._saida[self._falha[proximo]]
+
+    def buscar(self, texto: str) -> set[int]:
+        """
+        Retorna os ids das literais presentes no texto.
+
+        Args:
+            texto: Texto ja normalizado
+
+        Returns:
+            Conjunto de ids (indices em literais)
+        """
+        goto = self._goto
+        falha = self._falha
+        saida = self._saida
+        encontrados: set[int] = set()
+        estado = 0
+
+        for ch in texto:
+            while estado and ch not in goto[estado]:
+                estado = falha[estado]
+            estado = goto[estado].get(ch, 0)
+            if saida[estado]:
+                encontrados.update(saida[estado])
+
+        return encontrados
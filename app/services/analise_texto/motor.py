@@ -0,0 +1,408 @@
+"""
+Motor de analise de texto compartilhado pelos detectores.
+
+Cada detector registra seus padroes (regex ou literais) com a normalizacao
+que usa. analisar(texto) normaliza o texto uma vez por variante, roda um
+automato Aho-Corasick por variante e devolve as ocorrencias de todos os
+detectores, marcadas pelo nome do detector.
+
+Regex entram no automato pelas literais obrigatorias do padrao (ex:
+"\\bchatbot\\b" -> "chatbot", "(caro|barato)" -> "caro" ou "barato"): so os
+padroes com alguma literal presente sao verificados com re.search. Padroes
+sem literal aproveitavel (ou sem o parser interno do re) sao sempre
+verificados. Cada detector continua recebendo o primeiro match de cada
+padrao, na ordem em que registrou, como no loop original.
+
+O resultado fica em cache por texto, entao os varios detectores que olham
+a mesma mensagem no pipeline compartilham uma unica analise.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .automato import AutomatoAhoCorasick
+
+# O parser de re e interno ao CPython: sem ele (ou se mudar de formato),
+# nenhum padrao tem literal aproveitavel e todos sao verificados com re.search
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - depende da versao do Python
+    sre_constants = sre_parse = None
+
+logger = logging.getLogger(__name__)
+
+# Variantes de normalizacao suportadas
+ORIGINAL = "original"  # Texto como veio
+MINUSCULO = "minusculo"  # texto.lower()
+SEM_ACENTO = "sem_acento"  # Minusculo e sem acentos (opt-out, handoff)
+
+NORMALIZACOES = (ORIGINAL, MINUSCULO, SEM_ACENTO)
+
+TAMANHO_MINIMO_LITERAL = 2  # Literais menores nao filtram nada
+MAX_ANALISES_EM_CACHE = 512
+
+_TABELA_ACENTOS = str.maketrans("ãáâàéêèíîìóôõòúûùç", "aaaaeeeiiioooouuuc")
+
+
+def remover_acentos(texto: str) -> str:
+    """Minusculo sem acentos (mesma tabela dos detectores de opt-out e handoff)."""
+    return texto.lower().translate(_TABELA_ACENTOS)
+
+
+def _variante(texto: str, normalizacao: str) -> str:
+    if normalizacao == MINUSCULO:
+        return texto.lower()
+    if normalizacao == SEM_ACENTO:
+        return remover_acentos(texto)
+    return texto
+
+
+@dataclass(frozen=True, slots=True)
+class Ocorrencia:
+    """Primeiro match de um padrao de um detector."""
+
+    detector: str
+    indice: int  # Posicao do padrao na lista registrada pelo detector
+    padrao: str
+    trecho: str
+    inicio: int
+    fim: int
+
+
+class AnaliseTexto:
+    """Ocorrencias de todos os detectores para um texto."""
+
+    __slots__ = ("texto", "_ocorrencias")
+
+    def __init__(self, texto: str, ocorrencias: dict[str, list[Ocorrencia]]):
+        self.texto = texto
+        self._ocorrencias = ocorrencias
+
+    def ocorrencias(self, detector: str) -> list[Ocorrencia]:
+        """Todas as ocorrencias do detector, na ordem dos padroes."""
+        return self._ocorrencias.get(detector, [])
+
+    def primeira(self, detector: str) -> Optional[Ocorrencia]:
+        """Ocorrencia do primeiro padrao (na ordem registrada) que casou."""
+        ocorrencias = self._ocorrencias.get(detector)
+        return ocorrencias[0] if ocorrencias else None
+
+    def tem(self, detector: str) -> bool:
+        """True se algum padrao do detector casou."""
+        return bool(self._ocorrencias.get(detector))
+
+    def detectores(self) -> list[str]:
+        """Detectores com pelo menos uma ocorrencia."""
+        return list(self._ocorrencias)
+
+
+@dataclass(slots=True)
+class _Padrao:
+    detector: str
+    indice: int
+    padrao: str
+    normalizacao: str
+    regex: Optional[re.Pattern]  # None = literal pura (busca por substring)
+    literais: tuple[str, ...]  # Alternativas no automato (vazio = sempre verificar)
+
+
+@dataclass(slots=True)
+class _Variante:
+    automato: AutomatoAhoCorasick
+    por_literal: list[list[int]]  # id da literal -> padroes que dependem dela
+    sempre: list[int]  # Padroes verificados em todo texto
+
+
+def _fatores(itens) -> list[tuple[str, ...]]:
+    """
+    Fatores obrigatorios de uma sequencia do parser de re.
+
+    Cada fator e um conjunto de alternativas: todo match contem pelo menos
+    uma delas. Literais consecutivas viram um fator de uma alternativa;
+    uma alternancia vira a uniao do melhor fator de cada ramo.
+    """
+    fatores: list[tuple[str, ...]] = []
+    atual: list[str] = []
+
+    def fechar() -> None:
+        if atual:
+            fatores.append(("".join(atual),))
+            atual.clear()
+
+    for op, av in itens:
+        if op is sre_constants.LITERAL:
+            atual.append(chr(av))
+        elif op is sre_constants.SUBPATTERN:
+            fechar()
+            fatores.extend(_fatores(av[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            minimo, maximo, corpo = av
+            corpo = list(corpo)
+            if minimo >= 1 and len(corpo) == 1 and corpo[0][0] is sre_constants.LITERAL:
+                atual.extend(chr(corpo[0][1]) * minimo)
+                if maximo != minimo:
+                    fechar()
+            else:
+                fechar()
+                if minimo >= 1:
+                    fatores.extend(_fatores(corpo))
+        elif op is sre_constants.BRANCH:
+            fechar()
+            melhores = [_melhor_fator(_fatores(ramo)) for ramo in av[1]]
+            if all(melhores):
+                fatores.append(tuple(dict.fromkeys(alt for m in melhores for alt in m)))
+        else:
+            fechar()
+
+    fechar()
+    return fatores
+
+
+def _melhor_fator(fatores: list[tuple[str, ...]]) -> tuple[str, ...]:
+    """Fator cuja menor alternativa e a mais longa (filtra mais)."""
+    return max(fatores, key=lambda f: min(len(alt) for alt in f), default=())
+
+
+def literais_obrigatorias(padrao: str, flags: int = 0) -> tuple[str, ...]:
+    """
+    Literais das quais todo match do padrao contem pelo menos uma.
+
+    Percorre a arvore do parser de re: literais consecutivas formam uma
+    sequencia; grupos e repeticoes com minimo >= 1 contribuem; alternancias
+    viram a uniao das literais de cada ramo; classes, opcionais e assercoes
+    quebram a sequencia.
+
+    Args:
+        padrao: Regex
+        flags: Flags do re
+
+    Returns:
+        Alternativas em minusculo, ou () se nenhuma tiver tamanho minimo
+        (o padrao e verificado em todo texto)
+    """
+    if sre_parse is None:
+        return ()
+    try:
+        melhor = _melhor_fator(_fatores(sre_parse.parse(padrao, flags)))
+    except Exception:
+        return ()
+
+    if not melhor or min(len(alt) for alt in melhor) < TAMANHO_MINIMO_LITERAL:
+        return ()
+    return tuple(dict.fromkeys(alt.lower() for alt in melhor))
+
+
+class MotorAnalise:
+    """Registro de padroes dos detectores e analise em uma passada."""
+
+    def __init__(self, max_cache: int = MAX_ANALISES_EM_CACHE):
+        self._detectores: dict[str, list[_Padrao]] = {}
+        self._padroes: list[_Padrao] = []
+        self._variantes: Optional[dict[str, _Variante]] = None
+        self._cache: OrderedDict[str, AnaliseTexto] = OrderedDict()
+        self._max_cache = max_cache
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+
+    def registrar_padroes(
+        self,
+        detector: str,
+        padroes: Iterable[str],
+        normalizacao: str = MINUSCULO,
+        flags: int = 0,
+    ) -> None:
+        """
+        Registra regex de um detector (substitui registro anterior do nome).
+
+        Args:
+            detector: Nome do detector (ex: 'optout')
+            padroes: Regex na ordem de prioridade do detector
+            normalizacao: Variante do texto em que os padroes rodam
+            flags: Flags do re aplicadas a todos os padroes
+        """
+        self._registrar(
+            detector,
+            [
+                _Padrao(
+                    detector=detector,
+                    indice=i,
+                    padrao=padrao,
+                    normalizacao=normalizacao,
+                    regex=re.compile(padrao, flags),
+                    literais=literais_obrigatorias(padrao, flags),
+                )
+                for i, padrao in enumerate(padroes)
+            ],
+            normalizacao,
+        )
+
+    def registrar_literais(
+        self, detector: str, literais: Iterable[str], normalizacao: str = MINUSCULO
+    ) -> None:
+        """
+        Registra literais de um detector (semantica de `literal in texto`).
+
+        Args:
+            detector: Nome do detector
+            literais: Substrings na ordem de prioridade do detector
+            normalizacao: Variante do texto em que as literais sao buscadas
+        """
+        self._registrar(
+            detector,
+            [
+                _Padrao(
+                    detector=detector,
+                    indice=i,
+                    padrao=literal,
+                    normalizacao=normalizacao,
+                    regex=None,
+                    literais=(literal,) if literal else (),
+                )
+                for i, literal in enumerate(literais)
+            ],
+            normalizacao,
+        )
+
+    def _registrar(self, detector: str, padroes: list[_Padrao], normalizacao: str) -> None:
+        if normalizacao not in NORMALIZACOES:
+            raise ValueError(f"Normalizacao desconhecida: {normalizacao}")
+        self._detectores[detector] = padroes
+        self._padroes = [p for lista in self._detectores.values() for p in lista]
+        self._variantes = None
+        self._cache.clear()
+
+    def _compilar(self) -> dict[str, _Variante]:
+        variantes: dict[str, _Variante] = {}
+        for normalizacao in NORMALIZACOES:
+            literais: dict[str, int] = {}
+            por_literal: list[list[int]] = []
+            sempre: list[int] = []
+            for id_padrao, padrao in enumerate(self._padroes):
+                if padrao.normalizacao != normalizacao:
+                    continue
+                if not padrao.literais:
+                    # Literal vazia ("" in texto) ou regex sem literal
+                    sempre.append(id_padrao)
+                    continue
+                for literal in padrao.literais:
+                    id_literal = literais.setdefault(literal, len(literais))
+                    if id_literal == len(por_literal):
+                        por_literal.append([])
+                    por_literal[id_literal].append(id_padrao)
+            if literais or sempre:
+                variantes[normalizacao] = _Variante(
+                    automato=AutomatoAhoCorasick(literais),
+                    por_literal=por_literal,
+                    sempre=sempre,
+                )
+        logger.debug(
+            f"Motor de analise compilado: {len(self._padroes)} padroes, "
+            f"{len(self._detectores)} detectores"
+        )
+        return variantes
+
+    # ------------------------------------------------------------------
+    # Analise
+    # ------------------------------------------------------------------
+
+    def analisar(self, texto: str) -> AnaliseTexto:
+        """
+        Analisa o texto com todos os detectores registrados.
+
+        Args:
+            texto: Texto bruto (mensagem recebida ou resposta gerada)
+
+        Returns:
+            AnaliseTexto com as ocorrencias por detector
+        """
+        texto = texto or ""
+        analise = self._cache.get(texto)
+        if analise is not None:
+            self._cache.move_to_end(texto)
+            return analise
+
+        analise = self._analisar(texto)
+        self._cache[texto] = analise
+        if len(self._cache) > self._max_cache:
+            self._cache.popitem(last=False)
+        return analise
+
+    def _analisar(self, texto: str) -> AnaliseTexto:
+        if self._variantes is None:
+            self._variantes = self._compilar()
+
+        minusculo = texto.lower()
+        encontradas: list[Ocorrencia] = []
+
+        for normalizacao, variante in self._variantes.items():
+            if normalizacao == MINUSCULO:
+                alvo = minusculo
+            elif normalizacao == SEM_ACENTO:
+                alvo = minusculo.translate(_TABELA_ACENTOS)
+            else:
+                alvo = texto
+            # Literais estao em minusculo; padroes sobre o original tambem
+            # sao pre-filtrados no texto em minusculo
+            busca = minusculo if normalizacao == ORIGINAL else alvo
+
+            candidatos = set(variante.sempre)
+            for id_literal in variante.automato.buscar(busca):
+                candidatos.update(variante.por_literal[id_literal])
+
+            for id_padrao in candidatos:
+                padrao = self._padroes[id_padrao]
+                if padrao.regex is None:
+                    inicio = alvo.find(padrao.padrao)
+                    if inicio < 0:
+                        continue
+                    fim = inicio + len(padrao.padrao)
+                else:
+                    match = padrao.regex.search(alvo)
+                    if not match:
+                        continue
+                    inicio, fim = match.span()
+                encontradas.append(
+                    Ocorrencia(
+                        detector=padrao.detector,
+                        indice=padrao.indice,
+                        padrao=padrao.padrao,
+                        trecho=alvo[inicio:fim],
+                        inicio=inicio,
+                        fim=fim,
+                    )
+                )
+
+        encontradas.sort(key=lambda o: (o.detector, o.indice))
+        ocorrencias: dict[str, list[Ocorrencia]] = {}
+        for ocorrencia in encontradas:
+            ocorrencias.setdefault(ocorrencia.detector, []).append(ocorrencia)
+        return AnaliseTexto(texto, ocorrencias)
+
+
+# Singleton
+motor_analise = MotorAnalise()
+
+
+def analisar(texto: str) -> AnaliseTexto:
+    """Analisa o texto com o motor compartilhado."""
+    return motor_analise.analisar(texto)
+
+
+def registrar_padroes(
+    detector: str, padroes: Iterable[str], normalizacao: str = MINUSCULO, flags: int = 0
+) -> None:
+    """Registra regex de um detector no motor compartilhado."""
+    motor_analise.registrar_padroes(detector, padroes, normalizacao, flags)
+
+
+def registrar_literais(
+    detector: str, literais: Iterable[str], normalizacao: str = MINUSCULO
+) -> None:
+    """Registra literais de um detector no motor compartilhado."""
+    motor_analise.registrar_literais(detector, literais, normalizacao)
@@ -13,8 +13,6 @@ from typing import Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
-from anthropic import Anthropic
-
 from app.core.config import settings
 from app.core.timezone import agora_brasilia
 from app.services.supabase import supabase
@@ -298,6 +296,8 @@ class BriefingAnalyzer:
     """Analisador de briefings usando Claude Sonnet."""
 
     def __init__(self):
+        from anthropic import Anthropic
+
         self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.model = settings.LLM_MODEL_COMPLEX  # Sonnet
 
@@ -11,6 +11,13 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from dataclasses import dataclass
 
+from app.services.rollups import (
+    DIMENSAO_HOSPITAL,
+    DIMENSAO_TOTAL,
+    FONTE_EVENTOS,
+    contar_por_dimensao,
+    contar_por_metrica,
+)
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -63,6 +70,39 @@ class FunnelMetrics:
         }
 
 
+# Eventos contados no funil (atributo de FunnelMetrics = event_type)
+EVENTOS_FUNIL = (
+    "doctor_outbound",
+    "doctor_inbound",
+    "offer_teaser_sent",
+    "offer_made",
+    "offer_declined",
+    "offer_accepted",
+    "handoff_created",
+    "shift_completed",
+)
+
+
+def _preencher_funil(metrics: FunnelMetrics, counts: dict) -> FunnelMetrics:
+    """Preenche contagens (event_type -> count) e calcula as taxas."""
+    for event_type in EVENTOS_FUNIL:
+        setattr(metrics, event_type, counts.get(event_type, 0))
+
+    if metrics.doctor_outbound > 0:
+        metrics.response_rate = round((metrics.doctor_inbound / metrics.doctor_outbound) * 100, 2)
+        metrics.overall_success = round(
+            (metrics.shift_completed / metrics.doctor_outbound) * 100, 2
+        )
+
+    if metrics.offer_made > 0:
+        metrics.conversion_rate = round((metrics.offer_accepted / metrics.offer_made) * 100, 2)
+
+    if metrics.offer_accepted > 0:
+        metrics.completion_rate = round((metrics.shift_completed / metrics.offer_accepted) * 100, 2)
+
+    return metrics
+
+
 async def get_funnel_metrics(
     hours: int = 24,
     hospital_id: Optional[str] = None,
@@ -70,6 +110,9 @@ async def get_funnel_metrics(
     """
     Obtém métricas de funil.
 
+    Lê os rollups de business_events; sem rollup, usa a função SQL de
+    contagem sobre os eventos brutos.
+
     Args:
         hours: Janela de tempo em horas
         hospital_id: Filtrar por hospital (opcional)
@@ -79,52 +122,25 @@ async def get_funnel_metrics(
     """
     metrics = FunnelMetrics(period_hours=hours, hospital_id=hospital_id)
 
+    agora = datetime.now(timezone.utc)
+    counts = await contar_por_metrica(
+        FONTE_EVENTOS,
+        agora - timedelta(hours=hours),
+        agora,
+        dimensao=DIMENSAO_HOSPITAL if hospital_id else DIMENSAO_TOTAL,
+        valor=hospital_id,
+    )
+    if counts is not None:
+        return _preencher_funil(metrics, counts)
+
     try:
         # Chamar função SQL de contagem
         response = supabase.rpc(
             "count_business_events", {"p_hours": hours, "p_hospital_id": hospital_id}
         ).execute()
 
-        # Preencher contagens
-        for row in response.data or []:
-            event_type = row.get("event_type")
-            count = row.get("count", 0)
-
-            if event_type == "doctor_outbound":
-                metrics.doctor_outbound = count
-            elif event_type == "doctor_inbound":
-                metrics.doctor_inbound = count
-            elif event_type == "offer_teaser_sent":
-                metrics.offer_teaser_sent = count
-            elif event_type == "offer_made":
-                metrics.offer_made = count
-            elif event_type == "offer_declined":
-                metrics.offer_declined = count
-            elif event_type == "offer_accepted":
-                metrics.offer_accepted = count
-            elif event_type == "handoff_created":
-                metrics.handoff_created = count
-            elif event_type == "shift_completed":
-                metrics.shift_completed = count
-
-        # Calcular taxas
-        if metrics.doctor_outbound > 0:
-            metrics.response_rate = round(
-                (metrics.doctor_inbound / metrics.doctor_outbound) * 100, 2
-            )
-            metrics.overall_success = round(
-                (metrics.shift_completed / metrics.doctor_outbound) * 100, 2
-            )
-
-        if metrics.offer_made > 0:
-            metrics.conversion_rate = round((metrics.offer_accepted / metrics.offer_made) * 100, 2)
-
-        if metrics.offer_accepted > 0:
-            metrics.completion_rate = round(
-                (metrics.shift_completed / metrics.offer_accepted) * 100, 2
-            )
-
-        return metrics
+        counts = {row.get("event_type"): row.get("count", 0) for row in response.data or []}
+        return _preencher_funil(metrics, counts)
 
     except Exception as e:
         logger.error(f"Erro ao obter métricas de funil: {e}")
@@ -141,8 +157,26 @@ async def get_funnel_by_hospital(hours: int = 24) -> List[dict]:
     Returns:
         Lista de métricas por hospital
     """
+    agora = datetime.now(timezone.utc)
+    por_hospital = await contar_por_dimensao(
+        FONTE_EVENTOS,
+        agora - timedelta(hours=hours),
+        agora,
+        DIMENSAO_HOSPITAL,
+        metricas=EVENTOS_FUNIL,
+    )
+    if por_hospital is not None:
+        results = [
+            _preencher_funil(
+                FunnelMetrics(period_hours=hours, hospital_id=hospital_id), counts
+            ).to_dict()
+            for hospital_id, counts in por_hospital.items()
+        ]
+        results.sort(key=lambda x: x["rates"]["overall_success"], reverse=True)
+        return results
+
     try:
-        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        since = (agora - timedelta(hours=hours)).isoformat()
 
         # Buscar hospitais únicos com eventos
         response = (
@@ -193,6 +227,17 @@ async def get_funnel_trend(
         end = datetime.now(timezone.utc) - timedelta(days=i)
         start = end - timedelta(days=1)
 
+        counts = await contar_por_metrica(
+            FONTE_EVENTOS,
+            start,
+            end,
+            dimensao=DIMENSAO_HOSPITAL if hospital_id else DIMENSAO_TOTAL,
+            valor=hospital_id,
+        )
+        if counts is not None:
+            results.append({"date": end.strftime("%Y-%m-%d"), "counts": counts})
+            continue
+
         try:
             since = start.isoformat()
             until = end.isoformat()
@@ -5,10 +5,18 @@ Sprint 17 - E02
 """
 
 import logging
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from app.services.rollups import (
+    DIMENSAO_HOSPITAL,
+    DIMENSAO_TOTAL,
+    FONTE_EVENTOS,
+    contar_por_metrica,
+)
 from app.services.supabase import supabase
+from app.services.write_behind import write_behind
 from .types import BusinessEvent, EventType
 
 logger = logging.getLogger(__name__)
@@ -19,39 +27,46 @@ async def emit_event(event: BusinessEvent) -> str:
     Emite um evento de negocio.
 
     Idempotência:
-    - Se event.dedupe_key for definido, usa upsert para evitar duplicatas
+    - Se event.dedupe_key for definido, usa upsert ON CONFLICT DO NOTHING
     - Duplicata detectada retorna ID existente (não erro)
 
+    Com o write-behind ativo (API), evento sem dedupe_key entra no lote e o
+    ID é gerado aqui. Com dedupe_key, reaproveita o ID de um evento igual
+    ainda pendente no lote; senão grava direto, para retornar o ID que já
+    existe no banco em vez de um UUID novo que a gravação do lote descartaria.
+
     Args:
         event: Evento a emitir
 
     Returns:
         id do evento criado/existente (UUID) ou string vazia se falhou
     """
+    if write_behind.ativo:
+        if not event.dedupe_key:
+            return _enfileirar_evento(event)
+        pendente = write_behind.buscar_pendente("business_events", {"dedupe_key": event.dedupe_key})
+        if pendente:
+            return pendente["id"]
+
     try:
         data = event.to_dict()
 
-        # Se tem dedupe_key, usar upsert para idempotência
+        # Com dedupe_key: uma ida ao banco (sem SELECT prévio)
         if event.dedupe_key:
-            # Primeiro tenta buscar existente
-            existing = (
+            response = (
                 supabase.table("business_events")
-                .select("id")
-                .eq("dedupe_key", event.dedupe_key)
-                .limit(1)
+                .upsert(data, on_conflict="dedupe_key", ignore_duplicates=True)
                 .execute()
             )
-
-            if existing.data:
-                event_id = existing.data[0]["id"]
+            if not response.data:
+                event_id = _buscar_id_por_dedupe_key(event.dedupe_key)
                 logger.info(
                     f"BusinessEvent duplicado ignorado: {event.event_type.value} "
                     f"[{event_id[:8]}] dedupe_key={event.dedupe_key}"
                 )
                 return event_id
-
-        # Inserir novo evento
-        response = supabase.table("business_events").insert(data).execute()
+        else:
+            response = supabase.table("business_events").insert(data).execute()
 
         if response.data:
             event_id = response.data[0]["id"]
@@ -65,28 +80,38 @@ async def emit_event(event: BusinessEvent) -> str:
         return ""
 
     except Exception as e:
-        # Se for erro de unique constraint, é duplicata (race condition)
-        if "duplicate key" in str(e).lower() or "unique constraint" in str(e).lower():
-            logger.info(f"BusinessEvent duplicado (race): {event.event_type.value}")
-            # Tentar buscar o existente
-            try:
-                existing = (
-                    supabase.table("business_events")
-                    .select("id")
-                    .eq("dedupe_key", event.dedupe_key)
-                    .limit(1)
-                    .execute()
-                )
-                if existing.data:
-                    return existing.data[0]["id"]
-            except Exception:
-                pass
-            return ""
-
         logger.error(f"Erro ao emitir business_event: {e}")
         return ""
 
 
+def _buscar_id_por_dedupe_key(dedupe_key: str) -> str:
+    """ID do evento já gravado com a dedupe_key (string vazia se não achar)."""
+    try:
+        existing = (
+            supabase.table("business_events")
+            .select("id")
+            .eq("dedupe_key", dedupe_key)
+            .limit(1)
+            .execute()
+        )
+        if existing.data:
+            return existing.data[0]["id"]
+    except Exception as e:
+        logger.warning(f"Erro ao buscar business_event por dedupe_key: {e}")
+    return ""
+
+
+def _enfileirar_evento(event: BusinessEvent) -> str:
+    """Coloca o evento (sem dedupe_key) no lote do write-behind e retorna o ID gerado."""
+    event_id = str(uuid.uuid4())
+    write_behind.enfileirar(
+        "business_events",
+        {**event.to_dict(), "id": event_id, "ts": datetime.now(timezone.utc).isoformat()},
+    )
+    logger.debug(f"BusinessEvent enfileirado: {event.event_type.value} [{event_id[:8]}]")
+    return event_id
+
+
 async def get_events_by_type(
     event_type: EventType,
     hours: int = 24,
@@ -196,7 +221,19 @@ async def get_funnel_counts(
     Returns:
         Dict com contagens por tipo de evento
     """
-    since = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+    agora = datetime.now(timezone.utc)
+    since = (agora - timedelta(hours=hours)).isoformat()
+
+    # Rollups de business_events (migrations/metricas_rollup.sql)
+    counts = await contar_por_metrica(
+        FONTE_EVENTOS,
+        agora - timedelta(hours=hours),
+        agora,
+        dimensao=DIMENSAO_HOSPITAL if hospital_id else DIMENSAO_TOTAL,
+        valor=hospital_id,
+    )
+    if counts is not None:
+        return counts
 
     try:
         # Sprint 44 T04.5/T04.7: Usar RPC para contagens se disponível
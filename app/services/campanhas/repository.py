@@ -279,9 +279,9 @@ class CampanhaRepository:
 
             # Invalidar cache de contexto de campanha
             try:
-                from app.services.redis import cache_delete
+                from app.services.contexto import invalidar_contexto_campanha
 
-                await cache_delete(f"campanha:contexto:{campanha_id}")
+                await invalidar_contexto_campanha(campanha_id)
             except Exception as cache_err:
                 logger.debug(f"Erro ao invalidar cache campanha {campanha_id}: {cache_err}")
 
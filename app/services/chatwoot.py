@@ -4,17 +4,69 @@ Servico para consultas ao Chatwoot.
 IMPORTANTE: A integracao nativa Evolution API <-> Chatwoot ja faz
 a sincronizacao de mensagens/contatos/conversas. Este servico
 e apenas para CONSULTA de IDs e processamento de webhooks.
+
+O contato de cada telefone fica em cache no Redis
+(DatabaseConfig.CACHE_TTL_CHATWOOT_IDS); a conversa atual e sempre
+resolvida no Chatwoot, ja que cada conversa nova abre outra la. As labels
+atuais de cada conversa ficam em cache por pouco tempo
+(CACHE_TTL_CHATWOOT_LABELS): o POST de labels substitui todas, e um
+webhook conversation_updated perdido nao pode apagar labels que o operador
+colocou na mao.
+
+Na API, o espelhamento (mensagens, labels e sincronizacao de IDs) sai do
+caminho da resposta: o EspelhoChatwoot junta as operacoes por conversa e
+aplica em segundo plano.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
 
-from app.core.config import settings
+from app.core.config import DatabaseConfig, settings
 from app.services.http_client import get_http_client
+from app.services.redis import cache_delete, cache_get_json, cache_set_json
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
 
+CACHE_PREFIX_IDS = "chatwoot:ids:"
+CACHE_PREFIX_LABELS = "chatwoot:labels:"
+
+
+async def obter_ids_cache(telefone: str) -> Optional[dict]:
+    """
+    Contato do Chatwoot em cache para um telefone.
+
+    Returns:
+        Dict com contact_id, ou None
+    """
+    return await cache_get_json(f"{CACHE_PREFIX_IDS}{telefone}")
+
+
+async def salvar_ids_cache(telefone: str, contact_id: int) -> None:
+    """Guarda o mapeamento telefone -> contato."""
+    await cache_set_json(
+        f"{CACHE_PREFIX_IDS}{telefone}",
+        {"contact_id": contact_id},
+        DatabaseConfig.CACHE_TTL_CHATWOOT_IDS,
+    )
+
+
+async def obter_labels_cache(conversation_id: int) -> Optional[list[str]]:
+    """Labels atuais da conversa em cache (None se ausente)."""
+    dados = await cache_get_json(f"{CACHE_PREFIX_LABELS}{conversation_id}")
+    return dados.get("labels", []) if dados else None
+
+
+async def salvar_labels_cache(conversation_id: int, labels: list[str]) -> None:
+    """Guarda as labels atuais da conversa."""
+    await cache_set_json(
+        f"{CACHE_PREFIX_LABELS}{conversation_id}",
+        {"labels": list(labels)},
+        DatabaseConfig.CACHE_TTL_CHATWOOT_LABELS,
+    )
+
 
 class ChatwootService:
     """
@@ -119,11 +171,14 @@ class ChatwootService:
             client = await get_http_client()
             response = await client.get(url, headers=self.headers, timeout=10.0)
             response.raise_for_status()
-            return response.json()
+            conversa = response.json()
         except Exception as e:
             logger.error(f"Erro ao buscar conversa {conversation_id}: {e}")
             return None
 
+        await salvar_labels_cache(conversation_id, conversa.get("labels", []))
+        return conversa
+
     async def buscar_telefone_por_conversation_id(self, conversation_id: int) -> Optional[str]:
         """
         Busca telefone do contato a partir do ID da conversa.
@@ -197,37 +252,56 @@ class ChatwootService:
             logger.error(f"Erro ao enviar mensagem para Chatwoot: {e}")
             return False
 
-    async def adicionar_label(self, conversation_id: int, label: str) -> bool:
+    async def _labels_atuais(self, conversation_id: int) -> Optional[list[str]]:
+        labels = await obter_labels_cache(conversation_id)
+        if labels is not None:
+            return labels
+
+        conversa = await self.buscar_conversa_por_id(conversation_id)
+        if not conversa:
+            logger.error(f"Conversa {conversation_id} nao encontrada no Chatwoot")
+            return None
+        return conversa.get("labels", [])
+
+    async def atualizar_labels(
+        self,
+        conversation_id: int,
+        adicionar: Iterable[str] = (),
+        remover: Iterable[str] = (),
+    ) -> bool:
         """
-        Adiciona uma label a uma conversa no Chatwoot.
+        Adiciona e remove labels de uma conversa com um unico POST.
+
+        As labels atuais vem do cache curto (GET na conversa so no cache miss).
 
         Args:
             conversation_id: ID da conversa no Chatwoot
-            label: Nome da label (ex: "humano")
+            adicionar: Labels a adicionar
+            remover: Labels a remover
 
         Returns:
-            True se adicionou com sucesso
+            True se as labels ficaram como pedido
         """
         if not self.configurado:
-            logger.warning("Chatwoot nao configurado, ignorando adicao de label")
+            logger.warning("Chatwoot nao configurado, ignorando atualizacao de labels")
             return False
 
-        # Primeiro buscar labels atuais
-        conversa = await self.buscar_conversa_por_id(conversation_id)
-        if not conversa:
-            logger.error(f"Conversa {conversation_id} nao encontrada no Chatwoot")
+        labels_atuais = await self._labels_atuais(conversation_id)
+        if labels_atuais is None:
             return False
 
-        labels_atuais = conversa.get("labels", [])
+        remover = set(remover)
+        novas_labels = [lbl for lbl in labels_atuais if lbl not in remover]
+        novas_labels += [
+            lbl
+            for lbl in dict.fromkeys(adicionar)
+            if lbl not in novas_labels and lbl not in remover
+        ]
 
-        # Se label ja existe, nao precisa adicionar
-        if label in labels_atuais:
-            logger.debug(f"Label '{label}' ja existe na conversa {conversation_id}")
+        if novas_labels == labels_atuais:
+            logger.debug(f"Labels da conversa {conversation_id} ja estao atualizadas")
             return True
 
-        # Adicionar nova label
-        novas_labels = labels_atuais + [label]
-
         url = (
             f"{self.base_url}/api/v1/accounts/{self.account_id}"
             f"/conversations/{conversation_id}/labels"
@@ -239,12 +313,33 @@ class ChatwootService:
             client = await get_http_client()
             response = await client.post(url, json=payload, headers=self.headers, timeout=10.0)
             response.raise_for_status()
-            logger.info(f"Label '{label}' adicionada a conversa {conversation_id}")
-            return True
         except Exception as e:
-            logger.error(f"Erro ao adicionar label no Chatwoot: {e}")
+            logger.error(f"Erro ao atualizar labels no Chatwoot: {e}")
+            # Cache pode estar desatualizado; proxima chamada busca de novo
+            await cache_delete(f"{CACHE_PREFIX_LABELS}{conversation_id}")
+            return False
+
+        await salvar_labels_cache(conversation_id, novas_labels)
+        logger.info(f"Labels da conversa {conversation_id}: {labels_atuais} -> {novas_labels}")
+        return True
+
+    async def adicionar_label(self, conversation_id: int, label: str) -> bool:
+        """
+        Adiciona uma label a uma conversa no Chatwoot.
+
+        Args:
+            conversation_id: ID da conversa no Chatwoot
+            label: Nome da label (ex: "humano")
+
+        Returns:
+            True se adicionou com sucesso
+        """
+        if not self.configurado:
+            logger.warning("Chatwoot nao configurado, ignorando adicao de label")
             return False
 
+        return await self.atualizar_labels(conversation_id, adicionar=[label])
+
     async def remover_label(self, conversation_id: int, label: str) -> bool:
         """
         Remove uma label de uma conversa no Chatwoot.
@@ -260,38 +355,7 @@ class ChatwootService:
             logger.warning("Chatwoot nao configurado, ignorando remocao de label")
             return False
 
-        # Primeiro buscar labels atuais
-        conversa = await self.buscar_conversa_por_id(conversation_id)
-        if not conversa:
-            logger.error(f"Conversa {conversation_id} nao encontrada no Chatwoot")
-            return False
-
-        labels_atuais = conversa.get("labels", [])
-
-        # Se label nao existe, nao precisa remover
-        if label not in labels_atuais:
-            logger.debug(f"Label '{label}' nao existe na conversa {conversation_id}")
-            return True
-
-        # Remover label
-        novas_labels = [lbl for lbl in labels_atuais if lbl != label]
-
-        url = (
-            f"{self.base_url}/api/v1/accounts/{self.account_id}"
-            f"/conversations/{conversation_id}/labels"
-        )
-
-        payload = {"labels": novas_labels}
-
-        try:
-            client = await get_http_client()
-            response = await client.post(url, json=payload, headers=self.headers, timeout=10.0)
-            response.raise_for_status()
-            logger.info(f"Label '{label}' removida da conversa {conversation_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Erro ao remover label no Chatwoot: {e}")
-            return False
+        return await self.atualizar_labels(conversation_id, remover=[label])
 
 
 # Instancia global
@@ -313,25 +377,33 @@ async def sincronizar_ids_chatwoot(cliente_id: str, telefone: str) -> dict:
     """
     resultado = {"chatwoot_contact_id": None, "chatwoot_conversation_id": None}
 
-    # Buscar contato no Chatwoot
-    contato = await chatwoot_service.buscar_contato_por_telefone(telefone)
+    # Telefone ja resolvido antes: pula a busca do contato
+    ids = await obter_ids_cache(telefone)
+    contact_id = ids.get("contact_id") if ids else None
 
-    if not contato:
-        logger.warning(f"Contato nao encontrado no Chatwoot: {telefone}")
-        return resultado
+    if not contact_id:
+        contato = await chatwoot_service.buscar_contato_por_telefone(telefone)
 
-    resultado["chatwoot_contact_id"] = contato["id"]
+        if not contato:
+            logger.warning(f"Contato nao encontrado no Chatwoot: {telefone}")
+            return resultado
 
-    # Atualizar cliente com chatwoot_contact_id
-    try:
-        supabase.table("clientes").update({"chatwoot_contact_id": str(contato["id"])}).eq(
-            "id", cliente_id
-        ).execute()
-    except Exception as e:
-        logger.error(f"Erro ao atualizar chatwoot_contact_id: {e}")
+        contact_id = contato["id"]
+
+        # Atualizar cliente com chatwoot_contact_id
+        try:
+            supabase.table("clientes").update({"chatwoot_contact_id": str(contact_id)}).eq(
+                "id", cliente_id
+            ).execute()
+        except Exception as e:
+            logger.error(f"Erro ao atualizar chatwoot_contact_id: {e}")
+
+        await salvar_ids_cache(telefone, contact_id)
 
-    # Buscar conversa mais recente
-    conversas = await chatwoot_service.buscar_conversas_do_contato(contato["id"])
+    resultado["chatwoot_contact_id"] = contact_id
+
+    # Conversa mais recente (sem cache: conversa nova no Chatwoot = conversa nova aqui)
+    conversas = await chatwoot_service.buscar_conversas_do_contato(contact_id)
 
     if conversas:
         # Pegar a conversa mais recente (primeira da lista)
@@ -339,12 +411,7 @@ async def sincronizar_ids_chatwoot(cliente_id: str, telefone: str) -> dict:
         resultado["chatwoot_conversation_id"] = conversa_chatwoot["id"]
 
         # Atualizar nossa conversa ativa
-        try:
-            supabase.table("conversations").update(
-                {"chatwoot_conversation_id": str(conversa_chatwoot["id"])}
-            ).eq("cliente_id", cliente_id).eq("status", "active").execute()
-        except Exception as e:
-            logger.error(f"Erro ao atualizar chatwoot_conversation_id: {e}")
+        _atualizar_conversa_ativa(cliente_id, conversa_chatwoot["id"])
 
     logger.info(
         f"IDs Chatwoot sincronizados: contact={resultado['chatwoot_contact_id']}, "
@@ -352,3 +419,199 @@ async def sincronizar_ids_chatwoot(cliente_id: str, telefone: str) -> dict:
     )
 
     return resultado
+
+
+def _atualizar_conversa_ativa(cliente_id: str, chatwoot_conversation_id: int) -> None:
+    try:
+        supabase.table("conversations").update(
+            {"chatwoot_conversation_id": str(chatwoot_conversation_id)}
+        ).eq("cliente_id", cliente_id).eq("status", "active").execute()
+    except Exception as e:
+        logger.error(f"Erro ao atualizar chatwoot_conversation_id: {e}")
+
+
+# ----------------------------------------------------------------------
+# Espelhamento assincrono
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class _OperacoesConversa:
+    """Operacoes pendentes de uma conversa do Chatwoot."""
+
+    mensagens: list[tuple[str, str]] = field(default_factory=list)
+    adicionar: dict[str, None] = field(default_factory=dict)
+    remover: dict[str, None] = field(default_factory=dict)
+
+
+class EspelhoChatwoot:
+    """
+    Worker que espelha mensagens, labels e IDs no Chatwoot fora do
+    caminho da resposta.
+
+    As operacoes sao agrupadas por conversa: a cada intervalo_ms as
+    mensagens saem na ordem em que foram pedidas e as labels com um unico
+    POST. Sincronizacoes de IDs repetidas para o mesmo cliente viram uma.
+    Mensagens de cliente ainda sem conversa conhecida esperam a
+    sincronizacao e saem na conversa que ela encontrar.
+
+    So e usado quando iniciado (lifespan da API); inativo, cada chamada e
+    aplicada na hora, como antes.
+    """
+
+    def __init__(self, intervalo_ms: int = 1000, max_concorrencia: int = 5):
+        self.intervalo_ms = intervalo_ms
+        self.max_concorrencia = max_concorrencia
+        self._conversas: dict[int, _OperacoesConversa] = {}
+        self._sincronizacoes: dict[str, str] = {}
+        self._aguardando_conversa: dict[str, list[tuple[str, str]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        """True enquanto o loop do espelho esta rodando."""
+        return self._task is not None and not self._task.done()
+
+    def iniciar(self) -> None:
+        """Inicia o loop (chamar no startup, com event loop rodando)."""
+        if self.ativo:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop(), name="espelho_chatwoot")
+        logger.info(f"Espelho Chatwoot iniciado: flush a cada {self.intervalo_ms}ms")
+
+    async def parar(self) -> None:
+        """Para o loop e aplica o que estiver pendente (shutdown)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def _operacoes(self, conversation_id: int) -> _OperacoesConversa:
+        return self._conversas.setdefault(int(conversation_id), _OperacoesConversa())
+
+    async def enviar_mensagem(
+        self, conversation_id: int, content: str, message_type: str = "outgoing"
+    ) -> None:
+        """Espelha uma mensagem na conversa do Chatwoot."""
+        if not self.ativo:
+            await chatwoot_service.enviar_mensagem(
+                conversation_id=conversation_id, content=content, message_type=message_type
+            )
+            return
+        self._operacoes(conversation_id).mensagens.append((content, message_type))
+
+    async def adicionar_label(self, conversation_id: int, label: str) -> None:
+        """Adiciona label a conversa (colapsa com remocoes pendentes)."""
+        if not self.ativo:
+            await chatwoot_service.adicionar_label(conversation_id=conversation_id, label=label)
+            return
+        operacoes = self._operacoes(conversation_id)
+        operacoes.remover.pop(label, None)
+        operacoes.adicionar[label] = None
+
+    async def remover_label(self, conversation_id: int, label: str) -> None:
+        """Remove label da conversa (colapsa com adicoes pendentes)."""
+        if not self.ativo:
+            await chatwoot_service.remover_label(conversation_id=conversation_id, label=label)
+            return
+        operacoes = self._operacoes(conversation_id)
+        operacoes.adicionar.pop(label, None)
+        operacoes.remover[label] = None
+
+    async def sincronizar_ids(self, cliente_id: str, telefone: str) -> None:
+        """Resolve e grava os IDs do Chatwoot do cliente."""
+        if not self.ativo:
+            await sincronizar_ids_chatwoot(cliente_id, telefone)
+            return
+        self._sincronizacoes[cliente_id] = telefone
+
+    async def enviar_mensagem_cliente(
+        self, cliente_id: str, telefone: str, content: str, message_type: str = "outgoing"
+    ) -> None:
+        """
+        Espelha uma mensagem de cliente cuja conversa no Chatwoot ainda nao
+        e conhecida (conversa nova): sai depois da sincronizacao dos IDs.
+        """
+        if not self.ativo:
+            ids = await sincronizar_ids_chatwoot(cliente_id, telefone)
+            if ids.get("chatwoot_conversation_id"):
+                await chatwoot_service.enviar_mensagem(
+                    conversation_id=ids["chatwoot_conversation_id"],
+                    content=content,
+                    message_type=message_type,
+                )
+            return
+        self._aguardando_conversa.setdefault(cliente_id, []).append((content, message_type))
+        self._sincronizacoes[cliente_id] = telefone
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo_ms / 1000)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Erro no loop do espelho Chatwoot: {e}")
+
+    async def _sincronizar(
+        self, cliente_id: str, telefone: str, mensagens: list[tuple[str, str]]
+    ) -> None:
+        ids = await sincronizar_ids_chatwoot(cliente_id, telefone)
+        if not mensagens:
+            return
+        conversation_id = ids.get("chatwoot_conversation_id")
+        if not conversation_id:
+            logger.warning(
+                f"Conversa do Chatwoot nao encontrada para {cliente_id}: "
+                f"{len(mensagens)} mensagem(ns) nao espelhada(s)"
+            )
+            return
+        await self._aplicar_conversa(int(conversation_id), _OperacoesConversa(mensagens=mensagens))
+
+    async def _aplicar_conversa(self, conversation_id: int, operacoes: _OperacoesConversa) -> None:
+        for content, message_type in operacoes.mensagens:
+            await chatwoot_service.enviar_mensagem(
+                conversation_id=conversation_id, content=content, message_type=message_type
+            )
+        if operacoes.adicionar or operacoes.remover:
+            await chatwoot_service.atualizar_labels(
+                conversation_id, adicionar=operacoes.adicionar, remover=operacoes.remover
+            )
+
+    async def flush(self) -> int:
+        """
+        Aplica as operacoes pendentes.
+
+        Returns:
+            Quantidade de conversas/sincronizacoes processadas
+        """
+        conversas, self._conversas = self._conversas, {}
+        sincronizacoes, self._sincronizacoes = self._sincronizacoes, {}
+        aguardando, self._aguardando_conversa = self._aguardando_conversa, {}
+        if not conversas and not sincronizacoes:
+            return 0
+
+        semaforo = asyncio.Semaphore(self.max_concorrencia)
+
+        async def limitado(coro):
+            async with semaforo:
+                try:
+                    await coro
+                except Exception as e:
+                    logger.warning(f"Erro ao espelhar no Chatwoot: {e}")
+
+        await asyncio.gather(
+            *(limitado(self._aplicar_conversa(cid, ops)) for cid, ops in conversas.items()),
+            *(
+                limitado(self._sincronizar(cliente_id, telefone, aguardando.get(cliente_id, [])))
+                for cliente_id, telefone in sincronizacoes.items()
+            ),
+        )
+        return len(conversas) + len(sincronizacoes)
+
+
+# Singleton
+espelho_chatwoot = EspelhoChatwoot()
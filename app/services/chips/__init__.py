@@ -5,6 +5,7 @@ Sistema de orquestracao multi-chip para Julia:
 - Orchestrator: Pool manager, auto-replace, auto-provision
 - Selector: Selecao inteligente de chip por tipo de mensagem
 - Sender: Envio de mensagens via provider abstraction (E08)
+- Ator de envio: Fila por chip com presença e envio agendados
 - Health Monitor: Monitoramento proativo
 - Migration: Migracao anunciada de conversas
 
@@ -18,6 +19,7 @@ Sprint 40 - Instance Management UI:
 """
 
 from app.services.chips.orchestrator import chip_orchestrator, ChipOrchestrator
+from app.services.chips.ator_envio import atores_envio, AtorEnvioChip, RegistroAtores
 from app.services.chips.selector import chip_selector, ChipSelector
 from app.services.chips.health_monitor import health_monitor, HealthMonitor
 from app.services.chips.migration import (
@@ -99,6 +101,10 @@ __all__ = [
     "enviar_mensagem_inteligente",
     "enviar_media_via_chip",
     "verificar_conexao_chip",
+    # Ator de envio por chip
+    "atores_envio",
+    "AtorEnvioChip",
+    "RegistroAtores",
     # Sprint 36 - Circuit Breaker (E09)
     "ChipCircuitBreaker",
     "ChipCircuit",
@@ -0,0 +1,241 @@
+"""
+Ator de envio por chip.
+
+Cada chip tem uma fila propria. Ao sair da fila, o pedido nao espera:
+presenca ("digitando") e envio viram eventos agendados no event loop
+(loop.call_at). Varios destinatarios do mesmo chip ficam em andamento ao
+mesmo tempo, respeitando:
+- espacamento minimo entre envios do chip (humanizacao)
+- limite de requisicoes em voo por chip (vaga ocupada so durante o HTTP)
+
+Chips Meta nao tem presenca nem espacamento e usam mais vagas: as
+requisicoes sao multiplexadas no cliente HTTP/2 compartilhado.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.services.whatsapp_providers import MessageResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PedidoEnvio:
+    """Mensagem aguardando envio por um chip."""
+
+    chip: Dict
+    telefone: str
+    texto: str
+    template_info: Optional[Dict]
+    tempo_digitacao: float
+    resultado: asyncio.Future
+    agendas: List[asyncio.TimerHandle] = field(default_factory=list)
+
+
+class AtorEnvioChip:
+    """
+    Fila e agenda de envios de um chip.
+
+    Exemplo:
+        ator = AtorEnvioChip("chip-1", max_em_voo=2, intervalo_minimo=1.0)
+        result = await ator.enviar(chip, "5511999999999", "Oi!", tempo_digitacao=2.5)
+    """
+
+    def __init__(self, chip_id: str, max_em_voo: int, intervalo_minimo: float):
+        """
+        Args:
+            chip_id: ID do chip
+            max_em_voo: Requisicoes de envio simultaneas
+            intervalo_minimo: Segundos entre dois envios do chip
+        """
+        self.chip_id = chip_id
+        self.max_em_voo = max_em_voo
+        self.intervalo_minimo = intervalo_minimo
+        self._loop = asyncio.get_running_loop()
+        self._fila: asyncio.Queue[PedidoEnvio] = asyncio.Queue()
+        self._vagas = asyncio.Semaphore(max_em_voo)
+        self._proximo_envio = 0.0
+        self._agendados: Dict[int, PedidoEnvio] = {}
+        self._tarefas: Set[asyncio.Task] = set()
+        self._consumidor = self._loop.create_task(self._consumir())
+
+    def ativo_em(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Se o ator esta rodando neste event loop."""
+        return self._loop is loop and not self._consumidor.done()
+
+    @property
+    def pendentes(self) -> int:
+        """Pedidos na fila ou agendados ainda sem resultado."""
+        return self._fila.qsize() + len(self._agendados)
+
+    async def enviar(
+        self,
+        chip: Dict,
+        telefone: str,
+        texto: str,
+        template_info: Optional[Dict] = None,
+        tempo_digitacao: float = 0.0,
+    ) -> MessageResult:
+        """
+        Enfileira a mensagem e aguarda o resultado do envio.
+
+        Args:
+            chip: Dados atuais do chip
+            telefone: Destinatario
+            texto: Texto da mensagem
+            template_info: Template Meta (fora da janela 24h)
+            tempo_digitacao: Segundos de "digitando" antes do envio (0 = sem presenca)
+
+        Returns:
+            MessageResult do provider
+        """
+        pedido = PedidoEnvio(
+            chip=chip,
+            telefone=telefone,
+            texto=texto,
+            template_info=template_info,
+            tempo_digitacao=max(0.0, tempo_digitacao or 0.0),
+            resultado=self._loop.create_future(),
+        )
+        self._fila.put_nowait(pedido)
+        return await pedido.resultado
+
+    async def _consumir(self) -> None:
+        while True:
+            pedido = await self._fila.get()
+            self._agendar(pedido)
+
+    def _agendar(self, pedido: PedidoEnvio) -> None:
+        """Reserva o horario de envio e agenda presenca e envio (sem await)."""
+        agora = self._loop.time()
+        envio_em = max(agora + pedido.tempo_digitacao, self._proximo_envio)
+        self._proximo_envio = envio_em + self.intervalo_minimo
+        self._agendados[id(pedido)] = pedido
+
+        # Presenca alinhada ao horario real do envio (que pode ter sido empurrado)
+        if pedido.tempo_digitacao > 0:
+            inicio_presenca = envio_em - pedido.tempo_digitacao
+            pedido.agendas.append(
+                self._loop.call_at(inicio_presenca, self._disparar, self._enviar_presenca, pedido)
+            )
+        pedido.agendas.append(self._loop.call_at(envio_em, self._disparar, self._enviar, pedido))
+
+    def _disparar(self, etapa: Callable, pedido: PedidoEnvio) -> None:
+        tarefa = self._loop.create_task(etapa(pedido))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _enviar_presenca(self, pedido: PedidoEnvio) -> None:
+        from app.services.whatsapp_providers import get_provider
+
+        if pedido.resultado.done():
+            return
+        try:
+            provider = get_provider(pedido.chip)
+            await provider.send_presence(
+                pedido.telefone, "composing", int(pedido.tempo_digitacao * 1000)
+            )
+        except Exception as e:
+            logger.debug(f"[ChipActor] Erro ao enviar presence: {e}")
+
+    async def _enviar(self, pedido: PedidoEnvio) -> None:
+        from app.services.chips.sender import enviar_via_chip
+
+        try:
+            # Quem pediu desistiu (cancelado/timeout): nao envia
+            if pedido.resultado.done():
+                return
+            async with self._vagas:
+                result = await enviar_via_chip(
+                    pedido.chip,
+                    pedido.telefone,
+                    pedido.texto,
+                    template_info=pedido.template_info,
+                )
+            if not pedido.resultado.done():
+                pedido.resultado.set_result(result)
+        except Exception as e:
+            if not pedido.resultado.done():
+                pedido.resultado.set_exception(e)
+        finally:
+            self._agendados.pop(id(pedido), None)
+
+    async def encerrar(self) -> None:
+        """
+        Para de consumir a fila e cancela envios agendados e em andamento.
+
+        Quem ainda aguarda um pedido (na fila ou agendado) recebe um
+        MessageResult de falha em vez de ficar preso para sempre.
+        """
+        self._consumidor.cancel()
+        pedidos = list(self._agendados.values())
+        self._agendados.clear()
+        for pedido in pedidos:
+            for agenda in pedido.agendas:
+                agenda.cancel()
+        for tarefa in list(self._tarefas):
+            tarefa.cancel()
+        await asyncio.gather(self._consumidor, *self._tarefas, return_exceptions=True)
+        while not self._fila.empty():
+            pedidos.append(self._fila.get_nowait())
+
+        for pedido in pedidos:
+            if not pedido.resultado.done():
+                pedido.resultado.set_result(
+                    MessageResult(success=False, error="Ator de envio do chip encerrado")
+                )
+
+
+class RegistroAtores:
+    """Um ator por chip, criado sob demanda no event loop corrente."""
+
+    def __init__(self):
+        self._atores: Dict[str, AtorEnvioChip] = {}
+
+    def obter(self, chip: Dict) -> AtorEnvioChip:
+        """Ator do chip (recria se o anterior era de outro event loop)."""
+        ator = self._atores.get(chip["id"])
+        if ator is None or not ator.ativo_em(asyncio.get_running_loop()):
+            if chip.get("provider") == "meta":
+                ator = AtorEnvioChip(
+                    chip["id"],
+                    max_em_voo=settings.CHIP_ENVIO_MAX_EM_VOO_META,
+                    intervalo_minimo=0.0,
+                )
+            else:
+                ator = AtorEnvioChip(
+                    chip["id"],
+                    max_em_voo=settings.CHIP_ENVIO_MAX_EM_VOO,
+                    intervalo_minimo=settings.CHIP_ENVIO_INTERVALO_MIN_SEGUNDOS,
+                )
+            self._atores[chip["id"]] = ator
+        return ator
+
+    async def enviar(
+        self,
+        chip: Dict,
+        telefone: str,
+        texto: str,
+        template_info: Optional[Dict] = None,
+        tempo_digitacao: float = 0.0,
+    ) -> MessageResult:
+        """Envia pela fila do chip (ver AtorEnvioChip.enviar)."""
+        ator = self.obter(chip)
+        return await ator.enviar(
+            chip, telefone, texto, template_info=template_info, tempo_digitacao=tempo_digitacao
+        )
+
+    async def encerrar(self) -> None:
+        """Encerra todos os atores (shutdown)."""
+        atores = list(self._atores.values())
+        self._atores.clear()
+        for ator in atores:
+            await ator.encerrar()
+
+
+# Singleton
+atores_envio = RegistroAtores()
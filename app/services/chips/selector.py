@@ -25,6 +25,7 @@ import logging
 from typing import Optional, List, Dict, Literal
 from datetime import datetime, timedelta, timezone
 
+from app.models.registros import Chip
 from app.services.supabase import supabase
 from app.services.chips.circuit_breaker import ChipCircuitBreaker
 
@@ -165,7 +166,7 @@ class ChipSelector:
         # (conversation_chips tem 2 FKs para chips: chip_id e migrated_from)
         result = (
             supabase.table("conversation_chips")
-            .select("chip_id, chips!conversation_chips_chip_id_fkey(*)")
+            .select(f"chip_id, chips!conversation_chips_chip_id_fkey({Chip.projecao()})")
             .eq("conversa_id", conversa_id)
             .eq("active", True)
             .limit(1)
@@ -173,7 +174,7 @@ class ChipSelector:
         )
 
         if result.data and result.data[0].get("chips"):
-            chip = result.data[0]["chips"]
+            chip = Chip.de_linha(result.data[0]["chips"])
 
             # Sprint 27: Verificar conexão baseado no provider
             provider = chip.get("provider", "evolution")
@@ -227,7 +228,7 @@ class ChipSelector:
         Sprint 36 - T11.6: Verifica conexão (evolution_connected para Evolution)
         Sprint 27: Suporte multi-provider (Z-API não requer evolution_connected)
         """
-        query = supabase.table("chips").select("*").eq("status", "active")
+        query = supabase.table("chips").select(Chip.projecao()).eq("status", "active")
 
         # Sprint 51 - E03: NUNCA selecionar chips do tipo 'listener'
         # Chips listener são exclusivos para escuta de grupos (read-only)
@@ -257,9 +258,10 @@ class ChipSelector:
             )
 
         result = query.order("trust_score", desc=True).execute()
+        chips = Chip.de_linhas(result.data)
 
         # Sprint 59 Epic 4: Batch query de msgs/hora para todos os chips candidatos
-        all_chip_ids = [c["id"] for c in result.data or []]
+        all_chip_ids = [c.id for c in chips]
         uso_hora_batch = await self._contar_msgs_ultima_hora_batch(all_chip_ids)
 
         # Filtrar por limite de uso
@@ -267,7 +269,7 @@ class ChipSelector:
         chips_desconectados = 0
         chips_circuit_aberto = 0  # Sprint 36 - T09.2
 
-        for chip in result.data or []:
+        for chip in chips:
             # Sprint 27: Verificar conexão baseado no provider
             provider = chip.get("provider", "evolution")
 
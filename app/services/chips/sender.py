@@ -77,6 +77,12 @@ async def enviar_via_chip(
         else:
             result = await provider.send_text(telefone, texto)
 
+        # Afinidade telefone -> WABA para a seleção Multi-WABA
+        if result.success and chip.get("meta_waba_id"):
+            from app.services.meta.waba_selector import waba_selector
+
+            waba_selector.registrar_afinidade(telefone, chip["meta_waba_id"])
+
         # Atualizar métricas do chip (Sprint 36 - T08.1)
         await _registrar_envio(
             chip_id=chip["id"],
@@ -272,6 +278,12 @@ async def enviar_media_via_chip(
             media_type=media_type,
         )
 
+        # Afinidade telefone -> WABA para a seleção Multi-WABA
+        if result.success and chip.get("meta_waba_id"):
+            from app.services.meta.waba_selector import waba_selector
+
+            waba_selector.registrar_afinidade(telefone, chip["meta_waba_id"])
+
         # Atualizar métricas do chip (Sprint 36 - T08.1)
         await _registrar_envio(
             chip_id=chip["id"],
@@ -10,6 +10,11 @@ from .detector_objecao import DetectorObjecao, TipoObjecao, ResultadoDeteccao
 from .detector_perfil import DetectorPerfil, PerfilMedico, ResultadoPerfil
 from .detector_objetivo import DetectorObjetivo, ObjetivoConversa, ResultadoObjetivo
 from .orquestrador import OrquestradorConhecimento, ContextoSituacao
+from .precomputado import (
+    PrecomputadorConhecimento,
+    CatalogoPrecomputado,
+    catalogo_precomputado,
+)
 
 __all__ = [
     # E01 - Indexação
@@ -30,4 +35,8 @@ __all__ = [
     "ResultadoObjetivo",
     "OrquestradorConhecimento",
     "ContextoSituacao",
+    # Consultas pré-computadas
+    "PrecomputadorConhecimento",
+    "CatalogoPrecomputado",
+    "catalogo_precomputado",
 ]
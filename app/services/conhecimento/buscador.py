@@ -138,12 +138,39 @@ class BuscadorConhecimento:
             limite=3,
         )
 
-    async def buscar_para_perfil(self, perfil: str) -> list[ResultadoBusca]:
+    async def buscar_para_tipo_objecao(
+        self, tipo_objecao: str, usar_cache: bool = True
+    ) -> list[ResultadoBusca]:
+        """
+        Busca conhecimento para uma categoria de objeção.
+
+        Diferente de buscar_para_objecao, a query não depende do texto
+        da mensagem, então o resultado pode ser pré-computado.
+
+        Args:
+            tipo_objecao: Categoria da objeção (preco, tempo, etc)
+            usar_cache: Se deve usar cache
+
+        Returns:
+            Conhecimento sobre como responder a categoria
+        """
+        return await self.buscar(
+            query=f"Como responder objeção de {tipo_objecao} do médico",
+            tipo="objecao",
+            subtipo=tipo_objecao,
+            limite=3,
+            usar_cache=usar_cache,
+        )
+
+    async def buscar_para_perfil(
+        self, perfil: str, usar_cache: bool = True
+    ) -> list[ResultadoBusca]:
         """
         Busca conhecimento sobre como abordar perfil específico.
 
         Args:
             perfil: Nome do perfil (senior, recem_formado, etc)
+            usar_cache: Se deve usar cache
 
         Returns:
             Conhecimento sobre abordagem para perfil
@@ -153,6 +180,26 @@ class BuscadorConhecimento:
             tipo="perfil",
             subtipo=perfil,
             limite=3,
+            usar_cache=usar_cache,
+        )
+
+    async def buscar_para_objetivo(
+        self, objetivo: str, usar_cache: bool = True
+    ) -> list[ResultadoBusca]:
+        """
+        Busca conhecimento geral para o objetivo da conversa.
+
+        Args:
+            objetivo: Objetivo da conversa (prospectar, ofertar, etc)
+            usar_cache: Se deve usar cache
+
+        Returns:
+            Conhecimento sobre como conduzir o objetivo
+        """
+        return await self.buscar(
+            query=f"Como {objetivo} médico",
+            limite=2,
+            usar_cache=usar_cache,
         )
 
     async def buscar_exemplos_conversa(self, contexto: str) -> list[ResultadoBusca]:
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
 
+from app.services.analise_texto import analisar, registrar_literais, registrar_padroes
+
 logger = logging.getLogger(__name__)
 
 
@@ -150,31 +152,31 @@ class DetectorObjecao:
             ResultadoDeteccao com tipo e confiança
         """
         mensagem_lower = mensagem.lower().strip()
+        analise = analisar(mensagem)
 
         # 1. Verificar keywords de alta confiança primeiro
-        for tipo, keywords in self.KEYWORDS_ALTA_CONFIANCA.items():
-            for kw in keywords:
-                if kw in mensagem_lower:
-                    return ResultadoDeteccao(
-                        tem_objecao=True,
-                        tipo=tipo,
-                        confianca=0.95,
-                        trecho=kw,
-                        subtipo=self._detectar_subtipo(tipo, mensagem_lower),
-                    )
+        ocorrencia = analise.primeira("objecao.keywords")
+        if ocorrencia:
+            tipo = _TIPOS_KEYWORDS[ocorrencia.indice]
+            return ResultadoDeteccao(
+                tem_objecao=True,
+                tipo=tipo,
+                confianca=0.95,
+                trecho=ocorrencia.trecho,
+                subtipo=self._detectar_subtipo(tipo, mensagem_lower),
+            )
 
         # 2. Verificar padrões regex
-        for tipo, padroes in self.PADROES.items():
-            for padrao in padroes:
-                match = re.search(padrao, mensagem_lower, re.IGNORECASE)
-                if match:
-                    return ResultadoDeteccao(
-                        tem_objecao=True,
-                        tipo=tipo,
-                        confianca=0.75,
-                        trecho=match.group(),
-                        subtipo=self._detectar_subtipo(tipo, mensagem_lower),
-                    )
+        ocorrencia = analise.primeira("objecao.padroes")
+        if ocorrencia:
+            tipo = _TIPOS_PADROES[ocorrencia.indice]
+            return ResultadoDeteccao(
+                tem_objecao=True,
+                tipo=tipo,
+                confianca=0.75,
+                trecho=ocorrencia.trecho,
+                subtipo=self._detectar_subtipo(tipo, mensagem_lower),
+            )
 
         # 3. Nenhuma objeção detectada
         return ResultadoDeteccao(
@@ -296,3 +298,20 @@ Responda APENAS com o tipo (uma palavra). Se não for objeção, responda "nenhu
             logger.warning(f"Erro ao usar LLM para detecção: {e}")
             # Fallback para detecção por padrões
             return resultado_padrao
+
+
+# Padrões achatados na ordem de prioridade, registrados no motor de análise
+_TIPOS_KEYWORDS = [
+    tipo for tipo, keywords in DetectorObjecao.KEYWORDS_ALTA_CONFIANCA.items() for _ in keywords
+]
+_TIPOS_PADROES = [tipo for tipo, padroes in DetectorObjecao.PADROES.items() for _ in padroes]
+
+registrar_literais(
+    "objecao.keywords",
+    [kw for keywords in DetectorObjecao.KEYWORDS_ALTA_CONFIANCA.values() for kw in keywords],
+)
+registrar_padroes(
+    "objecao.padroes",
+    [padrao for padroes in DetectorObjecao.PADROES.values() for padrao in padroes],
+    flags=re.IGNORECASE,
+)
@@ -9,9 +9,53 @@ from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
 
+from app.services.analise_texto import analisar, registrar_literais
+
 logger = logging.getLogger(__name__)
 
 
+# Sinais por objetivo (substrings da mensagem em minúsculo), na ordem de verificação
+SINAIS_FECHAR = [
+    "quero",
+    "reserva",
+    "confirma",
+    "pode ser",
+    "aceito",
+    "combinado",
+    "fechado",
+    "beleza",
+    "blz",
+]
+
+SINAIS_QUALIFICAR = [
+    "como funciona",
+    "quais vagas",
+    "tem vaga",
+    "região",
+    "regiao",
+    "horário",
+    "horario",
+    "valor",
+    "quanto",
+    "especialidade",
+]
+
+SINAIS_NEGOCIAR = [
+    "mas",
+    "porém",
+    "entretanto",
+    "não sei",
+    "preciso pensar",
+    "depois",
+    "talvez",
+    "não tenho certeza",
+]
+
+registrar_literais("objetivo.fechar", SINAIS_FECHAR)
+registrar_literais("objetivo.qualificar", SINAIS_QUALIFICAR)
+registrar_literais("objetivo.negociar", SINAIS_NEGOCIAR)
+
+
 class ObjetivoConversa(str, Enum):
     """Objetivos/fases da conversa."""
 
@@ -178,22 +222,11 @@ class DetectorObjetivo:
         Returns:
             ResultadoObjetivo inferido
         """
-        mensagem_lower = mensagem.lower()
+        analise = analisar(mensagem)
         indicadores = []
 
         # Sinais de fechamento
-        sinais_fechar = [
-            "quero",
-            "reserva",
-            "confirma",
-            "pode ser",
-            "aceito",
-            "combinado",
-            "fechado",
-            "beleza",
-            "blz",
-        ]
-        if any(s in mensagem_lower for s in sinais_fechar):
+        if analise.tem("objetivo.fechar"):
             indicadores.append("sinal_fechamento")
             return ResultadoObjetivo(
                 objetivo=ObjetivoConversa.FECHAR,
@@ -203,19 +236,7 @@ class DetectorObjetivo:
             )
 
         # Sinais de interesse/qualificação
-        sinais_qualificar = [
-            "como funciona",
-            "quais vagas",
-            "tem vaga",
-            "região",
-            "regiao",
-            "horário",
-            "horario",
-            "valor",
-            "quanto",
-            "especialidade",
-        ]
-        if any(s in mensagem_lower for s in sinais_qualificar):
+        if analise.tem("objetivo.qualificar"):
             indicadores.append("sinal_interesse")
             return ResultadoObjetivo(
                 objetivo=ObjetivoConversa.QUALIFICAR,
@@ -225,17 +246,7 @@ class DetectorObjetivo:
             )
 
         # Sinais de negociação/objeção
-        sinais_negociar = [
-            "mas",
-            "porém",
-            "entretanto",
-            "não sei",
-            "preciso pensar",
-            "depois",
-            "talvez",
-            "não tenho certeza",
-        ]
-        if any(s in mensagem_lower for s in sinais_negociar):
+        if analise.tem("objetivo.negociar"):
             indicadores.append("sinal_negociacao")
             return ResultadoObjetivo(
                 objetivo=ObjetivoConversa.NEGOCIAR,
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from typing import Optional
 from enum import Enum
 
+from app.services.analise_texto import analisar, registrar_literais
+
 logger = logging.getLogger(__name__)
 
 
@@ -242,18 +244,17 @@ class DetectorPerfil:
         Returns:
             ResultadoPerfil inferido
         """
-        mensagem_lower = mensagem.lower()
         indicadores = []
-        melhor_perfil = PerfilMedico.DESCONHECIDO
-        maior_score = 0
+        scores = dict.fromkeys(self.INDICADORES, 0)
 
-        for perfil, dados in self.INDICADORES.items():
-            score = 0
-            for kw in dados["keywords"]:
-                if kw in mensagem_lower:
-                    score += 1
-                    indicadores.append(f"keyword:{kw}")
+        for ocorrencia in analisar(mensagem).ocorrencias("perfil.keywords"):
+            scores[_PERFIS_KEYWORDS[ocorrencia.indice]] += 1
+            indicadores.append(f"keyword:{ocorrencia.padrao}")
 
+        # Empate fica com o primeiro perfil, como na varredura sequencial
+        melhor_perfil = PerfilMedico.DESCONHECIDO
+        maior_score = 0
+        for perfil, score in scores.items():
             if score > maior_score:
                 maior_score = score
                 melhor_perfil = perfil
@@ -400,3 +401,14 @@ Responda APENAS com o perfil (uma palavra)."""
                 indicadores=["erro_llm"],
                 recomendacao_abordagem=self.ABORDAGENS[PerfilMedico.DESCONHECIDO],
             )
+
+
+# Keywords achatadas na ordem dos perfis, registradas no motor de análise
+_PERFIS_KEYWORDS = [
+    perfil for perfil, dados in DetectorPerfil.INDICADORES.items() for _ in dados["keywords"]
+]
+
+registrar_literais(
+    "perfil.keywords",
+    [kw for dados in DetectorPerfil.INDICADORES.values() for kw in dados["keywords"]],
+)
@@ -215,12 +215,13 @@ class IndexadorConhecimento:
         self.parser = ParserMarkdown()
         self.docs_path = Path("docs/julia")
 
-    async def indexar_todos(self, reindexar: bool = False) -> dict:
+    async def indexar_todos(self, reindexar: bool = False, precomputar: bool = True) -> dict:
         """
         Indexa todos os documentos da pasta docs/julia/.
 
         Args:
             reindexar: Se True, remove dados antigos antes
+            precomputar: Se True, regera as consultas pré-computadas ao final
 
         Returns:
             Estatísticas da indexação
@@ -275,14 +276,19 @@ class IndexadorConhecimento:
                 stats["erros"] += 1
 
         logger.info(f"Indexação concluída: {stats}")
+
+        if precomputar:
+            stats["precomputado"] = await self._precomputar()
+
         return stats
 
-    async def indexar_arquivo(self, nome_arquivo: str) -> int:
+    async def indexar_arquivo(self, nome_arquivo: str, precomputar: bool = True) -> int:
         """
         Indexa um arquivo específico.
 
         Args:
             nome_arquivo: Nome do arquivo em docs/julia/
+            precomputar: Se True, regera as consultas pré-computadas ao final
 
         Returns:
             Número de chunks indexados
@@ -318,4 +324,18 @@ class IndexadorConhecimento:
             count += 1
 
         logger.info(f"Indexado {nome_arquivo}: {count} chunks")
+
+        if precomputar:
+            await self._precomputar()
+
         return count
+
+    async def _precomputar(self) -> dict:
+        """Regera os resultados pré-computados após mudança na base."""
+        from .precomputado import PrecomputadorConhecimento
+
+        try:
+            return await PrecomputadorConhecimento().precomputar_todos()
+        except Exception as e:
+            logger.error(f"Erro ao pré-computar conhecimento: {e}")
+            return {"erros": 1}
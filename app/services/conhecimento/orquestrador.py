@@ -15,6 +15,12 @@ from .detector_objecao import DetectorObjecao, ResultadoDeteccao
 from .detector_perfil import DetectorPerfil, PerfilMedico, ResultadoPerfil
 from .detector_objetivo import DetectorObjetivo, ResultadoObjetivo
 from .buscador import BuscadorConhecimento, ResultadoBusca
+from .precomputado import (
+    CONSULTA_OBJECAO,
+    CONSULTA_OBJETIVO,
+    CONSULTA_PERFIL,
+    catalogo_precomputado,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +49,7 @@ class OrquestradorConhecimento:
         self.detector_perfil = DetectorPerfil()
         self.detector_objetivo = DetectorObjetivo()
         self.buscador = BuscadorConhecimento()
+        self.precomputado = catalogo_precomputado
 
     async def analisar_situacao(
         self,
@@ -153,25 +160,37 @@ class OrquestradorConhecimento:
         objetivo: ResultadoObjetivo,
         mensagem: str,
     ) -> list[ResultadoBusca]:
-        """Busca conhecimento relevante baseado na situação."""
+        """Busca conhecimento relevante baseado na situação.
+
+        Consultas de perfil, objetivo e categoria de objeção são servidas
+        da tabela pré-computada, sem embedding nem busca vetorial. A busca
+        normal só é usada quando a consulta ainda não foi pré-computada, ou
+        quando a categoria de objeção não tem chunks próprios (ex: risco):
+        aí a busca pela mensagem ainda acha conhecimento relacionado.
+        """
         conhecimento = []
 
         # 1. Se tem objeção com confiança, busca específico
         if objecao.tem_objecao and objecao.confianca >= 0.6:
-            resultados = await self.buscador.buscar_para_objecao(mensagem)
+            resultados = await self.precomputado.obter(CONSULTA_OBJECAO, objecao.tipo.value)
+            if not resultados:
+                resultados = await self.buscador.buscar_para_objecao(mensagem)
             conhecimento.extend(resultados)
             logger.debug(f"Conhecimento objeção: {len(resultados)} chunks")
 
         # 2. Se perfil identificado com confiança, busca específico
         if perfil.perfil != PerfilMedico.DESCONHECIDO and perfil.confianca >= 0.6:
-            resultados = await self.buscador.buscar_para_perfil(perfil.perfil.value)
+            resultados = await self.precomputado.obter(CONSULTA_PERFIL, perfil.perfil.value)
+            if resultados is None:
+                resultados = await self.buscador.buscar_para_perfil(perfil.perfil.value)
             conhecimento.extend(resultados)
             logger.debug(f"Conhecimento perfil: {len(resultados)} chunks")
 
         # 3. Busca por objetivo (se não tem conhecimento específico)
         if len(conhecimento) < 2:
-            query = f"Como {objetivo.objetivo.value} médico"
-            resultados = await self.buscador.buscar(query=query, limite=2)
+            resultados = await self.precomputado.obter(CONSULTA_OBJETIVO, objetivo.objetivo.value)
+            if resultados is None:
+                resultados = await self.buscador.buscar_para_objetivo(objetivo.objetivo.value)
             conhecimento.extend(resultados)
 
         # 4. Limitar e ordenar por relevância
@@ -0,0 +1,188 @@
+"""
+Resultados pré-computados de buscas de conhecimento.
+
+Várias buscas do orquestrador são geradas a partir de um conjunto fechado
+de valores (perfil, objetivo, categoria de objeção). Em vez de gerar
+embedding e buscar vetores a cada mensagem, os resultados são resolvidos
+uma vez por indexação e gravados em uma tabela versionada.
+"""
+
+import logging
+import time
+from dataclasses import asdict
+from typing import Optional
+
+from app.core.timezone import agora_utc
+
+from .buscador import BuscadorConhecimento, ResultadoBusca
+from .detector_objecao import TipoObjecao
+from .detector_objetivo import ObjetivoConversa
+from .detector_perfil import PerfilMedico
+
+logger = logging.getLogger(__name__)
+
+TABELA = "conhecimento_precomputado"
+
+# Tempo até recarregar a versão mais recente do banco (em segundos)
+CATALOGO_TTL_SEGUNDOS = 600
+
+# Tipos de consulta pré-computadas
+CONSULTA_PERFIL = "perfil"
+CONSULTA_OBJETIVO = "objetivo"
+CONSULTA_OBJECAO = "objecao"
+
+
+def listar_consultas() -> list[tuple[str, str]]:
+    """
+    Lista todas as consultas (tipo, chave) que devem ser pré-computadas.
+
+    Returns:
+        Lista de pares (tipo de consulta, valor)
+    """
+    consultas = [(CONSULTA_PERFIL, p.value) for p in PerfilMedico if p != PerfilMedico.DESCONHECIDO]
+    consultas += [(CONSULTA_OBJETIVO, o.value) for o in ObjetivoConversa]
+    consultas += [(CONSULTA_OBJECAO, t.value) for t in TipoObjecao if t != TipoObjecao.NENHUMA]
+    return consultas
+
+
+class PrecomputadorConhecimento:
+    """Resolve e grava os resultados de todas as consultas estáticas."""
+
+    def __init__(self, buscador: Optional[BuscadorConhecimento] = None):
+        self.buscador = buscador or BuscadorConhecimento()
+
+    async def _resolver(self, consulta: str, chave: str) -> list[ResultadoBusca]:
+        """Executa a busca real (embedding + vetor) de uma consulta."""
+        if consulta == CONSULTA_PERFIL:
+            return await self.buscador.buscar_para_perfil(chave, usar_cache=False)
+        if consulta == CONSULTA_OBJETIVO:
+            return await self.buscador.buscar_para_objetivo(chave, usar_cache=False)
+        if consulta == CONSULTA_OBJECAO:
+            return await self.buscador.buscar_para_tipo_objecao(chave, usar_cache=False)
+        raise ValueError(f"Consulta desconhecida: {consulta}")
+
+    async def precomputar_todos(self) -> dict:
+        """
+        Pré-computa todas as consultas e publica uma nova versão.
+
+        Deve rodar sempre que a base de conhecimento for reindexada.
+        Versões anteriores são removidas após a nova ser gravada.
+
+        Returns:
+            Estatísticas da pré-computação
+        """
+        from app.services.supabase import supabase
+
+        versao = int(agora_utc().timestamp())
+        stats = {"versao": versao, "consultas": 0, "resultados": 0, "erros": 0}
+        linhas = []
+
+        for consulta, chave in listar_consultas():
+            try:
+                resultados = await self._resolver(consulta, chave)
+            except Exception as e:
+                logger.error(f"Erro ao pré-computar {consulta}:{chave}: {e}")
+                stats["erros"] += 1
+                continue
+
+            linhas.append(
+                {
+                    "versao": versao,
+                    "consulta": consulta,
+                    "chave": chave,
+                    "resultados": [asdict(r) for r in resultados],
+                }
+            )
+            stats["consultas"] += 1
+            stats["resultados"] += len(resultados)
+
+        if stats["erros"]:
+            # Versão incompleta não é publicada: o orquestrador continuaria
+            # servindo a versão anterior para as consultas que falharam.
+            logger.warning(f"Pré-computação abortada com erros: {stats}")
+            return stats
+
+        if linhas:
+            supabase.table(TABELA).insert(linhas).execute()
+            supabase.table(TABELA).delete().lt("versao", versao).execute()
+
+        catalogo_precomputado.invalidar()
+        logger.info(f"Pré-computação concluída: {stats}")
+        return stats
+
+
+class CatalogoPrecomputado:
+    """Cache em memória da versão mais recente dos resultados pré-computados."""
+
+    def __init__(self, ttl_segundos: int = CATALOGO_TTL_SEGUNDOS):
+        self.ttl_segundos = ttl_segundos
+        self.versao: Optional[int] = None
+        self._resultados: dict[tuple[str, str], list[ResultadoBusca]] = {}
+        self._carregado_em: Optional[float] = None
+
+    def invalidar(self) -> None:
+        """Força recarga na próxima consulta."""
+        self._carregado_em = None
+
+    async def carregar(self) -> int:
+        """
+        Carrega a versão mais recente do banco.
+
+        Returns:
+            Número de consultas carregadas
+        """
+        from app.services.supabase import supabase
+
+        self._carregado_em = time.monotonic()
+
+        try:
+            response = (
+                supabase.table(TABELA)
+                .select("versao")
+                .order("versao", desc=True)
+                .limit(1)
+                .execute()
+            )
+            if not response.data:
+                self.versao = None
+                self._resultados = {}
+                return 0
+
+            versao = response.data[0]["versao"]
+            response = (
+                supabase.table(TABELA)
+                .select("consulta, chave, resultados")
+                .eq("versao", versao)
+                .execute()
+            )
+        except Exception as e:
+            # Mantém o que já estava carregado; orquestrador cai na busca normal
+            logger.warning(f"Erro ao carregar conhecimento pré-computado: {e}")
+            return len(self._resultados)
+
+        self.versao = versao
+        self._resultados = {
+            (r["consulta"], r["chave"]): [ResultadoBusca(**item) for item in r["resultados"] or []]
+            for r in response.data
+        }
+        logger.info(f"Conhecimento pré-computado v{versao}: {len(self._resultados)} consultas")
+        return len(self._resultados)
+
+    async def obter(self, consulta: str, chave: str) -> Optional[list[ResultadoBusca]]:
+        """
+        Retorna os resultados pré-computados de uma consulta.
+
+        Args:
+            consulta: Tipo da consulta (perfil, objetivo, objecao)
+            chave: Valor da consulta
+
+        Returns:
+            Lista de resultados (pode ser vazia) ou None se não pré-computada
+        """
+        if self._carregado_em is None or time.monotonic() - self._carregado_em > self.ttl_segundos:
+            await self.carregar()
+
+        return self._resultados.get((consulta, chave))
+
+
+catalogo_precomputado = CatalogoPrecomputado()
@@ -13,7 +13,7 @@ import logging
 from app.core.timezone import agora_brasilia, agora_utc
 from app.services.interacao import carregar_historico, formatar_historico_para_llm
 from app.config.especialidades import obter_config_especialidade
-from app.services.redis import cache_get_json, cache_set_json
+from app.services.redis import CacheNamespace, cache_get_json, cache_set_json
 from app.services.supabase import supabase
 from app.services.memoria import enriquecer_contexto_com_memorias
 from app.core.config import DatabaseConfig
@@ -23,6 +23,9 @@ logger = logging.getLogger(__name__)
 # TTL do cache de contexto de campanha (Redis)
 CACHE_TTL_CAMPANHA_CONTEXTO = 300  # 5 minutos
 
+# Tag por campanha: mudanca de status invalida com um INCR
+_cache_contexto_campanha = CacheNamespace("campanha:contexto")
+
 # Dias da semana em portugues
 DIAS_SEMANA = ["segunda", "terca", "quarta", "quinta", "sexta", "sabado", "domingo"]
 
@@ -320,8 +323,10 @@ async def carregar_contexto_campanha(
         return None
 
     # Tentar cache Redis (Issue 4.3)
-    cache_key = f"campanha:contexto:{effective_id}"
-    cached = await cache_get_json(cache_key)
+    cache_key = await _cache_contexto_campanha.chave(
+        str(effective_id), tags=[f"campanha:{effective_id}"]
+    )
+    cached = await cache_get_json(cache_key) if cache_key else None
     if cached:
         # Mesmo do cache, verificar TTL do last_touch_at
         if not _campanha_dentro_janela(
@@ -366,7 +371,8 @@ async def carregar_contexto_campanha(
         }
 
         # Salvar no cache Redis (Issue 4.3)
-        await cache_set_json(cache_key, contexto, CACHE_TTL_CAMPANHA_CONTEXTO)
+        if cache_key:
+            await cache_set_json(cache_key, contexto, CACHE_TTL_CAMPANHA_CONTEXTO)
 
         logger.info(
             f"Contexto campanha {effective_id} carregado: tipo={campanha.tipo_campanha.value}, "
@@ -379,6 +385,16 @@ async def carregar_contexto_campanha(
         return None
 
 
+async def invalidar_contexto_campanha(campanha_id: int) -> None:
+    """
+    Invalida o contexto de campanha em cache (chamar apos mudar status).
+
+    Args:
+        campanha_id: ID da campanha
+    """
+    await _cache_contexto_campanha.invalidar_tag(f"campanha:{campanha_id}")
+
+
 def _campanha_dentro_janela(
     status: Optional[str],
     concluida_em: Optional[str],
@@ -6,12 +6,13 @@ from typing import Optional, Literal
 import logging
 
 from app.core.timezone import agora_utc
+from app.models.registros import Conversa
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
 
 
-async def buscar_conversa_ativa(cliente_id: str) -> Optional[dict]:
+async def buscar_conversa_ativa(cliente_id: str) -> Optional[Conversa]:
     """
     Busca conversa ativa (aberta) do cliente (query otimizada).
 
@@ -25,16 +26,14 @@ async def buscar_conversa_ativa(cliente_id: str) -> Optional[dict]:
         # Query otimizada - apenas campos necessários
         response = (
             supabase.table("conversations")
-            .select(
-                "id, cliente_id, status, controlled_by, chatwoot_conversation_id, created_at, campanha_id, last_touch_campaign_id, last_touch_at"
-            )
+            .select(Conversa.projecao())
             .eq("cliente_id", cliente_id)
             .eq("status", "active")
             .order("created_at", desc=True)
             .limit(1)
             .execute()
         )
-        return response.data[0] if response.data else None
+        return Conversa.de_linha(response.data[0]) if response.data else None
     except Exception as e:
         logger.error(f"Erro ao buscar conversa: {e}")
         return None
@@ -42,7 +41,7 @@ async def buscar_conversa_ativa(cliente_id: str) -> Optional[dict]:
 
 async def criar_conversa(
     cliente_id: str, controlled_by: Literal["ai", "human"] = "ai"
-) -> Optional[dict]:
+) -> Optional[Conversa]:
     """
     Cria nova conversa.
 
@@ -66,13 +65,13 @@ async def criar_conversa(
             .execute()
         )
         logger.info(f"Conversa criada para cliente {cliente_id}")
-        return response.data[0] if response.data else None
+        return Conversa.de_linha(response.data[0]) if response.data else None
     except Exception as e:
         logger.error(f"Erro ao criar conversa: {e}")
         return None
 
 
-async def buscar_ou_criar_conversa(cliente_id: str) -> Optional[dict]:
+async def buscar_ou_criar_conversa(cliente_id: str) -> Optional[Conversa]:
     """
     Busca conversa ativa ou cria nova.
 
@@ -9,10 +9,11 @@ A decisão passa pela matriz ALLOWED_TRANSITIONS.
 """
 
 import logging
-import re
 from dataclasses import dataclass
 from enum import Enum
 
+from app.services.analise_texto import AnaliseTexto, analisar, registrar_padroes
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,6 +112,14 @@ RECUSA_KEYWORDS = [
 ]
 
 
+registrar_padroes("intent.interesse", INTERESSE_KEYWORDS)
+registrar_padroes("intent.fechar", FECHAR_KEYWORDS)
+registrar_padroes("intent.duvida", DUVIDA_KEYWORDS)
+registrar_padroes("intent.voltando", VOLTANDO_KEYWORDS)
+registrar_padroes("intent.objecao", OBJECAO_KEYWORDS)
+registrar_padroes("intent.recusa", RECUSA_KEYWORDS)
+
+
 @dataclass
 class IntentResult:
     """Resultado da detecção de intent."""
@@ -120,13 +129,11 @@ class IntentResult:
     evidence: str
 
 
-def _check_keywords(text: str, patterns: list[str]) -> tuple[bool, str]:
-    """Verifica se texto contém algum dos patterns."""
-    text_lower = text.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            return True, match.group()
+def _verificar(analise: AnaliseTexto, detector: str) -> tuple[bool, str]:
+    """(encontrou, trecho) do primeiro padrao do detector que casou."""
+    ocorrencia = analise.primeira(detector)
+    if ocorrencia:
+        return True, ocorrencia.trecho
     return False, ""
 
 
@@ -155,10 +162,12 @@ class IntentDetector:
                 evidence="mensagem vazia",
             )
 
+        analise = analisar(mensagem)
+
         # Ordem importa: mais específico primeiro
 
         # 1. Recusa (mais forte)
-        found, match = _check_keywords(mensagem, RECUSA_KEYWORDS)
+        found, match = _verificar(analise, "intent.recusa")
         if found:
             return IntentResult(
                 intent=DetectedIntent.RECUSA,
@@ -167,7 +176,7 @@ class IntentDetector:
             )
 
         # 2. Pronto para fechar
-        found, match = _check_keywords(mensagem, FECHAR_KEYWORDS)
+        found, match = _verificar(analise, "intent.fechar")
         if found:
             return IntentResult(
                 intent=DetectedIntent.PRONTO_FECHAR,
@@ -176,7 +185,7 @@ class IntentDetector:
             )
 
         # 3. Objeção
-        found, match = _check_keywords(mensagem, OBJECAO_KEYWORDS)
+        found, match = _verificar(analise, "intent.objecao")
         if found:
             return IntentResult(
                 intent=DetectedIntent.OBJECAO,
@@ -185,7 +194,7 @@ class IntentDetector:
             )
 
         # 4. Interesse em vaga
-        found, match = _check_keywords(mensagem, INTERESSE_KEYWORDS)
+        found, match = _verificar(analise, "intent.interesse")
         if found:
             return IntentResult(
                 intent=DetectedIntent.INTERESSE_VAGA,
@@ -194,7 +203,7 @@ class IntentDetector:
             )
 
         # 5. Dúvida sobre perfil
-        found, match = _check_keywords(mensagem, DUVIDA_KEYWORDS)
+        found, match = _verificar(analise, "intent.duvida")
         if found:
             return IntentResult(
                 intent=DetectedIntent.DUVIDA_PERFIL,
@@ -203,7 +212,7 @@ class IntentDetector:
             )
 
         # 6. Voltando após silêncio
-        found, match = _check_keywords(mensagem, VOLTANDO_KEYWORDS)
+        found, match = _verificar(analise, "intent.voltando")
         if found:
             return IntentResult(
                 intent=DetectedIntent.VOLTANDO,
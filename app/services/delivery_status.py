@@ -5,16 +5,27 @@ Sprint 41 - Rastreamento de Chips e Status de Entrega.
 
 Atualiza o delivery_status das interações quando recebemos
 webhooks de DELIVERY_ACK ou READ do WhatsApp.
+
+Na API, os webhooks passam pela IngestaoDeliveryStatus, que junta os
+callbacks por uma janela curta e aplica o lote com uma única RPC.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from dataclasses import dataclass
 
+from postgrest.types import ReturnMethod
+
 from app.services.supabase import supabase
+from app.services.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
+# Índice único de chip_interactions (migrations/delivery_status_lote_rpc.sql):
+# o mesmo callback (mensagem + status) conta uma vez, mesmo entre lotes
+_CONFLITO_METRICA_CHIP = "chip_id,tipo,provider_message_id"
+
 
 @dataclass
 class DeliveryStatusResult:
@@ -138,10 +149,45 @@ def _normalizar_status(status: str) -> Optional[str]:
     return None
 
 
+# Progressão usada para colapsar vários callbacks da mesma mensagem.
+# 'failed' fica abaixo de 'delivered': se o provider entregou, não falhou.
+_ORDEM_STATUS = {"pending": 0, "sent": 1, "failed": 2, "delivered": 3, "read": 4}
+
+
+def colapsar_status(
+    updates: list[tuple[str, str, Optional[str]]],
+) -> dict[str, tuple[str, Optional[str]]]:
+    """
+    Reduz uma sequência de callbacks ao status mais avançado por mensagem.
+
+    Args:
+        updates: Lista de tuplas (provider_message_id, status, chip_id)
+
+    Returns:
+        Dict provider_message_id -> (status normalizado, chip_id).
+        Entradas sem ID ou com status não reconhecido são descartadas.
+    """
+    colapsado: dict[str, tuple[str, Optional[str]]] = {}
+    for provider_message_id, status, chip_id in updates:
+        status_normalizado = _normalizar_status(status) if provider_message_id and status else None
+        if not status_normalizado:
+            continue
+
+        status_atual, chip_atual = colapsado.get(provider_message_id, (None, None))
+        if status_atual and _ORDEM_STATUS[status_atual] >= _ORDEM_STATUS[status_normalizado]:
+            status_normalizado = status_atual
+        colapsado[provider_message_id] = (status_normalizado, chip_id or chip_atual)
+    return colapsado
+
+
 async def atualizar_status_lote(updates: list[tuple[str, str, Optional[str]]]) -> dict:
     """
     Atualiza status de várias mensagens em lote.
 
+    Colapsa os callbacks por mensagem e aplica tudo com uma única chamada
+    da RPC interacao_atualizar_delivery_status_lote (mesma progressão da
+    RPC unitária).
+
     Args:
         updates: Lista de tuplas (provider_message_id, status, chip_id)
 
@@ -149,22 +195,213 @@ async def atualizar_status_lote(updates: list[tuple[str, str, Optional[str]]]) -
         Estatísticas: total, atualizados, erros
     """
     total = len(updates)
-    atualizados = 0
-    erros = 0
+    colapsado = colapsar_status(updates)
+    descartados = sum(
+        1
+        for provider_message_id, status, _ in updates
+        if not provider_message_id or not status or not _normalizar_status(status)
+    )
 
-    for provider_message_id, status, chip_id in updates:
-        result = await atualizar_delivery_status(
-            provider_message_id=provider_message_id,
-            status=status,
-            chip_id=chip_id,
+    if not colapsado:
+        return {"total": total, "atualizados": 0, "erros": descartados}
+
+    payload = [
+        {"provider_message_id": pmid, "status": status, "chip_id": chip_id}
+        for pmid, (status, chip_id) in colapsado.items()
+    ]
+
+    try:
+        result = supabase.rpc(
+            "interacao_atualizar_delivery_status_lote", {"p_updates": payload}
+        ).execute()
+    except Exception as e:
+        logger.error(f"[DeliveryStatus] Erro ao atualizar lote de {len(payload)}: {e}")
+        return {"total": total, "atualizados": 0, "erros": descartados + len(payload)}
+
+    atualizados = sum(1 for row in result.data or [] if row.get("atualizado"))
+    logger.debug(
+        f"[DeliveryStatus] Lote: {total} callback(s), {len(payload)} mensagem(ns), "
+        f"{atualizados} atualizada(s)"
+    )
+    return {"total": total, "atualizados": atualizados, "erros": descartados}
+
+
+# ----------------------------------------------------------------------
+# Ingestão em lote dos webhooks
+# ----------------------------------------------------------------------
+
+
+class IngestaoDeliveryStatus:
+    """
+    Buffer dos callbacks de status dos providers (Evolution, Z-API, Meta).
+
+    Os webhooks registram cada callback aqui; a cada intervalo_ms (ou ao
+    juntar max_mensagens mensagens distintas) o lote é colapsado no status
+    mais avançado por mensagem e aplicado com uma RPC em lote. As métricas
+    de entrega/leitura dos chips (chip_interactions) do mesmo lote saem num
+    único INSERT multi-row, com ON CONFLICT (chip_id, tipo,
+    provider_message_id) DO NOTHING: callback repetido pelo provider não
+    conta duas vezes, nem em lotes diferentes.
+
+    Só é usado quando iniciado (lifespan da API); inativo, registrar()
+    aplica o callback na hora, como antes.
+    """
+
+    def __init__(
+        self,
+        intervalo_ms: int = 250,
+        max_mensagens: int = 500,
+        max_pendentes: int = 20000,
+    ):
+        self.intervalo_ms = intervalo_ms
+        self.max_mensagens = max_mensagens
+        self.max_pendentes = max_pendentes
+        self._status: list[tuple[str, str, Optional[str]]] = []
+        self._mensagens: set[str] = set()
+        self._metricas_chip: list[dict] = []
+        self._metricas_vistas: set[tuple] = set()
+        self._acordar: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        """True enquanto o loop de flush está rodando."""
+        return self._task is not None and not self._task.done()
+
+    def iniciar(self) -> None:
+        """Inicia o loop de flush (chamar no startup, com event loop rodando)."""
+        if self.ativo:
+            return
+        self._acordar = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(
+            self._loop(), name="delivery_status_flush"
         )
-        if result.atualizado:
-            atualizados += 1
-        elif result.erro:
-            erros += 1
-
-    return {
-        "total": total,
-        "atualizados": atualizados,
-        "erros": erros,
-    }
+        logger.info(f"Ingestão de delivery status iniciada: flush a cada {self.intervalo_ms}ms")
+
+    async def parar(self) -> None:
+        """Para o loop e aplica o que estiver pendente (shutdown)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def registrar(
+        self,
+        provider_message_id: Optional[str],
+        status: str,
+        chip_id: Optional[str] = None,
+        metrica_chip: Optional[dict] = None,
+    ) -> None:
+        """
+        Registra um callback de status.
+
+        Args:
+            provider_message_id: ID da mensagem no provider (pode faltar)
+            status: Status recebido do webhook
+            chip_id: ID do chip
+            metrica_chip: Linha de chip_interactions (msg_entregue, msg_lida...)
+        """
+        # Chave do índice único: deduplica também no caminho direto
+        if metrica_chip and provider_message_id:
+            metrica_chip = {**metrica_chip, "provider_message_id": provider_message_id}
+
+        if not self.ativo:
+            await self._aplicar_direto(provider_message_id, status, chip_id, metrica_chip)
+            return
+
+        if metrica_chip:
+            # Repetido dentro do lote já sai aqui; entre lotes, o índice único
+            chave = (metrica_chip.get("chip_id"), metrica_chip.get("tipo"), provider_message_id)
+            if len(self._metricas_chip) >= self.max_pendentes:
+                logger.warning("[DeliveryStatus] Buffer de métricas cheio, gravando direto")
+                _gravar_metricas_chip([metrica_chip])
+            elif not provider_message_id or chave not in self._metricas_vistas:
+                self._metricas_vistas.add(chave)
+                self._metricas_chip.append(metrica_chip)
+
+        if provider_message_id:
+            if len(self._status) >= self.max_pendentes:
+                logger.warning("[DeliveryStatus] Buffer cheio, aplicando callback direto")
+                await atualizar_delivery_status(provider_message_id, status, chip_id)
+                return
+            self._status.append((provider_message_id, status, chip_id))
+            self._mensagens.add(provider_message_id)
+            if len(self._mensagens) >= self.max_mensagens and self._acordar:
+                self._acordar.set()
+
+    async def _aplicar_direto(
+        self,
+        provider_message_id: Optional[str],
+        status: str,
+        chip_id: Optional[str],
+        metrica_chip: Optional[dict],
+    ) -> None:
+        if metrica_chip:
+            _gravar_metricas_chip([metrica_chip])
+        if provider_message_id:
+            await atualizar_delivery_status(
+                provider_message_id=provider_message_id,
+                status=status,
+                chip_id=chip_id,
+            )
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._acordar.wait(), timeout=self.intervalo_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._acordar.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Erro no loop de delivery status: {e}")
+
+    async def flush(self) -> dict:
+        """
+        Aplica os callbacks pendentes.
+
+        Returns:
+            Estatísticas do lote (total, atualizados, erros, metricas_chip)
+        """
+        status, self._status, self._mensagens = self._status, [], set()
+        metricas, self._metricas_chip, self._metricas_vistas = self._metricas_chip, [], set()
+
+        if metricas:
+            try:
+                _gravar_metricas_chip(metricas)
+            except Exception as e:
+                logger.error(
+                    f"[DeliveryStatus] Erro ao gravar {len(metricas)} métrica(s) de chip: {e}"
+                )
+
+        if not status:
+            return {"total": 0, "atualizados": 0, "erros": 0, "metricas_chip": len(metricas)}
+
+        # Interações de saída ainda no write-behind precisam existir antes do UPDATE
+        if write_behind.ativo:
+            await write_behind.flush("interacoes")
+
+        resultado = await atualizar_status_lote(status)
+        resultado["metricas_chip"] = len(metricas)
+        return resultado
+
+
+def _gravar_metricas_chip(linhas: list[dict]) -> None:
+    """INSERT multi-row das métricas de chip, ignorando callbacks já contados."""
+    supabase.table("chip_interactions").upsert(
+        linhas,
+        on_conflict=_CONFLITO_METRICA_CHIP,
+        ignore_duplicates=True,
+        returning=ReturnMethod.minimal,
+        default_to_null=False,
+    ).execute()
+
+
+# Singleton
+ingestao_delivery_status = IngestaoDeliveryStatus()
@@ -9,6 +9,7 @@ import re
 import logging
 from datetime import datetime, timedelta, timezone
 
+from app.services.analise_texto import analisar, registrar_padroes
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -60,8 +61,8 @@ PADROES_DETECCAO = [
     r"n[aã]o [eé] humano",
 ]
 
-# Compilar regex para performance
-_padroes_compilados = [re.compile(p, re.IGNORECASE) for p in PADROES_DETECCAO]
+# Compilados no motor de analise compartilhado
+registrar_padroes("bot", PADROES_DETECCAO, flags=re.IGNORECASE)
 
 
 # =============================================================================
@@ -85,12 +86,9 @@ def detectar_mencao_bot(mensagem: str) -> dict:
     if not mensagem:
         return {"detectado": False, "padrao": None, "trecho": None}
 
-    mensagem_limpa = mensagem.lower().strip()
-
-    for padrao in _padroes_compilados:
-        match = padrao.search(mensagem_limpa)
-        if match:
-            return {"detectado": True, "padrao": padrao.pattern, "trecho": match.group(0)}
+    ocorrencia = analisar(mensagem).primeira("bot")
+    if ocorrencia:
+        return {"detectado": True, "padrao": ocorrencia.padrao, "trecho": ocorrencia.trecho}
 
     return {"detectado": False, "padrao": None, "trecho": None}
 
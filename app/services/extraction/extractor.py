@@ -12,7 +12,6 @@ import time
 import logging
 from typing import Optional
 
-import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
@@ -126,6 +125,8 @@ async def _save_to_cache(key: str, result: ExtractionResult) -> None:
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
 async def _chamar_llm(prompt: str) -> tuple[str, int, int]:
     """Chama o LLM para extracao com retry."""
+    import anthropic
+
     client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
     response = await client.messages.create(
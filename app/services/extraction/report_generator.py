@@ -12,7 +12,6 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 
-import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
@@ -600,6 +599,8 @@ async def _gerar_relatorio_llm(
     )
 
     try:
+        import anthropic
+
         client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
         response = await client.messages.create(
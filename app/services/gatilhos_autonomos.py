@@ -12,6 +12,7 @@ IMPORTANTE: Esses gatilhos SÓ executam se PILOT_MODE=False.
 
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
 
 from app.services.supabase import supabase
 from app.workers.pilot_mode import (
@@ -20,6 +21,9 @@ from app.workers.pilot_mode import (
     require_pilot_disabled,
 )
 
+if TYPE_CHECKING:
+    from app.services.priorizacao_medicos import MatrizPriorizacao
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +46,7 @@ FEEDBACK_DIAS_RECENTES = 2
 # Limites por execução (para não sobrecarregar)
 LIMITE_DISCOVERY_POR_CICLO = 50
 LIMITE_OFERTA_POR_CICLO = 30
+LIMITE_CANDIDATOS_OFERTA = 5000  # Candidatos pontuados por ciclo de oferta
 LIMITE_REATIVACAO_POR_CICLO = 20
 LIMITE_FEEDBACK_POR_CICLO = 20
 
@@ -199,7 +204,50 @@ async def buscar_vagas_urgentes(
         return []
 
 
-async def buscar_medicos_compativeis_para_vaga(vaga: dict, limite: int = 5) -> list[dict]:
+async def buscar_candidatos_oferta(
+    limite: int = LIMITE_CANDIDATOS_OFERTA, pagina: int = 1000
+) -> list[dict]:
+    """
+    Busca o conjunto de médicos elegíveis para ofertas de um ciclo.
+
+    Mesmos critérios de buscar_medicos_compativeis_para_vaga, sem o filtro
+    de especialidade (aplicado por vaga sobre a matriz de priorização).
+
+    Args:
+        limite: Máximo de médicos
+        pagina: Tamanho da página de leitura (limite do PostgREST)
+
+    Returns:
+        Lista de médicos elegíveis
+    """
+    medicos: list[dict] = []
+    inicio = 0
+
+    while len(medicos) < limite:
+        fim = min(inicio + pagina, limite) - 1
+        response = (
+            supabase.table("clientes")
+            .select("id, telefone, primeiro_nome, especialidade, qualification_score")
+            .eq("status_telefone", "validado")
+            .eq("opt_out", False)
+            .is_("opted_out", "null")
+            .is_("deleted_at", "null")
+            .order("id")
+            .range(inicio, fim)
+            .execute()
+        )
+        lote = response.data or []
+        medicos.extend(lote)
+        if len(lote) < fim - inicio + 1:
+            break
+        inicio = fim + 1
+
+    return medicos
+
+
+async def buscar_medicos_compativeis_para_vaga(
+    vaga: dict, limite: int = 5, matriz: Optional["MatrizPriorizacao"] = None
+) -> list[dict]:
     """
     Busca médicos compatíveis com uma vaga específica.
 
@@ -212,6 +260,8 @@ async def buscar_medicos_compativeis_para_vaga(vaga: dict, limite: int = 5) -> l
     Args:
         vaga: Dados da vaga
         limite: Máximo de médicos a retornar
+        matriz: Opcional - candidatos do ciclo já pontuáveis; evita nova
+            busca e nova consulta de histórico
 
     Returns:
         Lista de médicos compatíveis
@@ -223,6 +273,9 @@ async def buscar_medicos_compativeis_para_vaga(vaga: dict, limite: int = 5) -> l
         if not especialidade_id:
             return []
 
+        if matriz is not None:
+            return matriz.priorizar(vaga, limite, mascara=matriz.compativeis(vaga))
+
         # Buscar especialidade nome para match
         response = (
             supabase.table("clientes")
@@ -287,10 +340,22 @@ async def executar_oferta_automatica() -> dict:
     logger.info(f"Oferta automática: {len(vagas)} vagas urgentes encontradas")
 
     from app.services.fila import fila_service
+    from app.services.priorizacao_medicos import montar_matriz_priorizacao
+
+    # Candidatos e features uma vez por ciclo, reutilizados em todas as vagas
+    try:
+        candidatos = await buscar_candidatos_oferta()
+        matriz = await montar_matriz_priorizacao(candidatos)
+    except Exception as e:
+        logger.error(f"Erro ao montar candidatos da oferta automática: {e}")
+        stats["erros"] += 1
+        return stats
+
+    logger.info(f"Oferta automática: {len(matriz)} candidatos pontuados por vaga")
 
     for vaga in vagas:
         try:
-            medicos = await buscar_medicos_compativeis_para_vaga(vaga)
+            medicos = await buscar_medicos_compativeis_para_vaga(vaga, matriz=matriz)
 
             if not medicos:
                 logger.debug(f"Nenhum médico compatível para vaga {vaga['id']}")
@@ -42,8 +42,6 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
-import anthropic
-
 from app.core.config import settings
 from app.services.supabase import supabase
 
@@ -168,6 +166,8 @@ class GestorComanda:
         """
         self.user_id = user_id
         self.channel_id = channel_id
+        import anthropic
+
         self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.comando_atual: Optional[dict] = None
 
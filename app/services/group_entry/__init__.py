@@ -8,12 +8,14 @@ Integra com Trust Score, respeita fases de warmup e distribui carga entre múlti
 
 Componentes:
 - importer: Importa links de CSV/Excel
+- importacao_lote: Pipeline de importação em lotes (streaming, retomável)
 - validator: Valida links antes de tentar entrar
 - scheduler: Agenda entradas respeitando limites por fase
 - worker: Processa fila de entrada
 - chip_selector: Seleciona chip ideal para cada entrada
 - discovery: Descobre novas fontes de grupos (Sprint 26)
 - crawler: Crawling de fontes conhecidas (Sprint 26)
+- fronteira: Fila de crawl e validadores HTTP no Redis (Sprint 26)
 """
 
 from app.services.group_entry.importer import (
@@ -22,9 +24,16 @@ from app.services.group_entry.importer import (
     importar_diretorio,
     extrair_invite_code,
 )
+from app.services.group_entry.importacao_lote import (
+    ImportadorLinks,
+    ProgressoImportacao,
+    importar_arquivo,
+)
+from app.services.group_entry.limitador import LimitadorPorHost
 from app.services.group_entry.validator import (
     validar_link,
     validar_links_pendentes,
+    validar_links_em_lote,
 )
 from app.services.group_entry.scheduler import (
     agendar_entrada,
@@ -47,6 +56,15 @@ from app.services.group_entry.crawler import (
     crawler_manager,
     CrawlerManager,
 )
+from app.services.group_entry.extrator_links import extrair_links_whatsapp
+from app.services.group_entry.fronteira import (
+    fronteira_crawl,
+    FronteiraCrawl,
+)
+from app.services.group_entry.pool_navegadores import (
+    pool_navegadores,
+    PoolNavegadores,
+)
 
 __all__ = [
     # Importer
@@ -54,9 +72,15 @@ __all__ = [
     "importar_excel",
     "importar_diretorio",
     "extrair_invite_code",
+    # Importação em lote
+    "ImportadorLinks",
+    "ProgressoImportacao",
+    "importar_arquivo",
+    "LimitadorPorHost",
     # Validator
     "validar_link",
     "validar_links_pendentes",
+    "validar_links_em_lote",
     # Scheduler
     "agendar_entrada",
     "agendar_lote",
@@ -73,4 +97,9 @@ __all__ = [
     # Crawler (Sprint 26)
     "crawler_manager",
     "CrawlerManager",
+    "extrair_links_whatsapp",
+    "fronteira_crawl",
+    "FronteiraCrawl",
+    "pool_navegadores",
+    "PoolNavegadores",
 ]
@@ -8,31 +8,51 @@ Características:
 - Parsers específicos para sites conhecidos
 - Rate limiting por domínio
 - Retry com backoff
+- Fontes em paralelo, no máximo uma requisição por domínio por vez
+- Requisições condicionais (ETag/Last-Modified): página sem mudança não é reprocessada
+- Navegador headless compartilhado entre as fontes JavaScript da rodada
+- Fronteira persistida no Redis (rodada interrompida continua na seguinte)
 """
 
+import asyncio
+import hashlib
 import logging
-import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta, UTC
 
-from bs4 import BeautifulSoup
-
 from app.services.http_client import get_http_client
 from app.services.supabase import supabase
-from app.services.group_entry.importer import extrair_invite_code
+from app.services.group_entry.extrator_links import extrair_links_whatsapp
+from app.services.group_entry.fronteira import FronteiraCrawl, fronteira_crawl
+from app.services.group_entry.limitador import LimitadorPorHost, host_de
+from app.services.group_entry.pool_navegadores import PoolNavegadores, pool_navegadores
 
 logger = logging.getLogger(__name__)
 
+MAX_CRAWLS_SIMULTANEOS = 4
+INTERVALO_POR_DOMINIO_SEGUNDOS = 2.0
+
 
 class CrawlerManager:
     """Gerenciador de crawling de fontes."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        limitador: Optional[LimitadorPorHost] = None,
+        pool: Optional[PoolNavegadores] = None,
+        fronteira: Optional[FronteiraCrawl] = None,
+    ):
         self.user_agent = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
             "Chrome/120.0.0.0 Safari/537.36"
         )
+        # Politeness: uma requisição por domínio por vez, espaçadas
+        self.limitador = limitador or LimitadorPorHost(
+            max_concorrentes=1, intervalo_minimo=INTERVALO_POR_DOMINIO_SEGUNDOS
+        )
+        self.pool = pool or pool_navegadores
+        self.fronteira = fronteira or fronteira_crawl
 
     async def crawl_fonte(self, source_id: str) -> Dict:
         """
@@ -43,6 +63,7 @@ class CrawlerManager:
                 "status": "sucesso" | "parcial" | "erro",
                 "links_encontrados": N,
                 "links_novos": N,
+                "nao_modificado": bool (página igual ao último crawl),
                 "erro": str (se houver)
             }
         """
@@ -59,15 +80,26 @@ class CrawlerManager:
 
         try:
             # Executar crawl baseado no método
+            validadores = None
             if fonte["metodo_crawl"] == "requests":
-                links = await self._crawl_requests(fonte)
+                anteriores = await self.fronteira.obter_validadores(source_id)
+                links, validadores = await self._crawl_requests(fonte, anteriores)
             elif fonte["metodo_crawl"] == "playwright":
                 links = await self._crawl_playwright(fonte)
             else:
                 links = []
 
-            # Processar links
-            resultado = await self._processar_links(links, fonte)
+            # Processar links (None = página não mudou desde o último crawl)
+            if links is None:
+                resultado = {
+                    "links_encontrados": 0,
+                    "links_novos": 0,
+                    "links_duplicados": 0,
+                    "links_invalidos": 0,
+                    "nao_modificado": True,
+                }
+            else:
+                resultado = await self._processar_links(links, fonte)
 
             # Calcular duração
             duracao = int((datetime.now(UTC) - inicio).total_seconds())
@@ -97,6 +129,10 @@ class CrawlerManager:
                 }
             ).execute()
 
+            # Só depois de salvar os links: se algo falhar antes, o próximo crawl reprocessa
+            if validadores:
+                await self.fronteira.salvar_validadores(source_id, validadores)
+
             logger.info(
                 f"[Crawler] {fonte['dominio']}: "
                 f"{resultado['links_novos']} novos de {resultado['links_encontrados']}"
@@ -133,63 +169,57 @@ class CrawlerManager:
 
             return {"status": "erro", "erro": str(e)}
 
-    async def _crawl_requests(self, fonte: Dict) -> List[Dict]:
-        """Crawl usando requests (sites HTML simples)."""
-        links = []
+    async def _crawl_requests(
+        self, fonte: Dict, validadores: Optional[Dict] = None
+    ) -> Tuple[Optional[List[Dict]], Dict]:
+        """
+        Crawl usando requests (sites HTML simples).
+
+        Envia If-None-Match/If-Modified-Since com os validadores do último crawl.
+
+        Returns:
+            (links, validadores da resposta); links é None se a página não mudou
+        """
+        validadores = validadores or {}
+        headers = {"User-Agent": self.user_agent}
+        if validadores.get("etag"):
+            headers["If-None-Match"] = validadores["etag"]
+        if validadores.get("last_modified"):
+            headers["If-Modified-Since"] = validadores["last_modified"]
 
         client = await get_http_client()
-        resp = await client.get(
-            fonte["url"],
-            headers={"User-Agent": self.user_agent},
-            timeout=30,
-        )
+        async with self.limitador.slot(host_de(fonte["url"])):
+            resp = await client.get(fonte["url"], headers=headers, timeout=30)
+
+        if resp.status_code == 304:
+            return None, validadores
+
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Buscar links de WhatsApp
-        for a in soup.find_all("a", href=re.compile(r"chat\.whatsapp\.com")):
-            href = a.get("href", "")
-            invite_code = extrair_invite_code(href)
-
-            if invite_code:
-                # Tentar extrair nome do contexto
-                nome = a.get_text(strip=True)
-                if not nome or len(nome) < 3:
-                    parent = a.find_parent(["div", "li", "article"])
-                    if parent:
-                        title = parent.find(["h2", "h3", "h4", "strong"])
-                        if title:
-                            nome = title.get_text(strip=True)
-
-                links.append(
-                    {
-                        "invite_code": invite_code,
-                        "invite_url": href,
-                        "nome": nome[:100] if nome else None,
-                    }
-                )
-
-        return links
+        novos = {
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            # Servidores sem ETag/Last-Modified: compara o conteúdo
+            "conteudo_hash": hashlib.sha1(resp.content).hexdigest(),
+        }
+        if novos["conteudo_hash"] == validadores.get("conteudo_hash"):
+            return None, novos
+
+        return extrair_links_whatsapp(resp.text), novos
 
     async def _crawl_playwright(self, fonte: Dict) -> List[Dict]:
         """Crawl usando Playwright (sites JavaScript)."""
         try:
-            from playwright.async_api import async_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             logger.warning(
                 f"[Crawler] Playwright não instalado, usando requests para {fonte['dominio']}"
             )
-            return await self._crawl_requests(fonte)
-
-        links = []
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent=self.user_agent)
-            page = await context.new_page()
+            links, _ = await self._crawl_requests(fonte)
+            return links
 
-            try:
+        async with self.limitador.slot(host_de(fonte["url"])):
+            async with self.pool.pagina(self.user_agent) as page:
                 await page.goto(fonte["url"], timeout=60000)
                 await page.wait_for_timeout(5000)
 
@@ -198,73 +228,44 @@ class CrawlerManager:
                     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                     await page.wait_for_timeout(1000)
 
-                # Extrair links
-                whatsapp_links = await page.query_selector_all('a[href*="chat.whatsapp.com"]')
+                conteudo = await page.content()
 
-                for link in whatsapp_links:
-                    href = await link.get_attribute("href")
-                    nome = await link.inner_text()
+        return extrair_links_whatsapp(conteudo)
 
-                    invite_code = extrair_invite_code(href or "")
-                    if invite_code:
-                        links.append(
-                            {
-                                "invite_code": invite_code,
-                                "invite_url": href,
-                                "nome": nome[:100] if nome else None,
-                            }
-                        )
-
-            finally:
-                await browser.close()
+    async def _processar_links(self, links: List[Dict], fonte: Dict) -> Dict:
+        """Processa links extraídos e salva novos (uma query IN + um upsert por lote)."""
+        from app.services.group_entry.importacao_lote import ImportadorLinks
 
-        return links
+        linhas = (
+            (i, {"invite_code": link["invite_code"], "url": link.get("invite_url"), **link})
+            for i, link in enumerate(links, 1)
+        )
+        progresso = await ImportadorLinks().importar(linhas, fonte=fonte["dominio"])
 
-    async def _processar_links(self, links: List[Dict], fonte: Dict) -> Dict:
-        """Processa links extraídos e salva novos."""
-        resultado = {
+        return {
             "links_encontrados": len(links),
-            "links_novos": 0,
-            "links_duplicados": 0,
-            "links_invalidos": 0,
+            "links_novos": progresso.importados,
+            "links_duplicados": progresso.duplicados,
+            "links_invalidos": progresso.invalidos,
         }
 
-        for link in links:
-            invite_code = link["invite_code"]
-
-            # Verificar se já existe
-            exists = (
-                supabase.table("group_links").select("id").eq("invite_code", invite_code).execute()
-            )
-
-            if exists.data:
-                resultado["links_duplicados"] += 1
-                continue
-
-            # Inserir novo
-            try:
-                supabase.table("group_links").insert(
-                    {
-                        "invite_code": invite_code,
-                        "invite_url": link.get("invite_url"),
-                        "nome": link.get("nome"),
-                        "fonte": fonte["dominio"],
-                        "status": "pendente",
-                    }
-                ).execute()
-                resultado["links_novos"] += 1
-            except Exception:
-                resultado["links_duplicados"] += 1
-
-        return resultado
-
-    async def executar_crawls_pendentes(self, limite: int = 5) -> Dict:
+    async def executar_crawls_pendentes(
+        self, limite: int = 5, concorrencia: int = MAX_CRAWLS_SIMULTANEOS
+    ) -> Dict:
         """
         Executa crawls de fontes que estão prontas.
 
+        Fontes de domínios diferentes rodam em paralelo; a fila fica no Redis,
+        então fontes de uma rodada interrompida entram primeiro na próxima.
+
+        Args:
+            limite: Máximo de fontes na rodada
+            concorrencia: Fontes crawleadas ao mesmo tempo
+
         Returns:
             {
                 "fontes_processadas": N,
+                "fontes_nao_modificadas": N,
                 "total_links_novos": N
             }
         """
@@ -279,15 +280,43 @@ class CrawlerManager:
         )
 
         fontes = result.data or []
+        await self.fronteira.enfileirar([fonte["id"] for fonte in fontes])
+        source_ids = await self.fronteira.pendentes(limite) or [fonte["id"] for fonte in fontes]
+
+        semaforo = asyncio.Semaphore(concorrencia)
+
+        async def _executar(source_id: str) -> Optional[Dict]:
+            async with semaforo:
+                # Outro worker já está nessa fonte
+                if not await self.fronteira.reservar(source_id):
+                    return None
+                try:
+                    return await self.crawl_fonte(source_id)
+                finally:
+                    await self.fronteira.concluir(source_id)
+
+        try:
+            resultados = await asyncio.gather(
+                *(_executar(source_id) for source_id in source_ids),
+                return_exceptions=True,
+            )
+        finally:
+            await self.pool.fechar()
 
         total = {
             "fontes_processadas": 0,
+            "fontes_nao_modificadas": 0,
             "total_links_novos": 0,
         }
 
-        for fonte in fontes:
-            resultado = await self.crawl_fonte(fonte["id"])
+        for source_id, resultado in zip(source_ids, resultados):
+            if isinstance(resultado, Exception):
+                logger.error(f"[Crawler] Erro na fonte {source_id}: {resultado}")
+                continue
+            if resultado is None:
+                continue
             total["fontes_processadas"] += 1
+            total["fontes_nao_modificadas"] += int(bool(resultado.get("nao_modificado")))
             total["total_links_novos"] += resultado.get("links_novos", 0)
 
         return total
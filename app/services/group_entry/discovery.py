@@ -15,8 +15,6 @@ from typing import List, Optional, Dict
 from datetime import datetime, timedelta, UTC
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
-
 from app.services.http_client import get_http_client
 from app.services.supabase import supabase
 
@@ -92,6 +90,8 @@ class SourceDiscovery:
                 timeout=30,
             )
 
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(resp.text, "html.parser")
 
             # Extrai links dos resultados
@@ -131,6 +131,8 @@ class SourceDiscovery:
                 timeout=30,
             )
 
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(resp.text, "html.parser")
 
             for link in soup.find_all("a", href=True):
@@ -0,0 +1,87 @@
+"""
+Extrator rapido de links de grupos em HTML.
+
+Sprint 26 - E12
+
+Varre o HTML cru com regex em vez de montar a arvore (BeautifulSoup):
+so as ancoras com chat.whatsapp.com interessam, e o nome do grupo vem do
+texto da ancora ou do titulo mais proximo antes dela.
+"""
+
+import html
+import re
+from typing import Dict, List, Optional
+
+from app.services.group_entry.importer import extrair_invite_code
+
+MARCADOR = "chat.whatsapp.com/"
+
+# Janela (em caracteres) antes da ancora onde procurar um titulo para o nome
+JANELA_TITULO = 600
+
+_RE_ANCORA = re.compile(
+    r"<a\b[^>]*?\bhref\s*=\s*[\"']?([^\"'\s>]*chat\.whatsapp\.com/[^\"'\s>]*)[^>]*>(.*?)</a\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_RE_URL_SOLTA = re.compile(r"https?://chat\.whatsapp\.com/[A-Za-z0-9_-]+", re.IGNORECASE)
+_RE_TITULO = re.compile(r"<(h[2-4]|strong)\b[^>]*>(.*?)</\1\s*>", re.IGNORECASE | re.DOTALL)
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_ESPACOS = re.compile(r"\s+")
+
+
+def _texto_limpo(fragmento: str) -> str:
+    texto = _RE_TAG.sub(" ", fragmento)
+    return _RE_ESPACOS.sub(" ", html.unescape(texto)).strip()
+
+
+def _titulo_anterior(conteudo: str, inicio: int) -> Optional[str]:
+    """Ultimo h2-h4/strong antes da posicao (equivale ao titulo do bloco pai)."""
+    titulo = None
+    for match in _RE_TITULO.finditer(conteudo, max(0, inicio - JANELA_TITULO), inicio):
+        titulo = _texto_limpo(match.group(2)) or titulo
+    return titulo
+
+
+def extrair_links_whatsapp(conteudo: str) -> List[Dict]:
+    """
+    Extrai links de grupos de uma pagina HTML.
+
+    Args:
+        conteudo: HTML da pagina
+
+    Returns:
+        Lista de {"invite_code", "invite_url", "nome"} sem repetir invite_code
+    """
+    if MARCADOR not in conteudo:
+        return []
+
+    links: List[Dict] = []
+    vistos = set()
+
+    for match in _RE_ANCORA.finditer(conteudo):
+        href = html.unescape(match.group(1))
+        invite_code = extrair_invite_code(href)
+        if not invite_code or invite_code in vistos:
+            continue
+        vistos.add(invite_code)
+
+        nome = _texto_limpo(match.group(2))
+        if len(nome) < 3:
+            nome = _titulo_anterior(conteudo, match.start()) or nome
+
+        links.append(
+            {
+                "invite_code": invite_code,
+                "invite_url": href,
+                "nome": nome[:100] if nome else None,
+            }
+        )
+
+    # Links colados como texto (fora de <a>)
+    for match in _RE_URL_SOLTA.finditer(conteudo):
+        invite_code = extrair_invite_code(match.group(0))
+        if invite_code and invite_code not in vistos:
+            vistos.add(invite_code)
+            links.append({"invite_code": invite_code, "invite_url": match.group(0), "nome": None})
+
+    return links
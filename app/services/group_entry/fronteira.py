@@ -0,0 +1,79 @@
+"""
+Fronteira de crawl persistida no Redis.
+
+Sprint 26 - E12
+
+- Fila (sorted set) de fontes a crawlear: fontes de uma rodada interrompida
+  continuam na fila e sao as primeiras da rodada seguinte
+- Reserva por fonte (SET NX com TTL) para dois workers nao crawlearem a
+  mesma fonte ao mesmo tempo
+- Validadores HTTP da ultima resposta (ETag, Last-Modified, hash do
+  conteudo) para requisicoes condicionais
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.services.redis import cache_get_json, cache_set_json, redis_client
+
+logger = logging.getLogger(__name__)
+
+CHAVE_FILA = "crawler:fronteira"
+PREFIXO_RESERVA = "crawler:fronteira:reserva:"
+PREFIXO_VALIDADORES = "crawler:validadores:"
+TTL_RESERVA = 15 * 60  # 15 min (maior que o crawl mais lento)
+TTL_VALIDADORES = 30 * 24 * 3600  # 30 dias
+
+
+class FronteiraCrawl:
+    """Estado de crawl compartilhado entre workers."""
+
+    async def enfileirar(self, source_ids: List[str]) -> None:
+        """Adiciona fontes a fila, mantendo a posicao das que ja estavam."""
+        if not source_ids:
+            return
+        agora = time.time()
+        try:
+            await redis_client.zadd(CHAVE_FILA, {sid: agora for sid in source_ids}, nx=True)
+        except Exception as e:
+            logger.error(f"[CrawlFrontier] Erro ao enfileirar fontes: {e}")
+
+    async def pendentes(self, limite: int) -> List[str]:
+        """Fontes mais antigas da fila ([] se o Redis falhar)."""
+        try:
+            return list(await redis_client.zrange(CHAVE_FILA, 0, limite - 1))
+        except Exception as e:
+            logger.error(f"[CrawlFrontier] Erro ao ler fila: {e}")
+            return []
+
+    async def reservar(self, source_id: str) -> bool:
+        """Reserva a fonte para este worker (True tambem se o Redis falhar)."""
+        try:
+            reservado = await redis_client.set(
+                f"{PREFIXO_RESERVA}{source_id}", "1", nx=True, ex=TTL_RESERVA
+            )
+            return reservado is not None
+        except Exception as e:
+            logger.error(f"[CrawlFrontier] Erro ao reservar {source_id}: {e}")
+            return True
+
+    async def concluir(self, source_id: str) -> None:
+        """Tira a fonte da fila e libera a reserva."""
+        try:
+            await redis_client.zrem(CHAVE_FILA, source_id)
+            await redis_client.delete(f"{PREFIXO_RESERVA}{source_id}")
+        except Exception as e:
+            logger.error(f"[CrawlFrontier] Erro ao concluir {source_id}: {e}")
+
+    async def obter_validadores(self, source_id: str) -> Optional[Dict]:
+        """ETag, Last-Modified e hash do conteudo do ultimo crawl."""
+        return await cache_get_json(f"{PREFIXO_VALIDADORES}{source_id}")
+
+    async def salvar_validadores(self, source_id: str, validadores: Dict) -> None:
+        """Guarda os validadores da resposta (so apos processar os links)."""
+        await cache_set_json(f"{PREFIXO_VALIDADORES}{source_id}", validadores, TTL_VALIDADORES)
+
+
+# Singleton
+fronteira_crawl = FronteiraCrawl()
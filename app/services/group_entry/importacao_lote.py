@@ -0,0 +1,353 @@
+"""
+Importacao em lote de links de grupos (streaming).
+
+Sprint 26 - E12
+
+Le o arquivo linha a linha e processa em lotes de TAMANHO_LOTE:
+- Um unico SELECT ... IN (...) por lote para descartar invite_codes existentes
+- Um unico upsert multi-linha por lote (ON CONFLICT DO NOTHING)
+- Validacao opcional dos novos links em paralelo, limitada por chip
+- Checkpoint no Redis por arquivo para retomar importacoes interrompidas
+"""
+
+import csv
+import hashlib
+import inspect
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.services.group_entry.importer import extrair_invite_code, validar_formato_invite_code
+from app.services.redis import cache_delete, cache_get_json, cache_set_json
+from app.services.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 500
+CHECKPOINT_PREFIX = "group_import:checkpoint:"
+CHECKPOINT_TTL = 7 * 24 * 3600  # 7 dias
+MAX_ERROS_REGISTRADOS = 200
+
+
+@dataclass
+class ProgressoImportacao:
+    """Contadores de uma importacao em andamento."""
+
+    fonte: str
+    linhas_lidas: int = 0
+    importados: int = 0
+    duplicados: int = 0
+    invalidos: int = 0
+    validados: int = 0
+    invalidos_validacao: int = 0
+    ultima_linha: int = 0
+    erros: List[str] = field(default_factory=list)
+
+    def registrar_erro(self, erro: str) -> None:
+        """Guarda o erro, limitado para nao crescer com arquivos enormes."""
+        if len(self.erros) < MAX_ERROS_REGISTRADOS:
+            self.erros.append(erro)
+
+    def como_resultado(self) -> dict:
+        """Formato de retorno de importar_csv/importar_excel."""
+        return {
+            "total_linhas": self.linhas_lidas,
+            "importados": self.importados,
+            "duplicados": self.duplicados,
+            "invalidos": self.invalidos,
+            "erros": self.erros,
+        }
+
+
+def ler_linhas_csv(arquivo: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Gera (numero_linha, row) sem carregar o arquivo inteiro."""
+    with open(arquivo, encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f), 1):
+            yield i, row
+
+
+def ler_linhas_excel(
+    arquivo: Path, sheet_name: Optional[str] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Gera (numero_linha, row) de uma planilha em modo read_only."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("openpyxl é necessário para importar Excel. Instale com: uv add openpyxl")
+
+    wb = load_workbook(arquivo, read_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.active
+        linhas = ws.iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        headers = [str(h).lower().strip() if h else "" for h in cabecalho]
+        for i, row in enumerate(linhas, 1):
+            yield i, dict(zip(headers, row))
+    finally:
+        wb.close()
+
+
+def _texto(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    texto = str(valor).strip()
+    return texto or None
+
+
+def montar_link(
+    row: Dict[str, Any],
+    fonte: str,
+    categoria: Optional[str] = None,
+    estado: Optional[str] = None,
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Converte uma linha do arquivo no registro de group_links.
+
+    Args:
+        row: Linha (colunas name/url/invite_code/state/category ou em portugues)
+        fonte: Nome do arquivo de origem
+        categoria: Categoria padrao
+        estado: Estado padrao
+
+    Returns:
+        (link, None) se valido, (None, motivo) se invalido
+    """
+    invite_code = extrair_invite_code(
+        _texto(row.get("invite_code")) or _texto(row.get("url")) or _texto(row.get("link")) or ""
+    )
+    if not invite_code:
+        return None, "invite_code inválido"
+
+    if not validar_formato_invite_code(invite_code):
+        return None, "formato inválido"
+
+    return {
+        "invite_code": invite_code,
+        "invite_url": _texto(row.get("url")) or _texto(row.get("link")),
+        "nome": _texto(row.get("name")) or _texto(row.get("nome")),
+        "categoria": _texto(row.get("category")) or _texto(row.get("categoria")) or categoria,
+        "estado": _texto(row.get("state")) or _texto(row.get("estado")) or estado,
+        "regiao": _texto(row.get("regiao")) or _texto(row.get("region")),
+        "fonte": fonte,
+        "status": "pendente",
+    }, None
+
+
+def buscar_codigos_existentes(codigos: List[str]) -> Set[str]:
+    """invite_codes do lote que ja estao em group_links (uma query IN)."""
+    if not codigos:
+        return set()
+    result = (
+        supabase.table("group_links").select("invite_code").in_("invite_code", codigos).execute()
+    )
+    return {row["invite_code"] for row in result.data or []}
+
+
+def inserir_links(links: List[dict]) -> List[dict]:
+    """
+    Insere o lote num unico upsert (ON CONFLICT DO NOTHING).
+
+    Returns:
+        Linhas efetivamente inseridas (com id)
+    """
+    if not links:
+        return []
+    result = (
+        supabase.table("group_links")
+        .upsert(links, on_conflict="invite_code", ignore_duplicates=True)
+        .execute()
+    )
+    return result.data or []
+
+
+def hash_arquivo(arquivo: Path) -> str:
+    """SHA-1 do conteudo (chave do checkpoint)."""
+    digest = hashlib.sha1()
+    with open(arquivo, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+class ImportadorLinks:
+    """
+    Pipeline de importacao em lotes.
+
+    Exemplo:
+        importador = ImportadorLinks(validar=True)
+        progresso = await importador.importar(ler_linhas_csv(arquivo), fonte=arquivo.name)
+    """
+
+    def __init__(
+        self,
+        tamanho_lote: int = TAMANHO_LOTE,
+        validar: bool = False,
+        ao_progresso: Optional[Callable[[ProgressoImportacao], Any]] = None,
+    ):
+        """
+        Args:
+            tamanho_lote: Linhas por lote (uma query IN + um upsert por lote)
+            validar: Valida os links novos via Evolution apos cada lote
+            ao_progresso: Callback (sync ou async) chamado ao fim de cada lote
+        """
+        self.tamanho_lote = tamanho_lote
+        self.validar = validar
+        self.ao_progresso = ao_progresso
+
+    async def importar(
+        self,
+        linhas: Iterable[Tuple[int, Dict[str, Any]]],
+        fonte: str,
+        categoria: Optional[str] = None,
+        estado: Optional[str] = None,
+        chave_checkpoint: Optional[str] = None,
+    ) -> ProgressoImportacao:
+        """
+        Importa as linhas em lotes.
+
+        Args:
+            linhas: Iteravel de (numero_linha, row)
+            fonte: Nome da origem (gravado em group_links.fonte)
+            categoria: Categoria padrao
+            estado: Estado padrao
+            chave_checkpoint: Se informada, retoma/salva progresso no Redis
+
+        Returns:
+            Progresso final
+        """
+        progresso = ProgressoImportacao(fonte=fonte)
+        if chave_checkpoint:
+            salvo = await cache_get_json(chave_checkpoint)
+            if salvo:
+                progresso = ProgressoImportacao(**salvo)
+                logger.info(
+                    f"[GroupImporter] {fonte}: retomando após linha {progresso.ultima_linha}"
+                )
+
+        vistos: Set[str] = set()
+        lote: List[dict] = []
+        ultima_linha = progresso.ultima_linha
+
+        for numero, row in linhas:
+            if numero <= progresso.ultima_linha:
+                continue
+
+            ultima_linha = numero
+            progresso.linhas_lidas += 1
+            link, erro = montar_link(row, fonte, categoria, estado)
+
+            if erro:
+                progresso.invalidos += 1
+                progresso.registrar_erro(f"Linha {numero}: {erro}")
+            elif link["invite_code"] in vistos:
+                progresso.duplicados += 1
+            else:
+                vistos.add(link["invite_code"])
+                lote.append(link)
+
+            if len(lote) >= self.tamanho_lote:
+                if not await self._processar_lote(lote, progresso, ultima_linha, chave_checkpoint):
+                    return progresso
+                lote = []
+
+        if not await self._processar_lote(lote, progresso, ultima_linha, chave_checkpoint):
+            return progresso
+
+        if chave_checkpoint:
+            await cache_delete(chave_checkpoint)
+
+        logger.info(
+            f"[GroupImporter] {fonte}: "
+            f"{progresso.importados} importados, "
+            f"{progresso.duplicados} duplicados, "
+            f"{progresso.invalidos} inválidos"
+        )
+        return progresso
+
+    async def _processar_lote(
+        self,
+        lote: List[dict],
+        progresso: ProgressoImportacao,
+        ultima_linha: int,
+        chave_checkpoint: Optional[str],
+    ) -> bool:
+        """Filtra existentes, insere e valida um lote. False se o banco falhou."""
+        try:
+            existentes = buscar_codigos_existentes([link["invite_code"] for link in lote])
+            novos = [link for link in lote if link["invite_code"] not in existentes]
+            inseridos = inserir_links(novos)
+        except Exception as e:
+            # Checkpoint fica na linha anterior ao lote: a proxima execucao retoma daqui
+            logger.error(f"[GroupImporter] {progresso.fonte}: erro ao inserir lote: {e}")
+            progresso.registrar_erro(f"Erro no banco: {str(e)}")
+            return False
+
+        progresso.importados += len(inseridos)
+        # Existentes + conflitos de corrida resolvidos pelo ON CONFLICT DO NOTHING
+        progresso.duplicados += len(lote) - len(inseridos)
+        progresso.ultima_linha = ultima_linha
+
+        if self.validar and inseridos:
+            from app.services.group_entry.validator import validar_links_em_lote
+
+            validacao = await validar_links_em_lote(inseridos)
+            progresso.validados += validacao["validados"]
+            progresso.invalidos_validacao += validacao["invalidos"]
+
+        if lote:
+            logger.debug(
+                f"[GroupImporter] {progresso.fonte}: lote até linha {ultima_linha}, "
+                f"{len(inseridos)} novos de {len(lote)}"
+            )
+
+        if chave_checkpoint:
+            await cache_set_json(chave_checkpoint, asdict(progresso), CHECKPOINT_TTL)
+
+        if self.ao_progresso:
+            retorno = self.ao_progresso(progresso)
+            if inspect.isawaitable(retorno):
+                await retorno
+
+        return True
+
+
+async def importar_arquivo(
+    arquivo: Path,
+    sheet_name: Optional[str] = None,
+    categoria: Optional[str] = None,
+    estado: Optional[str] = None,
+    retomar: bool = True,
+    validar: bool = False,
+    ao_progresso: Optional[Callable[[ProgressoImportacao], Any]] = None,
+) -> ProgressoImportacao:
+    """
+    Importa um CSV ou Excel em lotes.
+
+    Args:
+        arquivo: Caminho do arquivo (.csv ou .xlsx)
+        sheet_name: Planilha (apenas Excel)
+        categoria: Categoria padrao
+        estado: Estado padrao
+        retomar: Usa checkpoint no Redis (chave = hash do conteudo)
+        validar: Valida os links novos apos cada lote
+        ao_progresso: Callback chamado ao fim de cada lote
+
+    Returns:
+        Progresso final
+    """
+    if not arquivo.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
+
+    if arquivo.suffix.lower() == ".xlsx":
+        linhas = ler_linhas_excel(arquivo, sheet_name)
+    else:
+        linhas = ler_linhas_csv(arquivo)
+
+    chave = f"{CHECKPOINT_PREFIX}{hash_arquivo(arquivo)}" if retomar else None
+    importador = ImportadorLinks(validar=validar, ao_progresso=ao_progresso)
+    return await importador.importar(
+        linhas, fonte=arquivo.name, categoria=categoria, estado=estado, chave_checkpoint=chave
+    )
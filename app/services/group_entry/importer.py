@@ -9,11 +9,10 @@ Suporta:
 - Importação de diretório completo
 """
 
-import csv
 import re
 import logging
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List
 
 from pydantic import BaseModel
 
@@ -126,14 +125,22 @@ async def importar_csv(
     arquivo: Path,
     categoria: Optional[str] = None,
     estado: Optional[str] = None,
+    retomar: bool = True,
+    validar: bool = False,
+    ao_progresso: Optional[Callable] = None,
 ) -> dict:
     """
     Importa links de um arquivo CSV.
 
+    Lê em streaming e processa em lotes (ver importacao_lote).
+
     Args:
         arquivo: Caminho do arquivo CSV
         categoria: Categoria padrão (sobrescreve se não houver coluna)
         estado: Estado padrão
+        retomar: Retoma do último lote salvo se o mesmo arquivo foi interrompido
+        validar: Valida os links novos via Evolution
+        ao_progresso: Callback chamado a cada lote com o ProgressoImportacao
 
     Returns:
         {
@@ -144,91 +151,17 @@ async def importar_csv(
             "erros": [...]
         }
     """
-    if not arquivo.exists():
-        raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
-
-    resultado = {
-        "total_linhas": 0,
-        "importados": 0,
-        "duplicados": 0,
-        "invalidos": 0,
-        "erros": [],
-    }
-
-    links_para_inserir = []
-
-    with open(arquivo, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        for i, row in enumerate(reader, 1):
-            resultado["total_linhas"] += 1
-
-            # Extrair invite code
-            invite_code = extrair_invite_code(
-                row.get("invite_code") or row.get("url") or row.get("link", "")
-            )
-
-            if not invite_code:
-                resultado["invalidos"] += 1
-                resultado["erros"].append(f"Linha {i}: invite_code inválido")
-                continue
-
-            # Validar formato
-            if not validar_formato_invite_code(invite_code):
-                resultado["invalidos"] += 1
-                resultado["erros"].append(f"Linha {i}: formato inválido")
-                continue
-
-            link = GroupLink(
-                invite_code=invite_code,
-                nome=row.get("name") or row.get("nome"),
-                invite_url=row.get("url") or row.get("link"),
-                categoria=row.get("category") or row.get("categoria") or categoria,
-                estado=row.get("state") or row.get("estado") or estado,
-                regiao=row.get("regiao") or row.get("region"),
-            )
-
-            links_para_inserir.append(
-                {
-                    "invite_code": link.invite_code,
-                    "invite_url": link.invite_url,
-                    "nome": link.nome,
-                    "categoria": link.categoria,
-                    "estado": link.estado,
-                    "regiao": link.regiao,
-                    "fonte": arquivo.name,
-                    "status": "pendente",
-                }
-            )
-
-    # Inserir em batch (ignorando duplicados)
-    if links_para_inserir:
-        try:
-            result = (
-                supabase.table("group_links")
-                .upsert(
-                    links_para_inserir,
-                    on_conflict="invite_code",
-                    ignore_duplicates=True,
-                )
-                .execute()
-            )
-
-            resultado["importados"] = len(result.data) if result.data else 0
-            resultado["duplicados"] = len(links_para_inserir) - resultado["importados"]
-
-        except Exception as e:
-            logger.error(f"Erro ao inserir links: {e}")
-            resultado["erros"].append(f"Erro no banco: {str(e)}")
-
-    logger.info(
-        f"[GroupImporter] {arquivo.name}: "
-        f"{resultado['importados']} importados, "
-        f"{resultado['duplicados']} duplicados, "
-        f"{resultado['invalidos']} inválidos"
+    from app.services.group_entry.importacao_lote import importar_arquivo
+
+    progresso = await importar_arquivo(
+        arquivo,
+        categoria=categoria,
+        estado=estado,
+        retomar=retomar,
+        validar=validar,
+        ao_progresso=ao_progresso,
     )
-
-    return resultado
+    return progresso.como_resultado()
 
 
 async def importar_excel(
@@ -236,6 +169,9 @@ async def importar_excel(
     sheet_name: Optional[str] = None,
     categoria: Optional[str] = None,
     estado: Optional[str] = None,
+    retomar: bool = True,
+    validar: bool = False,
+    ao_progresso: Optional[Callable] = None,
 ) -> dict:
     """
     Importa links de um arquivo Excel (.xlsx).
@@ -247,102 +183,25 @@ async def importar_excel(
         sheet_name: Nome da planilha (opcional, usa ativa)
         categoria: Categoria padrão
         estado: Estado padrão
+        retomar: Retoma do último lote salvo se o mesmo arquivo foi interrompido
+        validar: Valida os links novos via Evolution
+        ao_progresso: Callback chamado a cada lote com o ProgressoImportacao
 
     Returns:
         Resultado da importação
     """
-    try:
-        from openpyxl import load_workbook
-    except ImportError:
-        raise ImportError("openpyxl é necessário para importar Excel. Instale com: uv add openpyxl")
-
-    if not arquivo.exists():
-        raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
-
-    wb = load_workbook(arquivo, read_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.active
-
-    resultado = {
-        "total_linhas": 0,
-        "importados": 0,
-        "duplicados": 0,
-        "invalidos": 0,
-        "erros": [],
-    }
-
-    links_para_inserir = []
-    headers = None
-
-    for i, row in enumerate(ws.iter_rows(values_only=True), 1):
-        # Primeira linha = headers
-        if i == 1:
-            headers = [str(h).lower().strip() if h else "" for h in row]
-            continue
-
-        resultado["total_linhas"] += 1
-
-        # Montar dict da linha
-        row_dict = dict(zip(headers, row))
-
-        # Extrair invite code
-        invite_code = extrair_invite_code(
-            str(row_dict.get("invite_code") or row_dict.get("url") or row_dict.get("link", ""))
-        )
-
-        if not invite_code:
-            resultado["invalidos"] += 1
-            continue
-
-        # Validar formato
-        if not validar_formato_invite_code(invite_code):
-            resultado["invalidos"] += 1
-            continue
-
-        links_para_inserir.append(
-            {
-                "invite_code": invite_code,
-                "invite_url": str(row_dict.get("url") or row_dict.get("link") or ""),
-                "nome": str(row_dict.get("name") or row_dict.get("nome") or ""),
-                "categoria": str(
-                    row_dict.get("category") or row_dict.get("categoria") or categoria or ""
-                ),
-                "estado": str(row_dict.get("state") or row_dict.get("estado") or estado or ""),
-                "regiao": str(row_dict.get("regiao") or row_dict.get("region") or ""),
-                "fonte": arquivo.name,
-                "status": "pendente",
-            }
-        )
-
-    wb.close()
-
-    # Inserir em batch
-    if links_para_inserir:
-        try:
-            result = (
-                supabase.table("group_links")
-                .upsert(
-                    links_para_inserir,
-                    on_conflict="invite_code",
-                    ignore_duplicates=True,
-                )
-                .execute()
-            )
-
-            resultado["importados"] = len(result.data) if result.data else 0
-            resultado["duplicados"] = len(links_para_inserir) - resultado["importados"]
-
-        except Exception as e:
-            logger.error(f"Erro ao inserir links: {e}")
-            resultado["erros"].append(f"Erro no banco: {str(e)}")
-
-    logger.info(
-        f"[GroupImporter] {arquivo.name}: "
-        f"{resultado['importados']} importados, "
-        f"{resultado['duplicados']} duplicados, "
-        f"{resultado['invalidos']} inválidos"
+    from app.services.group_entry.importacao_lote import importar_arquivo
+
+    progresso = await importar_arquivo(
+        arquivo,
+        sheet_name=sheet_name,
+        categoria=categoria,
+        estado=estado,
+        retomar=retomar,
+        validar=validar,
+        ao_progresso=ao_progresso,
     )
-
-    return resultado
+    return progresso.como_resultado()
 
 
 async def importar_diretorio(diretorio: Path) -> dict:
@@ -0,0 +1,67 @@
+"""
+Limitador de requisicoes por host.
+
+Sprint 26 - E12
+
+Usado para chamadas concorrentes a servicos externos (validacao de links
+via Evolution, crawling de fontes): limita quantas requisicoes ficam em
+voo por host e espaca o inicio de cada uma por um intervalo minimo.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlparse
+
+
+def host_de(url: str) -> str:
+    """Host (netloc minusculo) de uma URL; a propria string se nao for URL."""
+    host = urlparse(url).netloc.lower()
+    return host or url.lower()
+
+
+class LimitadorPorHost:
+    """
+    Concorrencia maxima e intervalo minimo entre inicios, por host.
+
+    Exemplo:
+        limitador = LimitadorPorHost(max_concorrentes=2, intervalo_minimo=1.0)
+        async with limitador.slot("evolution.exemplo.com"):
+            await client.get(...)
+    """
+
+    def __init__(self, max_concorrentes: int = 2, intervalo_minimo: float = 0.5):
+        """
+        Args:
+            max_concorrentes: Requisicoes simultaneas por host
+            intervalo_minimo: Segundos entre o inicio de duas requisicoes ao mesmo host
+        """
+        self.max_concorrentes = max_concorrentes
+        self.intervalo_minimo = intervalo_minimo
+        self._semaforos: dict[str, asyncio.Semaphore] = {}
+        self._proximo_inicio: dict[str, float] = {}
+        self._intervalos: dict[str, float] = {}
+
+    def configurar_host(self, host: str, intervalo_minimo: float) -> None:
+        """Sobrescreve o intervalo de um host (ex: crawl-delay do robots.txt)."""
+        self._intervalos[host] = intervalo_minimo
+
+    async def _aguardar_vez(self, host: str) -> None:
+        loop = asyncio.get_event_loop()
+        agora = loop.time()
+        # Reserva o horario sem await entre leitura e escrita (atomico no event loop)
+        inicio = max(agora, self._proximo_inicio.get(host, 0.0))
+        self._proximo_inicio[host] = inicio + self._intervalos.get(host, self.intervalo_minimo)
+        if inicio > agora:
+            await asyncio.sleep(inicio - agora)
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Ocupa uma vaga do host pelo tempo da requisicao."""
+        semaforo = self._semaforos.get(host)
+        if semaforo is None:
+            semaforo = self._semaforos[host] = asyncio.Semaphore(self.max_concorrentes)
+
+        async with semaforo:
+            await self._aguardar_vez(host)
+            yield
@@ -0,0 +1,85 @@
+"""
+Pool de navegador headless para crawling de sites JavaScript.
+
+Sprint 26 - E12
+
+Um unico Chromium e compartilhado pelas fontes de uma rodada de crawl;
+cada fonte recebe um contexto isolado (cookies, user agent) que e fechado
+ao final. O navegador so sobe na primeira fonte que precisar dele.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGINAS_SIMULTANEAS = 3
+
+
+class PoolNavegadores:
+    """Navegador Playwright reutilizavel com limite de paginas abertas."""
+
+    def __init__(self, max_paginas: int = MAX_PAGINAS_SIMULTANEAS):
+        """
+        Args:
+            max_paginas: Contextos abertos ao mesmo tempo
+        """
+        self.max_paginas = max_paginas
+        self._semaforo = asyncio.Semaphore(max_paginas)
+        self._lock = asyncio.Lock()
+        self._playwright: Optional[Any] = None
+        self._browser: Optional[Any] = None
+
+    @property
+    def ativo(self) -> bool:
+        """Se ha um navegador aberto."""
+        return self._browser is not None
+
+    async def _obter_browser(self) -> Any:
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            from playwright.async_api import async_playwright
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            logger.debug("[BrowserPool] Chromium iniciado")
+            return self._browser
+
+    @asynccontextmanager
+    async def pagina(self, user_agent: str) -> AsyncIterator[Any]:
+        """
+        Abre uma pagina num contexto novo do navegador compartilhado.
+
+        Raises:
+            ImportError: Se o playwright nao estiver instalado
+        """
+        async with self._semaforo:
+            browser = await self._obter_browser()
+            context = await browser.new_context(user_agent=user_agent)
+            try:
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+    async def fechar(self) -> None:
+        """Fecha navegador e driver (chamado ao fim da rodada de crawl)."""
+        async with self._lock:
+            try:
+                if self._browser is not None:
+                    await self._browser.close()
+                if self._playwright is not None:
+                    await self._playwright.stop()
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Erro ao fechar navegador: {e}")
+            finally:
+                self._browser = None
+                self._playwright = None
+
+
+# Singleton
+pool_navegadores = PoolNavegadores()
@@ -6,15 +6,41 @@ Sprint 25 - E12 - S12.2
 Verifica se o link é válido antes de tentar entrar.
 """
 
+import asyncio
 import logging
+from collections import defaultdict
 from typing import Optional, List
 from datetime import datetime, UTC
 
+from app.services.group_entry.limitador import LimitadorPorHost
 from app.services.supabase import supabase
 from app.services.whatsapp import EvolutionClient
 
 logger = logging.getLogger(__name__)
 
+# Validacao em lote: por chip (instancia Evolution), no maximo 2 consultas
+# simultaneas e uma nova a cada 1s
+MAX_VALIDACOES_POR_CHIP = 2
+INTERVALO_VALIDACAO_SEGUNDOS = 1.0
+MAX_CHIPS_VALIDACAO = 5
+
+
+def _buscar_chips_validacao(limite: int = MAX_CHIPS_VALIDACAO) -> List[dict]:
+    """Chips ativos para validar links (listeners primeiro)."""
+    result = (
+        supabase.table("chips")
+        .select("*")
+        .eq("tipo", "listener")
+        .eq("status", "active")
+        .limit(limite)
+        .execute()
+    )
+    chips = result.data or []
+    if not chips:
+        result = supabase.table("chips").select("*").eq("status", "active").limit(1).execute()
+        chips = result.data or []
+    return chips
+
 
 async def validar_link(
     invite_code: str,
@@ -40,21 +66,9 @@ async def validar_link(
         result = supabase.table("chips").select("*").eq("id", chip_id).single().execute()
         chip = result.data
     else:
-        # Usar qualquer chip listener ativo
-        result = (
-            supabase.table("chips")
-            .select("*")
-            .eq("tipo", "listener")
-            .eq("status", "active")
-            .limit(1)
-            .execute()
-        )
-        chip = result.data[0] if result.data else None
-
-        # Se não tiver listener, tenta julia
-        if not chip:
-            result = supabase.table("chips").select("*").eq("status", "active").limit(1).execute()
-            chip = result.data[0] if result.data else None
+        # Usar qualquer chip listener ativo (se não tiver listener, tenta julia)
+        chips = _buscar_chips_validacao(limite=1)
+        chip = chips[0] if chips else None
 
     if not chip:
         return {"valido": False, "erro": "Nenhum chip disponível para validação"}
@@ -103,44 +117,7 @@ async def validar_links_pendentes(limite: int = 50) -> dict:
         logger.info("[GroupValidator] Nenhum link pendente para validar")
         return {"validados": 0, "invalidos": 0, "erros": 0}
 
-    links = result.data
-    resultado = {"validados": 0, "invalidos": 0, "erros": 0}
-
-    for link in links:
-        try:
-            validacao = await validar_link(link["invite_code"])
-
-            if validacao.get("valido"):
-                # Atualizar como validado
-                supabase.table("group_links").update(
-                    {
-                        "status": "validado",
-                        "nome": validacao.get("grupo_nome") or link.get("nome"),
-                        "validado_em": datetime.now(UTC).isoformat(),
-                    }
-                ).eq("id", link["id"]).execute()
-
-                resultado["validados"] += 1
-                logger.debug(f"[GroupValidator] Link validado: {link['invite_code']}")
-
-            else:
-                # Marcar como inválido
-                supabase.table("group_links").update(
-                    {
-                        "status": "invalido",
-                        "ultimo_erro": validacao.get("erro", "Link inválido"),
-                        "validado_em": datetime.now(UTC).isoformat(),
-                    }
-                ).eq("id", link["id"]).execute()
-
-                resultado["invalidos"] += 1
-                logger.debug(
-                    f"[GroupValidator] Link inválido: {link['invite_code']} - {validacao.get('erro')}"
-                )
-
-        except Exception as e:
-            logger.error(f"[GroupValidator] Erro ao validar {link['invite_code']}: {e}")
-            resultado["erros"] += 1
+    resultado = await validar_links_em_lote(result.data)
 
     logger.info(
         f"[GroupValidator] Batch concluído: "
@@ -152,6 +129,89 @@ async def validar_links_pendentes(limite: int = 50) -> dict:
     return resultado
 
 
+async def validar_links_em_lote(
+    links: List[dict],
+    limitador: Optional[LimitadorPorHost] = None,
+) -> dict:
+    """
+    Valida varios links em paralelo, distribuidos entre os chips ativos.
+
+    Cada chip (instancia Evolution) tem seu proprio limite de concorrencia e
+    intervalo; links invalidos com o mesmo erro sao marcados num unico UPDATE.
+
+    Args:
+        links: Links com id, invite_code e nome
+        limitador: Limites por chip (default: 2 simultaneas, 1 consulta/s)
+
+    Returns:
+        {"validados": N, "invalidos": N, "erros": N}
+    """
+    resultado = {"validados": 0, "invalidos": 0, "erros": 0}
+    if not links:
+        return resultado
+
+    chips = _buscar_chips_validacao()
+    if not chips:
+        logger.warning("[GroupValidator] Nenhum chip disponível para validação")
+        resultado["erros"] = len(links)
+        return resultado
+
+    limitador = limitador or LimitadorPorHost(
+        max_concorrentes=MAX_VALIDACOES_POR_CHIP,
+        intervalo_minimo=INTERVALO_VALIDACAO_SEGUNDOS,
+    )
+    clientes = [EvolutionClient(instance=chip["instance_name"]) for chip in chips]
+
+    async def _validar(indice: int, link: dict) -> Optional[dict]:
+        cliente = clientes[indice % len(clientes)]
+        async with limitador.slot(cliente.instance):
+            return await cliente.buscar_info_grupo_por_invite(link["invite_code"])
+
+    respostas = await asyncio.gather(
+        *(_validar(i, link) for i, link in enumerate(links)),
+        return_exceptions=True,
+    )
+
+    agora = datetime.now(UTC).isoformat()
+    invalidos_por_erro: dict[str, list[str]] = defaultdict(list)
+
+    for link, info in zip(links, respostas):
+        if isinstance(info, Exception):
+            # Mesmo tratamento de validar_link: erro da API marca o link como inválido
+            logger.warning(f"[GroupValidator] Erro ao validar {link['invite_code']}: {info}")
+            invalidos_por_erro[str(info)].append(link["id"])
+            continue
+
+        if not info:
+            invalidos_por_erro["Link inválido ou expirado"].append(link["id"])
+            continue
+
+        try:
+            supabase.table("group_links").update(
+                {
+                    "status": "validado",
+                    "nome": info.get("subject") or link.get("nome"),
+                    "validado_em": agora,
+                }
+            ).eq("id", link["id"]).execute()
+            resultado["validados"] += 1
+        except Exception as e:
+            logger.error(f"[GroupValidator] Erro ao salvar validação {link['invite_code']}: {e}")
+            resultado["erros"] += 1
+
+    for erro, ids in invalidos_por_erro.items():
+        try:
+            supabase.table("group_links").update(
+                {"status": "invalido", "ultimo_erro": erro, "validado_em": agora}
+            ).in_("id", ids).execute()
+            resultado["invalidos"] += len(ids)
+        except Exception as e:
+            logger.error(f"[GroupValidator] Erro ao marcar {len(ids)} links inválidos: {e}")
+            resultado["erros"] += len(ids)
+
+    return resultado
+
+
 async def revalidar_link(link_id: str) -> dict:
     """
     Revalida um link específico (para links marcados como inválidos ou erro).
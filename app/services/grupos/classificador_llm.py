@@ -10,7 +10,6 @@ import hashlib
 from dataclasses import dataclass
 from typing import Optional
 
-import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings, GruposConfig
@@ -127,6 +126,8 @@ def _parsear_resposta_llm(texto: str) -> ResultadoClassificacaoLLM:
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
 async def _chamar_llm(prompt: str) -> tuple:
     """Chama o LLM com retry (async)."""
+    import anthropic
+
     client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
     response = await client.messages.create(
@@ -170,6 +171,8 @@ async def classificar_com_llm(
         nome_contato=nome_contato or "Desconhecido",
     )
 
+    import anthropic
+
     try:
         resposta_texto, tokens_usados = await _chamar_llm(prompt)
 
@@ -17,7 +17,6 @@ from datetime import date, time
 from typing import List, Optional
 from uuid import UUID
 
-import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
@@ -315,6 +314,8 @@ async def salvar_extracao_cache(
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
 async def _chamar_llm_extracao(prompt: str) -> tuple:
     """Chama o LLM para extração com retry."""
+    import anthropic
+
     client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
     response = await client.messages.create(
@@ -404,6 +405,8 @@ async def extrair_com_llm(
         especialidades=especialidades_str,
     )
 
+    import anthropic
+
     try:
         resposta_texto, tokens_usados = await _chamar_llm_extracao(prompt)
         resultado = _parsear_resposta_extracao(resposta_texto)
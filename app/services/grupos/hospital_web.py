@@ -16,7 +16,6 @@ if TYPE_CHECKING:
     from app.services.grupos.hospital_google_places import InfoGooglePlaces
 from uuid import UUID
 
-import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
@@ -152,6 +151,8 @@ async def buscar_hospital_web(
     if not nome_hospital:
         return None
 
+    import anthropic
+
     client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
     prompt = PROMPT_BUSCA_HOSPITAL.format(
@@ -18,6 +18,7 @@ from uuid import UUID
 from app.core.config import GruposConfig
 from app.core.logging import get_logger
 from app.services.supabase import supabase
+from app.services.vagas.indice import indice_vagas
 
 logger = get_logger(__name__)
 
@@ -257,12 +258,14 @@ async def criar_vaga_principal(vaga_grupo: dict) -> UUID:
         registros = [dict(dados_vaga) for _ in range(numero_vagas)]
         result = supabase.table("vagas").insert(registros).execute()
         vaga_id = UUID(result.data[0]["id"])
+        indice_vagas.notificar_criacao(r["id"] for r in result.data)
         logger.info(
             f"{numero_vagas} vagas criadas (primeira: {vaga_id}, origem: grupo {vaga_grupo['id']})"
         )
     else:
         result = supabase.table("vagas").insert(dados_vaga).execute()
         vaga_id = UUID(result.data[0]["id"])
+        indice_vagas.notificar_criacao([vaga_id])
         logger.info(f"Vaga criada: {vaga_id} (origem: grupo {vaga_grupo['id']})")
 
     return vaga_id
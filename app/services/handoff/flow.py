@@ -242,6 +242,7 @@ async def _enviar_mensagem_transicao(
             tipo="saida",
             conteudo=mensagem,
             autor_tipo="julia",
+            aguardar=False,
         )
 
         # Sincronizar com Chatwoot
@@ -4,9 +4,10 @@ Identifica quando Julia deve passar a conversa para um humano.
 """
 
 import logging
-import re
 from typing import Optional
 
+from app.services.analise_texto import SEM_ACENTO, analisar, registrar_padroes, remover_acentos
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,62 +63,37 @@ PALAVRAS_NEGATIVAS = [
 ]
 
 
+registrar_padroes("handoff.pedido_humano", FRASES_PEDIDO_HUMANO, normalizacao=SEM_ACENTO)
+registrar_padroes("handoff.juridico", FRASES_JURIDICO, normalizacao=SEM_ACENTO)
+registrar_padroes("handoff.negativo", PALAVRAS_NEGATIVAS, normalizacao=SEM_ACENTO)
+
+
 def _normalizar_texto(texto: str) -> str:
     """
     Normaliza texto removendo acentos para matching mais robusto.
     """
-    return (
-        texto.lower()
-        .replace("ã", "a")
-        .replace("á", "a")
-        .replace("â", "a")
-        .replace("à", "a")
-        .replace("é", "e")
-        .replace("ê", "e")
-        .replace("è", "e")
-        .replace("í", "i")
-        .replace("î", "i")
-        .replace("ì", "i")
-        .replace("ó", "o")
-        .replace("ô", "o")
-        .replace("õ", "o")
-        .replace("ò", "o")
-        .replace("ú", "u")
-        .replace("û", "u")
-        .replace("ù", "u")
-        .replace("ç", "c")
-    )
+    return remover_acentos(texto)
 
 
 def detectar_pedido_humano(texto_normalizado: str) -> bool:
     """
     Detecta se mensagem indica pedido explicito de falar com humano.
     """
-    for padrao in FRASES_PEDIDO_HUMANO:
-        if re.search(padrao, texto_normalizado):
-            return True
-    return False
+    return analisar(texto_normalizado).tem("handoff.pedido_humano")
 
 
 def detectar_situacao_juridica(texto_normalizado: str) -> bool:
     """
     Detecta se mensagem indica situacao juridica/formal.
     """
-    for padrao in FRASES_JURIDICO:
-        if re.search(padrao, texto_normalizado):
-            return True
-    return False
+    return analisar(texto_normalizado).tem("handoff.juridico")
 
 
 def contar_palavras_negativas(texto_normalizado: str) -> int:
     """
     Conta quantas palavras negativas fortes estao na mensagem.
     """
-    count = 0
-    for padrao in PALAVRAS_NEGATIVAS:
-        if re.search(padrao, texto_normalizado):
-            count += 1
-    return count
+    return len(analisar(texto_normalizado).ocorrencias("handoff.negativo"))
 
 
 def detectar_trigger_handoff(texto: str) -> Optional[dict]:
@@ -133,10 +109,11 @@ def detectar_trigger_handoff(texto: str) -> Optional[dict]:
     if not texto:
         return None
 
-    texto_normalizado = _normalizar_texto(texto)
+    # Mesma analise serve as tres verificacoes (normalizacao feita no motor)
+    analise = analisar(texto)
 
     # 1. Verificar pedido explicito de humano
-    if detectar_pedido_humano(texto_normalizado):
+    if analise.tem("handoff.pedido_humano"):
         logger.info(f"Trigger handoff: pedido_humano em '{texto[:50]}'")
         return {
             "trigger": True,
@@ -145,12 +122,12 @@ def detectar_trigger_handoff(texto: str) -> Optional[dict]:
         }
 
     # 2. Verificar situacao juridica
-    if detectar_situacao_juridica(texto_normalizado):
+    if analise.tem("handoff.juridico"):
         logger.info(f"Trigger handoff: juridico em '{texto[:50]}'")
         return {"trigger": True, "motivo": "Situacao juridica/formal detectada", "tipo": "juridico"}
 
     # 3. Verificar sentimento negativo forte (2+ palavras)
-    negativos = contar_palavras_negativas(texto_normalizado)
+    negativos = len(analise.ocorrencias("handoff.negativo"))
     if negativos >= 2:
         logger.info(
             f"Trigger handoff: sentimento_negativo ({negativos} palavras) em '{texto[:50]}'"
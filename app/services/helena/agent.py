@@ -5,20 +5,29 @@ Sprint 47: Agente com capacidade de SQL dinâmico.
 Helena funciona APENAS no Slack, nunca no WhatsApp.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
+from typing import Awaitable, Callable, Optional
 
-import anthropic
-
-from app.core.config import settings
-from app.services.helena.session import SessionManager
 from app.services.helena.prompts import montar_prompt_helena
+from app.services.helena.session import SessionManager
+from app.services.llm import (
+    LLMError,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    Message,
+    ToolDefinition,
+    get_llm_provider,
+)
 
 logger = logging.getLogger(__name__)
 
 MAX_TOOL_ITERATIONS = 5
 MAX_RETRIES_INCOMPLETO = 2
+MAX_TOKENS = 2048
 
 # Padrões que indicam resposta incompleta
 PADROES_INCOMPLETOS = [
@@ -32,68 +41,100 @@ PADROES_INCOMPLETOS = [
     "consultando",
 ]
 
+# Recebe texto parcial (ex: "Vou consultar as métricas...") enquanto as tools rodam
+CallbackParcial = Callable[[str], Awaitable[None]]
+
 
 class AgenteHelena:
     """Agente de analytics para Slack."""
 
-    def __init__(self, user_id: str, channel_id: str):
+    def __init__(
+        self,
+        user_id: str,
+        channel_id: str,
+        provider: Optional[LLMProvider] = None,
+    ):
         """
         Inicializa agente Helena.
 
         Args:
             user_id: ID do usuário Slack
             channel_id: ID do canal Slack
+            provider: Provider de LLM (default: get_llm_provider(), resolvido na 1a chamada)
         """
         self.user_id = user_id
         self.channel_id = channel_id
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.session = SessionManager(user_id, channel_id)
+        self._provider = provider
         self._tools = None
+        self._ao_parcial: Optional[CallbackParcial] = None
+
+    @property
+    def provider(self) -> LLMProvider:
+        if self._provider is None:
+            self._provider = get_llm_provider()
+        return self._provider
 
-    def _get_tools(self) -> list:
+    def _get_tools(self) -> list[ToolDefinition]:
         """Lazy load das tools para evitar import circular."""
         if self._tools is None:
             from app.tools.helena import HELENA_TOOLS
 
-            self._tools = HELENA_TOOLS
+            self._tools = [ToolDefinition.from_dict(tool) for tool in HELENA_TOOLS]
         return self._tools
 
-    async def processar_mensagem(self, texto: str) -> str:
+    async def processar_mensagem(
+        self, texto: str, ao_parcial: Optional[CallbackParcial] = None
+    ) -> str:
         """
         Processa mensagem do usuário.
 
+        A sessão é carregada uma vez no início do turno e salva uma vez no
+        final (inclusive em erro, para não perder a pergunta do usuário).
+
         Args:
             texto: Texto da mensagem (sem menção @Helena)
+            ao_parcial: Callback opcional para respostas parciais
 
         Returns:
             Resposta formatada para Slack
         """
         logger.info(f"Helena processando: {texto[:100]}...")
+        self._ao_parcial = ao_parcial
 
         # Carregar sessão
         await self.session.carregar()
         self.session.adicionar_mensagem("user", texto)
 
         try:
-            # Chamar LLM
-            resposta = await self._chamar_llm()
+            return await self._chamar_llm()
 
-            # Salvar sessão
-            await self.session.salvar()
-
-            return resposta
-
-        except anthropic.APIError as e:
-            logger.error(f"Erro API Anthropic: {e}")
+        except LLMError as e:
+            logger.error(f"Erro no LLM: {e}")
             return "Ops, tive um problema técnico. Tenta de novo em alguns segundos?"
 
         except Exception as e:
             logger.exception(f"Erro ao processar mensagem Helena: {e}")
             return "Desculpa, algo deu errado. Pode repetir a pergunta?"
 
+        finally:
+            await self.session.salvar()
+
+    async def _gerar(self) -> LLMResponse:
+        """Uma chamada ao LLM com o histórico atual da sessão."""
+        data_hora = datetime.now().strftime("%d/%m/%Y %H:%M (%A)")
+        return await self.provider.generate(
+            LLMRequest(
+                messages=[Message.from_dict(m) for m in self.session.mensagens],
+                system_prompt=montar_prompt_helena(data_hora),
+                tools=self._get_tools(),
+                max_tokens=MAX_TOKENS,
+            )
+        )
+
     async def _chamar_llm(self, retry_count: int = 0) -> str:
         """
-        Chama Claude com tools.
+        Chama o LLM com tools.
 
         Args:
             retry_count: Número de retries para respostas incompletas
@@ -101,46 +142,71 @@ class AgenteHelena:
         Returns:
             Resposta final formatada
         """
-        # Preparar contexto
-        data_hora = datetime.now().strftime("%d/%m/%Y %H:%M (%A)")
-        system_prompt = montar_prompt_helena(data_hora)
-
-        # Chamar Claude
-        response = self.client.messages.create(
-            model=settings.LLM_MODEL,  # claude-haiku-4-5 ou equivalente
-            max_tokens=2048,
-            system=system_prompt,
-            tools=self._get_tools(),
-            messages=self.session.mensagens,
+        response = await self._gerar()
+        return await self._processar_resposta(response, retry_count)
+
+    async def _parcial(self, texto: str) -> None:
+        """Repassa texto parcial ao callback (falha no callback não interrompe o turno)."""
+        if not self._ao_parcial or not texto.strip():
+            return
+        try:
+            await self._ao_parcial(texto)
+        except Exception as e:
+            logger.warning(f"Erro ao enviar resposta parcial: {e}")
+
+    async def _executar_tools(self, response: LLMResponse) -> list[dict]:
+        """
+        Executa as tools pedidas na resposta em paralelo.
+
+        Returns:
+            Blocos tool_result na ordem das chamadas
+        """
+        from app.tools.helena import executar_tool
+
+        for tool_call in response.tool_calls:
+            logger.info(f"Helena executando tool: {tool_call.name}")
+
+        resultados = await asyncio.gather(
+            *(
+                executar_tool(tool_call.name, tool_call.input, self.user_id, self.channel_id)
+                for tool_call in response.tool_calls
+            ),
+            return_exceptions=True,
         )
 
-        return await self._processar_resposta(response, retry_count)
+        tool_results = []
+        for tool_call, result in zip(response.tool_calls, resultados):
+            if isinstance(result, Exception):
+                logger.error(f"Erro na tool {tool_call.name}: {result}")
+                result = {"success": False, "error": str(result)}
+
+            tool_results.append(
+                {
+                    "type": "tool_result",
+                    "tool_use_id": tool_call.id,
+                    "content": json.dumps(result, ensure_ascii=False, default=str),
+                }
+            )
+
+            # Salvar no contexto para referência futura
+            self.session.atualizar_contexto(f"ultima_{tool_call.name}", result)
 
-    async def _processar_resposta(self, response: anthropic.types.Message, retry_count: int) -> str:
+        return tool_results
+
+    async def _processar_resposta(self, response: LLMResponse, retry_count: int) -> str:
         """
         Processa resposta do LLM, executando tools se necessário.
 
         Args:
-            response: Resposta do Claude
+            response: Resposta do LLM
             retry_count: Contador de retries
 
         Returns:
             Texto final da resposta
         """
-        from app.tools.helena import executar_tool
-
-        texto_resposta = ""
-        tool_calls = []
-
-        # Extrair texto e tool_use
-        for block in response.content:
-            if block.type == "text":
-                texto_resposta += block.text
-            elif block.type == "tool_use":
-                tool_calls.append(block)
-
         # Se não há tools, verificar se resposta está completa
-        if not tool_calls:
+        if not response.has_tool_calls:
+            texto_resposta = response.content
             if self._resposta_incompleta(texto_resposta, response.stop_reason):
                 if retry_count < MAX_RETRIES_INCOMPLETO:
                     logger.debug(f"Resposta incompleta, retry {retry_count + 1}")
@@ -156,73 +222,21 @@ class AgenteHelena:
 
         # Executar tools (máximo MAX_TOOL_ITERATIONS)
         iteration = 0
-        while tool_calls and iteration < MAX_TOOL_ITERATIONS:
+        while response.has_tool_calls and iteration < MAX_TOOL_ITERATIONS:
             iteration += 1
 
-            tool_results = []
-            for tool_call in tool_calls:
-                logger.info(f"Helena executando tool: {tool_call.name}")
-
-                result = await executar_tool(
-                    tool_call.name,
-                    tool_call.input,
-                    self.user_id,
-                    self.channel_id,
-                )
-
-                tool_results.append(
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": tool_call.id,
-                        "content": json.dumps(result, ensure_ascii=False, default=str),
-                    }
-                )
-
-                # Salvar no contexto para referência futura
-                self.session.atualizar_contexto(
-                    f"ultima_{tool_call.name}",
-                    result,
-                )
+            await self._parcial(response.content)
+            tool_results = await self._executar_tools(response)
 
             # Adicionar tool calls e results ao histórico
-            # Converter content blocks para formato serializável
-            assistant_content = []
-            for block in response.content:
-                if block.type == "text":
-                    assistant_content.append({"type": "text", "text": block.text})
-                elif block.type == "tool_use":
-                    assistant_content.append(
-                        {
-                            "type": "tool_use",
-                            "id": block.id,
-                            "name": block.name,
-                            "input": block.input,
-                        }
-                    )
-
-            self.session.adicionar_mensagem("assistant", assistant_content)
+            self.session.adicionar_mensagem("assistant", response.content_blocks())
             self.session.adicionar_mensagem("user", tool_results)
 
             # Continuar conversa com resultados
-            data_hora = datetime.now().strftime("%d/%m/%Y %H:%M (%A)")
-            response = self.client.messages.create(
-                model=settings.LLM_MODEL,
-                max_tokens=2048,
-                system=montar_prompt_helena(data_hora),
-                tools=self._get_tools(),
-                messages=self.session.mensagens,
-            )
-
-            # Extrair nova resposta
-            texto_resposta = ""
-            tool_calls = []
-            for block in response.content:
-                if block.type == "text":
-                    texto_resposta += block.text
-                elif block.type == "tool_use":
-                    tool_calls.append(block)
+            response = await self._gerar()
 
         # Resposta final
+        texto_resposta = response.content
         self.session.adicionar_mensagem("assistant", texto_resposta)
         return texto_resposta
 
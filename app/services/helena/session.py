@@ -4,6 +4,7 @@ Gerenciamento de sessão para Helena.
 Sprint 47: Adaptado de app/services/slack/session.py com ajustes para Helena.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
@@ -58,15 +59,19 @@ class SessionManager:
     async def carregar(self) -> HelenaSession:
         """Carrega sessão existente ou cria nova."""
         try:
-            # Buscar sessão ativa
-            result = (
-                supabase.table("helena_sessoes")
-                .select("*")
-                .eq("user_id", self.user_id)
-                .eq("channel_id", self.channel_id)
-                .gte("expires_at", datetime.now(timezone.utc).isoformat())
-                .limit(1)
-                .execute()
+            # Buscar sessão ativa (client síncrono fora do event loop)
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: (
+                    supabase.table("helena_sessoes")
+                    .select("*")
+                    .eq("user_id", self.user_id)
+                    .eq("channel_id", self.channel_id)
+                    .gte("expires_at", datetime.now(timezone.utc).isoformat())
+                    .limit(1)
+                    .execute()
+                ),
             )
 
             if result.data and len(result.data) > 0:
@@ -103,19 +108,23 @@ class SessionManager:
 
         try:
             expires_at = datetime.now(timezone.utc) + timedelta(minutes=SESSION_TTL_MINUTES)
-
-            supabase.table("helena_sessoes").upsert(
-                {
-                    "user_id": self.user_id,
-                    "channel_id": self.channel_id,
-                    "mensagens": self.session.mensagens,
-                    "contexto": self.session.contexto,
-                    "created_at": self.session.created_at.isoformat(),
-                    "updated_at": self.session.updated_at.isoformat(),
-                    "expires_at": expires_at.isoformat(),
-                },
-                on_conflict="user_id,channel_id",
-            ).execute()
+            dados = {
+                "user_id": self.user_id,
+                "channel_id": self.channel_id,
+                "mensagens": self.session.mensagens,
+                "contexto": self.session.contexto,
+                "created_at": self.session.created_at.isoformat(),
+                "updated_at": self.session.updated_at.isoformat(),
+                "expires_at": expires_at.isoformat(),
+            }
+
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None,
+                lambda: supabase.table("helena_sessoes")
+                .upsert(dados, on_conflict="user_id,channel_id")
+                .execute(),
+            )
 
             logger.debug(f"Sessão Helena salva: {self.user_id}")
 
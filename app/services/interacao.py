@@ -2,10 +2,12 @@
 Servico para gerenciamento de interacoes (mensagens).
 """
 
+from datetime import datetime, timezone
 from typing import Optional, Literal
 import logging
 
 from app.services.supabase import supabase
+from app.services.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,8 @@ async def salvar_interacao(
     autor_tipo: Literal["medico", "julia", "gestor"],
     message_id: Optional[str] = None,
     chip_id: Optional[str] = None,
+    aguardar: bool = True,
+    levantar_erro: bool = False,
 ) -> Optional[dict]:
     """
     Salva uma interacao (mensagem) na conversa.
@@ -30,6 +34,10 @@ async def salvar_interacao(
         autor_tipo: Quem enviou (medico, julia, gestor)
         message_id: ID da mensagem no WhatsApp
         chip_id: ID do chip que enviou/recebeu a mensagem (Sprint 41)
+        aguardar: False quando o chamador nao usa o retorno; com o
+            write-behind ativo a interacao entra no lote e retorna None
+        levantar_erro: Propaga a excecao em vez de logar e retornar None
+            (quem chama decide o retry)
 
     Returns:
         Dados da interacao salva
@@ -58,12 +66,19 @@ async def salvar_interacao(
         if tipo == "saida":
             dados["delivery_status"] = "sent"
 
+        if not aguardar and write_behind.ativo:
+            dados["created_at"] = datetime.now(timezone.utc).isoformat()
+            write_behind.enfileirar("interacoes", dados)
+            return None
+
         response = supabase.table("interacoes").insert(dados).execute()
         logger.debug(f"Interacao salva: {tipo} - {conteudo[:50]}...")
         return response.data[0] if response.data else None
 
     except Exception as e:
         logger.error(f"Erro ao salvar interacao: {e}")
+        if levantar_erro:
+            raise
         return None
 
 
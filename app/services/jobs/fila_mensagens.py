@@ -182,6 +182,7 @@ async def _processar_mensagem(mensagem: dict) -> str:
                 conteudo=mensagem["conteudo"],
                 autor_tipo="julia",
                 chip_id=chip_id,
+                aguardar=False,
             )
 
         logger.info(f"Mensagem {mensagem_id} enviada para {telefone}")
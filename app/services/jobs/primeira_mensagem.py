@@ -114,6 +114,7 @@ async def enviar_primeira_mensagem(telefone: str) -> ResultadoPrimeiraMensagem:
             tipo="saida",
             conteudo=resposta,
             autor_tipo="julia",
+            aguardar=False,
         )
 
         # 9. Atualizar cliente
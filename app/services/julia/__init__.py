@@ -45,6 +45,7 @@ from .response_handler import ResponseHandler, get_response_handler, resposta_pa
 # Summarizer (Sprint 44 T02.3)
 from .summarizer import (
     sumarizar_se_necessario,
+    atualizar_resumo_conversa,
     formatar_contexto_com_resumo,
     obter_metricas_summarizer,
 )
@@ -86,6 +87,7 @@ __all__ = [
     "resposta_parece_incompleta",
     # Summarizer (Sprint 44 T02.3)
     "sumarizar_se_necessario",
+    "atualizar_resumo_conversa",
     "formatar_contexto_com_resumo",
     "obter_metricas_summarizer",
     # Event Emitter (Sprint 44 T02.4)
@@ -10,16 +10,23 @@ a qualidade das respostas.
 Estratégia:
 - Se histórico tem <= THRESHOLD_MSGS: usa completo
 - Se histórico tem > THRESHOLD_MSGS:
-  - Sumariza as (N - MSGS_RECENTES) primeiras mensagens
-  - Mantém as últimas MSGS_RECENTES completas
+  - Usa o resumo persistido da conversa (conversation_summaries)
+  - Mantém completas as mensagens posteriores ao resumo
   - Contexto final = [resumo] + [mensagens_recentes]
+
+Resumo incremental:
+- O resumo guarda o ID da última interação incorporada (high-water mark)
+- Após a resposta ser enviada, atualizar_resumo_conversa roda em background
+  e incorpora ao resumo apenas as mensagens que saíram da janela recente
+- O caminho da resposta só lê o resumo (nenhuma chamada ao LLM)
 """
 
 import logging
 from typing import List, Dict, Optional, Tuple
 
-from anthropic import AsyncAnthropic
 from app.core.config import settings
+from app.core.timezone import agora_utc
+from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +34,11 @@ logger = logging.getLogger(__name__)
 THRESHOLD_MSGS = 12  # Sumarizar se tiver mais que isso
 MSGS_RECENTES = 5  # Manter as últimas N mensagens completas
 MAX_TOKENS_RESUMO = 500  # Tokens máximos para o resumo
+MIN_MSGS_PARA_INCORPORAR = 4  # Agrupa ~2 turnos por chamada ao LLM
+MAX_MSGS_POR_ATUALIZACAO = 200  # Limite da primeira carga de conversas antigas
+
+# Conversas com atualização em andamento neste processo
+_atualizacoes_em_andamento: set[str] = set()
 
 
 async def sumarizar_se_necessario(
@@ -36,9 +48,12 @@ async def sumarizar_se_necessario(
     """
     Sumariza histórico se necessário, retornando resumo + mensagens recentes.
 
+    Não chama o LLM: usa o resumo persistido da conversa. Sem resumo
+    persistido (ainda não gerado), usa o resumo simplificado das antigas.
+
     Args:
         historico: Lista de interações ordenadas (mais antigas primeiro)
-        conversa_id: ID da conversa (para logging)
+        conversa_id: ID da conversa (para buscar o resumo persistido)
 
     Returns:
         Tupla (resumo, mensagens_recentes):
@@ -58,44 +73,176 @@ async def sumarizar_se_necessario(
         )
         return "", historico
 
-    # Separar mensagens antigas (para resumo) e recentes (completas)
+    persistido = await carregar_resumo(conversa_id) if conversa_id else None
+
+    if persistido and persistido.get("resumo"):
+        # Mensagens posteriores ao resumo seguem completas (no mínimo as recentes)
+        ultima_id = persistido.get("ultima_interacao_id") or 0
+        posteriores = [m for m in historico if (m.get("id") or 0) > ultima_id]
+        msgs_recentes = (
+            posteriores if len(posteriores) >= MSGS_RECENTES else historico[-MSGS_RECENTES:]
+        )
+        logger.debug(
+            f"[Summarizer] Conversa {conversa_id}: resumo persistido "
+            f"(até interação {ultima_id}) + {len(msgs_recentes)} recentes"
+        )
+        return persistido["resumo"], msgs_recentes
+
+    # Resumo ainda não gerado: fallback sem LLM até a atualização em background
     msgs_para_resumir = historico[:-MSGS_RECENTES]
     msgs_recentes = historico[-MSGS_RECENTES:]
 
     logger.info(
-        f"[Summarizer] T02.3: Conversa {conversa_id or 'N/A'}: {total_msgs} msgs, "
-        f"sumarizando {len(msgs_para_resumir)} antigas, mantendo {len(msgs_recentes)} recentes"
+        f"[Summarizer] T02.3: Conversa {conversa_id or 'N/A'}: {total_msgs} msgs sem resumo "
+        f"persistido, usando fallback para {len(msgs_para_resumir)} antigas"
     )
 
-    # Gerar resumo das mensagens antigas
-    resumo = await _gerar_resumo(msgs_para_resumir, conversa_id)
+    return _gerar_resumo_fallback(msgs_para_resumir), msgs_recentes
+
+
+async def carregar_resumo(conversa_id: str) -> Optional[Dict]:
+    """
+    Busca o resumo persistido da conversa.
+
+    Args:
+        conversa_id: ID da conversa
+
+    Returns:
+        Dict com resumo, ultima_interacao_id e msgs_resumidas, ou None
+    """
+    try:
+        response = (
+            supabase.table("conversation_summaries")
+            .select("resumo, ultima_interacao_id, msgs_resumidas")
+            .eq("conversation_id", conversa_id)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0] if response.data else None
+    except Exception as e:
+        logger.warning(f"[Summarizer] Erro ao carregar resumo de {conversa_id}: {e}")
+        return None
+
+
+async def atualizar_resumo_conversa(conversa_id: str) -> bool:
+    """
+    Incorpora ao resumo as mensagens que saíram da janela recente.
+
+    Roda em background após o envio da resposta. Só chama o LLM quando a
+    conversa passou do threshold e há pelo menos MIN_MSGS_PARA_INCORPORAR
+    mensagens fora da janela de MSGS_RECENTES ainda não resumidas.
 
-    return resumo, msgs_recentes
+    Args:
+        conversa_id: ID da conversa
+
+    Returns:
+        True se o resumo foi atualizado
+    """
+    if conversa_id in _atualizacoes_em_andamento:
+        return False
+
+    _atualizacoes_em_andamento.add(conversa_id)
+    try:
+        persistido = await carregar_resumo(conversa_id)
+        resumo_anterior = (persistido or {}).get("resumo") or ""
+        ultima_id = (persistido or {}).get("ultima_interacao_id")
+
+        query = (
+            supabase.table("interacoes")
+            .select("id, conteudo, autor_tipo")
+            .eq("conversation_id", conversa_id)
+        )
+        if ultima_id:
+            query = query.gt("id", ultima_id)
+        response = query.order("id").limit(MAX_MSGS_POR_ATUALIZACAO).execute()
+        novas = response.data or []
+
+        # Primeira sumarização só quando a conversa passa do threshold
+        if not persistido and len(novas) <= THRESHOLD_MSGS:
+            return False
+
+        a_incorporar = novas[:-MSGS_RECENTES]
+        if len(a_incorporar) < MIN_MSGS_PARA_INCORPORAR:
+            return False
+
+        # Sem fallback: resumo simplificado não deve ser persistido
+        resumo = await _gerar_resumo(
+            a_incorporar, conversa_id, resumo_anterior, usar_fallback=False
+        )
+        if not resumo:
+            return False
+
+        msgs_resumidas = (persistido or {}).get("msgs_resumidas") or 0
+
+        supabase.table("conversation_summaries").upsert(
+            {
+                "conversation_id": conversa_id,
+                "resumo": resumo,
+                "ultima_interacao_id": a_incorporar[-1]["id"],
+                "msgs_resumidas": msgs_resumidas + len(a_incorporar),
+                "updated_at": agora_utc().isoformat(),
+            },
+            on_conflict="conversation_id",
+        ).execute()
+
+        await registrar_summarization(
+            conversa_id=conversa_id,
+            msgs_originais=msgs_resumidas + len(a_incorporar),
+            msgs_resumidas=len(a_incorporar),
+            tamanho_resumo=len(resumo),
+        )
+        return True
+
+    except Exception as e:
+        logger.warning(f"[Summarizer] Erro ao atualizar resumo de {conversa_id}: {e}")
+        return False
+    finally:
+        _atualizacoes_em_andamento.discard(conversa_id)
 
 
 async def _gerar_resumo(
     mensagens: List[Dict],
     conversa_id: Optional[str] = None,
-) -> str:
+    resumo_anterior: str = "",
+    usar_fallback: bool = True,
+) -> Optional[str]:
     """
     Gera resumo das mensagens usando Claude Haiku.
 
     Args:
         mensagens: Lista de mensagens a sumarizar
         conversa_id: ID da conversa para logging
+        resumo_anterior: Resumo já existente a ser estendido com as mensagens
+        usar_fallback: Se False, retorna None quando o LLM falha
 
     Returns:
         String com resumo da conversa
     """
     if not mensagens:
-        return ""
+        return resumo_anterior
 
     try:
+        from anthropic import AsyncAnthropic
+
         client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
 
         # Formatar mensagens para o prompt
         msgs_formatadas = _formatar_mensagens_para_resumo(mensagens)
 
+        if resumo_anterior:
+            conteudo = f"""Resumo da conversa até aqui:
+{resumo_anterior}
+
+Mensagens seguintes (incorpore ao resumo):
+{msgs_formatadas}
+
+RESUMO ATUALIZADO (máximo 150 palavras, em português):"""
+        else:
+            conteudo = f"""Conversa a resumir:
+{msgs_formatadas}
+
+RESUMO (máximo 150 palavras, em português):"""
+
         prompt = f"""Você é um assistente que resume conversas de WhatsApp.
 
 Resuma a seguinte conversa de forma concisa, mantendo:
@@ -109,10 +256,7 @@ NÃO inclua:
 - Mensagens vazias ou de confirmação simples
 - Detalhes irrelevantes
 
-Conversa a resumir:
-{msgs_formatadas}
-
-RESUMO (máximo 150 palavras, em português):"""
+{conteudo}"""
 
         response = await client.messages.create(
             model="claude-haiku-4-5-20251001",  # Haiku para custo baixo
@@ -131,8 +275,11 @@ RESUMO (máximo 150 palavras, em português):"""
 
     except Exception as e:
         logger.warning(f"[Summarizer] Erro ao gerar resumo: {e}")
+        if not usar_fallback:
+            return None
         # Fallback: resumo simples sem LLM
-        return _gerar_resumo_fallback(mensagens)
+        fallback = _gerar_resumo_fallback(mensagens)
+        return f"{resumo_anterior}\n{fallback}" if resumo_anterior else fallback
 
 
 def _formatar_mensagens_para_resumo(mensagens: List[Dict]) -> str:
@@ -44,12 +44,8 @@ from .models import (
     UsageStats,
 )
 
-# Providers
-from .anthropic_provider import (
-    AnthropicProvider,
-    create_haiku_provider,
-    create_sonnet_provider,
-)
+# Providers (AnthropicProvider e atalhos via __getattr__: o SDK so e
+# importado quando usado)
 from .mock_provider import (
     MockLLMProvider,
     create_mock_that_returns,
@@ -127,3 +123,15 @@ __all__ = [
     "invalidar_cache_medico",
     "obter_metricas_cache",
 ]
+
+_EXPORTS_ANTHROPIC = ("AnthropicProvider", "create_haiku_provider", "create_sonnet_provider")
+
+
+def __getattr__(nome: str):
+    if nome in _EXPORTS_ANTHROPIC:
+        from . import anthropic_provider
+
+        valor = getattr(anthropic_provider, nome)
+        globals()[nome] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
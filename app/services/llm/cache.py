@@ -260,20 +260,29 @@ async def obter_metricas_cache() -> dict:
     """
     Obtém métricas do cache de LLM.
 
+    O cache exato não tem contadores; hits/misses/hit_rate agregam o cache
+    semântico (turnos de template), detalhado por intenção em 'semantico'.
+
     Returns:
         {
             'hits': int,
             'misses': int,
             'hit_rate': float,
+            'cache_enabled': bool,
+            'semantico': {intencao: {hits, misses, hit_rate, ms_economizados}},
         }
-
-    Nota: Implementação básica. Em produção, usar Redis INFO ou métricas customizadas.
     """
-    # Placeholder para métricas futuras
-    # Pode ser implementado com contadores Redis dedicados
+    from app.services.llm.cache_semantico import obter_metricas
+
+    semantico = await obter_metricas()
+    hits = sum(m["hits"] for m in semantico.values())
+    misses = sum(m["misses"] for m in semantico.values())
+    total = hits + misses
     return {
-        "hits": 0,
-        "misses": 0,
-        "hit_rate": 0.0,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 3) if total else 0.0,
         "cache_enabled": True,
+        "ms_economizados": sum(m["ms_economizados"] for m in semantico.values()),
+        "semantico": semantico,
     }
@@ -0,0 +1,387 @@
+"""
+Cache semântico de respostas LLM para turnos de template.
+
+O cache exato (cache.py) quase nunca acerta: a chave inclui o ID do médico e
+mensagens com menos de 3 palavras ficam de fora - justamente os turnos mais
+repetitivos ("oi", "quem é?", "ok obrigado").
+
+Aqui:
+- Só entram mensagens curtas com intenção de template
+  (classificar_intencao). O lookup acontece antes do loop de tools do
+  inbound; o save só se nenhuma tool rodou no turno. Pedidos de vagas
+  ficam de fora: a resposta depende de buscar_vagas e da situação de cada
+  médico;
+- A chave é a intenção + estado da conversa (modo, ação/tom da policy,
+  primeira mensagem), não o médico;
+- Cada chave guarda até MAX_EXEMPLOS mensagens com embedding (Voyage,
+  quantizado em int8) e o template da resposta; o hit exige similaridade
+  >= limiar com alguma delas;
+- O primeiro nome do médico vira a variável {nome} no template e é
+  substituído no hit. Respostas com números (valores, datas, horários) ou
+  outros dados do médico não viram template;
+- Métricas por intenção (hits, misses, ms de LLM economizados) num hash
+  Redis, expostas em obter_metricas_cache();
+- Kill switch por intenção na feature flag 'llm_cache_semantico'
+  (desligado por padrão).
+
+Sem embeddings (VOYAGE_API_KEY ausente) o lookup cai para igualdade do
+texto normalizado dentro da mesma chave.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from app.services.embedding import gerar_embedding
+from app.services.policy.flags import get_llm_cache_semantico_flags
+from app.services.redis import cache_get_json, cache_set_json, redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "llm:sem"
+METRICAS_KEY = f"{CACHE_PREFIX}:metricas"
+TTL_SEGUNDOS = 86400 * 7
+MAX_EXEMPLOS = 16  # Por chave (intenção + estado)
+MAX_PALAVRAS = 8  # Acima disso não é turno de template
+LIMIAR_SIMILARIDADE = 0.92
+VAR_NOME = "{nome}"
+
+# Intenções de template. Casam a mensagem inteira (normalizada, sem acento).
+INTENCOES: dict[str, re.Pattern] = {
+    "saudacao": re.compile(
+        r"^(oi+|ola|opa|e ai|bom dia|boa tarde|boa noite)"
+        r"( (tudo bem|td bem|tudo bom|tudo certo|como vai))?$"
+    ),
+    "quem_e": re.compile(
+        r"^(oi )?(quem (e|eh|fala|e voce|e vc|ta falando)|"
+        r"quem e voce|quem e vc|de onde (e|eh|fala)|que empresa (e essa|e|eh))$"
+    ),
+    "confirmacao": re.compile(
+        r"^(ok|okay|blz|beleza|certo|combinado|show|perfeito|entendi|otimo|joia|"
+        r"obrigad[oa]|valeu|vlw|brigad[oa])( (obrigad[oa]|valeu|entao|sim))?$"
+    ),
+}
+
+# Embeddings recentes por texto normalizado (lookup e save do mesmo turno)
+_embeddings_recentes: "OrderedDict[str, Optional[list[float]]]" = OrderedDict()
+_MAX_EMBEDDINGS_RECENTES = 256
+
+
+def _normalizar(mensagem: str) -> str:
+    """Minúsculas, sem acento, sem pontuação/emoji, espaços simples."""
+    texto = unicodedata.normalize("NFKD", mensagem.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r"[^a-z0-9 ]+", " ", texto)
+    return " ".join(texto.split())
+
+
+def classificar_intencao(mensagem: str) -> Optional[str]:
+    """
+    Retorna a intenção de template da mensagem, se houver.
+
+    Args:
+        mensagem: Texto do médico
+
+    Returns:
+        Nome da intenção (chave de INTENCOES) ou None
+    """
+    texto = _normalizar(mensagem or "")
+    if not texto or len(texto.split()) > MAX_PALAVRAS:
+        return None
+    for intencao, padrao in INTENCOES.items():
+        if padrao.match(texto):
+            return intencao
+    return None
+
+
+def _chave(intencao: str, contexto: dict, mode_info=None, policy_decision=None) -> Optional[str]:
+    """
+    Chave do estado da conversa, ou None se o estado não permite cache.
+    """
+    if contexto.get("controlled_by") == "human":
+        return None
+    estado = {
+        "modo": mode_info.mode.value if mode_info else None,
+        "primeira_msg": bool(contexto.get("primeira_msg")),
+    }
+    if policy_decision is not None:
+        if policy_decision.requires_human or policy_decision.forbid_all:
+            return None
+        estado["acao"] = policy_decision.primary_action.value
+        estado["tom"] = policy_decision.tone.value
+    serializado = json.dumps(estado, sort_keys=True)
+    return f"{CACHE_PREFIX}:{intencao}:{hashlib.sha256(serializado.encode()).hexdigest()[:16]}"
+
+
+# ----------------------------------------------------------------------
+# Template
+# ----------------------------------------------------------------------
+
+
+def _para_template(resposta: str, medico: dict) -> Optional[str]:
+    """
+    Converte a resposta em template reutilizável entre médicos.
+
+    Returns:
+        Template com {nome}, ou None se a resposta tem dados específicos
+    """
+    if not resposta or VAR_NOME in resposta:
+        return None
+    # Valores, datas, horários e contagens dependem da vaga/momento
+    if re.search(r"\d|R\$", resposta):
+        return None
+
+    resposta_norm = _normalizar(resposta)
+    for campo in ("sobrenome", "crm", "especialidade"):
+        valor = medico.get(campo)
+        if valor and _normalizar(str(valor)) in resposta_norm:
+            return None
+
+    nome = (medico.get("primeiro_nome") or "").strip()
+    if len(nome) >= 2:
+        return re.sub(rf"\b{re.escape(nome)}\b", VAR_NOME, resposta)
+    return resposta
+
+
+def _renderizar(template: str, medico: dict) -> Optional[str]:
+    """Substitui as variáveis do médico atual (None se faltar alguma)."""
+    if VAR_NOME not in template:
+        return template
+    nome = (medico.get("primeiro_nome") or "").strip()
+    if not nome:
+        return None
+    return template.replace(VAR_NOME, nome)
+
+
+# ----------------------------------------------------------------------
+# Embeddings
+# ----------------------------------------------------------------------
+
+
+def _quantizar(embedding: list[float]) -> str:
+    """Embedding normalizado -> int8 em base64 (~1.4KB para 1024 dims)."""
+    valores = array("b", (max(-127, min(127, round(x * 127))) for x in embedding))
+    return base64.b64encode(valores.tobytes()).decode()
+
+
+def _dequantizar(texto: str) -> array:
+    valores = array("b")
+    valores.frombytes(base64.b64decode(texto))
+    return valores
+
+
+def _similaridade(embedding: list[float], quantizado: str) -> float:
+    """Cosseno aproximado entre embedding e vetor quantizado."""
+    outro = _dequantizar(quantizado)
+    if len(outro) != len(embedding):
+        return 0.0
+    return sum(a * b for a, b in zip(embedding, outro)) / 127
+
+
+async def _embedding(texto_normalizado: str) -> Optional[list[float]]:
+    """Embedding do texto, reaproveitando o do mesmo turno."""
+    if texto_normalizado in _embeddings_recentes:
+        _embeddings_recentes.move_to_end(texto_normalizado)
+        return _embeddings_recentes[texto_normalizado]
+
+    embedding = await gerar_embedding(texto_normalizado, input_type="query")
+    _embeddings_recentes[texto_normalizado] = embedding
+    if len(_embeddings_recentes) > _MAX_EMBEDDINGS_RECENTES:
+        _embeddings_recentes.popitem(last=False)
+    return embedding
+
+
+# ----------------------------------------------------------------------
+# Métricas
+# ----------------------------------------------------------------------
+
+
+async def _registrar(intencao: str, evento: str, ms_economizados: int = 0) -> None:
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hincrby(METRICAS_KEY, f"{intencao}:{evento}", 1)
+        if ms_economizados:
+            pipe.hincrby(METRICAS_KEY, f"{intencao}:ms_economizados", ms_economizados)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug(f"[LLM Cache semântico] Erro ao registrar métrica: {e}")
+
+
+async def obter_metricas() -> dict:
+    """
+    Métricas por intenção desde o último reset.
+
+    Returns:
+        {intencao: {hits, misses, hit_rate, ms_economizados}, ...}
+    """
+    try:
+        brutos = await redis_client.hgetall(METRICAS_KEY) or {}
+    except Exception as e:
+        logger.warning(f"[LLM Cache semântico] Erro ao ler métricas: {e}")
+        brutos = {}
+
+    metricas = {}
+    for intencao in INTENCOES:
+        hits = int(brutos.get(f"{intencao}:hits", 0))
+        misses = int(brutos.get(f"{intencao}:misses", 0))
+        total = hits + misses
+        metricas[intencao] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "ms_economizados": int(brutos.get(f"{intencao}:ms_economizados", 0)),
+        }
+    return metricas
+
+
+# ----------------------------------------------------------------------
+# API
+# ----------------------------------------------------------------------
+
+
+async def buscar_resposta(
+    mensagem: str,
+    contexto: dict,
+    medico: dict,
+    mode_info=None,
+    policy_decision=None,
+) -> Optional[str]:
+    """
+    Busca resposta de template para a mensagem.
+
+    Args:
+        mensagem: Texto do médico
+        contexto: Contexto montado para o LLM
+        medico: Médico atual (variáveis do template)
+        mode_info: Modo da conversa (Sprint 29)
+        policy_decision: Decisão da policy para este turno
+
+    Returns:
+        Resposta pronta ou None (gerar com o LLM)
+    """
+    intencao = classificar_intencao(mensagem)
+    if not intencao:
+        return None
+
+    try:
+        flags = await get_llm_cache_semantico_flags()
+        if not flags.permite(intencao):
+            return None
+
+        chave = _chave(intencao, contexto, mode_info, policy_decision)
+        if not chave:
+            return None
+
+        exemplos = await cache_get_json(chave) or []
+        encontrado = None
+        if exemplos:
+            encontrado = await _melhor_template(mensagem, exemplos, flags.limiar, medico)
+
+        if encontrado is None:
+            await _registrar(intencao, "misses")
+            return None
+
+        resposta, latencia_ms = encontrado
+        await _registrar(intencao, "hits", latencia_ms)
+        logger.info(
+            "[LLM Cache semântico] Hit",
+            extra={"intencao": intencao, "mensagem_preview": mensagem[:50]},
+        )
+        return resposta
+
+    except Exception as e:
+        logger.warning(f"[LLM Cache semântico] Erro ao buscar: {e}")
+        return None
+
+
+async def _melhor_template(
+    mensagem: str, exemplos: list[dict], limiar: Optional[float], medico: dict
+) -> Optional[tuple[str, int]]:
+    """Renderiza o template do exemplo mais parecido, se acima do limiar."""
+    texto = _normalizar(mensagem)
+    embedding = await _embedding(texto)
+
+    melhor, melhor_score = None, 0.0
+    for exemplo in exemplos:
+        if embedding is not None and exemplo.get("emb"):
+            score = _similaridade(embedding, exemplo["emb"])
+        else:
+            score = 1.0 if exemplo.get("texto") == texto else 0.0
+        if score > melhor_score:
+            melhor, melhor_score = exemplo, score
+
+    if melhor is None or melhor_score < (limiar or LIMIAR_SIMILARIDADE):
+        return None
+    renderizada = _renderizar(melhor["template"], medico)
+    if renderizada is None:
+        return None
+    return renderizada, int(melhor.get("latencia_ms") or 0)
+
+
+async def salvar_resposta(
+    mensagem: str,
+    contexto: dict,
+    medico: dict,
+    resposta: str,
+    latencia_ms: int = 0,
+    mode_info=None,
+    policy_decision=None,
+) -> bool:
+    """
+    Guarda a resposta gerada pelo LLM como exemplo da intenção/estado.
+
+    Args:
+        mensagem: Texto do médico
+        contexto: Contexto montado para o LLM
+        medico: Médico (nome vira variável)
+        resposta: Resposta validada
+        latencia_ms: Tempo da geração (base da métrica de economia)
+        mode_info: Modo da conversa
+        policy_decision: Decisão da policy
+
+    Returns:
+        True se virou exemplo
+    """
+    intencao = classificar_intencao(mensagem)
+    if not intencao:
+        return False
+
+    try:
+        flags = await get_llm_cache_semantico_flags()
+        if not flags.permite(intencao):
+            return False
+
+        chave = _chave(intencao, contexto, mode_info, policy_decision)
+        template = _para_template(resposta, medico)
+        if not chave or not template:
+            return False
+
+        texto = _normalizar(mensagem)
+        embedding = await _embedding(texto)
+        exemplos = await cache_get_json(chave) or []
+
+        # Mesma pergunta já coberta: não duplica
+        for exemplo in exemplos:
+            if exemplo.get("texto") == texto:
+                return False
+
+        exemplos.append(
+            {
+                "texto": texto,
+                "emb": _quantizar(embedding) if embedding else None,
+                "template": template,
+                "latencia_ms": latencia_ms,
+            }
+        )
+        await cache_set_json(chave, exemplos[-MAX_EXEMPLOS:], TTL_SEGUNDOS)
+        return True
+
+    except Exception as e:
+        logger.warning(f"[LLM Cache semântico] Erro ao salvar: {e}")
+        return False
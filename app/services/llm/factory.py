@@ -11,7 +11,6 @@ from functools import lru_cache
 
 from app.core.config import settings
 from .protocol import LLMProvider
-from .anthropic_provider import AnthropicProvider
 
 
 @lru_cache()
@@ -36,6 +35,8 @@ def get_llm_provider(
         "sonnet": settings.LLM_MODEL_COMPLEX,
     }
 
+    from .anthropic_provider import AnthropicProvider
+
     model_id = model_map.get(model, settings.LLM_MODEL)
 
     return AnthropicProvider(model_id=model_id)
@@ -69,6 +70,8 @@ def create_provider(
     Returns:
         LLMProvider configurado
     """
+    from .anthropic_provider import AnthropicProvider
+
     return AnthropicProvider(
         model_id=model_id,
         api_key=api_key,
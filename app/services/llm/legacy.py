@@ -2,31 +2,36 @@
 Cliente Anthropic para geracao de respostas via Claude.
 """
 
-import anthropic
 import asyncio
 from functools import lru_cache
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
+from app.core.lazy import servico_lazy
 from app.services.circuit_breaker import circuit_claude
 
+if TYPE_CHECKING:
+    import anthropic
+
 logger = logging.getLogger(__name__)
 
 
 @lru_cache()
-def get_anthropic_client() -> anthropic.Anthropic:
+def get_anthropic_client() -> "anthropic.Anthropic":
     """
     Retorna cliente Anthropic cacheado.
     """
     if not settings.ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY e obrigatorio")
 
+    import anthropic
+
     return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
 
 
-# Instancia global
-client = get_anthropic_client()
+# Instancia global (SDK carregado no primeiro uso)
+client = servico_lazy("anthropic", get_anthropic_client)
 
 
 async def gerar_resposta(
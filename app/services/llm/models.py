@@ -56,6 +56,11 @@ class Message:
         """Cria mensagem de sistema."""
         return cls(role=MessageRole.SYSTEM, content=content)
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Message":
+        """Cria mensagem a partir do formato API (content pode ser lista de blocos)."""
+        return cls(role=MessageRole(data["role"]), content=data["content"])
+
     def to_dict(self) -> dict:
         """Converte para dict (formato API)."""
         return {"role": self.role.value, "content": self.content}
@@ -76,6 +81,15 @@ class ToolDefinition:
     description: str
     input_schema: Dict[str, Any]
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "ToolDefinition":
+        """Cria definição a partir do formato de API (dict de tool)."""
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            input_schema=data["input_schema"],
+        )
+
     def to_dict(self) -> dict:
         """Converte para formato de API."""
         return {
@@ -178,6 +192,22 @@ class LLMResponse:
         """Verifica se há chamadas de tool."""
         return len(self.tool_calls) > 0
 
+    def content_blocks(self) -> List[dict]:
+        """Conteúdo no formato de blocos da API (para histórico com tool_use)."""
+        blocos = []
+        if self.content:
+            blocos.append({"type": "text", "text": self.content})
+        for tool_call in self.tool_calls:
+            blocos.append(
+                {
+                    "type": "tool_use",
+                    "id": tool_call.id,
+                    "name": tool_call.name,
+                    "input": tool_call.input,
+                }
+            )
+        return blocos
+
     @property
     def input_tokens(self) -> int:
         """Tokens de input usados."""
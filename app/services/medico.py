@@ -5,18 +5,21 @@ Servico para gerenciamento de medicos.
 from typing import Optional
 import logging
 
+from app.models.registros import Medico
 from app.services.supabase import supabase
-from app.services.redis import cache_get_json, cache_set_json, cache_delete
+from app.services.redis import cache_get, cache_set, cache_delete
 from app.core.config import DatabaseConfig
 from app.services.telefone import normalizar_telefone
 
 logger = logging.getLogger(__name__)
 
 
-async def buscar_medico_por_telefone(telefone: str) -> Optional[dict]:
+async def buscar_medico_por_telefone(telefone: str) -> Optional[Medico]:
     """
     Busca medico pelo numero de telefone (com cache).
 
+    O cache guarda o registro serializado de forma compacta (Medico.serializar).
+
     Args:
         telefone: Numero no formato 5511999999999
 
@@ -27,7 +30,7 @@ async def buscar_medico_por_telefone(telefone: str) -> Optional[dict]:
     cache_key = f"medico:telefone:{telefone}"
 
     # Tentar cache primeiro
-    cached = await cache_get_json(cache_key)
+    cached = Medico.desserializar(await cache_get(cache_key))
     if cached:
         logger.debug(f"Cache hit para médico: {telefone[:8]}...")
         return cached
@@ -36,19 +39,17 @@ async def buscar_medico_por_telefone(telefone: str) -> Optional[dict]:
         # Buscar no banco (query otimizada - apenas campos necessários)
         response = (
             supabase.table("clientes")
-            .select(
-                "id, primeiro_nome, sobrenome, telefone, especialidade, crm, status, tags, preferencias_detectadas, stage_jornada"
-            )
+            .select(Medico.projecao())
             .eq("telefone", telefone)
             .limit(1)
             .execute()
         )
 
-        medico = response.data[0] if response.data else None
+        medico = Medico.de_linha(response.data[0]) if response.data else None
 
         # Salvar no cache se encontrado
         if medico:
-            await cache_set_json(cache_key, medico, DatabaseConfig.CACHE_TTL_MEDICO)
+            await cache_set(cache_key, medico.serializar(), DatabaseConfig.CACHE_TTL_MEDICO)
 
         return medico
     except Exception as e:
@@ -56,7 +57,7 @@ async def buscar_medico_por_telefone(telefone: str) -> Optional[dict]:
         return None
 
 
-async def criar_medico(telefone: str, nome: Optional[str] = None, **kwargs) -> Optional[dict]:
+async def criar_medico(telefone: str, nome: Optional[str] = None, **kwargs) -> Optional[Medico]:
     """
     Cria novo registro de medico.
 
@@ -87,7 +88,7 @@ async def criar_medico(telefone: str, nome: Optional[str] = None, **kwargs) -> O
 
         response = supabase.table("clientes").insert(dados).execute()
         logger.info(f"Medico criado: {telefone}")
-        return response.data[0] if response.data else None
+        return Medico.de_linha(response.data[0]) if response.data else None
 
     except Exception as e:
         logger.error(f"Erro ao criar medico: {e}")
@@ -96,7 +97,7 @@ async def criar_medico(telefone: str, nome: Optional[str] = None, **kwargs) -> O
 
 async def buscar_ou_criar_medico(
     telefone: str, nome_whatsapp: Optional[str] = None
-) -> Optional[dict]:
+) -> Optional[Medico]:
     """
     Busca medico existente ou cria novo.
 
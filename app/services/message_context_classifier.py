@@ -6,12 +6,12 @@ Detecta o tipo de interacao para determinar delay apropriado.
 Sprint 22 - Responsividade Inteligente
 """
 
-import re
 import logging
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from app.services.analise_texto import analisar, registrar_padroes
 from app.services.guardrails.types import OutboundContext, OutboundMethod
 
 logger = logging.getLogger(__name__)
@@ -58,27 +58,21 @@ PADROES_PERGUNTA = [
     r"\b(me explica|me fala|me conta)\b",
 ]
 
+registrar_padroes("contexto.aceite", PADROES_ACEITE)
+registrar_padroes("contexto.recusa", PADROES_RECUSA)
+registrar_padroes("contexto.pergunta", PADROES_PERGUNTA)
+
 
 def _detectar_aceite(mensagem: str) -> bool:
     """Detecta se mensagem indica aceite."""
-    msg_lower = mensagem.lower()
-    for padrao in PADROES_ACEITE:
-        if re.search(padrao, msg_lower):
-            # Verificar se nao tem negacao
-            for neg in PADROES_RECUSA:
-                if re.search(neg, msg_lower):
-                    return False
-            return True
-    return False
+    analise = analisar(mensagem)
+    # Aceite so vale sem negacao
+    return analise.tem("contexto.aceite") and not analise.tem("contexto.recusa")
 
 
 def _detectar_pergunta(mensagem: str) -> bool:
     """Detecta se mensagem eh uma pergunta."""
-    msg_lower = mensagem.lower()
-    for padrao in PADROES_PERGUNTA:
-        if re.search(padrao, msg_lower):
-            return True
-    return False
+    return analisar(mensagem).tem("contexto.pergunta")
 
 
 def _classificar_por_mensagem(mensagem: str) -> ContextClassification:
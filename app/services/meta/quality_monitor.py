@@ -21,6 +21,7 @@ from app.services.meta.quality_rules import (
     deve_reativar_chip,
     deve_desativar_chip,
 )
+from app.services.meta.waba_selector import waba_selector
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +149,7 @@ class MetaQualityMonitor:
                 "meta_tier_updated_at": datetime.now(timezone.utc).isoformat(),
             }
         ).eq("id", chip["id"]).execute()
+        waba_selector.atualizar_chip(chip["id"], meta_quality_rating=new_rating)
 
     async def _consultar_quality_api(self, chip: dict) -> Optional[dict]:
         """
@@ -247,6 +249,7 @@ class MetaQualityMonitor:
                     "trust_score": 0,
                 }
             ).eq("id", chip["id"]).execute()
+            waba_selector.atualizar_chip(chip["id"], status="cooldown", trust_score=0)
         except Exception as e:
             logger.error("Erro ao degradar chip %s: %s", chip["id"], e)
 
@@ -282,6 +285,7 @@ class MetaQualityMonitor:
                     "cooldown_until": None,
                 }
             ).eq("id", chip["id"]).execute()
+            waba_selector.atualizar_chip(chip["id"], status="active", trust_score=new_trust)
         except Exception as e:
             logger.error("Erro ao recovery chip %s: %s", chip["id"], e)
 
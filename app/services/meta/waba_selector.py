@@ -6,6 +6,7 @@ Sprint 72: v2 — selecao por quality, custo e capacidade.
 """
 
 import logging
+import time
 from typing import Optional, List
 from dataclasses import dataclass
 
@@ -13,6 +14,14 @@ from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
 
+# Agregados por WABA: recarga completa após este TTL (pega mudanças de
+# outros processos); entre recargas são atualizados incrementalmente.
+WABA_STATS_TTL_SEGUNDOS = 60
+
+# Afinidade telefone -> WABA (inclui resultado negativo)
+AFINIDADE_TTL_SEGUNDOS = 3600
+AFINIDADE_MAX_ENTRADAS = 50_000
+
 
 @dataclass
 class WabaSelection:
@@ -45,8 +54,17 @@ class WabaSelector:
     - Discovery/Campaign → WABA com maior trust medio (protege reputation)
     - Offer/Support → WABA com mais chips ativos (capacidade)
     - Evita WABAs com quality RED
+
+    Agregados por WABA e afinidade telefone -> WABA ficam em memória,
+    para que a seleção no hot path de envio não faça queries.
     """
 
+    def __init__(self):
+        self._chips: dict[str, dict] = {}
+        self._stats: dict[str, WabaStats] = {}
+        self._carregado_em: Optional[float] = None
+        self._afinidade: dict[str, tuple[Optional[str], float]] = {}
+
     async def selecionar_waba(
         self,
         intent: str = "default",
@@ -114,61 +132,127 @@ class WabaSelector:
             return None
 
     async def _agregar_wabas(self) -> List[WabaStats]:
-        """Agrega estatísticas por WABA a partir dos chips."""
+        """Retorna estatísticas por WABA (cache em memória com TTL curto)."""
+        if (
+            self._carregado_em is None
+            or time.monotonic() - self._carregado_em > WABA_STATS_TTL_SEGUNDOS
+        ):
+            await self._carregar_chips()
+
+        return [w for w in self._stats.values() if w.active_chips > 0]
+
+    async def _carregar_chips(self) -> None:
+        """Carrega chips com WABA e recalcula todos os agregados."""
         result = (
             supabase.table("chips")
-            .select("meta_waba_id, status, meta_quality_rating, trust_score")
+            .select("id, meta_waba_id, status, meta_quality_rating, trust_score")
             .not_.is_("meta_waba_id", "null")
             .execute()
         )
 
-        wabas: dict = {}
-        for chip in result.data or []:
-            waba_id = chip["meta_waba_id"]
-            if waba_id not in wabas:
-                wabas[waba_id] = {
-                    "chips": [],
-                    "active": 0,
-                    "trusts": [],
-                    "has_red": False,
-                }
-            w = wabas[waba_id]
-            w["chips"].append(chip)
-            if chip["status"] == "active":
-                w["active"] += 1
-                w["trusts"].append(chip.get("trust_score", 0))
-            if chip.get("meta_quality_rating") == "RED":
-                w["has_red"] = True
-
-        stats = []
-        for waba_id, w in wabas.items():
-            if w["active"] == 0:
-                continue
-            avg_trust = sum(w["trusts"]) / len(w["trusts"]) if w["trusts"] else 0
-            min_q = "GREEN"
-            for c in w["chips"]:
-                q = c.get("meta_quality_rating", "GREEN")
-                if q == "RED":
-                    min_q = "RED"
-                elif q == "YELLOW" and min_q != "RED":
-                    min_q = "YELLOW"
-            stats.append(
-                WabaStats(
-                    waba_id=waba_id,
-                    chip_count=len(w["chips"]),
-                    active_chips=w["active"],
-                    avg_trust=avg_trust,
-                    min_quality=min_q,
-                    has_red=w["has_red"],
-                )
-            )
+        self._chips = {}
+        for i, chip in enumerate(result.data or []):
+            self._chips[chip.get("id") or f"_sem_id_{i}"] = chip
+
+        self._stats = {}
+        for waba_id in {c["meta_waba_id"] for c in self._chips.values()}:
+            self._recalcular_waba(waba_id)
+
+        self._carregado_em = time.monotonic()
+
+    def _recalcular_waba(self, waba_id: str) -> None:
+        """Recalcula o agregado de uma única WABA a partir dos chips em memória."""
+        chips = [c for c in self._chips.values() if c.get("meta_waba_id") == waba_id]
+        if not chips:
+            self._stats.pop(waba_id, None)
+            return
+
+        trusts = [c.get("trust_score", 0) or 0 for c in chips if c["status"] == "active"]
+        min_q = "GREEN"
+        for c in chips:
+            q = c.get("meta_quality_rating", "GREEN")
+            if q == "RED":
+                min_q = "RED"
+            elif q == "YELLOW" and min_q != "RED":
+                min_q = "YELLOW"
+
+        self._stats[waba_id] = WabaStats(
+            waba_id=waba_id,
+            chip_count=len(chips),
+            active_chips=len(trusts),
+            avg_trust=sum(trusts) / len(trusts) if trusts else 0,
+            min_quality=min_q,
+            has_red=min_q == "RED",
+        )
+
+    def atualizar_chip(self, chip_id: str, **campos) -> None:
+        """
+        Aplica mudança de um chip aos agregados em memória.
+
+        Chamado quando trust, quality ou status do chip mudam. Só a WABA
+        afetada (e a anterior, se o chip mudou de WABA) é recalculada.
+
+        Args:
+            chip_id: ID do chip
+            **campos: Campos alterados (status, meta_quality_rating,
+                trust_score, meta_waba_id)
+        """
+        if self._carregado_em is None:
+            return
+
+        chip = self._chips.get(chip_id)
+        if chip is None:
+            if not campos.get("meta_waba_id"):
+                return  # Chip sem WABA não entra nos agregados
+            chip = {"id": chip_id, "status": None}
+            self._chips[chip_id] = chip
 
-        return stats
+        waba_anterior = chip.get("meta_waba_id")
+        chip.update(campos)
+
+        self._recalcular_waba(chip["meta_waba_id"])
+        if waba_anterior and waba_anterior != chip["meta_waba_id"]:
+            self._recalcular_waba(waba_anterior)
+
+    def invalidar(self) -> None:
+        """Força recarga completa dos agregados na próxima seleção."""
+        self._carregado_em = None
+
+    def registrar_afinidade(self, telefone: str, waba_id: Optional[str]) -> None:
+        """
+        Registra a WABA que interagiu por último com o telefone.
+
+        Args:
+            telefone: Número do médico
+            waba_id: WABA usada (None = sem histórico)
+        """
+        if len(self._afinidade) >= AFINIDADE_MAX_ENTRADAS:
+            agora = time.monotonic()
+            self._afinidade = {t: v for t, v in self._afinidade.items() if v[1] > agora}
+            if len(self._afinidade) >= AFINIDADE_MAX_ENTRADAS:
+                self._afinidade.clear()
+
+        self._afinidade[telefone] = (waba_id, time.monotonic() + AFINIDADE_TTL_SEGUNDOS)
 
     async def _buscar_waba_historico(
         self, telefone: str, wabas: List[WabaStats]
     ) -> Optional[WabaStats]:
         """Busca WABA que já interagiu com este telefone."""
+        entrada = self._afinidade.get(telefone)
+        if entrada and entrada[1] > time.monotonic():
+            waba_id = entrada[0]
+        else:
+            waba_id = await self._consultar_waba_historico(telefone)
+
+        if waba_id:
+            for w in wabas:
+                if w.waba_id == waba_id:
+                    return w
+
+        return None
+
+    async def _consultar_waba_historico(self, telefone: str) -> Optional[str]:
+        """Consulta no banco a última WABA usada com o telefone e guarda em cache."""
         try:
             result = (
                 supabase.table("chip_interactions")
@@ -179,17 +263,16 @@ class WabaSelector:
                 .execute()
             )
 
+            waba_id = None
             if result.data:
                 chip_data = result.data[0].get("chips", {})
                 waba_id = chip_data.get("meta_waba_id") if chip_data else None
-                if waba_id:
-                    for w in wabas:
-                        if w.waba_id == waba_id:
-                            return w
+
+            self.registrar_afinidade(telefone, waba_id)
+            return waba_id
         except Exception as e:
             logger.debug("[WabaSelector] Erro ao buscar historico WABA: %s", e)
-
-        return None
+            return None
 
     async def listar_wabas_disponiveis(self) -> list:
         """
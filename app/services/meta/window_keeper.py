@@ -38,22 +38,21 @@ class MetaWindowKeeper:
         """
         Identifica conversas com janelas expirando em 2-4h.
 
+        Usa o índice de expiração do Redis (range scan no sorted set).
+
         Returns:
             Lista de conversas com janelas prestes a expirar
         """
+        from app.services.meta.window_tracker import window_tracker
+
         try:
             now = datetime.now(timezone.utc)
             expiry_min = now + timedelta(hours=self.WINDOW_EXPIRY_HOURS_MIN)
             expiry_max = now + timedelta(hours=self.WINDOW_EXPIRY_HOURS_MAX)
 
-            result = (
-                supabase.table("meta_conversation_windows")
-                .select("chip_id, telefone, window_type, expires_at")
-                .gte("expires_at", expiry_min.isoformat())
-                .lte("expires_at", expiry_max.isoformat())
-                .execute()
-            )
-            return result.data or []
+            # Poda do índice aproveita a varredura periódica
+            await window_tracker.limpar_janelas_expiradas()
+            return await window_tracker.listar_janelas_expirando(expiry_min, expiry_max)
 
         except Exception as e:
             logger.error("[WindowKeeper] Erro ao identificar janelas: %s", e)
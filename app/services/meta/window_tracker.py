@@ -2,11 +2,21 @@
 Meta Conversation Window Tracker — Rastreia janelas de 24h.
 
 Sprint 66 — Dentro da janela: free-form. Fora: template obrigatório.
+
+Estado da janela fica no Redis:
+- Chave por (chip, telefone) com TTL igual à expiração da janela.
+- Sorted set indexado pelo timestamp de expiração (varreduras do WindowKeeper).
+
+Postgres (meta_conversation_windows) é apenas log de auditoria, gravado
+em background.
 """
 
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import List
 
+from app.core.tasks import safe_create_task
+from app.services.redis import redis_client
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -17,6 +27,33 @@ WINDOW_DURATIONS = {
     "click_to_whatsapp": timedelta(hours=72),
 }
 
+WINDOW_KEY_PREFIX = "meta:window"
+WINDOW_INDEX_KEY = "meta:window:expiry"
+
+
+# Tamanho da página na leitura das janelas ativas (PostgREST limita a 1000 linhas)
+PAGINA_REIDRATACAO = 1000
+
+# Lua script: só grava se a janela do banco expira depois da que já está no Redis,
+# para que linhas de auditoria atrasadas não sobrescrevam estado mais recente.
+_LUA_GRAVAR_SE_POSTERIOR = """
+local atual = redis.call("zscore", KEYS[2], ARGV[3])
+if atual and tonumber(atual) >= tonumber(ARGV[2]) and redis.call("exists", KEYS[1]) == 1 then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[1], "EXAT", ARGV[2])
+redis.call("zadd", KEYS[2], ARGV[2], ARGV[3])
+return 1
+"""
+
+
+def _window_key(chip_id: str, telefone: str) -> str:
+    return f"{WINDOW_KEY_PREFIX}:{chip_id}:{telefone}"
+
+
+def _index_member(chip_id: str, telefone: str) -> str:
+    return f"{chip_id}|{telefone}"
+
 
 class MetaWindowTracker:
     """Rastreia janelas de conversa 24h da Meta."""
@@ -32,6 +69,11 @@ class MetaWindowTracker:
         Returns:
             True se janela ativa (pode enviar free-form)
         """
+        try:
+            return bool(await redis_client.exists(_window_key(chip_id, telefone)))
+        except Exception as e:
+            logger.warning(f"[WindowTracker] Redis indisponível, consultando banco: {e}")
+
         try:
             now = datetime.now(timezone.utc).isoformat()
             result = (
@@ -69,51 +111,163 @@ class MetaWindowTracker:
         duration = WINDOW_DURATIONS.get(tipo, timedelta(hours=24))
         expires = now + duration
 
+        try:
+            await self._gravar_redis(chip_id, telefone, tipo, expires)
+
+            logger.debug(
+                f"[WindowTracker] Janela aberta: chip={chip_id[:8]}, "
+                f"tel={telefone[-4:]}, expira={expires.isoformat()}"
+            )
+        except Exception as e:
+            logger.error(f"[WindowTracker] Erro ao abrir janela no Redis: {e}")
+
+        safe_create_task(
+            self._registrar_auditoria(chip_id, telefone, tipo, now, expires),
+            name="meta_window_auditoria",
+        )
+
+    async def _gravar_redis(
+        self, chip_id: str, telefone: str, tipo: str, expires: datetime
+    ) -> None:
+        """Grava a chave da janela e atualiza o índice de expiração."""
+        pipe = redis_client.pipeline()
+        pipe.set(_window_key(chip_id, telefone), tipo, exat=int(expires.timestamp()))
+        pipe.zadd(WINDOW_INDEX_KEY, {_index_member(chip_id, telefone): expires.timestamp()})
+        await pipe.execute()
+
+    async def _registrar_auditoria(
+        self,
+        chip_id: str,
+        telefone: str,
+        tipo: str,
+        opened: datetime,
+        expires: datetime,
+    ) -> None:
+        """Grava a janela no Postgres (log de auditoria)."""
         try:
             supabase.table("meta_conversation_windows").upsert(
                 {
                     "chip_id": chip_id,
                     "telefone": telefone,
-                    "window_opened_at": now.isoformat(),
+                    "window_opened_at": opened.isoformat(),
                     "window_expires_at": expires.isoformat(),
                     "window_type": tipo,
-                    "created_at": now.isoformat(),
+                    "created_at": opened.isoformat(),
                 },
                 on_conflict="chip_id,telefone",
             ).execute()
+        except Exception as e:
+            logger.error(f"[WindowTracker] Erro ao registrar auditoria da janela: {e}")
 
-            logger.debug(
-                f"[WindowTracker] Janela aberta: chip={chip_id[:8]}, "
-                f"tel={telefone[-4:]}, expira={expires.isoformat()}"
+    async def listar_janelas_expirando(self, inicio: datetime, fim: datetime) -> List[dict]:
+        """
+        Lista janelas que expiram no intervalo [inicio, fim].
+
+        Args:
+            inicio: Limite inferior da expiração
+            fim: Limite superior da expiração
+
+        Returns:
+            Lista de dicts com chip_id, telefone, window_type e expires_at
+        """
+        membros = await redis_client.zrangebyscore(
+            WINDOW_INDEX_KEY, inicio.timestamp(), fim.timestamp(), withscores=True
+        )
+        if not membros:
+            return []
+
+        pares = [membro.split("|", 1) for membro, _ in membros]
+        tipos = await redis_client.mget([_window_key(c, t) for c, t in pares])
+
+        janelas = []
+        for (chip_id, telefone), (_, score), tipo in zip(pares, membros, tipos):
+            if tipo is None:
+                # Chave expirou ou foi removida; índice será podado
+                continue
+            janelas.append(
+                {
+                    "chip_id": chip_id,
+                    "telefone": telefone,
+                    "window_type": tipo,
+                    "expires_at": datetime.fromtimestamp(score, timezone.utc).isoformat(),
+                }
             )
-        except Exception as e:
-            logger.error(f"[WindowTracker] Erro ao abrir janela: {e}")
+        return janelas
 
     async def limpar_janelas_expiradas(self) -> int:
         """
-        Remove janelas expiradas do banco.
+        Poda entradas expiradas do índice de expiração no Redis.
 
-        Deve ser chamado periodicamente por um job.
+        As chaves de janela expiram sozinhas (TTL) e o Postgres é mantido
+        como histórico, então só o sorted set precisa de poda.
 
         Returns:
-            Número de janelas removidas
+            Número de entradas removidas do índice
         """
         try:
-            now = datetime.now(timezone.utc).isoformat()
-            result = (
-                supabase.table("meta_conversation_windows")
-                .delete()
-                .lt("window_expires_at", now)
-                .execute()
-            )
-            count = len(result.data) if result.data else 0
+            now = datetime.now(timezone.utc).timestamp()
+            count = await redis_client.zremrangebyscore(WINDOW_INDEX_KEY, "-inf", now)
             if count > 0:
-                logger.info(f"[WindowTracker] {count} janelas expiradas removidas")
+                logger.info(f"[WindowTracker] {count} janelas expiradas removidas do índice")
             return count
         except Exception as e:
             logger.error(f"[WindowTracker] Erro ao limpar janelas: {e}")
             return 0
 
+    async def reidratar_do_banco(self) -> int:
+        """
+        Carrega no Redis as janelas ativas registradas no Postgres.
+
+        Usado no startup para cobrir janelas abertas antes do Redis
+        ser a fonte de verdade (ou após perda do Redis). Lê o banco em
+        páginas e só grava quando a janela do banco expira depois da
+        que já está no Redis.
+
+        Returns:
+            Número de janelas carregadas
+        """
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            janelas: List[dict] = []
+            inicio = 0
+            while True:
+                result = (
+                    supabase.table("meta_conversation_windows")
+                    .select("chip_id, telefone, window_type, window_expires_at")
+                    .gt("window_expires_at", now)
+                    .order("id")
+                    .range(inicio, inicio + PAGINA_REIDRATACAO - 1)
+                    .execute()
+                )
+                lote = result.data or []
+                janelas.extend(lote)
+                if len(lote) < PAGINA_REIDRATACAO:
+                    break
+                inicio += PAGINA_REIDRATACAO
+
+            pipe = redis_client.pipeline()
+            for janela in janelas:
+                chip_id, telefone = janela["chip_id"], janela["telefone"]
+                expires = datetime.fromisoformat(janela["window_expires_at"])
+                pipe.eval(
+                    _LUA_GRAVAR_SE_POSTERIOR,
+                    2,
+                    _window_key(chip_id, telefone),
+                    WINDOW_INDEX_KEY,
+                    janela.get("window_type") or "user_initiated",
+                    int(expires.timestamp()),
+                    _index_member(chip_id, telefone),
+                )
+            if janelas:
+                await pipe.execute()
+
+            if janelas:
+                logger.info(f"[WindowTracker] {len(janelas)} janelas reidratadas do banco")
+            return len(janelas)
+        except Exception as e:
+            logger.error(f"[WindowTracker] Erro ao reidratar janelas: {e}")
+            return 0
+
 
 # Singleton
 window_tracker = MetaWindowTracker()
@@ -4,10 +4,10 @@ Permite que médicos solicitem parar de receber mensagens.
 """
 
 import logging
-import re
 from typing import Tuple
 
 from app.core.timezone import agora_utc
+from app.services.analise_texto import SEM_ACENTO, analisar, registrar_padroes, remover_acentos
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -38,31 +38,14 @@ PADROES_OPTOUT = [
 ]
 
 
+registrar_padroes("optout", PADROES_OPTOUT, normalizacao=SEM_ACENTO)
+
+
 def _normalizar_texto(texto: str) -> str:
     """
     Normaliza texto removendo acentos para matching mais robusto.
     """
-    return (
-        texto.lower()
-        .replace("ã", "a")
-        .replace("á", "a")
-        .replace("â", "a")
-        .replace("à", "a")
-        .replace("é", "e")
-        .replace("ê", "e")
-        .replace("è", "e")
-        .replace("í", "i")
-        .replace("î", "i")
-        .replace("ì", "i")
-        .replace("ó", "o")
-        .replace("ô", "o")
-        .replace("õ", "o")
-        .replace("ò", "o")
-        .replace("ú", "u")
-        .replace("û", "u")
-        .replace("ù", "u")
-        .replace("ç", "c")
-    )
+    return remover_acentos(texto)
 
 
 def detectar_optout(texto: str) -> Tuple[bool, str]:
@@ -78,12 +61,10 @@ def detectar_optout(texto: str) -> Tuple[bool, str]:
     if not texto:
         return False, ""
 
-    texto_normalizado = _normalizar_texto(texto)
-
-    for padrao in PADROES_OPTOUT:
-        if re.search(padrao, texto_normalizado):
-            logger.info(f"Opt-out detectado: padrao '{padrao}' em '{texto[:50]}'")
-            return True, padrao
+    ocorrencia = analisar(texto).primeira("optout")
+    if ocorrencia:
+        logger.info(f"Opt-out detectado: padrao '{ocorrencia.padrao}' em '{texto[:50]}'")
+        return True, ocorrencia.padrao
 
     return False, ""
 
@@ -3,6 +3,7 @@ Multi-chip envio outbound.
 
 Sprint 58 E04 - Extraido de sender.py.
 Sprint 26 E02 - Integracao com ChipSelector para multi-chip.
+Envio pela fila de cada chip (chips/ator_envio.py).
 """
 
 import logging
@@ -69,8 +70,8 @@ async def _enviar_via_multi_chip(
     Returns:
         Dict com resultado do envio
     """
+    from app.services.chips.ator_envio import atores_envio
     from app.services.chips.selector import chip_selector
-    from app.services.chips.sender import enviar_via_chip
 
     tipo_mensagem = _determinar_tipo_mensagem(ctx)
 
@@ -88,43 +89,17 @@ async def _enviar_via_multi_chip(
         )
         return {"fallback": True}
 
-    # Simular digitacao se necessario
-    if simular_digitacao:
-        from app.services.whatsapp_providers import get_provider
-        import asyncio
-
-        provider = get_provider(chip)
-        tempo = tempo_digitacao or 1.5
-
-        # Enviar presence "composing"
-        try:
-            # Evolution API: /chat/presence/{instance}
-            if chip.get("provider") == "evolution":
-                from app.services.http_client import get_http_client
-
-                client = await get_http_client()
-                await client.post(
-                    f"{provider.base_url}/chat/presence/{provider.instance_name}",
-                    headers=provider.headers,
-                    json={
-                        "number": telefone,
-                        "delay": int(tempo * 1000),
-                        "presence": "composing",
-                    },
-                    timeout=5,
-                )
-        except Exception as e:
-            logger.debug(f"[MultiChip] Erro ao enviar presence: {e}")
-
-        await asyncio.sleep(tempo)
-
     # Sprint 66: Extrair template_info da metadata (para chips Meta)
     template_info = None
     if hasattr(ctx, "metadata") and ctx.metadata:
         template_info = ctx.metadata.get("meta_template")
 
-    # Enviar mensagem
-    result = await enviar_via_chip(chip, telefone, texto, template_info=template_info)
+    # Enviar pela fila do chip: presence "composing" e envio sao eventos
+    # agendados pelo ator, sem sleep ocupando o worker ou uma vaga de envio
+    tempo = (tempo_digitacao or 1.5) if simular_digitacao else 0.0
+    result = await atores_envio.enviar(
+        chip, telefone, texto, template_info=template_info, tempo_digitacao=tempo
+    )
 
     # Registrar envio para metricas
     if result.success and ctx.conversation_id:
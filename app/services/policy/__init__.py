@@ -35,9 +35,11 @@ from .types import (
 from .repository import (
     load_doctor_state,
     save_doctor_state_updates,
+    aplicar_updates_em_memoria,
     create_default_state,
     resolve_objection,
     buscar_states_para_decay,
+    invalidar_cache_states,
 )
 
 from .state_update import StateUpdate, state_updater
@@ -112,9 +114,11 @@ __all__ = [
     # Repository
     "load_doctor_state",
     "save_doctor_state_updates",
+    "aplicar_updates_em_memoria",
     "create_default_state",
     "resolve_objection",
     "buscar_states_para_decay",
+    "invalidar_cache_states",
     # StateUpdate
     "StateUpdate",
     "state_updater",
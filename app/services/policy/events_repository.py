@@ -10,12 +10,21 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from app.services.supabase import supabase
+from app.services.write_behind import write_behind
 from .types import DoctorState, PolicyDecision
 from .version import POLICY_VERSION
 
 logger = logging.getLogger(__name__)
 
 
+def _gravar_evento(event_data: dict) -> None:
+    """Grava o evento direto ou no lote do write-behind (se ativo)."""
+    if write_behind.ativo:
+        write_behind.enfileirar("policy_events", event_data)
+    else:
+        supabase.table("policy_events").insert(event_data).execute()
+
+
 async def persist_decision(
     event_id: str,
     policy_decision_id: str,
@@ -74,7 +83,7 @@ async def persist_decision(
             "conversa_status": conversa_status,
         }
 
-        supabase.table("policy_events").insert(event_data).execute()
+        _gravar_evento(event_data)
 
         logger.debug(f"Decision persistido: {policy_decision_id[:8]}...")
         return True
@@ -122,7 +131,7 @@ async def persist_effect(
             "effect_details": details or {},
         }
 
-        supabase.table("policy_events").insert(event_data).execute()
+        _gravar_evento(event_data)
 
         logger.debug(f"Effect persistido: {effect_type} -> {policy_decision_id[:8]}...")
         return True
@@ -284,6 +293,20 @@ async def update_effect_interaction_id(
     import asyncio
 
     for attempt in range(max_retries):
+        # Effect ainda no lote do write-behind: ajusta antes da gravação
+        pendente = write_behind.buscar_pendente(
+            "policy_events",
+            {
+                "policy_decision_id": policy_decision_id,
+                "effect_type": effect_type,
+                "interaction_id": None,
+            },
+        )
+        if pendente:
+            pendente["interaction_id"] = interaction_id
+            logger.debug(f"Effect pendente atualizado com interaction_id: {interaction_id}")
+            return True
+
         try:
             response = (
                 supabase.table("policy_events")
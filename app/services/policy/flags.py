@@ -56,6 +56,23 @@ class CampaignsFlags:
     enabled: bool = True
 
 
+@dataclass
+class LLMCacheSemanticoFlags:
+    """Flags do cache semântico de respostas (kill switch por intenção)."""
+
+    enabled: bool = False  # Default: desligado
+    intents_desligadas: list[str] = None
+    limiar: Optional[float] = None  # None = LIMIAR_SIMILARIDADE do cache
+
+    def __post_init__(self):
+        if self.intents_desligadas is None:
+            self.intents_desligadas = []
+
+    def permite(self, intencao: str) -> bool:
+        """True se o cache está ligado para esta intenção."""
+        return self.enabled and intencao not in self.intents_desligadas
+
+
 @dataclass
 class DisabledRulesFlags:
     """Regras desabilitadas."""
@@ -152,6 +169,26 @@ async def get_campaigns_flags() -> CampaignsFlags:
     return CampaignsFlags(enabled=value.get("enabled", True))
 
 
+async def get_llm_cache_semantico_flags() -> LLMCacheSemanticoFlags:
+    """
+    Retorna flags do cache semântico de respostas LLM.
+
+    Valor esperado: {"enabled": true, "intents_desligadas": ["confirmacao"], "limiar": 0.93}
+
+    Fallback seguro: enabled=False (sempre gera com o LLM)
+    """
+    value = await _get_flag_value("llm_cache_semantico")
+
+    if value is None:
+        return LLMCacheSemanticoFlags()
+
+    return LLMCacheSemanticoFlags(
+        enabled=value.get("enabled", False),
+        intents_desligadas=value.get("intents_desligadas", []),
+        limiar=value.get("limiar"),
+    )
+
+
 async def get_disabled_rules() -> DisabledRulesFlags:
     """
     Retorna lista de regras desabilitadas.
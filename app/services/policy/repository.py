@@ -10,7 +10,7 @@ from typing import Optional
 
 from app.core.timezone import agora_utc
 from app.services.supabase import supabase
-from app.services.redis import cache_get_json, cache_set_json, cache_delete
+from app.services.redis import cache_get_json, cache_set_json, cache_delete, cache_delete_many
 from .types import (
     DoctorState,
     PermissionState,
@@ -103,6 +103,50 @@ def _row_to_state(row: dict) -> DoctorState:
     )
 
 
+_CAMPOS_ENUM = {
+    "permission_state": PermissionState,
+    "temperature_trend": TemperatureTrend,
+    "temperature_band": TemperatureBand,
+    "risk_tolerance": RiskTolerance,
+    "lifecycle_stage": LifecycleStage,
+    "objection_severity": ObjectionSeverity,
+}
+
+_CAMPOS_DATA = {
+    "cooling_off_until",
+    "last_inbound_at",
+    "last_outbound_at",
+    "next_allowed_at",
+    "objection_detected_at",
+    "objection_resolved_at",
+    "last_decay_at",
+}
+
+
+def aplicar_updates_em_memoria(state: DoctorState, updates: dict) -> None:
+    """
+    Aplica no DoctorState os mesmos updates gravados no banco.
+
+    Os updates vêm no formato da coluna (enum como string, data ISO);
+    converte para os tipos do dataclass, como `_row_to_state` faz na leitura.
+
+    Args:
+        state: Estado em memória (alterado no lugar)
+        updates: Campos -> valores, como passados a save_doctor_state_updates
+    """
+    for campo, valor in updates.items():
+        if not hasattr(state, campo):
+            continue
+        if campo in _CAMPOS_ENUM and valor is not None:
+            try:
+                valor = _CAMPOS_ENUM[campo](valor)
+            except ValueError:
+                continue
+        elif campo in _CAMPOS_DATA:
+            valor = _parse_datetime(valor)
+        setattr(state, campo, valor)
+
+
 async def load_doctor_state(cliente_id: str) -> Optional[DoctorState]:
     """
     Carrega estado do médico.
@@ -195,6 +239,24 @@ async def save_doctor_state_updates(cliente_id: str, updates: dict) -> bool:
         return False
 
 
+async def invalidar_cache_states(cliente_ids: list[str]) -> int:
+    """
+    Invalida o cache de varios doctor_state de uma vez.
+
+    Usado pelos jobs de manutencao em lote, que atualizam o banco direto
+    via RPC sem passar por save_doctor_state_updates.
+
+    Args:
+        cliente_ids: IDs dos medicos alterados
+
+    Returns:
+        Quantidade de chaves removidas
+    """
+    if not cliente_ids:
+        return 0
+    return await cache_delete_many([f"{CACHE_PREFIX}:{cliente_id}" for cliente_id in cliente_ids])
+
+
 async def resolve_objection(cliente_id: str) -> bool:
     """
     Marca objeção como resolvida.
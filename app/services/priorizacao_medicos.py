@@ -8,12 +8,20 @@ Critérios de priorização (em ordem):
 2. Qualification score alto
 3. Nunca foi contatado (novo na base)
 4. Tempo desde última interação (nem muito recente, nem muito antigo)
+
+Priorização em lote: MatrizPriorizacao guarda as features de todos os
+candidatos em arrays NumPy (histórico vem de uma única RPC agregada) e
+pontua todos de uma vez. executar_oferta_automatica monta a matriz uma vez
+por ciclo e a reutiliza para todas as vagas urgentes.
 """
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import numpy as np
+
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -29,6 +37,7 @@ PESO_QUALIFICATION_SCORE = 50  # Multiplicado pelo score (0-1)
 PESO_NUNCA_CONTATADO = 30  # Novo na base
 PESO_TEMPO_IDEAL = 20  # Entre 7-30 dias desde último contato
 PESO_ESPECIALIDADE_MATCH = 40  # Match exato de especialidade
+PENALIDADE_CONTATO_RECENTE = 50  # Contatado há menos de DIAS_CONTATO_MINIMO
 
 # Intervalo ideal de contato (nem muito recente, nem muito antigo)
 DIAS_CONTATO_MINIMO = 7  # Não contatar se contatou nos últimos 7 dias
@@ -55,36 +64,17 @@ async def priorizar_medicos(medicos: list[dict], vaga: dict, limite: int = 5) ->
     if not medicos:
         return []
 
-    # Calcular score para cada médico
-    medicos_com_score = []
-
-    for medico in medicos:
-        score = await calcular_score_priorizacao(medico, vaga)
-        medicos_com_score.append(
-            {
-                **medico,
-                "_prioridade_score": score,
-            }
-        )
-
-    # Ordenar por score (maior primeiro)
-    medicos_ordenados = sorted(
-        medicos_com_score, key=lambda m: m["_prioridade_score"], reverse=True
-    )
-
-    # Remover score interno antes de retornar
-    resultado = []
-    for medico in medicos_ordenados[:limite]:
-        medico_limpo = {k: v for k, v in medico.items() if not k.startswith("_")}
-        resultado.append(medico_limpo)
-
-    return resultado
+    matriz = await montar_matriz_priorizacao(medicos)
+    return matriz.priorizar(vaga, limite)
 
 
 async def calcular_score_priorizacao(medico: dict, vaga: dict) -> float:
     """
     Calcula score de priorização para um médico.
 
+    Versão unitária (uma query de histórico). Para vários médicos use
+    MatrizPriorizacao, que aplica as mesmas regras em lote.
+
     Args:
         medico: Dados do médico
         vaga: Dados da vaga
@@ -120,7 +110,7 @@ async def calcular_score_priorizacao(medico: dict, vaga: dict) -> float:
 
             # Penalizar se contatou muito recentemente
             if dias < DIAS_CONTATO_MINIMO:
-                score -= 50  # Penalidade por contato recente
+                score -= PENALIDADE_CONTATO_RECENTE
 
             # Bonus se está no intervalo ideal
             elif dias <= DIAS_CONTATO_IDEAL_MAX:
@@ -188,6 +178,186 @@ async def verificar_historico_positivo(cliente_id: str, hospital_id: Optional[st
         return {"tem_historico": False, "total_plantoes": 0}
 
 
+# =============================================================================
+# PRIORIZAÇÃO EM LOTE
+# =============================================================================
+
+TAMANHO_LOTE_HISTORICO = 500  # IDs por chamada da RPC de histórico
+
+
+async def buscar_historico_lote(cliente_ids: list[str]) -> dict[str, int]:
+    """
+    Conta plantões fechados/realizados de vários médicos numa query agregada.
+
+    Usa a RPC historico_plantoes_por_medico (migrations/priorizacao_historico_rpc.sql).
+
+    Args:
+        cliente_ids: IDs dos médicos
+
+    Returns:
+        Dict cliente_id -> total de plantões (só médicos com histórico)
+    """
+    totais: dict[str, int] = {}
+    for i in range(0, len(cliente_ids), TAMANHO_LOTE_HISTORICO):
+        lote = cliente_ids[i : i + TAMANHO_LOTE_HISTORICO]
+        try:
+            response = supabase.rpc(
+                "historico_plantoes_por_medico", {"p_cliente_ids": lote}
+            ).execute()
+            for row in response.data or []:
+                totais[str(row["cliente_id"])] = int(row["total_plantoes"])
+        except Exception as e:
+            logger.error(f"Erro ao buscar histórico em lote: {e}")
+    return totais
+
+
+def _dias_desde(valor, agora: datetime) -> float:
+    """Dias inteiros desde a data ISO (nan se ausente ou inválida)."""
+    if not valor:
+        return np.nan
+    try:
+        return float((agora - datetime.fromisoformat(valor.replace("Z", "+00:00"))).days)
+    except (ValueError, TypeError, AttributeError):
+        return np.nan
+
+
+def _nome_especialidade_vaga(vaga: dict) -> str:
+    if vaga.get("especialidades") and isinstance(vaga["especialidades"], dict):
+        return (vaga["especialidades"].get("nome") or "").lower()
+    return ""
+
+
+@dataclass
+class MatrizPriorizacao:
+    """
+    Features dos candidatos alinhadas por índice com medicos.
+
+    Especialidades viram códigos (índice em especialidades) para que o match
+    com a vaga seja calculado uma vez por especialidade distinta e espalhado
+    por indexação.
+    """
+
+    medicos: list[dict]
+    historico: np.ndarray  # bool
+    qualification: np.ndarray  # float
+    nunca_contatado: np.ndarray  # bool
+    dias_contato: np.ndarray  # float, nan sem contato
+    codigos_especialidade: np.ndarray  # int
+    especialidades: list[str]  # minúsculas, "" = sem especialidade
+
+    def __len__(self) -> int:
+        return len(self.medicos)
+
+    def _por_especialidade(self, valores: list[float]) -> np.ndarray:
+        return np.asarray(valores, dtype=float)[self.codigos_especialidade]
+
+    def pontuar(self, vaga: dict) -> np.ndarray:
+        """
+        Score de todos os candidatos (mesmas regras de calcular_score_priorizacao).
+
+        Args:
+            vaga: Dados da vaga
+
+        Returns:
+            Array de scores alinhado com medicos
+        """
+        score = np.where(self.historico, float(PESO_HISTORICO_POSITIVO), 0.0)
+        score += PESO_QUALIFICATION_SCORE * self.qualification
+        score += np.where(self.nunca_contatado, PESO_NUNCA_CONTATADO, 0.0)
+
+        # Comparações com nan dão False: sem contato não pontua
+        recente = self.dias_contato < DIAS_CONTATO_MINIMO
+        ideal = ~recente & (self.dias_contato <= DIAS_CONTATO_IDEAL_MAX)
+        score -= np.where(recente, PENALIDADE_CONTATO_RECENTE, 0.0)
+        score += np.where(ideal, PESO_TEMPO_IDEAL, 0.0)
+
+        esp_vaga = _nome_especialidade_vaga(vaga)
+        if esp_vaga:
+            bonus = []
+            for esp in self.especialidades:
+                if esp and esp == esp_vaga:
+                    bonus.append(PESO_ESPECIALIDADE_MATCH)
+                elif esp and (esp in esp_vaga or esp_vaga in esp):
+                    bonus.append(PESO_ESPECIALIDADE_MATCH * 0.5)
+                else:
+                    bonus.append(0.0)
+            score += self._por_especialidade(bonus)
+
+        return score
+
+    def compativeis(self, vaga: dict) -> np.ndarray:
+        """
+        Máscara de candidatos cuja especialidade contém a da vaga.
+
+        Mesmo filtro de buscar_medicos_compativeis_para_vaga; vaga sem
+        especialidade aceita todos.
+        """
+        esp_vaga = _nome_especialidade_vaga(vaga)
+        if not esp_vaga:
+            return np.ones(len(self), dtype=bool)
+        tabela = [1.0 if esp and esp_vaga in esp else 0.0 for esp in self.especialidades]
+        return self._por_especialidade(tabela).astype(bool)
+
+    def priorizar(
+        self, vaga: dict, limite: int = 5, mascara: Optional[np.ndarray] = None
+    ) -> list[dict]:
+        """
+        Top médicos por score (empates mantêm a ordem de entrada).
+
+        Args:
+            vaga: Dados da vaga
+            limite: Máximo de médicos a retornar
+            mascara: Opcional - só considera candidatos marcados
+
+        Returns:
+            Médicos ordenados, sem campos internos (prefixo "_")
+        """
+        if not len(self):
+            return []
+        scores = self.pontuar(vaga)
+        indices = np.arange(len(self)) if mascara is None else np.flatnonzero(mascara)
+        ordem = indices[np.argsort(-scores[indices], kind="stable")][:limite]
+        return [{k: v for k, v in self.medicos[i].items() if not k.startswith("_")} for i in ordem]
+
+
+async def montar_matriz_priorizacao(medicos: list[dict]) -> MatrizPriorizacao:
+    """
+    Monta a matriz de features de um conjunto de candidatos.
+
+    Uma chamada de histórico em lote para todos; o resto vem dos próprios
+    registros. Pode ser reutilizada para várias vagas no mesmo ciclo.
+
+    Args:
+        medicos: Médicos candidatos
+
+    Returns:
+        MatrizPriorizacao
+    """
+    historico = await buscar_historico_lote([m["id"] for m in medicos]) if medicos else {}
+    agora = datetime.now(timezone.utc)
+
+    codigos: dict[str, int] = {}
+    codigos_especialidade = [
+        codigos.setdefault((m.get("especialidade") or "").lower(), len(codigos)) for m in medicos
+    ]
+
+    return MatrizPriorizacao(
+        medicos=medicos,
+        historico=np.array([historico.get(str(m["id"]), 0) > 0 for m in medicos], dtype=bool),
+        qualification=np.array(
+            [float(m.get("qualification_score") or 0) for m in medicos], dtype=float
+        ),
+        nunca_contatado=np.array(
+            [(m.get("total_interacoes") or 0) == 0 for m in medicos], dtype=bool
+        ),
+        dias_contato=np.array(
+            [_dias_desde(m.get("ultima_mensagem_data"), agora) for m in medicos], dtype=float
+        ),
+        codigos_especialidade=np.array(codigos_especialidade, dtype=np.intp),
+        especialidades=list(codigos),
+    )
+
+
 # =============================================================================
 # FUNÇÕES DE FILTRO
 # =============================================================================
@@ -6,13 +6,20 @@ import json
 import logging
 from typing import Optional
 
-from anthropic import Anthropic
+from app.core.lazy import servico_lazy
 from app.services.supabase import supabase
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+def _criar_client():
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+
+client = servico_lazy("anthropic_qualidade", _criar_client)
 
 
 async def avaliar_qualidade_conversa(conversa_id: str) -> Optional[dict]:
@@ -2,16 +2,23 @@
 Cliente Redis para rate limiting e cache.
 """
 
-import redis.asyncio as redis
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from app.core.config import settings
+from app.core.lazy import servico_lazy
 
 logger = logging.getLogger(__name__)
 
-# Cliente Redis global
-redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+
+def _criar_redis_client():
+    import redis.asyncio as redis
+
+    return redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+
+
+# Cliente Redis global (criado no primeiro uso)
+redis_client = servico_lazy("redis", _criar_redis_client)
 
 
 async def verificar_conexao_redis() -> bool:
@@ -74,3 +81,91 @@ async def cache_delete(key: str) -> bool:
     except Exception as e:
         logger.error(f"Erro ao deletar cache {key}: {e}")
         return False
+
+
+async def cache_delete_many(keys: list[str], tamanho_lote: int = 500) -> int:
+    """
+    Remove varias chaves com DEL de multiplas chaves.
+
+    Args:
+        keys: Chaves a remover
+        tamanho_lote: Chaves por comando DEL
+
+    Returns:
+        Quantidade de chaves removidas
+    """
+    removidas = 0
+    for i in range(0, len(keys), tamanho_lote):
+        lote = keys[i : i + tamanho_lote]
+        try:
+            removidas += await redis_client.delete(*lote)
+        except Exception as e:
+            logger.error(f"Erro ao deletar {len(lote)} chaves do cache: {e}")
+    return removidas
+
+
+# Namespaces de cache com invalidacao por geracao
+class CacheNamespace:
+    """
+    Namespace de cache invalidado por contadores de geracao.
+
+    Cada chave embute a geracao global do namespace e a de cada tag que a
+    marca (ex: 'especialidade:<id>'). Invalidar uma tag e um INCR no seu
+    contador: as chaves antigas deixam de ser lidas e expiram pelo TTL,
+    sem varrer o keyspace com KEYS/SCAN.
+
+    Os contadores ficam em '{prefixo}:gen' e '{prefixo}:gen:{tag}', sem TTL.
+    """
+
+    def __init__(self, prefixo: str):
+        """
+        Args:
+            prefixo: Prefixo das chaves do namespace (ex: 'vagas')
+        """
+        self.prefixo = prefixo
+
+    def _chave_geracao(self, tag: Optional[str] = None) -> str:
+        return f"{self.prefixo}:gen:{tag}" if tag else f"{self.prefixo}:gen"
+
+    async def chave(self, sufixo: str, tags: Iterable[str] = ()) -> Optional[str]:
+        """
+        Monta a chave versionada (um MGET dos contadores).
+
+        Se o Redis falhar, retorna None e o chamador pula o cache: uma
+        geracao chutada (ex: 0) poderia apontar para entradas ja invalidadas.
+
+        Args:
+            sufixo: Identificador do item dentro do namespace
+            tags: Tags cuja invalidacao deve descartar o item
+
+        Returns:
+            Chave no formato '{prefixo}:v{global}.{tag1}...:{sufixo}', ou None
+            se nao foi possivel ler as geracoes
+        """
+        contadores = [self._chave_geracao()] + [self._chave_geracao(t) for t in tags]
+        try:
+            geracoes = await redis_client.mget(contadores)
+        except Exception as e:
+            logger.warning(f"Erro ao ler geracoes do cache {self.prefixo}, sem cache: {e}")
+            return None
+
+        versao = ".".join(str(g or 0) for g in geracoes)
+        return f"{self.prefixo}:v{versao}:{sufixo}"
+
+    async def invalidar_tag(self, tag: str) -> bool:
+        """Invalida todas as chaves marcadas com a tag (INCR)."""
+        try:
+            await redis_client.incr(self._chave_geracao(tag))
+            return True
+        except Exception as e:
+            logger.warning(f"Erro ao invalidar tag {tag} do cache {self.prefixo}: {e}")
+            return False
+
+    async def invalidar_tudo(self) -> bool:
+        """Invalida todas as chaves do namespace (INCR da geracao global)."""
+        try:
+            await redis_client.incr(self._chave_geracao())
+            return True
+        except Exception as e:
+            logger.warning(f"Erro ao invalidar cache {self.prefixo}: {e}")
+            return False
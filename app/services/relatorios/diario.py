@@ -4,11 +4,18 @@ Relatorio diario (legado, mantido para compatibilidade).
 Sprint 10 - S10.E3.3
 """
 
-from datetime import timedelta
-from typing import Dict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
 import logging
 
 from app.core.timezone import agora_brasilia
+from app.services.rollups import (
+    FONTE_AVALIACOES,
+    FONTE_CONVERSAS,
+    FONTE_HANDOFFS,
+    FONTE_INTERACOES,
+    somar_rollup,
+)
 from app.services.supabase import supabase
 from app.services.slack import enviar_slack
 
@@ -18,66 +25,31 @@ logger = logging.getLogger(__name__)
 async def gerar_relatorio_diario() -> Dict:
     """Gera relatorio do dia anterior."""
     ontem = agora_brasilia() - timedelta(days=1)
-    inicio = ontem.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    inicio_dia = ontem.replace(hour=0, minute=0, second=0, microsecond=0)
+    inicio = inicio_dia.isoformat()
     fim = ontem.replace(hour=23, minute=59, second=59, microsecond=0).isoformat()
 
     try:
-        conversas_response = (
-            supabase.table("conversations")
-            .select("*")
-            .gte("created_at", inicio)
-            .lte("created_at", fim)
-            .execute()
-        )
-        conversas = conversas_response.data or []
-
-        interacoes_response = (
-            supabase.table("interacoes")
-            .select("*")
-            .gte("created_at", inicio)
-            .lte("created_at", fim)
-            .execute()
-        )
-        interacoes = interacoes_response.data or []
-
-        handoffs_response = (
-            supabase.table("handoffs")
-            .select("*")
-            .gte("created_at", inicio)
-            .lte("created_at", fim)
-            .execute()
-        )
-        handoffs = handoffs_response.data or []
-
-        avaliacoes_response = (
-            supabase.table("avaliacoes_qualidade")
-            .select("score_geral")
-            .gte("created_at", inicio)
-            .lte("created_at", fim)
-            .execute()
-        )
-        avaliacoes = avaliacoes_response.data or []
-
-        total_conversas = len(conversas)
-        total_msgs_recebidas = len([i for i in interacoes if i.get("direcao") == "entrada"])
-        total_msgs_enviadas = len([i for i in interacoes if i.get("direcao") == "saida"])
-        total_handoffs = len(handoffs)
+        totais = await _totais_rollup(inicio_dia, inicio_dia + timedelta(days=1))
+        if totais is None:
+            totais = _totais_brutos(inicio, fim)
+
+        total_conversas = totais["conversas"]
+        total_handoffs = totais["handoffs"]
 
         score_medio = 0
-        if avaliacoes:
-            scores = [a.get("score_geral") for a in avaliacoes if a.get("score_geral")]
-            if scores:
-                score_medio = sum(scores) / len(scores)
+        if totais["pontuadas"]:
+            score_medio = totais["soma_scores"] / totais["pontuadas"]
 
         return {
             "data": ontem.strftime("%d/%m/%Y"),
             "conversas": {
                 "total": total_conversas,
-                "novas": len([c for c in conversas if c.get("created_at") >= inicio]),
+                "novas": total_conversas,
             },
             "mensagens": {
-                "recebidas": total_msgs_recebidas,
-                "enviadas": total_msgs_enviadas,
+                "recebidas": totais["recebidas"],
+                "enviadas": totais["enviadas"],
             },
             "handoffs": {
                 "total": total_handoffs,
@@ -85,7 +57,7 @@ async def gerar_relatorio_diario() -> Dict:
             },
             "qualidade": {
                 "score_medio": round(score_medio, 1),
-                "avaliacoes": len(avaliacoes),
+                "avaliacoes": totais["avaliacoes"],
             },
         }
     except Exception as e:
@@ -93,6 +65,79 @@ async def gerar_relatorio_diario() -> Dict:
         return {"data": ontem.strftime("%d/%m/%Y"), "erro": str(e)}
 
 
+async def _totais_rollup(inicio: datetime, fim: datetime) -> Optional[Dict]:
+    """Totais do dia pelos rollups (None se algum estiver indisponivel)."""
+    linhas = {}
+    for fonte in (FONTE_CONVERSAS, FONTE_INTERACOES, FONTE_HANDOFFS, FONTE_AVALIACOES):
+        resultado = await somar_rollup(fonte, inicio, fim)
+        if resultado is None:
+            return None
+        linhas.update({(fonte, linha.metrica): linha for linha in resultado})
+
+    def contagem(fonte: str, metrica: str) -> int:
+        linha = linhas.get((fonte, metrica))
+        return linha.contagem if linha else 0
+
+    pontuadas = linhas.get((FONTE_AVALIACOES, "pontuadas"))
+    return {
+        "conversas": contagem(FONTE_CONVERSAS, "criadas"),
+        "recebidas": contagem(FONTE_INTERACOES, "entrada"),
+        "enviadas": contagem(FONTE_INTERACOES, "saida"),
+        "handoffs": contagem(FONTE_HANDOFFS, "criados"),
+        "avaliacoes": contagem(FONTE_AVALIACOES, "avaliacoes"),
+        "pontuadas": pontuadas.contagem if pontuadas else 0,
+        "soma_scores": pontuadas.soma if pontuadas else 0,
+    }
+
+
+def _totais_brutos(inicio: str, fim: str) -> Dict:
+    """Totais do dia contando as linhas de origem (sem rollups)."""
+    conversas_response = (
+        supabase.table("conversations")
+        .select("id", count="exact")
+        .gte("created_at", inicio)
+        .lte("created_at", fim)
+        .execute()
+    )
+
+    interacoes_response = (
+        supabase.table("interacoes")
+        .select("direcao")
+        .gte("created_at", inicio)
+        .lte("created_at", fim)
+        .execute()
+    )
+    interacoes = interacoes_response.data or []
+
+    handoffs_response = (
+        supabase.table("handoffs")
+        .select("id", count="exact")
+        .gte("created_at", inicio)
+        .lte("created_at", fim)
+        .execute()
+    )
+
+    avaliacoes_response = (
+        supabase.table("avaliacoes_qualidade")
+        .select("score_geral")
+        .gte("created_at", inicio)
+        .lte("created_at", fim)
+        .execute()
+    )
+    avaliacoes = avaliacoes_response.data or []
+    scores = [a.get("score_geral") for a in avaliacoes if a.get("score_geral")]
+
+    return {
+        "conversas": conversas_response.count or 0,
+        "recebidas": len([i for i in interacoes if i.get("direcao") == "entrada"]),
+        "enviadas": len([i for i in interacoes if i.get("direcao") == "saida"]),
+        "handoffs": handoffs_response.count or 0,
+        "avaliacoes": len(avaliacoes),
+        "pontuadas": len(scores),
+        "soma_scores": sum(scores),
+    }
+
+
 async def enviar_relatorio_slack(relatorio: Dict):
     """Envia relatorio formatado para Slack."""
     if "erro" in relatorio:
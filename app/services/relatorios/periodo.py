@@ -7,6 +7,7 @@ Sprint 10 - S10.E3.3
 from datetime import datetime, timezone
 import logging
 
+from app.services.rollups import FONTE_HANDOFFS, FONTE_INTERACOES, contar_por_metrica
 from app.services.supabase import supabase, contar_interacoes_periodo
 from app.services.slack import enviar_slack
 
@@ -56,8 +57,13 @@ async def gerar_report_periodo(tipo: str = "manha") -> dict:
 async def _coletar_metricas_periodo(inicio: datetime, fim: datetime) -> dict:
     """Coleta metricas do periodo."""
     try:
-        total_enviadas = await contar_interacoes_periodo(inicio, fim, direcao="saida")
-        total_recebidas = await contar_interacoes_periodo(inicio, fim, direcao="entrada")
+        mensagens = await contar_por_metrica(FONTE_INTERACOES, inicio, fim)
+        if mensagens is not None:
+            total_enviadas = mensagens.get("saida", 0)
+            total_recebidas = mensagens.get("entrada", 0)
+        else:
+            total_enviadas = await contar_interacoes_periodo(inicio, fim, direcao="saida")
+            total_recebidas = await contar_interacoes_periodo(inicio, fim, direcao="entrada")
 
         plantoes_resp = (
             supabase.table("vagas")
@@ -68,13 +74,18 @@ async def _coletar_metricas_periodo(inicio: datetime, fim: datetime) -> dict:
             .execute()
         )
 
-        handoffs_resp = (
-            supabase.table("handoffs")
-            .select("id", count="exact")
-            .gte("created_at", inicio.isoformat())
-            .lte("created_at", fim.isoformat())
-            .execute()
-        )
+        handoffs = await contar_por_metrica(FONTE_HANDOFFS, inicio, fim)
+        if handoffs is not None:
+            total_handoffs = handoffs.get("criados", 0)
+        else:
+            handoffs_resp = (
+                supabase.table("handoffs")
+                .select("id", count="exact")
+                .gte("created_at", inicio.isoformat())
+                .lte("created_at", fim.isoformat())
+                .execute()
+            )
+            total_handoffs = handoffs_resp.count or 0
 
         from app.services.deteccao_bot import calcular_taxa_deteccao_periodo
 
@@ -87,7 +98,7 @@ async def _coletar_metricas_periodo(inicio: datetime, fim: datetime) -> dict:
             "msgs_recebidas": total_recebidas,
             "taxa_resposta": round(taxa_resposta, 1),
             "plantoes_fechados": plantoes_resp.count or 0,
-            "handoffs": handoffs_resp.count or 0,
+            "handoffs": total_handoffs,
             "deteccao_bot": deteccao["taxa_percentual"],
             "deteccoes_total": deteccao["deteccoes"],
         }
@@ -0,0 +1,50 @@
+"""
+Rollups de metricas (hora e dia) para relatorios e dashboards.
+
+Uso:
+    from app.services.rollups import contar_por_metrica, FONTE_EVENTOS
+
+    contagens = await contar_por_metrica(FONTE_EVENTOS, inicio, fim)
+    if contagens is None:
+        ...  # Consulta direta (rollups indisponiveis)
+"""
+
+from .repository import (
+    DIMENSAO_CAMPANHA,
+    DIMENSAO_CHIP,
+    DIMENSAO_HOSPITAL,
+    DIMENSAO_TIPO,
+    DIMENSAO_TOTAL,
+    FONTE_AVALIACOES,
+    FONTE_CONVERSAS,
+    FONTE_EVENTOS,
+    FONTE_HANDOFFS,
+    FONTE_INTERACOES,
+    FONTES,
+    LinhaRollup,
+    atualizar_fonte,
+    contar_por_dimensao,
+    contar_por_metrica,
+    listar_watermarks,
+    somar_rollup,
+)
+
+__all__ = [
+    "LinhaRollup",
+    "atualizar_fonte",
+    "contar_por_dimensao",
+    "contar_por_metrica",
+    "listar_watermarks",
+    "somar_rollup",
+    "FONTES",
+    "FONTE_AVALIACOES",
+    "FONTE_CONVERSAS",
+    "FONTE_EVENTOS",
+    "FONTE_HANDOFFS",
+    "FONTE_INTERACOES",
+    "DIMENSAO_CAMPANHA",
+    "DIMENSAO_CHIP",
+    "DIMENSAO_HOSPITAL",
+    "DIMENSAO_TIPO",
+    "DIMENSAO_TOTAL",
+]
@@ -0,0 +1,206 @@
+"""
+Leitura e atualizacao dos rollups de metricas.
+
+As tabelas e RPCs estao em migrations/metricas_rollup.sql: contagens por
+hora e por dia de Brasilia, por fonte, metrica e dimensao. Relatorios e
+dashboards leem uma janela qualquer com rollup_somar (dias e horas inteiras
+dos rollups; bordas, cauda depois do watermark e o trecho antes do inicio da
+cobertura direto da origem).
+
+As leituras devolvem None quando os rollups nao respondem (migration ainda
+nao aplicada, RPC fora do ar): o chamador cai na consulta antiga.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.services.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+# Fontes (tabelas de origem) com rollup
+FONTE_INTERACOES = "interacoes"
+FONTE_EVENTOS = "business_events"
+FONTE_CONVERSAS = "conversations"
+FONTE_HANDOFFS = "handoffs"
+FONTE_AVALIACOES = "avaliacoes_qualidade"
+
+FONTES = (
+    FONTE_INTERACOES,
+    FONTE_EVENTOS,
+    FONTE_CONVERSAS,
+    FONTE_HANDOFFS,
+    FONTE_AVALIACOES,
+)
+
+# Dimensoes (nem toda fonte tem todas; ver a migration)
+DIMENSAO_TOTAL = "total"
+DIMENSAO_CHIP = "chip"
+DIMENSAO_CAMPANHA = "campanha"
+DIMENSAO_HOSPITAL = "hospital"
+DIMENSAO_TIPO = "tipo"
+
+# Linhas por pagina na leitura do rollup_somar (PostgREST limita a 1000)
+PAGINA_ROLLUP = 1000
+
+
+@dataclass(frozen=True)
+class LinhaRollup:
+    """Total de uma metrica para um valor de dimensao na janela."""
+
+    metrica: str
+    valor_dimensao: str
+    contagem: int
+    soma: float = 0.0
+
+
+async def somar_rollup(
+    fonte: str,
+    inicio: datetime,
+    fim: datetime,
+    dimensao: str = DIMENSAO_TOTAL,
+    valor: Optional[str] = None,
+    metricas: Optional[Iterable[str]] = None,
+) -> Optional[list[LinhaRollup]]:
+    """
+    Soma as metricas de uma fonte na janela [inicio, fim).
+
+    Args:
+        fonte: Tabela de origem (FONTES)
+        inicio: Inicio da janela
+        fim: Fim da janela (exclusivo)
+        dimensao: Dimensao de agrupamento
+        valor: Filtra um valor da dimensao (ex: hospital_id)
+        metricas: Restringe as metricas (None = todas)
+
+    Returns:
+        Linhas por metrica e valor de dimensao, ou None se o rollup falhar
+    """
+    params = {
+        "p_fonte": fonte,
+        "p_inicio": inicio.isoformat(),
+        "p_fim": fim.isoformat(),
+        "p_dimensao": dimensao,
+        "p_valor": valor,
+        "p_metricas": list(metricas) if metricas is not None else None,
+    }
+
+    linhas: list[LinhaRollup] = []
+    offset = 0
+    try:
+        while True:
+            response = (
+                supabase.rpc("rollup_somar", params)
+                .order("metrica")
+                .order("valor_dimensao")
+                .range(offset, offset + PAGINA_ROLLUP - 1)
+                .execute()
+            )
+            pagina = response.data or []
+            linhas.extend(
+                LinhaRollup(
+                    metrica=row["metrica"],
+                    valor_dimensao=row.get("valor_dimensao") or "",
+                    contagem=int(row.get("contagem") or 0),
+                    soma=float(row.get("soma") or 0),
+                )
+                for row in pagina
+            )
+            if len(pagina) < PAGINA_ROLLUP:
+                break
+            offset += PAGINA_ROLLUP
+    except Exception as e:
+        logger.warning(f"Rollup {fonte}/{dimensao} indisponivel: {e}")
+        return None
+
+    return linhas
+
+
+async def contar_por_metrica(
+    fonte: str,
+    inicio: datetime,
+    fim: datetime,
+    dimensao: str = DIMENSAO_TOTAL,
+    valor: Optional[str] = None,
+) -> Optional[dict[str, int]]:
+    """
+    Contagem por metrica (um valor de dimensao, ou o total).
+
+    Returns:
+        metrica -> contagem, ou None se o rollup falhar
+    """
+    linhas = await somar_rollup(fonte, inicio, fim, dimensao=dimensao, valor=valor)
+    if linhas is None:
+        return None
+
+    contagens: dict[str, int] = {}
+    for linha in linhas:
+        contagens[linha.metrica] = contagens.get(linha.metrica, 0) + linha.contagem
+    return contagens
+
+
+async def contar_por_dimensao(
+    fonte: str,
+    inicio: datetime,
+    fim: datetime,
+    dimensao: str,
+    metricas: Optional[Iterable[str]] = None,
+) -> Optional[dict[str, dict[str, int]]]:
+    """
+    Contagem por valor de dimensao e metrica.
+
+    Args:
+        metricas: Restringe as metricas (None = todas)
+
+    Returns:
+        valor_dimensao -> {metrica -> contagem}, ou None se o rollup falhar
+    """
+    linhas = await somar_rollup(fonte, inicio, fim, dimensao=dimensao, metricas=metricas)
+    if linhas is None:
+        return None
+
+    resultado: dict[str, dict[str, int]] = {}
+    for linha in linhas:
+        resultado.setdefault(linha.valor_dimensao, {})[linha.metrica] = linha.contagem
+    return resultado
+
+
+async def atualizar_fonte(
+    fonte: str,
+    atraso_minutos: int = 15,
+    historico_dias: int = 35,
+) -> dict:
+    """
+    Atualiza os rollups de uma fonte a partir do watermark.
+
+    Args:
+        fonte: Tabela de origem (FONTES)
+        atraso_minutos: Reprocessa esse tanto antes do watermark (escritas tardias)
+        historico_dias: Janela inicial quando a fonte ainda nao tem watermark
+
+    Returns:
+        Dict com de/ate (janela recalculada) e linhas_hora/linhas_dia gravadas
+    """
+    response = supabase.rpc(
+        "rollup_atualizar_fonte",
+        {
+            "p_fonte": fonte,
+            "p_atraso": f"{atraso_minutos} minutes",
+            "p_historico": f"{historico_dias} days",
+        },
+    ).execute()
+
+    return (response.data or [{}])[0]
+
+
+async def listar_watermarks() -> list[dict]:
+    """Watermark e linhas gravadas na ultima atualizacao de cada fonte."""
+    response = (
+        supabase.table("metricas_rollup_watermarks")
+        .select("fonte, processado_ate, processado_desde, linhas_hora, linhas_dia, atualizado_em")
+        .order("fonte")
+        .execute()
+    )
+    return response.data or []
@@ -5,13 +5,21 @@ Orquestrador principal que usa SessionManager e ToolExecutor.
 Sprint 10 - S10.E2.2
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-
-import anthropic
-
-from app.core.config import settings
+from typing import Awaitable, Callable, Optional
+
+from app.services.llm import (
+    LLMError,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    Message,
+    ToolDefinition,
+    get_llm_provider,
+)
 from app.tools.slack import SLACK_TOOLS
 from app.services.slack.session import SessionManager
 from app.services.slack.tool_executor import ToolExecutor
@@ -35,23 +43,41 @@ PADROES_INCOMPLETO = [
 # Máximo de retries para respostas incompletas
 MAX_RETRIES_INCOMPLETO = 2
 
+MAX_TOKENS = 1024
+
+# Recebe texto parcial (ex: "Vou buscar as metricas...") enquanto as tools rodam
+CallbackParcial = Callable[[str], Awaitable[None]]
+
 
 class AgenteSlack:
     """Agente conversacional da Julia para Slack."""
 
-    def __init__(self, user_id: str, channel_id: str):
+    def __init__(
+        self,
+        user_id: str,
+        channel_id: str,
+        provider: Optional[LLMProvider] = None,
+    ):
         """
         Inicializa o agente.
 
         Args:
             user_id: ID do usuario Slack
             channel_id: ID do canal Slack
+            provider: Provider de LLM (default: get_llm_provider(), resolvido na 1a chamada)
         """
         self.user_id = user_id
         self.channel_id = channel_id
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.session = SessionManager(user_id, channel_id)
         self.executor = ToolExecutor(user_id, channel_id)
+        self._provider = provider
+        self._ao_parcial: Optional[CallbackParcial] = None
+
+    @property
+    def provider(self) -> LLMProvider:
+        if self._provider is None:
+            self._provider = get_llm_provider()
+        return self._provider
 
     # =========================================================================
     # PROPRIEDADES DE COMPATIBILIDADE (backward compat para testes)
@@ -101,41 +127,68 @@ class AgenteSlack:
         """Backward compat: chama executor.formatar_resultado()."""
         return self.executor.formatar_resultado(tool_results)
 
-    async def processar_mensagem(self, texto: str) -> str:
+    async def processar_mensagem(
+        self, texto: str, ao_parcial: Optional[CallbackParcial] = None
+    ) -> str:
         """
         Processa mensagem do gestor e retorna resposta.
 
+        A sessao e carregada uma vez no inicio do turno e salva uma vez no
+        final, qualquer que seja o caminho (confirmacao, briefing ou LLM).
+
         Args:
             texto: Mensagem do gestor
+            ao_parcial: Callback opcional para respostas parciais
 
         Returns:
             Resposta da Julia
         """
+        self._ao_parcial = ao_parcial
+
         # Carregar ou criar sessao
         await self.session.carregar()
 
         # Adicionar mensagem do usuario ao historico
         self.session.adicionar_mensagem("user", texto)
 
-        # Verificar se eh confirmacao de acao pendente
-        if self.session.get_acao_pendente():
-            resposta = await self._processar_confirmacao(texto)
-            if resposta:
-                return resposta
-
-        # Verificar se tem briefing aguardando aprovacao
-        resposta_briefing = await self._verificar_briefing_pendente(texto)
-        if resposta_briefing:
+        try:
+            # Verificar se eh confirmacao de acao pendente
+            if self.session.get_acao_pendente():
+                resposta = await self._processar_confirmacao(texto)
+                if resposta:
+                    return resposta
+
+            # Verificar se tem briefing aguardando aprovacao
+            resposta_briefing = await self._verificar_briefing_pendente(texto)
+            if resposta_briefing:
+                return resposta_briefing
+
+            # Chamar LLM com tools
+            return await self._chamar_llm()
+
+        finally:
+            # Salvar sessao atualizada
             await self.session.salvar()
-            return resposta_briefing
-
-        # Chamar LLM com tools
-        resposta = await self._chamar_llm()
 
-        # Salvar sessao atualizada
-        await self.session.salvar()
+    async def _gerar(self) -> LLMResponse:
+        """Uma chamada ao LLM com o historico atual da sessao."""
+        return await self.provider.generate(
+            LLMRequest(
+                messages=[Message.from_dict(m) for m in self.session.mensagens],
+                system_prompt=SYSTEM_PROMPT_AGENTE.format(contexto=self._preparar_contexto()),
+                tools=[ToolDefinition.from_dict(tool) for tool in SLACK_TOOLS],
+                max_tokens=MAX_TOKENS,
+            )
+        )
 
-        return resposta
+    async def _parcial(self, texto: str) -> None:
+        """Repassa texto parcial ao callback (falha no callback nao interrompe o turno)."""
+        if not self._ao_parcial or not texto.strip():
+            return
+        try:
+            await self._ao_parcial(texto)
+        except Exception as e:
+            logger.warning(f"Erro ao enviar resposta parcial: {e}")
 
     async def _chamar_llm(self, retry_count: int = 0) -> str:
         """
@@ -144,27 +197,15 @@ class AgenteSlack:
         Args:
             retry_count: Número de retries já realizados (para respostas incompletas)
         """
-        # Preparar contexto
-        contexto = self._preparar_contexto()
-
-        # System prompt com contexto
-        system = SYSTEM_PROMPT_AGENTE.format(contexto=contexto)
-
         try:
             # Primeira chamada
-            response = self.client.messages.create(
-                model=settings.LLM_MODEL,
-                max_tokens=1024,
-                system=system,
-                tools=SLACK_TOOLS,
-                messages=self.session.mensagens,
-            )
+            response = await self._gerar()
 
             # Processar resposta (pode ter tool_use)
             return await self._processar_resposta(response, retry_count)
 
-        except anthropic.APIError as e:
-            logger.error(f"Erro na API Anthropic: {e}")
+        except LLMError as e:
+            logger.error(f"Erro no LLM: {e}")
             return "Ops, tive um problema aqui. Tenta de novo?"
 
     def _resposta_parece_incompleta(self, texto: str, stop_reason: str) -> bool:
@@ -198,29 +239,20 @@ class AgenteSlack:
 
         return False
 
-    async def _processar_resposta(self, response, retry_count: int = 0) -> str:
+    async def _processar_resposta(self, response: LLMResponse, retry_count: int = 0) -> str:
         """
         Processa resposta do LLM, executando tools se necessario.
 
         Args:
-            response: Resposta da API Anthropic
+            response: Resposta do LLM
             retry_count: Número de retries já realizados
 
         Returns:
             Texto final para o usuario
         """
-        # Coletar partes da resposta
-        texto_resposta = ""
-        tool_calls = []
-
-        for block in response.content:
-            if block.type == "text":
-                texto_resposta += block.text
-            elif block.type == "tool_use":
-                tool_calls.append(block)
-
-        # Verificar stop_reason
-        stop_reason = getattr(response, "stop_reason", "unknown")
+        texto_resposta = response.content
+        tool_calls = response.tool_calls
+        stop_reason = response.stop_reason
 
         # Se nao tem tool calls, verificar se resposta está incompleta
         if not tool_calls:
@@ -258,22 +290,15 @@ class AgenteSlack:
             self.session.adicionar_mensagem("assistant", texto_resposta)
             return texto_resposta
 
-        # Processar tool calls
-        tool_results = []
-
+        # Acao critica precisa de confirmacao antes de qualquer execucao
         for tool_call in tool_calls:
-            tool_name = tool_call.name
-            tool_input = tool_call.input
-            tool_id = tool_call.id
-
-            # Verificar se eh acao critica que precisa confirmacao
-            if self.executor.is_tool_critica(tool_name, tool_input):
+            if self.executor.is_tool_critica(tool_call.name, tool_call.input):
                 # Guardar acao pendente e pedir confirmacao
                 self.session.set_acao_pendente(
                     {
-                        "tool_name": tool_name,
-                        "tool_input": tool_input,
-                        "tool_id": tool_id,
+                        "tool_name": tool_call.name,
+                        "tool_input": tool_call.input,
+                        "tool_id": tool_call.id,
                         "preview": texto_resposta,
                     }
                 )
@@ -281,43 +306,44 @@ class AgenteSlack:
                 return (
                     texto_resposta
                     if texto_resposta
-                    else self.executor.gerar_preview(tool_name, tool_input)
+                    else self.executor.gerar_preview(tool_call.name, tool_call.input)
                 )
 
-            # Executar tool
-            result = await self.executor.executar(tool_name, tool_input)
+        await self._parcial(texto_resposta)
+
+        # Executar tools em paralelo (consultas independentes)
+        resultados = await asyncio.gather(
+            *(self.executor.executar(tc.name, tc.input) for tc in tool_calls),
+            return_exceptions=True,
+        )
+
+        tool_results = []
+        for tool_call, result in zip(tool_calls, resultados):
+            if isinstance(result, Exception):
+                logger.error(f"Erro na tool {tool_call.name}: {result}")
+                result = {"success": False, "error": str(result)}
+
             tool_results.append(
                 {
                     "type": "tool_result",
-                    "tool_use_id": tool_id,
+                    "tool_use_id": tool_call.id,
                     "content": json.dumps(result, ensure_ascii=False),
                 }
             )
 
             # Salvar no contexto
-            self.session.atualizar_contexto(f"ultimo_{tool_name}", result)
+            self.session.atualizar_contexto(f"ultimo_{tool_call.name}", result)
 
         # Adicionar resposta do assistant com tool_use
-        self.session.adicionar_mensagem("assistant", response.content)
+        self.session.adicionar_mensagem("assistant", response.content_blocks())
 
         # Adicionar resultados das tools
         self.session.adicionar_mensagem("user", tool_results)
 
         # Chamar LLM novamente para formatar resposta
         try:
-            final_response = self.client.messages.create(
-                model=settings.LLM_MODEL,
-                max_tokens=1024,
-                system=SYSTEM_PROMPT_AGENTE.format(contexto=self._preparar_contexto()),
-                tools=SLACK_TOOLS,
-                messages=self.session.mensagens,
-            )
-
-            # Extrair texto da resposta final
-            texto_final = ""
-            for block in final_response.content:
-                if block.type == "text":
-                    texto_final += block.text
+            final_response = await self._gerar()
+            texto_final = final_response.content
 
             self.session.adicionar_mensagem("assistant", texto_final)
             return texto_final
@@ -464,7 +490,9 @@ class AgenteSlack:
 # =============================================================================
 
 
-async def processar_mensagem_slack(texto: str, channel: str, user: str) -> str:
+async def processar_mensagem_slack(
+    texto: str, channel: str, user: str, ao_parcial: Optional[CallbackParcial] = None
+) -> str:
     """
     Processa mensagem do Slack usando o agente.
 
@@ -472,9 +500,10 @@ async def processar_mensagem_slack(texto: str, channel: str, user: str) -> str:
         texto: Texto da mensagem
         channel: ID do canal
         user: ID do usuario
+        ao_parcial: Callback opcional para respostas parciais
 
     Returns:
         Resposta da Julia
     """
     agente = AgenteSlack(user_id=user, channel_id=channel)
-    return await agente.processar_mensagem(texto)
+    return await agente.processar_mensagem(texto, ao_parcial=ao_parcial)
@@ -4,6 +4,7 @@ Gerenciador de sessoes do agente Slack.
 Sprint 10 - S10.E2.2
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional
@@ -38,12 +39,17 @@ class SessionManager:
             Dados da sessao
         """
         try:
-            result = (
-                supabase.table("slack_sessoes")
-                .select("*")
-                .eq("user_id", self.user_id)
-                .eq("channel_id", self.channel_id)
-                .execute()
+            # Client sincrono fora do event loop
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: (
+                    supabase.table("slack_sessoes")
+                    .select("*")
+                    .eq("user_id", self.user_id)
+                    .eq("channel_id", self.channel_id)
+                    .execute()
+                ),
             )
 
             if result.data:
@@ -108,7 +114,13 @@ class SessionManager:
             }
 
             # Upsert
-            supabase.table("slack_sessoes").upsert(data, on_conflict="user_id,channel_id").execute()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None,
+                lambda: supabase.table("slack_sessoes")
+                .upsert(data, on_conflict="user_id,channel_id")
+                .execute(),
+            )
 
         except Exception as e:
             logger.error(f"Erro ao salvar sessao: {e}")
@@ -62,9 +62,12 @@ async def processar_comando(texto: str, channel: str, user: str):
         # Usar agente conversacional
         from app.services.agente_slack import processar_mensagem_slack
 
-        resposta = await processar_mensagem_slack(texto_limpo, channel, user)
+        saida = RespostaProgressiva(channel)
+        resposta = await processar_mensagem_slack(
+            texto_limpo, channel, user, ao_parcial=saida.atualizar
+        )
 
-        await _responder_slack(channel, resposta)
+        await saida.atualizar(resposta)
         await _atualizar_comando(comando_id, resposta, sucesso=True)
 
     except Exception as e:
@@ -79,32 +82,76 @@ async def processar_comando(texto: str, channel: str, user: str):
 # =============================================================================
 
 
-async def _responder_slack(channel: str, mensagem: str):
+async def _responder_slack(channel: str, mensagem: str, ts: Optional[str] = None) -> Optional[str]:
     """
     Envia resposta para o canal do Slack.
+
+    Args:
+        channel: ID do canal
+        mensagem: Texto da mensagem
+        ts: Se informado, edita a mensagem existente (chat.update)
+
+    Returns:
+        ts da mensagem enviada/editada (None se falhou)
     """
     if not settings.SLACK_BOT_TOKEN:
         logger.warning("SLACK_BOT_TOKEN nao configurado")
-        return
+        return None
+
+    metodo = "chat.update" if ts else "chat.postMessage"
+    payload = {"channel": channel, "text": mensagem}
+    if ts:
+        payload["ts"] = ts
+    else:
+        payload["unfurl_links"] = False
 
     try:
         client = await get_http_client()
         response = await client.post(
-            "https://slack.com/api/chat.postMessage",
+            f"https://slack.com/api/{metodo}",
             headers={
                 "Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}",
                 "Content-Type": "application/json",
             },
-            json={"channel": channel, "text": mensagem, "unfurl_links": False},
+            json=payload,
             timeout=10.0,
         )
 
         data = response.json()
         if not data.get("ok"):
             logger.error(f"Erro ao responder Slack: {data.get('error')}")
+            return None
+        return data.get("ts")
 
     except Exception as e:
         logger.error(f"Erro ao enviar resposta Slack: {e}")
+        return None
+
+
+class RespostaProgressiva:
+    """
+    Resposta do agente que evolui numa unica mensagem do Slack.
+
+    A primeira chamada publica a mensagem; as seguintes editam a mesma
+    (chat.update), de modo que o texto parcial ("Vou buscar as metricas...")
+    aparece enquanto as tools rodam e e substituido pela resposta final.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.ts: Optional[str] = None
+        self._ultimo_texto: Optional[str] = None
+
+    async def atualizar(self, texto: str) -> None:
+        """Publica ou edita a mensagem com o texto atual."""
+        if not texto or texto == self._ultimo_texto:
+            return
+        ts = await _responder_slack(self.channel, texto, ts=self.ts)
+        # Edicao falhou: publica nova mensagem para a resposta nao se perder
+        if ts is None and self.ts is not None:
+            ts = await _responder_slack(self.channel, texto)
+        self.ts = ts or self.ts
+        self._ultimo_texto = texto
 
 
 async def _salvar_comando(
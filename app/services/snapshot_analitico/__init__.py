@@ -0,0 +1,50 @@
+"""
+Snapshot analitico local (DuckDB) para as consultas da Helena.
+
+As tabelas de fatos e dimensoes usadas nas metricas sao exportadas de forma
+incremental para um arquivo DuckDB local; agregacoes rodam nele, com cache
+por SQL normalizado, e caem na producao quando o snapshot nao atende.
+
+Uso:
+    from app.services.snapshot_analitico import consultar_analitico
+
+    resultado = await consultar_analitico(sql, fallback=lambda: executar_na_producao(sql))
+    resultado.linhas, resultado.frescor()
+
+Requer o extra opcional duckdb (uv add duckdb); sem ele tudo vai para a producao.
+"""
+
+from .consulta import (
+    FONTE_PRODUCAO,
+    FONTE_SNAPSHOT,
+    ConsultorAnalitico,
+    ResultadoAnalitico,
+    consultar_analitico,
+    consultor_analitico,
+    inicio_da_janela,
+    normalizar_sql,
+    tabelas_referenciadas,
+)
+from .exportador import atualizar_snapshot, exportar_tabela
+from .store import SnapshotAnalitico, SnapshotIndisponivel, snapshot_analitico
+from .tabelas import TABELAS, TABELAS_POR_NOME, TabelaSnapshot
+
+__all__ = [
+    "ConsultorAnalitico",
+    "ResultadoAnalitico",
+    "SnapshotAnalitico",
+    "SnapshotIndisponivel",
+    "TabelaSnapshot",
+    "atualizar_snapshot",
+    "consultar_analitico",
+    "consultor_analitico",
+    "exportar_tabela",
+    "inicio_da_janela",
+    "normalizar_sql",
+    "snapshot_analitico",
+    "tabelas_referenciadas",
+    "FONTE_PRODUCAO",
+    "FONTE_SNAPSHOT",
+    "TABELAS",
+    "TABELAS_POR_NOME",
+]
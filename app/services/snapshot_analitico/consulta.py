@@ -0,0 +1,247 @@
+"""
+Consultas analiticas com snapshot local, cache e fallback para a producao.
+
+Fluxo de consultar_analitico:
+1. Cache por SQL normalizado (invalidado a cada gravacao no snapshot)
+2. Snapshot DuckDB, se todas as tabelas citadas ja foram exportadas, a
+   defasagem esta dentro do limite e a janela da consulta nao vai antes do
+   limite inferior das tabelas exportadas so em parte (sem janela
+   reconhecivel no SQL, essas tabelas nao sao consultadas no snapshot)
+3. Fallback (a consulta original na producao) em qualquer outro caso,
+   inclusive erro do DuckDB (coluna fora do snapshot, sintaxe so do Postgres)
+
+O resultado carrega a origem e ate quando os dados vao, para a Helena
+poder dizer "dados ate 14:35" quando a resposta veio do snapshot.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+from .store import SnapshotAnalitico, snapshot_analitico
+from .tabelas import TABELAS_POR_NOME
+
+logger = logging.getLogger(__name__)
+
+FONTE_SNAPSHOT = "snapshot"
+FONTE_PRODUCAO = "producao"
+
+MAX_CACHE = 256
+
+_RE_TABELA = re.compile(r"\b(?:from|join)\s+([a-z_][a-z0-9_]*)\b(?!\s*\()")
+_RE_CTE = re.compile(r"\b([a-z_][a-z0-9_]*)\s+as\s*\(")
+_RE_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_RE_DATA = re.compile(r"'(\d{4}-\d{2}-\d{2}(?:[ t][0-9:.]+)?(?:z|[+-]\d{2}(?::?\d{2})?)?)'", re.I)
+_RE_INTERVALO = re.compile(
+    r"interval\s*'(\d+)\s*(minute|hour|day|week|month|year)s?'"
+    r"|interval\s*'(\d+)'\s*(minute|hour|day|week|month|year)s?"
+)
+# Unidades arredondadas para cima: na duvida a janela comeca antes (producao)
+_UNIDADES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=31),
+    "year": timedelta(days=366),
+}
+
+
+def normalizar_sql(sql: str) -> str:
+    """
+    Forma canonica do SQL para chave de cache.
+
+    Minusculo e com espacos colapsados fora de literais (o conteudo entre
+    aspas simples e preservado); remove o ';' final.
+    """
+    partes = _RE_LITERAL.split(sql.strip().rstrip(";").strip())
+    return "".join(
+        parte if i % 2 else re.sub(r"\s+", " ", parte.lower()) for i, parte in enumerate(partes)
+    ).strip()
+
+
+def tabelas_referenciadas(sql_normalizado: str) -> set[str]:
+    """Tabelas do snapshot citadas em FROM/JOIN (ignora CTEs e funcoes)."""
+    ctes = set(_RE_CTE.findall(sql_normalizado))
+    return {
+        nome
+        for nome in _RE_TABELA.findall(_RE_LITERAL.sub("''", sql_normalizado))
+        if nome in TABELAS_POR_NOME and nome not in ctes
+    }
+
+
+def inicio_da_janela(sql_normalizado: str) -> Optional[datetime]:
+    """
+    Limite inferior conservador da janela da consulta.
+
+    Pega a data literal mais antiga (ou agora, se nao houver) e subtrai o
+    maior INTERVAL citado, cobrindo tanto `ts >= '2026-10-01'` quanto
+    `ts >= now() - interval '7 days'` e `'2026-10-18'::date - interval '1 day'`.
+
+    Returns:
+        datetime em UTC, ou None se o SQL nao tem janela reconhecivel
+    """
+    datas = []
+    for literal in _RE_DATA.findall(sql_normalizado):
+        try:
+            instante = datetime.fromisoformat(literal.upper().replace("T", " "))
+        except ValueError:
+            continue
+        if instante.tzinfo is None:
+            instante = instante.replace(tzinfo=timezone.utc)
+        datas.append(instante)
+
+    intervalos = [
+        int(qtd or qtd_alt) * _UNIDADES[unidade or unidade_alt]
+        for qtd, unidade, qtd_alt, unidade_alt in _RE_INTERVALO.findall(sql_normalizado)
+    ]
+
+    if not datas and not intervalos:
+        return None
+    base = min(datas) if datas else datetime.now(timezone.utc)
+    return base - max(intervalos, default=timedelta(0))
+
+
+@dataclass
+class ResultadoAnalitico:
+    """Linhas de uma consulta analitica e de onde vieram."""
+
+    linhas: list[dict]
+    fonte: str
+    dados_ate: Optional[datetime] = None
+    cache: bool = False
+
+    def frescor(self) -> dict:
+        """Indicador de frescor para anexar ao retorno das tools."""
+        if self.fonte != FONTE_SNAPSHOT or self.dados_ate is None:
+            return {"fonte": self.fonte, "dados_ate": None, "defasagem_minutos": 0, "cache": False}
+        defasagem = datetime.now(timezone.utc) - self.dados_ate
+        return {
+            "fonte": self.fonte,
+            "dados_ate": self.dados_ate.isoformat(),
+            "defasagem_minutos": max(0, int(defasagem.total_seconds() // 60)),
+            "cache": self.cache,
+        }
+
+
+class ConsultorAnalitico:
+    """Executa consultas no snapshot com cache LRU por SQL normalizado."""
+
+    def __init__(self, snapshot: SnapshotAnalitico, max_cache: int = MAX_CACHE):
+        self.snapshot = snapshot
+        self._cache: OrderedDict[str, tuple[int, list[dict], datetime]] = OrderedDict()
+        self._max_cache = max_cache
+        self._lock = threading.Lock()
+
+    def limpar_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _defasado(dados_ate: datetime, defasagem_maxima_min: int) -> bool:
+        defasagem = (datetime.now(timezone.utc) - dados_ate).total_seconds() / 60
+        if defasagem > defasagem_maxima_min:
+            logger.debug(f"Snapshot analítico defasado ({defasagem:.0f} min), usando produção")
+            return True
+        return False
+
+    def _consultar_snapshot(
+        self, chave: str, sql: str, defasagem_maxima_min: int
+    ) -> Optional[ResultadoAnalitico]:
+        """Consulta sincrona no snapshot; None quando deve cair na producao."""
+        versao = self.snapshot.versao
+        with self._lock:
+            em_cache = self._cache.get(chave)
+            if em_cache and em_cache[0] == versao:
+                self._cache.move_to_end(chave)
+        if em_cache and em_cache[0] == versao:
+            if self._defasado(em_cache[2], defasagem_maxima_min):
+                return None
+            return ResultadoAnalitico(list(em_cache[1]), FONTE_SNAPSHOT, em_cache[2], cache=True)
+
+        watermarks = self.snapshot.watermarks()
+        if not watermarks:
+            return None
+
+        tabelas = tabelas_referenciadas(chave)
+        if any(tabela not in watermarks for tabela in tabelas):
+            return None
+
+        dados_ate = min(watermarks[t] for t in tabelas) if tabelas else min(watermarks.values())
+        if self._defasado(dados_ate, defasagem_maxima_min):
+            return None
+
+        # Tabelas com so parte do historico: a consulta tem que caber nele
+        limites = self.snapshot.limites_inferiores()
+        parciais = [limites[t] for t in tabelas if t in limites]
+        if parciais:
+            inicio = inicio_da_janela(chave)
+            if inicio is None or inicio < max(parciais):
+                logger.debug("Consulta fora do histórico do snapshot analítico, usando produção")
+                return None
+
+        linhas = self.snapshot.consultar(sql)
+
+        with self._lock:
+            self._cache[chave] = (versao, linhas, dados_ate)
+            self._cache.move_to_end(chave)
+            while len(self._cache) > self._max_cache:
+                self._cache.popitem(last=False)
+
+        return ResultadoAnalitico(list(linhas), FONTE_SNAPSHOT, dados_ate)
+
+    async def consultar(
+        self,
+        sql: str,
+        fallback: Callable[[], list[dict]],
+        defasagem_maxima_min: Optional[int] = None,
+    ) -> ResultadoAnalitico:
+        """
+        Executa a consulta no snapshot ou, se nao der, na producao.
+
+        Args:
+            sql: SELECT no dialeto da producao (compativel com DuckDB na maioria dos casos)
+            fallback: Executa a mesma consulta na producao (sincrono)
+            defasagem_maxima_min: Defasagem aceita (default: ANALYTICS_SNAPSHOT_DEFASAGEM_MAX_MIN)
+
+        Returns:
+            ResultadoAnalitico com as linhas e o frescor
+
+        Raises:
+            Exceptions do fallback (erro na producao sobe para o chamador)
+        """
+        if defasagem_maxima_min is None:
+            defasagem_maxima_min = settings.ANALYTICS_SNAPSHOT_DEFASAGEM_MAX_MIN
+
+        if self.snapshot.existe():
+            try:
+                loop = asyncio.get_event_loop()
+                resultado = await loop.run_in_executor(
+                    None, self._consultar_snapshot, normalizar_sql(sql), sql, defasagem_maxima_min
+                )
+                if resultado is not None:
+                    return resultado
+            except Exception as e:
+                logger.debug(f"Snapshot analítico não atendeu a consulta: {e}")
+
+        return ResultadoAnalitico(fallback(), FONTE_PRODUCAO)
+
+
+# Singleton
+consultor_analitico = ConsultorAnalitico(snapshot_analitico)
+
+
+async def consultar_analitico(
+    sql: str,
+    fallback: Callable[[], list[dict]],
+    defasagem_maxima_min: Optional[int] = None,
+) -> ResultadoAnalitico:
+    """Atalho para consultor_analitico.consultar."""
+    return await consultor_analitico.consultar(sql, fallback, defasagem_maxima_min)
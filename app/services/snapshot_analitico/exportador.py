@@ -0,0 +1,143 @@
+"""
+Exportacao incremental da producao para o snapshot analitico.
+
+Tabelas incrementais leem so a janela [watermark - margem, agora), paginada
+e ordenada pela coluna incremental; linhas alteradas dentro da margem sao
+reescritas pelo upsert da chave. Tabelas sem coluna incremental (dimensoes
+pequenas) sao recarregadas por inteiro.
+
+Na primeira carga, entidades mutaveis (historico_completo) vem inteiras; as
+demais tabelas incrementais trazem so HISTORICO_INICIAL, e esse limite
+inferior fica registrado junto do watermark para as consultas saberem ate
+onde o snapshot responde.
+
+O watermark so avanca depois que a janela inteira foi gravada: uma falha no
+meio deixa a tabela no estado anterior e a proxima execucao refaz a janela.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from app.services.supabase import supabase
+
+from .store import SnapshotAnalitico, snapshot_analitico
+from .tabelas import TABELAS, TabelaSnapshot
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_PAGINA = 1000
+
+# Janela da primeira carga de tabelas incrementais sem historico_completo
+HISTORICO_INICIAL = timedelta(days=90)
+
+
+def _buscar_pagina(
+    tabela: TabelaSnapshot, desde: Optional[datetime], ate: datetime, offset: int
+) -> list[dict]:
+    query = supabase.table(tabela.nome).select(",".join(tabela.colunas))
+    if tabela.incremental:
+        if desde is not None:
+            query = query.gte(tabela.coluna_incremental, desde.isoformat())
+        query = query.lt(tabela.coluna_incremental, ate.isoformat()).order(
+            tabela.coluna_incremental
+        )
+    for coluna in tabela.chave:
+        query = query.order(coluna)
+    return query.range(offset, offset + TAMANHO_PAGINA - 1).execute().data or []
+
+
+async def exportar_tabela(
+    tabela: TabelaSnapshot,
+    snapshot: SnapshotAnalitico = snapshot_analitico,
+    agora: Optional[datetime] = None,
+) -> dict:
+    """
+    Atualiza uma tabela do snapshot.
+
+    Args:
+        tabela: Definicao da tabela
+        snapshot: Banco local de destino
+        agora: Limite superior da janela (default: agora)
+
+    Returns:
+        Dict com linhas gravadas, paginas lidas e janela exportada
+    """
+    loop = asyncio.get_event_loop()
+    ate = agora or datetime.now(timezone.utc)
+
+    desde = None
+    # Inicio do historico presente no snapshot (None = tabela inteira)
+    limite_inferior = None
+    if tabela.incremental:
+        watermark = await loop.run_in_executor(None, snapshot.watermark, tabela.nome)
+        if watermark:
+            desde = watermark - tabela.margem
+            limite_inferior = await loop.run_in_executor(
+                None, snapshot.limite_inferior, tabela.nome
+            )
+        elif not tabela.historico_completo:
+            desde = limite_inferior = ate - HISTORICO_INICIAL
+
+    linhas_gravadas = 0
+    paginas = 0
+    acumuladas: list[dict] = []
+    offset = 0
+
+    while True:
+        pagina = await loop.run_in_executor(None, _buscar_pagina, tabela, desde, ate, offset)
+        paginas += 1
+
+        if tabela.incremental:
+            if pagina:
+                linhas_gravadas += await loop.run_in_executor(None, snapshot.gravar, tabela, pagina)
+        else:
+            acumuladas.extend(pagina)
+
+        if len(pagina) < TAMANHO_PAGINA:
+            break
+        offset += TAMANHO_PAGINA
+
+    if not tabela.incremental:
+        linhas_gravadas = await loop.run_in_executor(
+            None, lambda: snapshot.gravar(tabela, acumuladas, substituir=True)
+        )
+
+    await loop.run_in_executor(
+        None, snapshot.registrar_watermark, tabela.nome, ate, linhas_gravadas, limite_inferior
+    )
+
+    return {
+        "linhas": linhas_gravadas,
+        "paginas": paginas,
+        "desde": desde.isoformat() if desde else None,
+        "ate": ate.isoformat(),
+    }
+
+
+async def atualizar_snapshot(
+    tabelas: Iterable[TabelaSnapshot] = TABELAS,
+    snapshot: SnapshotAnalitico = snapshot_analitico,
+) -> dict:
+    """
+    Atualiza todas as tabelas do snapshot (uma falha nao interrompe as demais).
+
+    Returns:
+        Dict tabela -> resultado (ou {"erro": ...})
+    """
+    resultado = {}
+    for tabela in tabelas:
+        inicio = time.perf_counter()
+        try:
+            resumo = await exportar_tabela(tabela, snapshot)
+            resumo["duracao_s"] = round(time.perf_counter() - inicio, 2)
+            resultado[tabela.nome] = resumo
+        except Exception as e:
+            logger.error(f"Erro ao exportar {tabela.nome} para o snapshot analítico: {e}")
+            resultado[tabela.nome] = {"erro": str(e)}
+
+    total = sum(r.get("linhas", 0) for r in resultado.values())
+    logger.info(f"Snapshot analítico atualizado: {total} linhas em {len(resultado)} tabelas")
+    return resultado
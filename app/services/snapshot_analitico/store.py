@@ -0,0 +1,270 @@
+"""
+Armazenamento local (DuckDB) do snapshot analitico.
+
+Uma conexao por processo. Gravacoes sao serializadas por um lock e cada
+lote entra numa transacao; consultas usam cursores proprios e enxergam o
+ultimo estado confirmado.
+
+A conexao sobe com enable_external_access desligado e configuracao
+travada: o SQL da Helena nao consegue ler arquivos nem rede pelo DuckDB.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+from .tabelas import TABELAS, TabelaSnapshot
+
+logger = logging.getLogger(__name__)
+
+TABELA_CONTROLE = "_snapshot_controle"
+
+
+class SnapshotIndisponivel(Exception):
+    """DuckDB nao instalado ou banco local inacessivel."""
+
+    pass
+
+
+def _valor_json(valor):
+    """Converte valores do DuckDB para o formato que o PostgREST devolveria."""
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, UUID):
+        return str(valor)
+    return valor
+
+
+class SnapshotAnalitico:
+    """Banco DuckDB local com as tabelas de TABELAS e seus watermarks."""
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho: Arquivo do banco DuckDB (criado na primeira gravacao)
+        """
+        self.caminho = caminho
+        self._con = None
+        self._lock = threading.Lock()
+        # Incrementa a cada gravacao; usado para invalidar o cache de consultas
+        self.versao = 0
+
+    def existe(self) -> bool:
+        """True se o banco local ja foi criado (sem abrir conexao)."""
+        return self._con is not None or os.path.exists(self.caminho)
+
+    def _conexao(self):
+        if self._con is not None:
+            return self._con
+
+        with self._lock:
+            if self._con is None:
+                try:
+                    import duckdb
+                except ImportError:
+                    raise SnapshotIndisponivel(
+                        "duckdb é necessário para o snapshot analítico. Instale com: uv add duckdb"
+                    )
+
+                diretorio = os.path.dirname(self.caminho)
+                if diretorio:
+                    os.makedirs(diretorio, exist_ok=True)
+
+                con = duckdb.connect(self.caminho)
+                con.execute("SET TimeZone = 'UTC'")
+                for tabela in TABELAS:
+                    colunas = ", ".join(f"{nome} {tipo}" for nome, tipo in tabela.colunas.items())
+                    con.execute(f"CREATE TABLE IF NOT EXISTS {tabela.nome} ({colunas})")
+                con.execute(
+                    f"CREATE TABLE IF NOT EXISTS {TABELA_CONTROLE} ("
+                    "tabela VARCHAR PRIMARY KEY, ate TIMESTAMPTZ, linhas BIGINT, "
+                    "atualizado_em TIMESTAMPTZ, desde TIMESTAMPTZ)"
+                )
+                colunas_controle = {
+                    linha[0] for linha in con.execute(f"DESCRIBE {TABELA_CONTROLE}").fetchall()
+                }
+                if "desde" not in colunas_controle:
+                    # Banco anterior ao limite inferior: nao da para saber ate onde
+                    # cada tabela vai, entao a proxima exportacao recomeca do zero
+                    con.execute(f"ALTER TABLE {TABELA_CONTROLE} ADD COLUMN desde TIMESTAMPTZ")
+                    con.execute(f"DELETE FROM {TABELA_CONTROLE}")
+                con.execute("SET enable_external_access = false")
+                con.execute("SET lock_configuration = true")
+                self._con = con
+                logger.info(f"Snapshot analítico aberto em {self.caminho}")
+
+        return self._con
+
+    # ------------------------------------------------------------------
+    # Gravacao
+    # ------------------------------------------------------------------
+
+    def gravar(self, tabela: TabelaSnapshot, linhas: list[dict], substituir: bool = False) -> int:
+        """
+        Grava um lote de linhas (upsert pela chave).
+
+        Args:
+            tabela: Definicao da tabela
+            linhas: Linhas como vieram do PostgREST
+            substituir: Apaga a tabela inteira antes (recarga completa)
+
+        Returns:
+            Quantidade de linhas gravadas
+        """
+        import pandas as pd
+
+        colunas = list(tabela.colunas)
+        colunas_json = set(tabela.colunas_json())
+        registros = [
+            {
+                coluna: (
+                    json.dumps(linha.get(coluna), ensure_ascii=False)
+                    if coluna in colunas_json and linha.get(coluna) is not None
+                    else linha.get(coluna)
+                )
+                for coluna in colunas
+            }
+            for linha in linhas
+        ]
+        lote = pd.DataFrame.from_records(registros, columns=colunas).astype(object)
+
+        selecao = ", ".join(
+            f"CAST(l.{nome} AS {tipo}) AS {nome}" for nome, tipo in tabela.colunas.items()
+        )
+        casamento = " AND ".join(
+            f"{tabela.nome}.{nome} = CAST(l.{nome} AS {tabela.colunas[nome]})"
+            for nome in tabela.chave
+        )
+
+        con = self._conexao()
+        with self._lock:
+            cursor = con.cursor()
+            try:
+                cursor.execute("BEGIN TRANSACTION")
+                if substituir:
+                    cursor.execute(f"DELETE FROM {tabela.nome}")
+                if registros:
+                    cursor.register("_lote", lote)
+                    if not substituir:
+                        cursor.execute(
+                            f"DELETE FROM {tabela.nome} USING _lote AS l WHERE {casamento}"
+                        )
+                    cursor.execute(
+                        f"INSERT INTO {tabela.nome} ({', '.join(colunas)}) "
+                        f"SELECT {selecao} FROM _lote AS l"
+                    )
+                    cursor.unregister("_lote")
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+            self.versao += 1
+
+        return len(registros)
+
+    def registrar_watermark(
+        self, tabela: str, ate: datetime, linhas: int, desde: Optional[datetime] = None
+    ) -> None:
+        """
+        Marca a tabela como atualizada ate `ate`.
+
+        Args:
+            tabela: Nome da tabela
+            ate: Dados completos ate este instante
+            linhas: Linhas gravadas na exportacao
+            desde: Inicio do historico no snapshot (None = tabela inteira)
+        """
+        con = self._conexao()
+        with self._lock:
+            cursor = con.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT OR REPLACE INTO {TABELA_CONTROLE} "
+                    "(tabela, ate, linhas, atualizado_em, desde) VALUES (?, ?, ?, ?, ?)",
+                    [tabela, ate, linhas, datetime.now(timezone.utc), desde],
+                )
+            finally:
+                cursor.close()
+            self.versao += 1
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def watermarks(self) -> dict[str, datetime]:
+        """Tabela -> dados completos ate (so tabelas ja exportadas)."""
+        if not self.existe():
+            return {}
+        linhas = self.consultar(f"SELECT tabela, ate FROM {TABELA_CONTROLE}")
+        return {
+            linha["tabela"]: datetime.fromisoformat(linha["ate"])
+            for linha in linhas
+            if linha["ate"]
+        }
+
+    def watermark(self, tabela: str) -> Optional[datetime]:
+        """Ultimo watermark da tabela (None se nunca exportada)."""
+        return self.watermarks().get(tabela)
+
+    def limites_inferiores(self) -> dict[str, datetime]:
+        """Tabela -> inicio do historico (so tabelas exportadas parcialmente)."""
+        if not self.existe():
+            return {}
+        linhas = self.consultar(
+            f"SELECT tabela, desde FROM {TABELA_CONTROLE} WHERE desde IS NOT NULL"
+        )
+        return {linha["tabela"]: datetime.fromisoformat(linha["desde"]) for linha in linhas}
+
+    def limite_inferior(self, tabela: str) -> Optional[datetime]:
+        """Inicio do historico da tabela (None = tabela inteira ou nunca exportada)."""
+        return self.limites_inferiores().get(tabela)
+
+    def consultar(self, sql: str) -> list[dict]:
+        """
+        Executa um SELECT no snapshot.
+
+        Returns:
+            Linhas como dicts, com datas em ISO e decimais como float
+
+        Raises:
+            SnapshotIndisponivel: duckdb ausente
+            Exception: erros do DuckDB (tabela/coluna inexistente, sintaxe)
+        """
+        sql = sql.strip().rstrip(";")
+        cursor = self._conexao().cursor()
+        try:
+            # TIMESTAMPTZ vira texto no proprio DuckDB (como o Postgres serializa);
+            # a conversao para datetime no Python exigiria pytz
+            com_fuso = [
+                nome
+                for nome, tipo, *_ in cursor.execute(f"DESCRIBE {sql}").fetchall()
+                if tipo == "TIMESTAMP WITH TIME ZONE"
+            ]
+            if com_fuso:
+                troca = ", ".join(f'CAST("{nome}" AS VARCHAR) AS "{nome}"' for nome in com_fuso)
+                sql = f"SELECT * REPLACE ({troca}) FROM ({sql}) AS _consulta"
+            cursor.execute(sql)
+            colunas = [descricao[0] for descricao in cursor.description]
+            return [
+                {coluna: _valor_json(valor) for coluna, valor in zip(colunas, linha)}
+                for linha in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+
+
+# Singleton
+snapshot_analitico = SnapshotAnalitico(settings.ANALYTICS_SNAPSHOT_PATH)
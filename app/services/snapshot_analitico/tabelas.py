@@ -0,0 +1,198 @@
+"""
+Tabelas espelhadas no snapshot analitico.
+
+Cada tabela declara as colunas exportadas (com o tipo no DuckDB), a chave
+e como e atualizada:
+- coluna_incremental: exporta so linhas com a coluna >= watermark - margem
+  (created_at/ts para tabelas so de insercao, updated_at para as mutaveis)
+- historico_completo: a primeira carga traz a tabela inteira; sem ele, traz
+  so os ultimos dias e o snapshot guarda esse limite inferior (consultas
+  que vao antes dele caem na producao)
+- sem coluna_incremental: tabela pequena, recarregada por inteiro
+
+Colunas de texto livre e telefone ficam de fora (nao servem para
+agregacao e nao precisam ser copiadas para disco local); consultas que
+dependem delas caem na producao.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class TabelaSnapshot:
+    """Definicao de uma tabela do snapshot."""
+
+    nome: str
+    colunas: dict[str, str]  # coluna -> tipo DuckDB
+    chave: tuple[str, ...] = ("id",)
+    coluna_incremental: Optional[str] = None
+    margem: timedelta = field(default=timedelta(minutes=15))
+    historico_completo: bool = False
+
+    @property
+    def incremental(self) -> bool:
+        return self.coluna_incremental is not None
+
+    def colunas_json(self) -> list[str]:
+        return [nome for nome, tipo in self.colunas.items() if tipo == "JSON"]
+
+
+TABELAS: tuple[TabelaSnapshot, ...] = (
+    # Fatos
+    TabelaSnapshot(
+        nome="interacoes",
+        colunas={
+            "id": "VARCHAR",
+            "conversation_id": "VARCHAR",
+            "cliente_id": "VARCHAR",
+            "tipo": "VARCHAR",
+            "direcao": "VARCHAR",
+            "autor_tipo": "VARCHAR",
+            "chip_id": "VARCHAR",
+            "created_at": "TIMESTAMPTZ",
+        },
+        coluna_incremental="created_at",
+    ),
+    TabelaSnapshot(
+        nome="business_events",
+        colunas={
+            "id": "VARCHAR",
+            "event_type": "VARCHAR",
+            "source": "VARCHAR",
+            "cliente_id": "VARCHAR",
+            "vaga_id": "VARCHAR",
+            "hospital_id": "VARCHAR",
+            "conversation_id": "VARCHAR",
+            "event_props": "JSON",
+            "ts": "TIMESTAMPTZ",
+        },
+        coluna_incremental="ts",
+    ),
+    TabelaSnapshot(
+        nome="fila_mensagens",
+        colunas={
+            "id": "VARCHAR",
+            "cliente_id": "VARCHAR",
+            "status": "VARCHAR",
+            "metadata": "JSON",
+            "enviada_em": "TIMESTAMPTZ",
+            "created_at": "TIMESTAMPTZ",
+            "updated_at": "TIMESTAMPTZ",
+        },
+        coluna_incremental="updated_at",
+    ),
+    TabelaSnapshot(
+        nome="vagas",
+        colunas={
+            "id": "VARCHAR",
+            "hospital_id": "VARCHAR",
+            "especialidade_id": "VARCHAR",
+            "data": "DATE",
+            "periodo": "VARCHAR",
+            "valor": "DOUBLE",
+            "status": "VARCHAR",
+            "created_at": "TIMESTAMPTZ",
+            "updated_at": "TIMESTAMPTZ",
+        },
+        coluna_incremental="updated_at",
+        historico_completo=True,
+    ),
+    TabelaSnapshot(
+        nome="chip_metrics_hourly",
+        colunas={
+            "chip_id": "VARCHAR",
+            "hora": "TIMESTAMPTZ",
+            "msgs_enviadas": "BIGINT",
+            "msgs_recebidas": "BIGINT",
+            "erros": "BIGINT",
+            "prospeccoes": "BIGINT",
+            "followups": "BIGINT",
+            "respostas": "BIGINT",
+        },
+        chave=("chip_id", "hora"),
+        coluna_incremental="hora",
+        # A hora corrente continua sendo agregada
+        margem=timedelta(hours=2),
+    ),
+    # Entidades mutaveis com updated_at (count(*) precisa da tabela inteira)
+    TabelaSnapshot(
+        nome="conversations",
+        colunas={
+            "id": "VARCHAR",
+            "cliente_id": "VARCHAR",
+            "status": "VARCHAR",
+            "controlled_by": "VARCHAR",
+            "created_at": "TIMESTAMPTZ",
+            "updated_at": "TIMESTAMPTZ",
+        },
+        coluna_incremental="updated_at",
+        historico_completo=True,
+    ),
+    TabelaSnapshot(
+        nome="clientes",
+        colunas={
+            "id": "VARCHAR",
+            "primeiro_nome": "VARCHAR",
+            "sobrenome": "VARCHAR",
+            "especialidade_id": "VARCHAR",
+            "crm": "VARCHAR",
+            "regiao": "VARCHAR",
+            "opted_out": "BOOLEAN",
+            "created_at": "TIMESTAMPTZ",
+            "updated_at": "TIMESTAMPTZ",
+        },
+        coluna_incremental="updated_at",
+        historico_completo=True,
+    ),
+    # Dimensoes pequenas (recarga completa)
+    TabelaSnapshot(
+        nome="especialidades",
+        colunas={"id": "VARCHAR", "nome": "VARCHAR", "codigo": "VARCHAR"},
+    ),
+    TabelaSnapshot(
+        nome="hospitais",
+        colunas={"id": "VARCHAR", "nome": "VARCHAR", "cidade": "VARCHAR", "uf": "VARCHAR"},
+    ),
+    TabelaSnapshot(
+        nome="campanhas",
+        colunas={
+            "id": "BIGINT",
+            "nome_template": "VARCHAR",
+            "tipo_campanha": "VARCHAR",
+            "status": "VARCHAR",
+            "total_destinatarios": "BIGINT",
+            "enviados": "BIGINT",
+            "entregues": "BIGINT",
+            "respondidos": "BIGINT",
+            "created_at": "TIMESTAMPTZ",
+            "agendar_para": "TIMESTAMPTZ",
+        },
+    ),
+    TabelaSnapshot(
+        nome="handoffs",
+        colunas={
+            "id": "VARCHAR",
+            "conversation_id": "VARCHAR",
+            "reason": "VARCHAR",
+            "motivo": "VARCHAR",
+            "status": "VARCHAR",
+            "created_at": "TIMESTAMPTZ",
+            "resolvido_em": "TIMESTAMPTZ",
+        },
+    ),
+    TabelaSnapshot(
+        nome="julia_chips",
+        colunas={
+            "id": "VARCHAR",
+            "instance_name": "VARCHAR",
+            "status": "VARCHAR",
+            "trust_score": "DOUBLE",
+            "messages_sent_today": "BIGINT",
+            "last_message_at": "TIMESTAMPTZ",
+        },
+    ),
+)
+
+TABELAS_POR_NOME: dict[str, TabelaSnapshot] = {t.nome: t for t in TABELAS}
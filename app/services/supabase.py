@@ -6,15 +6,18 @@ Manter apenas: cliente, circuit breaker e helpers genericos.
 """
 
 import asyncio
-from supabase import create_client, Client
 from functools import lru_cache
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import logging
 
 from app.core.config import settings
+from app.core.lazy import servico_lazy
 from app.services.circuit_breaker import circuit_supabase
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -78,7 +81,7 @@ def _validar_ambiente_supabase() -> None:
 
 
 @lru_cache()
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """
     Retorna cliente Supabase cacheado.
     Usa service key para acesso completo.
@@ -91,11 +94,14 @@ def get_supabase_client() -> Client:
     # Validar consistência ambiente <-> banco
     _validar_ambiente_supabase()
 
+    from supabase import create_client
+
     return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
 
 
 # Instancia global (use via dependency injection quando possivel)
-supabase = get_supabase_client()
+# Criada no primeiro uso: importar o módulo não carrega a biblioteca nem valida o ambiente
+supabase = servico_lazy("supabase", get_supabase_client)
 
 
 async def _executar_com_circuit_breaker(func):
@@ -8,8 +8,11 @@ Sprint 31 - S31.E5: Adição de EspecialidadeService e filtros
 from .repository import (
     buscar_por_id as buscar_vaga_por_id,
     verificar_conflito as verificar_conflito_vaga,
+    listar_turnos_reservados,
 )
 
+from .indice import IndiceVagas, indice_vagas
+
 from .cache import invalidar as invalidar_cache_vagas
 
 from .preferencias import (
@@ -25,6 +28,7 @@ from .formatters import (
 from .service import (
     buscar_vagas_compativeis,
     buscar_vagas_por_regiao,
+    buscar_vagas_indexadas,
     reservar_vaga,
     cancelar_reserva,
     marcar_vaga_realizada,
@@ -55,6 +59,7 @@ __all__ = [
     # Service principal
     "buscar_vagas_compativeis",
     "buscar_vagas_por_regiao",
+    "buscar_vagas_indexadas",
     "reservar_vaga",
     "cancelar_reserva",
     "marcar_vaga_realizada",
@@ -62,6 +67,10 @@ __all__ = [
     "buscar_vaga_por_id",
     "verificar_conflito",
     "verificar_conflito_vaga",
+    "listar_turnos_reservados",
+    # Indice em memoria
+    "IndiceVagas",
+    "indice_vagas",
     # Cache
     "invalidar_cache_vagas",
     # Preferencias
@@ -7,18 +7,35 @@ Sprint 10 - S10.E3.2
 import logging
 from typing import Optional
 
-from app.services.redis import cache_get_json, cache_set_json, redis_client
+from app.services.redis import CacheNamespace, cache_get_json, cache_set_json
 from app.core.config import DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
-CACHE_PREFIX = "vagas:"
+CACHE_PREFIX = "vagas"
+
+# Uma tag por especialidade: reservar invalida so a especialidade da vaga
+_namespace = CacheNamespace(CACHE_PREFIX)
+
+
+def _tag_especialidade(especialidade_id: str) -> str:
+    return f"especialidade:{especialidade_id}"
+
+
+async def _chave(especialidade_id: str, limite: int) -> Optional[str]:
+    return await _namespace.chave(
+        f"especialidade:{especialidade_id}:limite:{limite}",
+        tags=[_tag_especialidade(especialidade_id)],
+    )
 
 
 async def get_cached(especialidade_id: str, limite: int) -> Optional[list[dict]]:
     """Busca vagas do cache."""
-    cache_key = f"{CACHE_PREFIX}especialidade:{especialidade_id}:limite:{limite}"
-    cached = await cache_get_json(cache_key)
+    chave = await _chave(especialidade_id, limite)
+    if not chave:
+        return None
+
+    cached = await cache_get_json(chave)
     if cached:
         logger.debug(f"Cache hit para vagas: especialidade {especialidade_id}")
     return cached
@@ -26,27 +43,22 @@ async def get_cached(especialidade_id: str, limite: int) -> Optional[list[dict]]
 
 async def set_cached(especialidade_id: str, limite: int, vagas: list[dict]) -> None:
     """Salva vagas no cache."""
-    cache_key = f"{CACHE_PREFIX}especialidade:{especialidade_id}:limite:{limite}"
-    await cache_set_json(cache_key, vagas, DatabaseConfig.CACHE_TTL_VAGAS)
+    chave = await _chave(especialidade_id, limite)
+    if chave:
+        await cache_set_json(chave, vagas, DatabaseConfig.CACHE_TTL_VAGAS)
 
 
 async def invalidar(especialidade_id: Optional[str] = None) -> None:
     """
-    Invalida cache de vagas.
+    Invalida cache de vagas (INCR do contador de geracao, sem KEYS).
 
     Args:
         especialidade_id: ID da especialidade (opcional, invalida todas se None)
     """
-    try:
-        if especialidade_id:
-            pattern = f"{CACHE_PREFIX}especialidade:{especialidade_id}:*"
-        else:
-            pattern = f"{CACHE_PREFIX}*"
-
-        keys = await redis_client.keys(pattern)
-
-        if keys:
-            await redis_client.delete(*keys)
-            logger.debug(f"Cache invalidado: {len(keys)} chave(s) removida(s)")
-    except Exception as e:
-        logger.warning(f"Erro ao invalidar cache de vagas: {e}")
+    if especialidade_id:
+        invalidado = await _namespace.invalidar_tag(_tag_especialidade(especialidade_id))
+    else:
+        invalidado = await _namespace.invalidar_tudo()
+
+    if invalidado:
+        logger.debug(f"Cache de vagas invalidado: {especialidade_id or 'todas'}")
@@ -0,0 +1,208 @@
+"""
+Indice em memoria das vagas abertas.
+
+Mantem as vagas abertas (data >= hoje) do processo organizadas por
+especialidade, regiao, data e turno (data, periodo_id), para a tool
+buscar_vagas responder sem round-trip ao banco alem da query de turnos
+ocupados do medico.
+
+Frescor:
+- Recarga completa a cada DatabaseConfig.CACHE_TTL_INDICE_VAGAS (pega
+  alteracoes feitas por outros processos);
+- Atualizacao pontual no proprio processo via notificar_reserva,
+  notificar_abertura e notificar_criacao.
+
+Vaga vista aberta aqui mas ja reservada em outro processo e barrada pelo
+optimistic locking de repository.reservar.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional
+
+from app.core.config import DatabaseConfig
+from . import repository
+
+logger = logging.getLogger(__name__)
+
+Turno = tuple[str, str]
+
+
+class IndiceVagas:
+    """Vagas abertas indexadas por especialidade, regiao, data e turno."""
+
+    def __init__(self, ttl_segundos: int = DatabaseConfig.CACHE_TTL_INDICE_VAGAS):
+        self.ttl_segundos = ttl_segundos
+        self._vagas: dict[str, dict] = {}
+        self._por_especialidade: dict[str, set[str]] = defaultdict(set)
+        self._por_regiao: dict[str, set[str]] = defaultdict(set)
+        self._por_data: dict[str, set[str]] = defaultdict(set)
+        self._por_turno: dict[Turno, set[str]] = defaultdict(set)
+        self._pendentes: set[str] = set()
+        self._carregado_em: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Manutencao
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _regiao(vaga: dict) -> Optional[str]:
+        regiao = (vaga.get("hospitais") or {}).get("regiao")
+        return regiao.lower() if regiao else None
+
+    def _adicionar(self, vaga: dict) -> None:
+        vaga_id = vaga["id"]
+        self._remover(vaga_id)
+        if vaga.get("status") != "aberta":
+            return
+
+        self._vagas[vaga_id] = vaga
+        if vaga.get("especialidade_id"):
+            self._por_especialidade[vaga["especialidade_id"]].add(vaga_id)
+        if regiao := self._regiao(vaga):
+            self._por_regiao[regiao].add(vaga_id)
+        if vaga.get("data"):
+            self._por_data[vaga["data"]].add(vaga_id)
+            if vaga.get("periodo_id"):
+                self._por_turno[(vaga["data"], vaga["periodo_id"])].add(vaga_id)
+
+    def _remover(self, vaga_id: str) -> None:
+        vaga = self._vagas.pop(vaga_id, None)
+        if not vaga:
+            return
+
+        indices: list[tuple[dict, object]] = [
+            (self._por_especialidade, vaga.get("especialidade_id")),
+            (self._por_regiao, self._regiao(vaga)),
+            (self._por_data, vaga.get("data")),
+            (self._por_turno, (vaga.get("data"), vaga.get("periodo_id"))),
+        ]
+        for indice, chave in indices:
+            ids = indice.get(chave)
+            if ids is not None:
+                ids.discard(vaga_id)
+                if not ids:
+                    del indice[chave]
+
+    def _expirar_datas_passadas(self) -> None:
+        hoje = date.today().isoformat()
+        for data in [d for d in self._por_data if d < hoje]:
+            for vaga_id in list(self._por_data.get(data, ())):
+                self._remover(vaga_id)
+
+    def _expirado(self) -> bool:
+        return (
+            self._carregado_em is None or time.monotonic() - self._carregado_em > self.ttl_segundos
+        )
+
+    async def _recarregar(self) -> None:
+        vagas = await repository.listar_abertas()
+
+        self._vagas.clear()
+        for indice in (self._por_especialidade, self._por_regiao, self._por_data, self._por_turno):
+            indice.clear()
+        self._pendentes.clear()
+
+        for vaga in vagas:
+            self._adicionar(vaga)
+        self._carregado_em = time.monotonic()
+
+    async def _aplicar_pendentes(self) -> None:
+        ids = list(self._pendentes)
+        self._pendentes.clear()
+        for vaga in await repository.listar_por_ids(ids):
+            self._adicionar(vaga)
+
+    async def garantir_atualizado(self) -> None:
+        """
+        Recarrega o indice se expirado e incorpora vagas criadas.
+
+        Se a recarga falhar com o indice ja populado, segue servindo o
+        conteudo atual (a proxima consulta tenta de novo).
+        """
+        if not self._expirado() and not self._pendentes:
+            return
+
+        async with self._lock:
+            try:
+                if self._expirado():
+                    await self._recarregar()
+                elif self._pendentes:
+                    await self._aplicar_pendentes()
+            except Exception as e:
+                if self._carregado_em is None:
+                    raise
+                logger.warning(f"Erro ao atualizar indice de vagas, usando versao atual: {e}")
+
+    def notificar_reserva(self, vaga_id: str) -> None:
+        """Remove vaga reservada/fechada do indice."""
+        self._remover(vaga_id)
+
+    def notificar_abertura(self, vaga: dict) -> None:
+        """Reinsere vaga que voltou a ficar aberta (ex: reserva cancelada)."""
+        self._adicionar(vaga)
+
+    def notificar_criacao(self, vaga_ids: Iterable[str]) -> None:
+        """Marca vagas criadas para serem carregadas (uma query) na proxima consulta."""
+        if self._carregado_em is not None:
+            self._pendentes.update(str(v) for v in vaga_ids)
+
+    def invalidar(self) -> None:
+        """Forca recarga completa na proxima consulta."""
+        self._carregado_em = None
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def ids_em_turnos(self, turnos: Iterable[Turno]) -> set[str]:
+        """IDs das vagas que caem em algum dos turnos informados."""
+        resultado: set[str] = set()
+        for turno in turnos:
+            resultado |= self._por_turno.get(turno, set())
+        return resultado
+
+    def regioes(self) -> set[str]:
+        """Regioes com vagas abertas."""
+        return set(self._por_regiao)
+
+    async def consultar(
+        self,
+        especialidade_id: str,
+        regiao: Optional[str] = None,
+        turnos_ocupados: Optional[Iterable[Turno]] = None,
+    ) -> tuple[list[dict], set[str]]:
+        """
+        Vagas abertas da especialidade, sem as que conflitam com o medico.
+
+        Args:
+            especialidade_id: ID da especialidade
+            regiao: Regiao a priorizar (opcional)
+            turnos_ocupados: Turnos (data, periodo_id) ja reservados pelo medico
+
+        Returns:
+            Tupla (vagas, ids_da_regiao). As vagas nao sao ordenadas.
+        """
+        await self.garantir_atualizado()
+        self._expirar_datas_passadas()
+
+        ids = set(self._por_especialidade.get(especialidade_id, ()))
+        if turnos_ocupados:
+            conflitantes = ids & self.ids_em_turnos(turnos_ocupados)
+            if conflitantes:
+                logger.debug(f"{len(conflitantes)} vaga(s) filtrada(s): conflito de horário")
+            ids -= conflitantes
+
+        ids_regiao = ids & self._por_regiao.get(regiao.lower(), set()) if regiao else set()
+        return [self._vagas[i] for i in ids], ids_regiao
+
+    def __len__(self) -> int:
+        return len(self._vagas)
+
+
+# Singleton
+indice_vagas = IndiceVagas()
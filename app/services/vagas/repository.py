@@ -45,6 +45,84 @@ async def listar_disponiveis(especialidade_id: str, limite: int = 10) -> list[di
     return response.data or []
 
 
+async def listar_abertas(pagina: int = 1000) -> list[dict]:
+    """
+    Lista todas as vagas abertas a partir de hoje (carga do indice em memoria).
+
+    Args:
+        pagina: Tamanho da pagina de leitura (limite do PostgREST)
+
+    Returns:
+        Vagas com hospital, periodo, setor e especialidade
+    """
+    hoje = date.today().isoformat()
+    vagas: list[dict] = []
+    inicio = 0
+
+    while True:
+        response = (
+            supabase.table("vagas")
+            .select("*, hospitais(*), periodos(*), setores(*), especialidades(*)")
+            .eq("status", "aberta")
+            .gte("data", hoje)
+            .order("id")
+            .range(inicio, inicio + pagina - 1)
+            .execute()
+        )
+        lote = response.data or []
+        vagas.extend(lote)
+        if len(lote) < pagina:
+            break
+        inicio += pagina
+
+    logger.info(f"Carregadas {len(vagas)} vagas abertas")
+    return vagas
+
+
+async def listar_por_ids(vaga_ids: list[str]) -> list[dict]:
+    """Busca varias vagas pelo ID com dados relacionados (uma query)."""
+    if not vaga_ids:
+        return []
+
+    response = (
+        supabase.table("vagas")
+        .select("*, hospitais(*), periodos(*), setores(*), especialidades(*)")
+        .in_("id", vaga_ids)
+        .execute()
+    )
+    return response.data or []
+
+
+async def listar_turnos_reservados(cliente_id: str) -> set[tuple[str, str]]:
+    """
+    Lista os turnos (data, periodo_id) ja ocupados pelo medico.
+
+    Uma query substitui o verificar_conflito por vaga na busca.
+
+    Args:
+        cliente_id: ID do medico
+
+    Returns:
+        Conjunto de pares (data, periodo_id) de vagas reservadas/confirmadas
+    """
+    hoje = date.today().isoformat()
+
+    response = (
+        supabase.table("vagas")
+        .select("data, periodo_id")
+        .eq("cliente_id", cliente_id)
+        .in_("status", ["reservada", "confirmada"])
+        .gte("data", hoje)
+        .execute()
+    )
+
+    return {
+        (v["data"], v["periodo_id"])
+        for v in response.data or []
+        if v.get("data") and v.get("periodo_id")
+    }
+
+
 async def verificar_conflito(cliente_id: str, data: str, periodo_id: str) -> dict:
     """
     Verifica se medico ja tem vaga reservada no mesmo dia/periodo.
@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from app.config.regioes import detectar_regiao_por_telefone
 from app.services.supabase import supabase
 from . import repository, cache, preferencias
+from .indice import indice_vagas
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +102,55 @@ async def buscar_vagas_por_regiao(medico: dict, limite: int = 5) -> list[dict]:
     return vagas_ordenadas[:limite]
 
 
+async def buscar_vagas_indexadas(
+    medico: dict,
+    regiao: str = None,
+    turnos_ocupados: set[tuple[str, str]] = None,
+) -> list[dict]:
+    """
+    Busca vagas compativeis no indice em memoria.
+
+    Diferente de buscar_vagas_compativeis, ja remove as vagas que conflitam
+    com reservas do medico e considera a regiao antes de truncar, entao
+    retorna todas as candidatas (o chamador aplica o limite).
+
+    Args:
+        medico: Dados do medico (especialidade_id, telefone, preferencias)
+        regiao: Regiao pedida; se nao casar com nenhuma regiao conhecida,
+            prioriza a regiao do telefone do medico
+        turnos_ocupados: Turnos (data, periodo_id) ja reservados pelo medico
+
+    Returns:
+        Vagas ordenadas por regiao, criticidade e data
+    """
+    especialidade_id = medico.get("especialidade_id")
+    if not especialidade_id:
+        logger.warning("Nenhuma especialidade fornecida para buscar vagas")
+        return []
+
+    await indice_vagas.garantir_atualizado()
+    regiao_alvo = None
+    if regiao:
+        regiao_alvo = regiao if regiao.lower() in indice_vagas.regioes() else None
+        regiao_alvo = regiao_alvo or detectar_regiao_por_telefone(medico.get("telefone", ""))
+
+    vagas, ids_regiao = await indice_vagas.consultar(
+        especialidade_id, regiao=regiao_alvo, turnos_ocupados=turnos_ocupados
+    )
+
+    prefs = medico.get("preferencias_detectadas") or {}
+    vagas = preferencias.filtrar_por_preferencias(vagas, prefs)
+
+    vagas.sort(
+        key=lambda v: (
+            0 if v["id"] in ids_regiao else 1,
+            _CRITICIDADE_PRIORIDADE.get(v.get("criticidade", "normal"), 2),
+            v.get("data", ""),
+        )
+    )
+    return vagas
+
+
 async def reservar_vaga(
     vaga_id: str, cliente_id: str, medico: dict = None, notificar_gestor: bool = True
 ) -> dict:
@@ -142,6 +192,7 @@ async def reservar_vaga(
         raise ValueError("Vaga foi reservada por outro medico")
 
     # Invalidar cache
+    indice_vagas.notificar_reserva(vaga_id)
     if vaga.get("especialidade_id"):
         await cache.invalidar(vaga["especialidade_id"])
 
@@ -180,6 +231,8 @@ async def cancelar_reserva(vaga_id: str, cliente_id: str) -> dict:
         raise ValueError(f"Vaga nao pode ser cancelada (status: {vaga['status']})")
 
     resultado = await repository.cancelar_reserva(vaga_id)
+    if resultado:
+        indice_vagas.notificar_abertura({**vaga, **resultado})
     logger.info(f"Reserva da vaga {vaga_id} cancelada pelo medico {cliente_id}")
 
     return resultado
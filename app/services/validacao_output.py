@@ -7,6 +7,8 @@ import logging
 from dataclasses import dataclass
 from typing import Optional, Callable
 
+from app.services.analise_texto import ORIGINAL, analisar, registrar_padroes
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,6 +62,8 @@ PADROES_REVELACAO_IA = [
     (r"fico\s+feliz\s+em\s+ajudar", "resposta_robotica", "baixa"),
 ]
 
+registrar_padroes("saida.revelacao_ia", [p for p, _, _ in PADROES_REVELACAO_IA])
+
 
 def detectar_revelacao_ia(texto: str) -> ValidacaoResult:
     """
@@ -71,19 +75,17 @@ def detectar_revelacao_ia(texto: str) -> ValidacaoResult:
     Returns:
         ValidacaoResult com detalhes da validacao
     """
-    texto_lower = texto.lower()
-
-    for padrao, tipo, severidade in PADROES_REVELACAO_IA:
-        match = re.search(padrao, texto_lower)
-        if match:
-            logger.warning(f"Revelacao de IA detectada: tipo={tipo}, trecho='{match.group()}'")
-            return ValidacaoResult(
-                valido=False,
-                motivo=f"Texto revela que Julia e IA ({tipo})",
-                tipo_violacao=tipo,
-                trecho_problematico=match.group(),
-                severidade=severidade,
-            )
+    ocorrencia = analisar(texto).primeira("saida.revelacao_ia")
+    if ocorrencia:
+        _, tipo, severidade = PADROES_REVELACAO_IA[ocorrencia.indice]
+        logger.warning(f"Revelacao de IA detectada: tipo={tipo}, trecho='{ocorrencia.trecho}'")
+        return ValidacaoResult(
+            valido=False,
+            motivo=f"Texto revela que Julia e IA ({tipo})",
+            tipo_violacao=tipo,
+            trecho_problematico=ocorrencia.trecho,
+            severidade=severidade,
+        )
 
     return ValidacaoResult(valido=True)
 
@@ -106,6 +108,13 @@ PADROES_FORMATO_PROIBIDO = [
     (r"(atenciosamente|cordialmente|respeitosamente)", "despedida_formal", "media"),
 ]
 
+registrar_padroes(
+    "saida.formato_proibido",
+    [p for p, _, _ in PADROES_FORMATO_PROIBIDO],
+    normalizacao=ORIGINAL,
+    flags=re.MULTILINE | re.IGNORECASE,
+)
+
 
 def detectar_formato_proibido(texto: str) -> ValidacaoResult:
     """
@@ -117,19 +126,19 @@ def detectar_formato_proibido(texto: str) -> ValidacaoResult:
     Returns:
         ValidacaoResult com detalhes
     """
-    for padrao, tipo, severidade in PADROES_FORMATO_PROIBIDO:
-        match = re.search(padrao, texto, re.MULTILINE | re.IGNORECASE)
-        if match:
-            logger.warning(
-                f"Formato proibido detectado: tipo={tipo}, trecho='{match.group()[:50]}'"
-            )
-            return ValidacaoResult(
-                valido=False,
-                motivo=f"Formato proibido ({tipo})",
-                tipo_violacao=tipo,
-                trecho_problematico=match.group()[:100],
-                severidade=severidade,
-            )
+    ocorrencia = analisar(texto).primeira("saida.formato_proibido")
+    if ocorrencia:
+        _, tipo, severidade = PADROES_FORMATO_PROIBIDO[ocorrencia.indice]
+        logger.warning(
+            f"Formato proibido detectado: tipo={tipo}, trecho='{ocorrencia.trecho[:50]}'"
+        )
+        return ValidacaoResult(
+            valido=False,
+            motivo=f"Formato proibido ({tipo})",
+            tipo_violacao=tipo,
+            trecho_problematico=ocorrencia.trecho[:100],
+            severidade=severidade,
+        )
 
     return ValidacaoResult(valido=True)
 
@@ -159,6 +168,12 @@ PADROES_INSTRUCAO_INTERNA = [
     (r"execut(ei|ando)\s+(o\s+)?sistema", "referencia_sistema", "critica"),
 ]
 
+registrar_padroes(
+    "saida.instrucao_interna",
+    [p for p, _, _ in PADROES_INSTRUCAO_INTERNA],
+    flags=re.IGNORECASE,
+)
+
 
 def detectar_instrucao_interna(texto: str) -> ValidacaoResult:
     """
@@ -170,19 +185,17 @@ def detectar_instrucao_interna(texto: str) -> ValidacaoResult:
     Returns:
         ValidacaoResult com detalhes
     """
-    texto_lower = texto.lower()
-
-    for padrao, tipo, severidade in PADROES_INSTRUCAO_INTERNA:
-        match = re.search(padrao, texto_lower, re.IGNORECASE)
-        if match:
-            logger.warning(f"Instrucao interna vazada: tipo={tipo}, trecho='{match.group()[:50]}'")
-            return ValidacaoResult(
-                valido=False,
-                motivo=f"Instrucao interna vazada ({tipo})",
-                tipo_violacao=tipo,
-                trecho_problematico=match.group()[:100],
-                severidade=severidade,
-            )
+    ocorrencia = analisar(texto).primeira("saida.instrucao_interna")
+    if ocorrencia:
+        _, tipo, severidade = PADROES_INSTRUCAO_INTERNA[ocorrencia.indice]
+        logger.warning(f"Instrucao interna vazada: tipo={tipo}, trecho='{ocorrencia.trecho[:50]}'")
+        return ValidacaoResult(
+            valido=False,
+            motivo=f"Instrucao interna vazada ({tipo})",
+            tipo_violacao=tipo,
+            trecho_problematico=ocorrencia.trecho[:100],
+            severidade=severidade,
+        )
 
     return ValidacaoResult(valido=True)
 
@@ -211,6 +224,8 @@ PADROES_LINGUAGEM_ROBOTICA = [
     (r"protocolo\s+(de\s+atendimento|n[uú]mero)", "sac_protocolo", "media"),
 ]
 
+registrar_padroes("saida.linguagem_robotica", [p for p, _, _ in PADROES_LINGUAGEM_ROBOTICA])
+
 
 def detectar_linguagem_robotica(texto: str) -> ValidacaoResult:
     """
@@ -222,19 +237,17 @@ def detectar_linguagem_robotica(texto: str) -> ValidacaoResult:
     Returns:
         ValidacaoResult com detalhes
     """
-    texto_lower = texto.lower()
-
-    for padrao, tipo, severidade in PADROES_LINGUAGEM_ROBOTICA:
-        match = re.search(padrao, texto_lower)
-        if match:
-            logger.warning(f"Linguagem robotica detectada: tipo={tipo}")
-            return ValidacaoResult(
-                valido=False,
-                motivo=f"Linguagem muito formal/robotica ({tipo})",
-                tipo_violacao=tipo,
-                trecho_problematico=match.group(),
-                severidade=severidade,
-            )
+    ocorrencia = analisar(texto).primeira("saida.linguagem_robotica")
+    if ocorrencia:
+        _, tipo, severidade = PADROES_LINGUAGEM_ROBOTICA[ocorrencia.indice]
+        logger.warning(f"Linguagem robotica detectada: tipo={tipo}")
+        return ValidacaoResult(
+            valido=False,
+            motivo=f"Linguagem muito formal/robotica ({tipo})",
+            tipo_violacao=tipo,
+            trecho_problematico=ocorrencia.trecho,
+            severidade=severidade,
+        )
 
     return ValidacaoResult(valido=True)
 
@@ -313,6 +313,11 @@ async def calcular_trust_score(chip_id: str) -> dict:
 
     supabase.table("chips").update(update_data).eq("id", chip_id).execute()
 
+    # Agregados por WABA (seleção Multi-WABA) acompanham o novo trust
+    from app.services.meta.waba_selector import waba_selector
+
+    waba_selector.atualizar_chip(chip_id, trust_score=score)
+
     # Registrar historico
     supabase.table("chip_trust_history").insert(
         {
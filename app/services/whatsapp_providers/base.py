@@ -118,6 +118,24 @@ class WhatsAppProvider(ABC):
         """
         pass
 
+    async def send_presence(
+        self, phone: str, presence: str = "composing", delay_ms: int = 0
+    ) -> bool:
+        """
+        Envia indicador de presença (ex: "digitando").
+
+        Providers sem suporte (ex: Meta Cloud API) não fazem nada.
+
+        Args:
+            phone: Número do destinatário
+            presence: composing, recording, paused ou available
+            delay_ms: Por quanto tempo exibir a presença
+
+        Returns:
+            True se o indicador foi enviado
+        """
+        return False
+
     def format_phone(self, phone: str) -> str:
         """
         Formata número de telefone removendo caracteres especiais.
@@ -86,6 +86,27 @@ class EvolutionProvider(WhatsAppProvider):
                 provider=self.provider_type.value,
             )
 
+    async def send_presence(
+        self, phone: str, presence: str = "composing", delay_ms: int = 0
+    ) -> bool:
+        """Envia presença via Evolution API (/chat/presence)."""
+        try:
+            client = await get_http_client()
+            response = await client.post(
+                f"{self.base_url}/chat/presence/{self.instance_name}",
+                headers=self.headers,
+                json={
+                    "number": self.format_phone(phone),
+                    "delay": delay_ms,
+                    "presence": presence,
+                },
+                timeout=5,
+            )
+            return response.status_code in (200, 201)
+        except Exception as e:
+            logger.debug(f"[Evolution] Erro ao enviar presence: {e}")
+            return False
+
     async def send_media(
         self,
         phone: str,
@@ -0,0 +1,298 @@
+"""
+Write-behind de registros de auditoria/observabilidade.
+
+Interações sem consumidor do ID, business_events e policy_events deixam de
+ser um INSERT por linha no caminho da mensagem: entram num buffer em
+memória e são gravados em lote (multi-row INSERT / upsert ON CONFLICT DO
+NOTHING) a cada INTERVALO_FLUSH_MS ou quando uma tabela junta
+MAX_LINHAS_LOTE registros.
+
+Durabilidade:
+- Lote que falha no banco (ou buffer acima de MAX_PENDENTES) vai para uma
+  lista no Redis ('write_behind:spill:{tabela}') e é regravado depois por
+  qualquer instância, sob DistributedLock;
+- Toda tabela tem chave de idempotência: regravar um lote (ex: LTRIM falhou
+  depois do INSERT) não duplica linhas. Interações recebem um write_id
+  gerado no enfileiramento;
+- Linha que o banco recusa na drenagem vai para 'write_behind:dead:{tabela}'
+  em vez de travar o resto do spill;
+- O lifespan da API chama parar() no shutdown, que faz o flush final.
+
+Registros em memória no momento de um crash do processo se perdem (mesma
+exposição dos create_task fire-and-forget que este buffer substitui).
+
+O buffer só é usado quando iniciado (lifespan da API). Em workers e testes,
+os repositórios continuam gravando direto.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+from app.core.distributed_lock import DistributedLock
+from app.core.tasks import safe_create_task
+from app.services.redis import redis_client
+from app.services.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_FLUSH_MS = 250
+MAX_LINHAS_LOTE = 100
+MAX_PENDENTES = 5000  # Por tabela; acima disso vai direto para o spill
+INTERVALO_DRENAGEM_SPILL_S = 5
+
+SPILL_PREFIX = "write_behind:spill:"
+DEAD_LETTER_PREFIX = "write_behind:dead:"
+
+
+@dataclass(frozen=True)
+class ConfigTabela:
+    """Como gravar o lote de uma tabela."""
+
+    # Coluna única para ON CONFLICT DO NOTHING (None = INSERT simples)
+    on_conflict: Optional[str] = None
+    # Preenche on_conflict com um UUID ao enfileirar (tabela sem chave natural)
+    gerar_chave: bool = False
+
+
+TABELAS: dict[str, ConfigTabela] = {
+    "interacoes": ConfigTabela(on_conflict="write_id", gerar_chave=True),
+    "business_events": ConfigTabela(on_conflict="dedupe_key"),
+    "policy_events": ConfigTabela(on_conflict="event_id"),
+}
+
+
+class WriteBehindBuffer:
+    """Buffer por tabela com flush periódico e spill no Redis."""
+
+    def __init__(
+        self,
+        intervalo_ms: int = INTERVALO_FLUSH_MS,
+        max_linhas: int = MAX_LINHAS_LOTE,
+        max_pendentes: int = MAX_PENDENTES,
+    ):
+        self.intervalo_ms = intervalo_ms
+        self.max_linhas = max_linhas
+        self.max_pendentes = max_pendentes
+        self._pendentes: dict[str, list[dict]] = {t: [] for t in TABELAS}
+        self._acordar: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        """True enquanto o loop de flush está rodando."""
+        return self._task is not None and not self._task.done()
+
+    def iniciar(self) -> None:
+        """Inicia o loop de flush (chamar no startup, com event loop rodando)."""
+        if self.ativo:
+            return
+        self._acordar = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._loop(), name="write_behind_flush")
+        logger.info(
+            f"Write-behind iniciado: flush a cada {self.intervalo_ms}ms ou {self.max_linhas} linhas"
+        )
+
+    async def parar(self) -> None:
+        """Para o loop e grava o que estiver pendente (shutdown)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        gravados = await self.flush()
+        logger.info(f"Write-behind parado: {gravados} registro(s) no flush final")
+
+    # ------------------------------------------------------------------
+    # Entrada
+    # ------------------------------------------------------------------
+
+    def enfileirar(self, tabela: str, registro: dict) -> None:
+        """
+        Adiciona um registro ao lote da tabela.
+
+        Args:
+            tabela: Uma das TABELAS
+            registro: Linha já serializada (JSON-compatível)
+        """
+        config = TABELAS[tabela]
+        if config.gerar_chave and not registro.get(config.on_conflict):
+            registro[config.on_conflict] = str(uuid.uuid4())
+
+        pendentes = self._pendentes[tabela]
+        if len(pendentes) >= self.max_pendentes:
+            safe_create_task(self._spill(tabela, [registro]), name="write_behind_spill")
+            return
+
+        pendentes.append(registro)
+        if len(pendentes) >= self.max_linhas and self._acordar:
+            self._acordar.set()
+
+    def buscar_pendente(self, tabela: str, filtro: dict) -> Optional[dict]:
+        """
+        Retorna o registro ainda em memória que casa com o filtro.
+
+        Args:
+            tabela: Uma das TABELAS
+            filtro: Colunas e valores que devem ser iguais
+
+        Returns:
+            O próprio dict pendente (alterações valem para a gravação) ou None
+        """
+        for registro in self._pendentes[tabela]:
+            if all(registro.get(k) == v for k, v in filtro.items()):
+                return registro
+        return None
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+
+    async def _loop(self) -> None:
+        ciclos_por_drenagem = max(1, INTERVALO_DRENAGEM_SPILL_S * 1000 // self.intervalo_ms)
+        ciclo = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._acordar.wait(), timeout=self.intervalo_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._acordar.clear()
+
+            try:
+                await self.flush()
+                ciclo += 1
+                if ciclo % ciclos_por_drenagem == 0:
+                    for tabela in TABELAS:
+                        await self.drenar_spill(tabela)
+            except Exception as e:
+                logger.error(f"Erro no loop do write-behind: {e}")
+
+    async def flush(self, tabela: Optional[str] = None) -> int:
+        """
+        Grava os lotes pendentes.
+
+        Args:
+            tabela: Só esta tabela (default: todas)
+
+        Returns:
+            Quantidade de registros gravados no banco
+        """
+        gravados = 0
+        for nome in [tabela] if tabela else list(TABELAS):
+            linhas, self._pendentes[nome] = self._pendentes[nome], []
+            for inicio in range(0, len(linhas), self.max_linhas):
+                lote = linhas[inicio : inicio + self.max_linhas]
+                try:
+                    self._gravar(nome, lote)
+                    gravados += len(lote)
+                except Exception as e:
+                    logger.warning(f"Falha ao gravar lote de {len(lote)} em {nome}: {e}")
+                    await self._spill(nome, lote)
+        return gravados
+
+    def _gravar(self, tabela: str, linhas: list[dict]) -> None:
+        config = TABELAS[tabela]
+        query = supabase.table(tabela)
+        # default_to_null=False: colunas ausentes em parte do lote usam o DEFAULT
+        if config.on_conflict:
+            query = query.upsert(
+                linhas,
+                on_conflict=config.on_conflict,
+                ignore_duplicates=True,
+                returning=ReturnMethod.minimal,
+                default_to_null=False,
+            )
+        else:
+            query = query.insert(linhas, returning=ReturnMethod.minimal, default_to_null=False)
+        query.execute()
+        logger.debug(f"Write-behind: {len(linhas)} registro(s) gravados em {tabela}")
+
+    async def _spill(self, tabela: str, linhas: list[dict]) -> None:
+        try:
+            await redis_client.rpush(
+                f"{SPILL_PREFIX}{tabela}",
+                *[json.dumps(linha, ensure_ascii=False, default=str) for linha in linhas],
+            )
+        except Exception as e:
+            logger.error(f"Write-behind: {len(linhas)} registro(s) de {tabela} perdidos: {e}")
+
+    async def drenar_spill(self, tabela: str) -> int:
+        """
+        Regrava registros que foram para o spill no Redis.
+
+        Lê o lote com LRANGE e só remove (LTRIM) depois de gravado; o
+        on_conflict de cada tabela torna a regravação idempotente. Se o
+        banco recusa o lote, regrava linha a linha e manda as linhas
+        recusadas para a dead-letter, para uma linha ruim não travar o spill.
+
+        Args:
+            tabela: Uma das TABELAS
+
+        Returns:
+            Quantidade de registros regravados
+        """
+        chave = f"{SPILL_PREFIX}{tabela}"
+        try:
+            if not await redis_client.llen(chave):
+                return 0
+        except Exception as e:
+            logger.warning(f"Erro ao consultar spill de {tabela}: {e}")
+            return 0
+
+        lock = DistributedLock(f"write_behind:{tabela}", timeout=30)
+        if not await lock.acquire():
+            return 0
+
+        regravados = 0
+        try:
+            while True:
+                brutos = await redis_client.lrange(chave, 0, self.max_linhas - 1)
+                if not brutos:
+                    break
+                try:
+                    self._gravar(tabela, [json.loads(b) for b in brutos])
+                    regravados += len(brutos)
+                except (APIError, ValueError) as e:
+                    logger.warning(f"Lote do spill de {tabela} recusado ({e}), linha a linha")
+                    regravados += await self._gravar_linha_a_linha(tabela, brutos)
+                await redis_client.ltrim(chave, len(brutos), -1)
+        except Exception as e:
+            logger.warning(f"Falha ao drenar spill de {tabela}: {e}")
+        finally:
+            await lock.release()
+
+        if regravados:
+            logger.info(f"Write-behind: {regravados} registro(s) de {tabela} regravados do spill")
+        return regravados
+
+    async def _gravar_linha_a_linha(self, tabela: str, brutos: list[str]) -> int:
+        """
+        Regrava um lote recusado uma linha por vez.
+
+        Só erros do banco (APIError) e JSON inválido mandam a linha para a
+        dead-letter; falha de conexão sobe e o lote fica no spill.
+
+        Returns:
+            Quantidade de linhas gravadas
+        """
+        gravadas = 0
+        for bruto in brutos:
+            try:
+                self._gravar(tabela, [json.loads(bruto)])
+                gravadas += 1
+            except (APIError, ValueError) as e:
+                logger.error(f"Write-behind: registro de {tabela} recusado, dead-letter: {e}")
+                await redis_client.rpush(f"{DEAD_LETTER_PREFIX}{tabela}", bruto)
+        return gravadas
+
+
+# Singleton
+write_behind = WriteBehindBuffer()
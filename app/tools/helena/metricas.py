@@ -7,10 +7,17 @@ Sprint 47: Métricas pré-definidas otimizadas.
 import logging
 from datetime import datetime, timedelta, timezone
 
+from app.services.snapshot_analitico import consultar_analitico
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
 
+
+def _executar_producao(sql: str) -> list[dict]:
+    """Executa a query na producao (fallback do snapshot analitico)."""
+    return supabase.rpc("execute_readonly_query", {"sql_query": sql}).execute().data or []
+
+
 # === TOOL: metricas_periodo ===
 
 TOOL_METRICAS_PERIODO = {
@@ -67,31 +74,28 @@ async def handle_metricas_periodo(params: dict, user_id: str, channel_id: str) -
 
     try:
         # Query otimizada
-        result = supabase.rpc(
-            "execute_readonly_query",
-            {
-                "sql_query": f"""
-                SELECT
-                    COUNT(DISTINCT c.id) as total_conversas,
-                    COUNT(DISTINCT c.id) FILTER (
-                        WHERE EXISTS (
-                            SELECT 1 FROM interacoes i
-                            WHERE i.conversation_id = c.id AND i.tipo = 'entrada'
-                        )
-                    ) as com_resposta,
-                    COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'convertida') as conversoes
-                FROM conversations c
-                WHERE c.created_at >= '{inicio}'::date
-                AND c.created_at < '{fim}'::date
-                LIMIT 1
-                """
-            },
-        ).execute()
-
-        if not result.data or len(result.data) == 0:
+        sql = f"""
+        SELECT
+            COUNT(DISTINCT c.id) as total_conversas,
+            COUNT(DISTINCT c.id) FILTER (
+                WHERE EXISTS (
+                    SELECT 1 FROM interacoes i
+                    WHERE i.conversation_id = c.id AND i.tipo = 'entrada'
+                )
+            ) as com_resposta,
+            COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'convertida') as conversoes
+        FROM conversations c
+        WHERE c.created_at >= '{inicio}'::date
+        AND c.created_at < '{fim}'::date
+        LIMIT 1
+        """
+        resultado = await consultar_analitico(sql, fallback=lambda: _executar_producao(sql))
+        linhas = resultado.linhas
+
+        if not linhas:
             data = {"total_conversas": 0, "com_resposta": 0, "conversoes": 0}
         else:
-            data = result.data[0]
+            data = linhas[0]
 
         # Calcular taxas
         total = data.get("total_conversas", 0) or 0
@@ -113,6 +117,7 @@ async def handle_metricas_periodo(params: dict, user_id: str, channel_id: str) -
                 "taxa_resposta": taxa_resposta,
                 "taxa_conversao": taxa_conversao,
             },
+            "frescor": resultado.frescor(),
         }
 
     except Exception as e:
@@ -154,25 +159,22 @@ async def handle_metricas_conversao(params: dict, user_id: str, channel_id: str)
     inicio = datetime.now(timezone.utc).date() - timedelta(days=dias)
 
     try:
-        result = supabase.rpc(
-            "execute_readonly_query",
-            {
-                "sql_query": f"""
-                SELECT
-                    COUNT(DISTINCT c.id) as total_abordados,
-                    COUNT(DISTINCT c.id) FILTER (
-                        WHERE EXISTS (SELECT 1 FROM interacoes i WHERE i.conversation_id = c.id AND i.tipo = 'entrada')
-                    ) as responderam,
-                    COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'convertida') as converteram,
-                    COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'perdida') as perdidos
-                FROM conversations c
-                WHERE c.created_at >= '{inicio}'::date
-                LIMIT 1
-                """
-            },
-        ).execute()
-
-        data = result.data[0] if result.data else {}
+        sql = f"""
+        SELECT
+            COUNT(DISTINCT c.id) as total_abordados,
+            COUNT(DISTINCT c.id) FILTER (
+                WHERE EXISTS (SELECT 1 FROM interacoes i WHERE i.conversation_id = c.id AND i.tipo = 'entrada')
+            ) as responderam,
+            COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'convertida') as converteram,
+            COUNT(DISTINCT c.id) FILTER (WHERE c.status = 'perdida') as perdidos
+        FROM conversations c
+        WHERE c.created_at >= '{inicio}'::date
+        LIMIT 1
+        """
+        resultado = await consultar_analitico(sql, fallback=lambda: _executar_producao(sql))
+        linhas = resultado.linhas
+
+        data = linhas[0] if linhas else {}
 
         total = data.get("total_abordados", 0) or 0
         responderam = data.get("responderam", 0) or 0
@@ -197,6 +199,7 @@ async def handle_metricas_conversao(params: dict, user_id: str, channel_id: str)
                     "taxa": round(100 * perdidos / total, 1) if total > 0 else 0,
                 },
             },
+            "frescor": resultado.frescor(),
         }
 
     except Exception as e:
@@ -248,35 +251,33 @@ async def handle_metricas_campanhas(params: dict, user_id: str, channel_id: str)
         if status != "todas":
             status_filter = f"WHERE status = '{status}'"
 
-        result = supabase.rpc(
-            "execute_readonly_query",
-            {
-                "sql_query": f"""
-                SELECT
-                    id,
-                    nome_template,
-                    tipo_campanha,
-                    status,
-                    total_destinatarios,
-                    enviados,
-                    entregues,
-                    respondidos,
-                    CASE WHEN enviados > 0 THEN ROUND(100.0 * entregues / enviados, 1) ELSE 0 END as taxa_entrega,
-                    CASE WHEN entregues > 0 THEN ROUND(100.0 * respondidos / entregues, 1) ELSE 0 END as taxa_resposta,
-                    created_at
-                FROM campanhas
-                {status_filter}
-                ORDER BY created_at DESC
-                LIMIT {limite}
-                """
-            },
-        ).execute()
+        sql = f"""
+        SELECT
+            id,
+            nome_template,
+            tipo_campanha,
+            status,
+            total_destinatarios,
+            enviados,
+            entregues,
+            respondidos,
+            CASE WHEN enviados > 0 THEN ROUND(100.0 * entregues / enviados, 1) ELSE 0 END as taxa_entrega,
+            CASE WHEN entregues > 0 THEN ROUND(100.0 * respondidos / entregues, 1) ELSE 0 END as taxa_resposta,
+            created_at
+        FROM campanhas
+        {status_filter}
+        ORDER BY created_at DESC
+        LIMIT {limite}
+        """
+        resultado = await consultar_analitico(sql, fallback=lambda: _executar_producao(sql))
+        linhas = resultado.linhas
 
         return {
             "success": True,
             "filtro_status": status,
-            "campanhas": result.data or [],
-            "total": len(result.data or []),
+            "campanhas": linhas,
+            "total": len(linhas),
+            "frescor": resultado.frescor(),
         }
 
     except Exception as e:
@@ -8,6 +8,7 @@ Apenas SELECT é permitido.
 import logging
 import re
 
+from app.services.snapshot_analitico import consultar_analitico
 from app.services.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -156,10 +157,14 @@ async def handle_consulta_sql(params: dict, user_id: str, channel_id: str) -> di
         return {"success": False, "error": erro}
 
     try:
-        # Executar via função segura
-        result = supabase.rpc("execute_readonly_query", {"sql_query": query}).execute()
-
-        data = result.data or []
+        # Snapshot analítico local quando cobre a query; senão função segura na produção
+        resultado = await consultar_analitico(
+            query,
+            fallback=lambda: (
+                supabase.rpc("execute_readonly_query", {"sql_query": query}).execute().data or []
+            ),
+        )
+        data = resultado.linhas
 
         logger.info(f"Query Helena executada: {explicacao} | User: {user_id} | Rows: {len(data)}")
 
@@ -169,6 +174,7 @@ async def handle_consulta_sql(params: dict, user_id: str, channel_id: str) -> di
             "query_executada": query,
             "data": data,
             "row_count": len(data),
+            "frescor": resultado.frescor(),
         }
 
     except Exception as e:
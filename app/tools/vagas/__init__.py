@@ -18,6 +18,8 @@ from app.core.timezone import agora_brasilia  # noqa: F401
 from app.services.vagas import (  # noqa: F401
     buscar_vagas_compativeis,
     buscar_vagas_por_regiao,
+    buscar_vagas_indexadas,
+    listar_turnos_reservados,
     reservar_vaga,
     formatar_vaga_para_mensagem,
     formatar_vagas_contexto,
@@ -48,7 +48,12 @@ def _preparar_medico_com_preferencias(medico: dict, valor_minimo: float) -> dict
 
 
 async def _buscar_vagas_base(medico: dict, regiao: str | None, limite: int) -> list[dict]:
-    """Busca vagas base (com ou sem priorizacao por regiao)."""
+    """
+    Busca vagas base (com ou sem priorizacao por regiao).
+
+    DEPRECATED: handle_buscar_vagas usa buscar_vagas_indexadas, que ja filtra
+    conflitos. Mantido para compatibilidade com codigo legado.
+    """
     # Import lazy para manter patch path via __init__
     from app.tools.vagas import buscar_vagas_compativeis, buscar_vagas_por_regiao
 
@@ -10,7 +10,6 @@ import logging
 from typing import Any
 
 from app.tools.vagas._helpers import (
-    _buscar_vagas_base,
     _construir_resposta_com_vagas,
     _construir_resposta_sem_vagas,
     _limpar_especialidade_input,
@@ -29,7 +28,8 @@ async def handle_buscar_vagas(tool_input: dict, medico: dict, conversa: dict) ->
     Fluxo:
     1. Parse e validacao de input
     2. Resolucao de especialidade via EspecialidadeService
-    3. Busca de vagas via service existente
+    3. Busca de vagas no indice em memoria, ja sem conflitos de horario
+       (uma query para os turnos reservados do medico)
     4. Aplicacao de filtros via modulo de filtros
     5. Formatacao de resposta via VagasResponseFormatter
 
@@ -44,10 +44,10 @@ async def handle_buscar_vagas(tool_input: dict, medico: dict, conversa: dict) ->
     # Import lazy para manter patch path via app.tools.vagas (package __init__)
     from app.tools.vagas import (
         aplicar_filtros,
-        filtrar_por_conflitos,
+        buscar_vagas_indexadas,
         get_especialidade_service,
         get_vagas_formatter,
-        verificar_conflito,
+        listar_turnos_reservados,
     )
 
     # Services
@@ -99,13 +99,13 @@ async def handle_buscar_vagas(tool_input: dict, medico: dict, conversa: dict) ->
     medico_com_prefs = _preparar_medico_com_preferencias(medico, valor_minimo)
 
     try:
-        # 3. Buscar vagas
-        vagas = await _buscar_vagas_base(medico_com_prefs, regiao, limite)
+        # 3. Buscar vagas (conflitos filtrados em memoria)
+        turnos_ocupados = await listar_turnos_reservados(medico["id"])
+        vagas = await buscar_vagas_indexadas(medico_com_prefs, regiao, turnos_ocupados)
         total_inicial = len(vagas)
 
         # 4. Aplicar filtros
         vagas, filtros_aplicados = aplicar_filtros(vagas, periodo, dias_semana)
-        vagas = await filtrar_por_conflitos(vagas, medico["id"], verificar_conflito)
         vagas_final = vagas[:limite]
 
         # 5. Formatar resposta
@@ -236,6 +236,7 @@ async def processar_fila():
                         autor_tipo="julia",
                         message_id=result.provider_message_id,
                         chip_id=chip_id,
+                        aguardar=False,
                     )
             elif result.outcome.is_blocked:
                 logger.info(
@@ -0,0 +1,56 @@
+"""
+Job incremental dos rollups de metricas.
+
+Roda a cada 5 minutos: para cada fonte, recalcula no banco as horas desde o
+watermark (e os dias que as contem) e avanca o watermark. Relatorios e
+dashboards leem os rollups via app.services.rollups.
+"""
+
+import logging
+import time
+
+from app.services.rollups import FONTES, atualizar_fonte
+
+logger = logging.getLogger(__name__)
+
+# Resultado da ultima execucao de cada fonte (fonte -> janela, linhas, duracao)
+ultimas_execucoes: dict[str, dict] = {}
+
+
+async def atualizar_rollups(
+    fontes: tuple[str, ...] = FONTES,
+    atraso_minutos: int = 15,
+) -> dict:
+    """
+    Atualiza os rollups de todas as fontes.
+
+    Uma fonte com erro nao impede as demais; o watermark dela fica parado
+    e a proxima execucao recalcula a mesma janela.
+
+    Args:
+        fontes: Fontes a atualizar
+        atraso_minutos: Margem para escritas tardias antes do watermark
+
+    Returns:
+        Dict fonte -> resultado (ou erro)
+    """
+    resultado = {}
+
+    for fonte in fontes:
+        inicio = time.monotonic()
+        try:
+            dados = await atualizar_fonte(fonte, atraso_minutos=atraso_minutos)
+        except Exception as e:
+            logger.error(f"Erro ao atualizar rollup de {fonte}: {e}")
+            resultado[fonte] = {"erro": str(e)}
+            continue
+
+        dados = {**dados, "duracao_s": round(time.monotonic() - inicio, 3)}
+        ultimas_execucoes[fonte] = dados
+        resultado[fonte] = dados
+        logger.info(
+            f"Rollup {fonte}: {dados.get('linhas_hora', 0)} linhas/hora, "
+            f"{dados.get('linhas_dia', 0)} linhas/dia em {dados['duracao_s']}s"
+        )
+
+    return resultado
@@ -146,6 +146,17 @@ JOBS = [
     # Reports periódicos (V2 - reduzido para 2x por dia + semanal)
     # Ref: Slack V2 - SRE Review 31/12/2025
     # Removidos: report_almoco e report_tarde (ruido excessivo)
+    # Rollups de metricas para relatorios e dashboards
+    {
+        "name": "atualizar_rollups",
+        "endpoint": "/jobs/atualizar-rollups",
+        "schedule": "*/5 * * * *",  # A cada 5 minutos
+    },
+    {
+        "name": "atualizar_snapshot_analitico",
+        "endpoint": "/jobs/atualizar-snapshot-analitico",
+        "schedule": "*/10 * * * *",  # A cada 10 minutos
+    },
     {
         "name": "report_manha",
         "endpoint": "/jobs/report-periodo?tipo=manha",
@@ -10,176 +10,187 @@ Sprint 15 - Policy Engine
 """
 
 import logging
+import time
 from datetime import timedelta
+from typing import Optional
 
 from app.core.timezone import agora_utc
 from app.services.supabase import supabase
-from app.services.policy.state_update import StateUpdate
-from app.services.policy.repository import (
-    save_doctor_state_updates,
-    buscar_states_para_decay,
-    _row_to_state,
-)
+from app.services.policy.repository import invalidar_cache_states
 
 logger = logging.getLogger(__name__)
 
+TAMANHO_LOTE_PADRAO = 1000
 
-async def decay_all_temperatures(batch_size: int = 100) -> int:
+# Vazao da ultima execucao de cada job (nome -> contagens e linhas/s)
+ultimas_execucoes: dict[str, dict] = {}
+
+
+async def _processar_em_lotes(
+    nome: str,
+    rpc: str,
+    params: dict,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+) -> int:
+    """
+    Aplica uma RPC de manutencao sobre toda a populacao, lote a lote.
+
+    As RPCs (migrations/doctor_state_manutencao_lote_rpc.sql) atualizam ate
+    p_limite linhas com cliente_id > p_cursor e devolvem os ids alterados.
+    O maior id vira o cursor do proximo lote; um lote menor que o limite
+    encerra. O cache dos ids alterados e invalidado em bloco por lote.
+
+    Args:
+        nome: Nome do job (logs e ultimas_execucoes)
+        rpc: Nome da RPC
+        params: Parametros fixos da RPC (sem cursor/limite)
+        tamanho_lote: Linhas por chamada
+
+    Returns:
+        Quantidade de linhas alteradas
+    """
+    inicio = time.monotonic()
+    cursor: Optional[str] = None
+    total = 0
+    lotes = 0
+
+    while True:
+        response = supabase.rpc(
+            rpc, {**params, "p_cursor": cursor, "p_limite": tamanho_lote}
+        ).execute()
+        ids = [str(row["cliente_id"]) for row in response.data or []]
+        lotes += 1
+
+        if ids:
+            total += len(ids)
+            cursor = max(ids)
+            await invalidar_cache_states(ids)
+
+        if len(ids) < tamanho_lote:
+            break
+
+    duracao = time.monotonic() - inicio
+    vazao = round(total / duracao, 1) if duracao > 0 else float(total)
+    ultimas_execucoes[nome] = {
+        "linhas": total,
+        "lotes": lotes,
+        "duracao_s": round(duracao, 3),
+        "linhas_por_s": vazao,
+    }
+    logger.info(f"{nome}: {total} linhas em {lotes} lote(s), {duracao:.2f}s ({vazao} linhas/s)")
+    return total
+
+
+async def decay_all_temperatures(batch_size: int = TAMANHO_LOTE_PADRAO) -> int:
     """
     Job principal: decai temperatura de médicos inativos.
 
     Usa last_decay_at para ser IDEMPOTENTE.
     Pode rodar múltiplas vezes sem efeito cumulativo errado.
 
+    A regra de StateUpdate.decay_temperature roda no banco
+    (doctor_state_decay_lote), sobre todos os candidatos.
+
     Args:
-        batch_size: Número máximo de registros por batch
+        batch_size: Registros por lote (todos os lotes são processados)
 
     Returns:
         Quantidade de médicos com decay aplicado
     """
     logger.info("Iniciando job de decay de temperatura...")
 
-    now = agora_utc()
-
     try:
-        # Buscar estados que precisam de decay
-        states_to_decay = await buscar_states_para_decay(dias_minimo=1)
-        logger.info(f"Encontrados {len(states_to_decay)} médicos para avaliar decay")
-
-        state_updater = StateUpdate()
-        decayed = 0
-
-        for row in states_to_decay[:batch_size]:  # Limitar batch
-            try:
-                # Sprint 59 Epic 4.2: Converter row direto ao invés de load_doctor_state
-                state = _row_to_state(row)
-                updates = state_updater.decay_temperature(state, now)
-
-                if updates:
-                    await save_doctor_state_updates(row["cliente_id"], updates)
-                    decayed += 1
-                    logger.debug(
-                        f"Decay aplicado: {row['cliente_id'][:8]}... "
-                        f"temp={state.temperature} -> {updates.get('temperature')}"
-                    )
-            except Exception as e:
-                logger.error(f"Erro ao decair {row['cliente_id']}: {e}")
-                continue
-
-        logger.info(f"Decay aplicado em {decayed} médicos")
-        return decayed
+        return await _processar_em_lotes(
+            "decay",
+            "doctor_state_decay_lote",
+            {"p_agora": agora_utc().isoformat()},
+            batch_size,
+        )
 
     except Exception as e:
         logger.error(f"Erro no job de decay: {e}")
         raise
 
 
-async def expire_cooling_off() -> int:
+async def expire_cooling_off(batch_size: int = TAMANHO_LOTE_PADRAO) -> int:
     """
     Expira cooling_off que passou do prazo.
 
     Médicos em cooling_off com prazo expirado voltam para 'active'.
 
+    Args:
+        batch_size: Registros por lote
+
     Returns:
         Quantidade de cooling_off expirados
     """
     logger.info("Verificando cooling_off expirados...")
 
-    now = agora_utc().isoformat()
-
     try:
-        response = (
-            supabase.table("doctor_state")
-            .update(
-                {
-                    "permission_state": "active",
-                    "cooling_off_until": None,
-                }
-            )
-            .eq("permission_state", "cooling_off")
-            .lt("cooling_off_until", now)
-            .execute()
+        return await _processar_em_lotes(
+            "expire_cooling_off",
+            "doctor_state_expirar_cooling_off_lote",
+            {"p_agora": agora_utc().isoformat()},
+            batch_size,
         )
 
-        expired = len(response.data or [])
-        if expired:
-            logger.info(f"Expirados {expired} cooling_off")
-        else:
-            logger.debug("Nenhum cooling_off expirado")
-
-        return expired
-
     except Exception as e:
         logger.error(f"Erro ao expirar cooling_off: {e}")
         raise
 
 
-async def reset_weekly_contact_count() -> int:
+async def reset_weekly_contact_count(batch_size: int = TAMANHO_LOTE_PADRAO) -> int:
     """
     Reseta contact_count_7d semanalmente.
 
     Executar toda segunda-feira às 00:00.
 
+    Args:
+        batch_size: Registros por lote
+
     Returns:
         Quantidade de contadores resetados
     """
     logger.info("Resetando contact_count_7d...")
 
     try:
-        response = (
-            supabase.table("doctor_state")
-            .update({"contact_count_7d": 0})
-            .gt("contact_count_7d", 0)
-            .execute()
+        return await _processar_em_lotes(
+            "reset_contact_count",
+            "doctor_state_resetar_contagem_lote",
+            {},
+            batch_size,
         )
 
-        reset = len(response.data or [])
-        if reset:
-            logger.info(f"Resetados {reset} contadores semanais")
-        else:
-            logger.debug("Nenhum contador para resetar")
-
-        return reset
-
     except Exception as e:
         logger.error(f"Erro ao resetar contadores: {e}")
         raise
 
 
-async def update_lifecycle_stages() -> int:
+async def update_lifecycle_stages(batch_size: int = TAMANHO_LOTE_PADRAO) -> int:
     """
     Atualiza lifecycle_stage baseado em inatividade.
 
-    Médicos inativos por muito tempo podem virar 'churned'.
+    Médicos inativos por muito tempo podem virar 'churned': última mensagem
+    recebida há mais de 90 dias, fora de opted_out e ainda não churned.
+
+    Args:
+        batch_size: Registros por lote
 
     Returns:
         Quantidade de stages atualizados
     """
     logger.info("Verificando lifecycle stages...")
 
-    now = agora_utc()
-    churned_cutoff = (now - timedelta(days=90)).isoformat()  # 90 dias sem atividade
+    churned_cutoff = (agora_utc() - timedelta(days=90)).isoformat()  # 90 dias sem atividade
 
     try:
-        # Marcar como churned se:
-        # - última mensagem recebida foi há mais de 90 dias
-        # - não está em opted_out (já é terminal)
-        # - não está em 'churned' já
-        response = (
-            supabase.table("doctor_state")
-            .update({"lifecycle_stage": "churned"})
-            .neq("permission_state", "opted_out")
-            .neq("lifecycle_stage", "churned")
-            .lt("last_inbound_at", churned_cutoff)
-            .execute()
+        return await _processar_em_lotes(
+            "churn",
+            "doctor_state_marcar_churned_lote",
+            {"p_corte": churned_cutoff},
+            batch_size,
         )
 
-        churned = len(response.data or [])
-        if churned:
-            logger.info(f"Marcados {churned} médicos como churned")
-
-        return churned
-
     except Exception as e:
         logger.error(f"Erro ao atualizar lifecycle: {e}")
         raise
@@ -208,6 +219,11 @@ async def run_daily_maintenance() -> dict:
             "decayed": decayed,
             "expired_cooling_off": expired,
             "churned": churned,
+            "throughput": {
+                nome: ultimas_execucoes[nome]
+                for nome in ("decay", "expire_cooling_off", "churn")
+                if nome in ultimas_execucoes
+            },
             "timestamp": agora_utc().isoformat(),
         }
 
@@ -244,6 +260,8 @@ async def run_weekly_maintenance() -> dict:
             **daily_result,
             "reset_contact_count": reset,
         }
+        if "reset_contact_count" in ultimas_execucoes:
+            result["throughput"]["reset_contact_count"] = ultimas_execucoes["reset_contact_count"]
 
         logger.info(f"=== Manutenção semanal concluída: {result} ===")
 
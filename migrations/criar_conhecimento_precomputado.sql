@@ -0,0 +1,24 @@
+-- Resultados pré-computados de buscas de conhecimento (RAG)
+-- Consultas geradas a partir de valores fechados (perfil, objetivo, categoria
+-- de objeção) são resolvidas na indexação e servidas sem embedding.
+-- Gerado por IndexadorConhecimento -> PrecomputadorConhecimento.precomputar_todos()
+
+CREATE TABLE IF NOT EXISTS conhecimento_precomputado (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    -- Versão da pré-computação (epoch da execução)
+    versao BIGINT NOT NULL,
+    -- Tipo da consulta: perfil, objetivo, objecao
+    consulta VARCHAR(50) NOT NULL,
+    -- Valor da consulta (ex: senior, ofertar, preco)
+    chave VARCHAR(100) NOT NULL,
+    -- Lista de ResultadoBusca serializada
+    resultados JSONB NOT NULL DEFAULT '[]',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    UNIQUE (versao, consulta, chave)
+);
+
+CREATE INDEX IF NOT EXISTS idx_conhecimento_precomputado_versao
+    ON conhecimento_precomputado(versao DESC);
+
+COMMENT ON TABLE conhecimento_precomputado IS 'Resultados de busca RAG pré-computados por versão da base de conhecimento';
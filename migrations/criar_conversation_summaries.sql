@@ -0,0 +1,16 @@
+-- Resumo incremental (rolling summary) por conversa
+-- Mantido por app.services.julia.summarizer.atualizar_resumo_conversa em
+-- background após cada resposta; o caminho da resposta só lê.
+
+CREATE TABLE IF NOT EXISTS conversation_summaries (
+    conversation_id UUID PRIMARY KEY REFERENCES conversations(id) ON DELETE CASCADE,
+    resumo TEXT NOT NULL,
+    -- Última interação incorporada ao resumo (high-water mark)
+    ultima_interacao_id BIGINT NOT NULL,
+    -- Total de mensagens já resumidas
+    msgs_resumidas INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE conversation_summaries IS 'Resumo incremental das mensagens antigas de cada conversa (summarizer)';
@@ -0,0 +1,18 @@
+-- Alvos de ON CONFLICT do write-behind (app.services.write_behind)
+-- Os lotes usam INSERT ... ON CONFLICT (coluna) DO NOTHING; o Postgres exige
+-- um índice único não parcial na coluna. NULLs continuam permitidos em
+-- business_events.dedupe_key (eventos sem dedupe não conflitam).
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_business_events_dedupe_key_unique
+    ON business_events (dedupe_key);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_policy_events_event_id_unique
+    ON policy_events (event_id);
+
+-- interacoes não tem chave natural (id é bigserial): o buffer gera um
+-- write_id por linha ao enfileirar, para regravar o spill sem duplicar.
+-- Linhas antigas e gravações diretas ficam com NULL.
+ALTER TABLE interacoes ADD COLUMN IF NOT EXISTS write_id uuid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_interacoes_write_id_unique
+    ON interacoes (write_id);
@@ -0,0 +1,73 @@
+-- RPC em lote para status de entrega (app.services.delivery_status)
+-- Recebe os callbacks já colapsados (um status por mensagem) e aplica
+-- todos num único UPDATE, com a mesma progressão da RPC unitária
+-- interacao_atualizar_delivery_status (pending -> sent -> delivered -> read).
+--
+-- p_updates: [{"provider_message_id": "...", "status": "read", "chip_id": "uuid|null"}, ...]
+
+CREATE OR REPLACE FUNCTION interacao_atualizar_delivery_status_lote(p_updates JSONB)
+RETURNS TABLE (
+    provider_message_id TEXT,
+    interacao_id UUID,
+    atualizado BOOLEAN,
+    status_anterior TEXT,
+    status_novo TEXT
+)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH entrada AS (
+        SELECT
+            u->>'provider_message_id' AS pmid,
+            u->>'status' AS status,
+            NULLIF(u->>'chip_id', '')::UUID AS chip_id
+        FROM jsonb_array_elements(p_updates) AS u
+    ),
+    alvo AS (
+        -- Uma interação por provider_message_id (como o LIMIT 1 da RPC unitária)
+        SELECT DISTINCT ON (e.pmid)
+            e.pmid, e.status, e.chip_id, i.id, i.delivery_status AS anterior
+        FROM entrada e
+        JOIN interacoes i ON i.provider_message_id = e.pmid
+        ORDER BY e.pmid, i.created_at
+    ),
+    atualizadas AS (
+        UPDATE interacoes i
+        SET
+            delivery_status = a.status,
+            delivery_status_at = NOW(),
+            chip_id = COALESCE(a.chip_id, i.chip_id)
+        FROM alvo a
+        WHERE i.id = a.id
+          -- Reavaliado sobre a versão atual da linha: nunca retrocede
+          AND (
+              i.delivery_status IS NULL
+              OR (i.delivery_status = 'pending' AND a.status IN ('sent', 'delivered', 'read', 'failed'))
+              OR (i.delivery_status = 'sent' AND a.status IN ('delivered', 'read', 'failed'))
+              OR (i.delivery_status = 'delivered' AND a.status = 'read')
+          )
+        RETURNING i.id
+    )
+    SELECT
+        e.pmid,
+        a.id,
+        u.id IS NOT NULL,
+        a.anterior,
+        CASE WHEN u.id IS NOT NULL OR a.id IS NULL THEN e.status ELSE a.anterior END
+    FROM entrada e
+    LEFT JOIN alvo a ON a.pmid = e.pmid
+    LEFT JOIN atualizadas u ON u.id = a.id;
+$$;
+
+COMMENT ON FUNCTION interacao_atualizar_delivery_status_lote IS
+    'Atualiza status de entrega de várias interações num único UPDATE. Só avança na progressão de status.';
+
+-- Métricas de entrega/leitura (chip_interactions) deduplicadas por mensagem:
+-- o provider reenvia callbacks, e o buffer só junta os repetidos dentro do
+-- mesmo lote. Com o índice, o INSERT ... ON CONFLICT DO NOTHING descarta o
+-- repetido em qualquer lote. Linhas sem provider_message_id (NULL) não
+-- conflitam entre si.
+ALTER TABLE chip_interactions ADD COLUMN IF NOT EXISTS provider_message_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_chip_interactions_mensagem_unique
+    ON chip_interactions (chip_id, tipo, provider_message_id);
@@ -0,0 +1,142 @@
+-- RPCs em lote para a manutenção do doctor_state (app.workers.temperature_decay)
+-- Cada chamada processa um lote da população inteira com paginação por
+-- chave (cliente_id > p_cursor ORDER BY cliente_id LIMIT p_limite) e devolve
+-- os cliente_id alterados. O worker repete com o maior id devolvido como
+-- cursor até o lote vir menor que p_limite, e invalida o cache desses ids.
+--
+-- FOR UPDATE SKIP LOCKED: linhas presas por outra transação ficam para a
+-- próxima execução em vez de travar o job.
+
+-- Decay de temperatura: mesma regra de StateUpdate.decay_temperature
+-- (-0.05 por dia inteiro desde last_decay_at, ou last_inbound_at, sem ir abaixo
+-- de zero). last_decay_at = p_agora mantém o job idempotente.
+CREATE OR REPLACE FUNCTION doctor_state_decay_lote(
+    p_agora TIMESTAMPTZ,
+    p_cursor UUID DEFAULT NULL,
+    p_limite INT DEFAULT 1000
+)
+RETURNS TABLE (cliente_id UUID)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH lote AS (
+        SELECT d.cliente_id
+        FROM doctor_state d
+        WHERE (p_cursor IS NULL OR d.cliente_id > p_cursor)
+          AND d.permission_state <> 'opted_out'
+          AND d.temperature > 0
+          AND COALESCE(d.last_decay_at, d.last_inbound_at) <= p_agora - INTERVAL '1 day'
+        ORDER BY d.cliente_id
+        LIMIT p_limite
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE doctor_state d
+    SET
+        temperature = ROUND(
+            GREATEST(
+                0,
+                d.temperature - LEAST(
+                    d.temperature,
+                    FLOOR(
+                        EXTRACT(EPOCH FROM p_agora - COALESCE(d.last_decay_at, d.last_inbound_at))
+                        / 86400
+                    ) * 0.05
+                )
+            )::NUMERIC,
+            2
+        ),
+        temperature_trend = 'cooling',
+        last_decay_at = p_agora
+    FROM lote l
+    WHERE d.cliente_id = l.cliente_id
+    RETURNING d.cliente_id;
+$$;
+
+-- cooling_off vencido volta para 'active'
+CREATE OR REPLACE FUNCTION doctor_state_expirar_cooling_off_lote(
+    p_agora TIMESTAMPTZ,
+    p_cursor UUID DEFAULT NULL,
+    p_limite INT DEFAULT 1000
+)
+RETURNS TABLE (cliente_id UUID)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH lote AS (
+        SELECT d.cliente_id
+        FROM doctor_state d
+        WHERE (p_cursor IS NULL OR d.cliente_id > p_cursor)
+          AND d.permission_state = 'cooling_off'
+          AND d.cooling_off_until < p_agora
+        ORDER BY d.cliente_id
+        LIMIT p_limite
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE doctor_state d
+    SET permission_state = 'active', cooling_off_until = NULL
+    FROM lote l
+    WHERE d.cliente_id = l.cliente_id
+    RETURNING d.cliente_id;
+$$;
+
+-- Reset semanal de contact_count_7d
+CREATE OR REPLACE FUNCTION doctor_state_resetar_contagem_lote(
+    p_cursor UUID DEFAULT NULL,
+    p_limite INT DEFAULT 1000
+)
+RETURNS TABLE (cliente_id UUID)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH lote AS (
+        SELECT d.cliente_id
+        FROM doctor_state d
+        WHERE (p_cursor IS NULL OR d.cliente_id > p_cursor)
+          AND d.contact_count_7d > 0
+        ORDER BY d.cliente_id
+        LIMIT p_limite
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE doctor_state d
+    SET contact_count_7d = 0
+    FROM lote l
+    WHERE d.cliente_id = l.cliente_id
+    RETURNING d.cliente_id;
+$$;
+
+-- Churn: sem inbound desde p_corte, fora de opted_out e ainda não churned
+CREATE OR REPLACE FUNCTION doctor_state_marcar_churned_lote(
+    p_corte TIMESTAMPTZ,
+    p_cursor UUID DEFAULT NULL,
+    p_limite INT DEFAULT 1000
+)
+RETURNS TABLE (cliente_id UUID)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH lote AS (
+        SELECT d.cliente_id
+        FROM doctor_state d
+        WHERE (p_cursor IS NULL OR d.cliente_id > p_cursor)
+          AND d.permission_state <> 'opted_out'
+          AND d.lifecycle_stage <> 'churned'
+          AND d.last_inbound_at < p_corte
+        ORDER BY d.cliente_id
+        LIMIT p_limite
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE doctor_state d
+    SET lifecycle_stage = 'churned'
+    FROM lote l
+    WHERE d.cliente_id = l.cliente_id
+    RETURNING d.cliente_id;
+$$;
+
+-- Índices parciais: cada lote percorre só os candidatos, em ordem de cliente_id
+CREATE INDEX IF NOT EXISTS idx_doctor_state_cooling_off_lote
+    ON doctor_state (cliente_id)
+    WHERE permission_state = 'cooling_off';
+
+CREATE INDEX IF NOT EXISTS idx_doctor_state_contagem_lote
+    ON doctor_state (cliente_id)
+    WHERE contact_count_7d > 0;
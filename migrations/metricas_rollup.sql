@@ -0,0 +1,331 @@
+-- Rollups de métricas para relatórios e dashboards (app.services.rollups)
+-- metricas_rollup guarda contagens (e somas) por hora e por dia de Brasília,
+-- por fonte, métrica e dimensão (total, chip, campanha, hospital, tipo).
+-- rollup_atualizar_fonte recalcula, a partir do watermark da fonte, as horas
+-- afetadas e os dias que as contêm; rollup_somar responde uma janela
+-- qualquer com dias e horas inteiras dos rollups e só as bordas, a cauda
+-- depois do watermark e o trecho antes da cobertura (processado_desde)
+-- direto da tabela de origem.
+--
+-- Métricas por fonte:
+--   interacoes            entrada, saida                  (total, chip)
+--   business_events       <event_type>                    (total, hospital, campanha)
+--   conversations         criadas                         (total, campanha)
+--   handoffs              criados                         (total, tipo)
+--   avaliacoes_qualidade  avaliacoes, pontuadas (soma)    (total)
+
+CREATE TABLE IF NOT EXISTS metricas_rollup (
+    granularidade TEXT NOT NULL CHECK (granularidade IN ('hora', 'dia')),
+    bucket TIMESTAMPTZ NOT NULL,
+    fonte TEXT NOT NULL,
+    metrica TEXT NOT NULL,
+    dimensao TEXT NOT NULL DEFAULT 'total',
+    valor_dimensao TEXT NOT NULL DEFAULT '',
+    contagem BIGINT NOT NULL DEFAULT 0,
+    soma NUMERIC NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (granularidade, fonte, dimensao, bucket, metrica, valor_dimensao)
+);
+
+-- Recalculo incremental apaga por fonte e bucket, sem filtrar dimensão
+CREATE INDEX IF NOT EXISTS idx_metricas_rollup_fonte_bucket
+    ON metricas_rollup (granularidade, fonte, bucket);
+
+CREATE TABLE IF NOT EXISTS metricas_rollup_watermarks (
+    fonte TEXT PRIMARY KEY,
+    processado_ate TIMESTAMPTZ NOT NULL,
+    -- Início (dia de Brasília) da cobertura; antes disso os rollups não têm dados
+    processado_desde TIMESTAMPTZ,
+    linhas_hora INT NOT NULL DEFAULT 0,
+    linhas_dia INT NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE metricas_rollup_watermarks
+    ADD COLUMN IF NOT EXISTS processado_desde TIMESTAMPTZ;
+
+-- Fontes já carregadas antes da coluna começaram numa hora qualquer: o
+-- primeiro dia ficou parcial, então a cobertura começa no dia seguinte.
+UPDATE metricas_rollup_watermarks w
+SET processado_desde = COALESCE(
+    (
+        SELECT (date_trunc('day', min(r.bucket) AT TIME ZONE 'America/Sao_Paulo')
+                   AT TIME ZONE 'America/Sao_Paulo') + INTERVAL '1 day'
+        FROM metricas_rollup r
+        WHERE r.granularidade = 'hora' AND r.fonte = w.fonte
+    ),
+    w.processado_ate
+)
+WHERE w.processado_desde IS NULL;
+
+-- Agregação por hora de uma janela da tabela de origem (todas as dimensões)
+CREATE OR REPLACE FUNCTION rollup_agregar_fonte(
+    p_fonte TEXT,
+    p_inicio TIMESTAMPTZ,
+    p_fim TIMESTAMPTZ
+)
+RETURNS TABLE (
+    bucket TIMESTAMPTZ,
+    metrica TEXT,
+    dimensao TEXT,
+    valor_dimensao TEXT,
+    contagem BIGINT,
+    soma NUMERIC
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF p_inicio >= p_fim THEN
+        RETURN;
+    END IF;
+
+    IF p_fonte = 'interacoes' THEN
+        RETURN QUERY
+        SELECT date_trunc('hour', i.created_at), i.direcao::text, d.dimensao, d.valor,
+               count(*)::bigint, 0::numeric
+        FROM interacoes i
+        CROSS JOIN LATERAL (VALUES ('total', ''), ('chip', i.chip_id::text)) AS d(dimensao, valor)
+        WHERE i.created_at >= p_inicio AND i.created_at < p_fim
+          AND i.direcao IS NOT NULL
+          AND d.valor IS NOT NULL
+        GROUP BY 1, 2, 3, 4;
+
+    ELSIF p_fonte = 'business_events' THEN
+        RETURN QUERY
+        SELECT date_trunc('hour', e.ts), e.event_type::text, d.dimensao, d.valor,
+               count(*)::bigint, 0::numeric
+        FROM business_events e
+        CROSS JOIN LATERAL (
+            VALUES ('total', ''),
+                   ('hospital', e.hospital_id::text),
+                   ('campanha', e.event_props->>'campaign_id')
+        ) AS d(dimensao, valor)
+        WHERE e.ts >= p_inicio AND e.ts < p_fim
+          AND d.valor IS NOT NULL
+        GROUP BY 1, 2, 3, 4;
+
+    ELSIF p_fonte = 'conversations' THEN
+        RETURN QUERY
+        SELECT date_trunc('hour', c.created_at), 'criadas'::text, d.dimensao, d.valor,
+               count(*)::bigint, 0::numeric
+        FROM conversations c
+        CROSS JOIN LATERAL (
+            VALUES ('total', ''), ('campanha', c.campanha_id::text)
+        ) AS d(dimensao, valor)
+        WHERE c.created_at >= p_inicio AND c.created_at < p_fim
+          AND d.valor IS NOT NULL
+        GROUP BY 1, 2, 3, 4;
+
+    ELSIF p_fonte = 'handoffs' THEN
+        RETURN QUERY
+        SELECT date_trunc('hour', h.created_at), 'criados'::text, d.dimensao, d.valor,
+               count(*)::bigint, 0::numeric
+        FROM handoffs h
+        CROSS JOIN LATERAL (
+            VALUES ('total', ''), ('tipo', COALESCE(h.trigger_type, 'desconhecido'))
+        ) AS d(dimensao, valor)
+        WHERE h.created_at >= p_inicio AND h.created_at < p_fim
+        GROUP BY 1, 2, 3, 4;
+
+    ELSIF p_fonte = 'avaliacoes_qualidade' THEN
+        -- pontuadas: só avaliações com score (mesmo filtro do relatório diário)
+        RETURN QUERY
+        SELECT date_trunc('hour', a.created_at), m.metrica, 'total'::text, ''::text,
+               count(*)::bigint, COALESCE(sum(a.score_geral), 0)::numeric
+        FROM avaliacoes_qualidade a
+        CROSS JOIN LATERAL (
+            VALUES ('avaliacoes', TRUE),
+                   ('pontuadas', a.score_geral IS NOT NULL AND a.score_geral <> 0)
+        ) AS m(metrica, entra)
+        WHERE a.created_at >= p_inicio AND a.created_at < p_fim
+          AND m.entra
+        GROUP BY 1, 2;
+
+    ELSE
+        RAISE EXCEPTION 'Fonte de rollup desconhecida: %', p_fonte;
+    END IF;
+END;
+$$;
+
+-- Atualização incremental: recalcula as horas desde o watermark (menos o
+-- atraso tolerado para escritas tardias, ex: write-behind) e os dias que as
+-- contêm. Horas e dias são reescritos por inteiro, então rodar de novo é
+-- idempotente. Sem watermark, começa no início do dia de Brasília de
+-- p_historico atrás (o rollup diário desse dia sai completo) e grava esse
+-- início como processado_desde.
+CREATE OR REPLACE FUNCTION rollup_atualizar_fonte(
+    p_fonte TEXT,
+    p_atraso INTERVAL DEFAULT INTERVAL '15 minutes',
+    p_historico INTERVAL DEFAULT INTERVAL '35 days'
+)
+RETURNS TABLE (
+    fonte TEXT,
+    de TIMESTAMPTZ,
+    ate TIMESTAMPTZ,
+    linhas_hora INT,
+    linhas_dia INT
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_watermark TIMESTAMPTZ;
+    v_ate TIMESTAMPTZ := now();
+    v_de TIMESTAMPTZ;
+    v_dia_de TIMESTAMPTZ;
+    v_linhas_hora INT;
+    v_linhas_dia INT;
+BEGIN
+    -- Uma execução por fonte de cada vez
+    PERFORM pg_advisory_xact_lock(hashtext('metricas_rollup:' || p_fonte));
+
+    SELECT w.processado_ate INTO v_watermark
+    FROM metricas_rollup_watermarks w
+    WHERE w.fonte = p_fonte;
+
+    IF v_watermark IS NULL THEN
+        v_de := date_trunc('day', (v_ate - p_historico) AT TIME ZONE 'America/Sao_Paulo')
+            AT TIME ZONE 'America/Sao_Paulo';
+    ELSE
+        v_de := date_trunc('hour', v_watermark - p_atraso);
+    END IF;
+    v_dia_de := date_trunc('day', v_de AT TIME ZONE 'America/Sao_Paulo')
+        AT TIME ZONE 'America/Sao_Paulo';
+
+    DELETE FROM metricas_rollup r
+    WHERE r.granularidade = 'hora' AND r.fonte = p_fonte AND r.bucket >= v_de;
+
+    INSERT INTO metricas_rollup (
+        granularidade, bucket, fonte, metrica, dimensao, valor_dimensao, contagem, soma
+    )
+    SELECT 'hora', a.bucket, p_fonte, a.metrica, a.dimensao, a.valor_dimensao,
+           a.contagem, a.soma
+    FROM rollup_agregar_fonte(p_fonte, v_de, v_ate) a;
+    GET DIAGNOSTICS v_linhas_hora = ROW_COUNT;
+
+    DELETE FROM metricas_rollup r
+    WHERE r.granularidade = 'dia' AND r.fonte = p_fonte AND r.bucket >= v_dia_de;
+
+    INSERT INTO metricas_rollup (
+        granularidade, bucket, fonte, metrica, dimensao, valor_dimensao, contagem, soma
+    )
+    SELECT 'dia',
+           date_trunc('day', r.bucket AT TIME ZONE 'America/Sao_Paulo')
+               AT TIME ZONE 'America/Sao_Paulo',
+           p_fonte, r.metrica, r.dimensao, r.valor_dimensao, sum(r.contagem), sum(r.soma)
+    FROM metricas_rollup r
+    WHERE r.granularidade = 'hora' AND r.fonte = p_fonte AND r.bucket >= v_dia_de
+    GROUP BY 2, 4, 5, 6;
+    GET DIAGNOSTICS v_linhas_dia = ROW_COUNT;
+
+    INSERT INTO metricas_rollup_watermarks AS w (
+        fonte, processado_ate, processado_desde, linhas_hora, linhas_dia, atualizado_em
+    )
+    VALUES (p_fonte, v_ate, v_de, v_linhas_hora, v_linhas_dia, now())
+    ON CONFLICT ON CONSTRAINT metricas_rollup_watermarks_pkey DO UPDATE
+    SET processado_ate = EXCLUDED.processado_ate,
+        processado_desde = COALESCE(w.processado_desde, EXCLUDED.processado_desde),
+        linhas_hora = EXCLUDED.linhas_hora,
+        linhas_dia = EXCLUDED.linhas_dia,
+        atualizado_em = now();
+
+    RETURN QUERY SELECT p_fonte, v_de, v_ate, v_linhas_hora, v_linhas_dia;
+END;
+$$;
+
+-- Soma de uma janela [p_inicio, p_fim): dias inteiros de Brasília da
+-- granularidade 'dia', horas inteiras restantes da 'hora' e, da tabela de
+-- origem, só a borda inicial (até a primeira hora cheia, ou até
+-- processado_desde se a janela começa antes da cobertura) e a cauda depois
+-- da última hora coberta pelo watermark.
+CREATE OR REPLACE FUNCTION rollup_somar(
+    p_fonte TEXT,
+    p_inicio TIMESTAMPTZ,
+    p_fim TIMESTAMPTZ,
+    p_dimensao TEXT DEFAULT 'total',
+    p_valor TEXT DEFAULT NULL,
+    p_metricas TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    metrica TEXT,
+    valor_dimensao TEXT,
+    contagem BIGINT,
+    soma NUMERIC
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_coberto TIMESTAMPTZ;
+    v_desde TIMESTAMPTZ;
+    v_h_ini TIMESTAMPTZ;
+    v_h_fim TIMESTAMPTZ;
+    v_d_ini TIMESTAMPTZ;
+    v_d_fim TIMESTAMPTZ;
+BEGIN
+    SELECT date_trunc('hour', w.processado_ate), w.processado_desde
+    INTO v_coberto, v_desde
+    FROM metricas_rollup_watermarks w
+    WHERE w.fonte = p_fonte;
+
+    -- Horas inteiras dentro da janela e já cobertas pelos rollups
+    v_h_ini := date_trunc('hour', p_inicio);
+    IF v_h_ini < p_inicio THEN
+        v_h_ini := v_h_ini + INTERVAL '1 hour';
+    END IF;
+    -- Antes de processado_desde os rollups não têm dados: vem da origem
+    IF v_desde IS NULL AND v_coberto IS NOT NULL THEN
+        v_desde := v_coberto;
+    END IF;
+    v_h_ini := GREATEST(v_h_ini, v_desde);
+    v_h_fim := LEAST(date_trunc('hour', p_fim), COALESCE(v_coberto, v_h_ini));
+    IF v_h_fim < v_h_ini THEN
+        v_h_fim := v_h_ini;
+    END IF;
+
+    -- Dias inteiros dentro das horas cobertas
+    v_d_ini := date_trunc('day', v_h_ini AT TIME ZONE 'America/Sao_Paulo')
+        AT TIME ZONE 'America/Sao_Paulo';
+    IF v_d_ini < v_h_ini THEN
+        v_d_ini := v_d_ini + INTERVAL '1 day';
+    END IF;
+    v_d_fim := date_trunc('day', v_h_fim AT TIME ZONE 'America/Sao_Paulo')
+        AT TIME ZONE 'America/Sao_Paulo';
+    IF v_d_fim <= v_d_ini THEN
+        v_d_ini := v_h_fim;
+        v_d_fim := v_h_fim;
+    END IF;
+
+    RETURN QUERY
+    WITH partes AS (
+        SELECT r.metrica, r.valor_dimensao, r.contagem, r.soma
+        FROM metricas_rollup r
+        WHERE r.granularidade = 'dia' AND r.fonte = p_fonte AND r.dimensao = p_dimensao
+          AND r.bucket >= v_d_ini AND r.bucket < v_d_fim
+        UNION ALL
+        SELECT r.metrica, r.valor_dimensao, r.contagem, r.soma
+        FROM metricas_rollup r
+        WHERE r.granularidade = 'hora' AND r.fonte = p_fonte AND r.dimensao = p_dimensao
+          AND (
+              (r.bucket >= v_h_ini AND r.bucket < v_d_ini)
+              OR (r.bucket >= v_d_fim AND r.bucket < v_h_fim)
+          )
+        UNION ALL
+        SELECT a.metrica, a.valor_dimensao, a.contagem, a.soma
+        FROM rollup_agregar_fonte(p_fonte, p_inicio, LEAST(v_h_ini, p_fim)) a
+        WHERE a.dimensao = p_dimensao
+        UNION ALL
+        SELECT a.metrica, a.valor_dimensao, a.contagem, a.soma
+        FROM rollup_agregar_fonte(p_fonte, v_h_fim, p_fim) a
+        WHERE a.dimensao = p_dimensao
+    )
+    SELECT p.metrica, p.valor_dimensao, sum(p.contagem)::bigint, sum(p.soma)
+    FROM partes p
+    WHERE (p_valor IS NULL OR p.valor_dimensao = p_valor)
+      AND (p_metricas IS NULL OR p.metrica = ANY(p_metricas))
+    GROUP BY p.metrica, p.valor_dimensao;
+END;
+$$;
@@ -0,0 +1,22 @@
+-- Histórico de plantões agregado por médico (app.services.priorizacao_medicos)
+-- Substitui uma query em vagas por médico (verificar_historico_positivo) por
+-- uma chamada para o conjunto inteiro de candidatos do ciclo de oferta.
+-- Mesmo critério: vagas reservadas/fechadas/realizadas e não deletadas.
+
+CREATE OR REPLACE FUNCTION historico_plantoes_por_medico(p_cliente_ids UUID[])
+RETURNS TABLE (cliente_id UUID, total_plantoes BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+AS $$
+    SELECT v.cliente_id, COUNT(*) AS total_plantoes
+    FROM vagas v
+    WHERE v.cliente_id = ANY(p_cliente_ids)
+      AND v.status IN ('reservada', 'fechada', 'realizada')
+      AND v.deleted_at IS NULL
+    GROUP BY v.cliente_id;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_vagas_cliente_historico
+    ON vagas (cliente_id)
+    WHERE status IN ('reservada', 'fechada', 'realizada') AND deleted_at IS NULL;
@@ -75,6 +75,8 @@ async def main():
         print(f"Chunks criados: {stats['chunks']}")
         print(f"Embeddings gerados: {stats['embeddings']}")
         print(f"Erros: {stats['erros']}")
+        if "precomputado" in stats:
+            print(f"Consultas pré-computadas: {stats['precomputado'].get('consultas', 0)}")
 
         if stats["erros"] > 0:
             print("\n⚠️  Houve erros durante a indexação. Verifique os logs.")
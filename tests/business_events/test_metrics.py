@@ -4,7 +4,7 @@ Testes para métricas de funil.
 Sprint 17 - E06
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 from app.services.business_events.metrics import (
     get_funnel_metrics,
@@ -13,9 +13,18 @@ from app.services.business_events.metrics import (
     get_top_doctors,
     get_conversion_time,
     FunnelMetrics,
+    EVENTOS_FUNIL,
 )
 
 
+@pytest.fixture(autouse=True)
+def rollups_indisponiveis():
+    """Sem rollups: os testes exercitam a consulta direta."""
+    with patch("app.services.rollups.repository.supabase") as mock:
+        mock.rpc.side_effect = Exception("rollup_somar indisponivel")
+        yield mock
+
+
 class TestFunnelMetrics:
     """Testes para FunnelMetrics dataclass."""
 
@@ -152,6 +161,39 @@ class TestGetFunnelMetrics:
         assert metrics.shift_completed == 12
 
 
+class TestFunilViaRollups:
+    """Funil servido pelos rollups de business_events."""
+
+    @pytest.mark.asyncio
+    @patch("app.services.business_events.metrics.supabase")
+    @patch("app.services.business_events.metrics.contar_por_metrica", new_callable=AsyncMock)
+    async def test_metricas_nao_consultam_eventos_brutos(self, mock_contar, mock_supabase):
+        mock_contar.return_value = {"doctor_outbound": 100, "doctor_inbound": 30}
+
+        metrics = await get_funnel_metrics(hours=24, hospital_id="hosp-1")
+
+        assert metrics.doctor_outbound == 100
+        assert metrics.response_rate == 30.0
+        assert mock_contar.await_args.kwargs == {"dimensao": "hospital", "valor": "hosp-1"}
+        mock_supabase.rpc.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("app.services.business_events.metrics.supabase")
+    @patch("app.services.business_events.metrics.contar_por_dimensao", new_callable=AsyncMock)
+    async def test_por_hospital_em_uma_leitura(self, mock_contar, mock_supabase):
+        mock_contar.return_value = {
+            "hosp-1": {"doctor_outbound": 10, "shift_completed": 1},
+            "hosp-2": {"doctor_outbound": 10, "shift_completed": 3},
+        }
+
+        result = await get_funnel_by_hospital(hours=24)
+
+        assert [r["hospital_id"] for r in result] == ["hosp-2", "hosp-1"]
+        assert result[0]["rates"]["overall_success"] == 30.0
+        assert mock_contar.await_args.kwargs == {"metricas": EVENTOS_FUNIL}
+        mock_supabase.table.assert_not_called()
+
+
 class TestGetFunnelByHospital:
     """Testes para get_funnel_by_hospital."""
 
@@ -17,6 +17,14 @@ from app.services.business_events import (
 )
 
 
+@pytest.fixture(autouse=True)
+def rollups_indisponiveis():
+    """Sem rollups: os testes exercitam a consulta direta."""
+    with patch("app.services.rollups.repository.supabase") as mock:
+        mock.rpc.side_effect = Exception("rollup_somar indisponivel")
+        yield mock
+
+
 class TestEmitEvent:
     """Testes para emissao de eventos."""
 
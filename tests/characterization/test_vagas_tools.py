@@ -138,14 +138,15 @@ class TestHandleBuscarVagas:
             patch("app.tools.vagas.get_especialidade_service") as mock_svc,
             patch("app.tools.vagas.get_vagas_formatter") as mock_fmt,
             patch(
-                "app.tools.vagas.buscar_vagas_compativeis",
+                "app.tools.vagas.listar_turnos_reservados",
                 new_callable=AsyncMock,
-            ) as mock_buscar,
-            patch("app.tools.vagas.aplicar_filtros") as mock_filtros,
+                return_value=set(),
+            ),
             patch(
-                "app.tools.vagas.filtrar_por_conflitos",
+                "app.tools.vagas.buscar_vagas_indexadas",
                 new_callable=AsyncMock,
-            ) as mock_conflitos,
+            ) as mock_buscar,
+            patch("app.tools.vagas.aplicar_filtros") as mock_filtros,
             patch("app.tools.vagas.formatar_vagas_contexto") as mock_fmt_ctx,
         ):
             mock_instance = MagicMock()
@@ -164,7 +165,6 @@ class TestHandleBuscarVagas:
             ]
             mock_buscar.return_value = vagas
             mock_filtros.return_value = (vagas, [])
-            mock_conflitos.return_value = vagas
             mock_fmt_ctx.return_value = "Contexto formatado"
 
             result = await handle_buscar_vagas({}, medico, conversa)
@@ -183,16 +183,16 @@ class TestHandleBuscarVagas:
             patch("app.tools.vagas.get_especialidade_service") as mock_svc,
             patch("app.tools.vagas.get_vagas_formatter") as mock_fmt,
             patch(
-                "app.tools.vagas.buscar_vagas_compativeis",
+                "app.tools.vagas.listar_turnos_reservados",
                 new_callable=AsyncMock,
-                return_value=[],
+                return_value=set(),
             ),
-            patch("app.tools.vagas.aplicar_filtros", return_value=([], [])),
             patch(
-                "app.tools.vagas.filtrar_por_conflitos",
+                "app.tools.vagas.buscar_vagas_indexadas",
                 new_callable=AsyncMock,
                 return_value=[],
             ),
+            patch("app.tools.vagas.aplicar_filtros", return_value=([], [])),
         ):
             mock_instance = MagicMock()
             mock_instance.resolver_especialidade_medico = AsyncMock(
@@ -246,7 +246,12 @@ class TestHandleBuscarVagas:
             patch("app.tools.vagas.get_especialidade_service") as mock_svc,
             patch("app.tools.vagas.get_vagas_formatter") as mock_fmt,
             patch(
-                "app.tools.vagas.buscar_vagas_compativeis",
+                "app.tools.vagas.listar_turnos_reservados",
+                new_callable=AsyncMock,
+                return_value=set(),
+            ),
+            patch(
+                "app.tools.vagas.buscar_vagas_indexadas",
                 new_callable=AsyncMock,
                 side_effect=Exception("DB error"),
             ),
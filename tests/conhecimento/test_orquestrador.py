@@ -17,7 +17,10 @@ class TestOrquestradorConhecimento:
 
     @pytest.fixture
     def orquestrador(self):
-        return OrquestradorConhecimento()
+        orq = OrquestradorConhecimento()
+        # Sem versão pré-computada: força o caminho de busca normal
+        orq.precomputado = MagicMock(obter=AsyncMock(return_value=None))
+        return orq
 
     @pytest.mark.asyncio
     async def test_analisar_situacao_detecta_objecao(self, orquestrador):
@@ -128,7 +131,10 @@ class TestOrquestradorCenariosReais:
 
     @pytest.fixture
     def orquestrador(self):
-        return OrquestradorConhecimento()
+        orq = OrquestradorConhecimento()
+        # Sem versão pré-computada: força o caminho de busca normal
+        orq.precomputado = MagicMock(obter=AsyncMock(return_value=None))
+        return orq
 
     @pytest.mark.asyncio
     async def test_cenario_medico_senior_com_objecao_preco(self, orquestrador):
@@ -211,7 +217,10 @@ class TestOrquestradorLatencia:
 
     @pytest.fixture
     def orquestrador(self):
-        return OrquestradorConhecimento()
+        orq = OrquestradorConhecimento()
+        # Sem versão pré-computada: força o caminho de busca normal
+        orq.precomputado = MagicMock(obter=AsyncMock(return_value=None))
+        return orq
 
     @pytest.mark.asyncio
     async def test_analise_rapida_latencia(self, orquestrador):
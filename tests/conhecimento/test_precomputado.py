@@ -0,0 +1,168 @@
+"""Testes das consultas de conhecimento pré-computadas."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.conhecimento import (
+    CatalogoPrecomputado,
+    OrquestradorConhecimento,
+    PerfilMedico,
+    PrecomputadorConhecimento,
+    ResultadoBusca,
+    TipoObjecao,
+)
+from app.services.conhecimento.precomputado import listar_consultas
+from tests.conftest import criar_mock_supabase
+
+
+def _resultado(id: str = "chunk-1", similaridade: float = 0.8) -> ResultadoBusca:
+    return ResultadoBusca(
+        id=id,
+        arquivo="guia.md",
+        secao="Seção",
+        conteudo="Conteúdo",
+        tipo="perfil",
+        subtipo="senior",
+        tags=["perfil"],
+        similaridade=similaridade,
+    )
+
+
+class TestListarConsultas:
+    def test_cobre_todos_os_valores_fechados(self):
+        consultas = listar_consultas()
+
+        assert ("perfil", "senior") in consultas
+        assert ("objetivo", "ofertar") in consultas
+        assert ("objecao", "preco") in consultas
+        assert ("perfil", PerfilMedico.DESCONHECIDO.value) not in consultas
+        assert ("objecao", TipoObjecao.NENHUMA.value) not in consultas
+
+
+class TestPrecomputador:
+    @pytest.mark.asyncio
+    async def test_grava_nova_versao_e_remove_antigas(self):
+        buscador = MagicMock()
+        buscador.buscar_para_perfil = AsyncMock(return_value=[_resultado()])
+        buscador.buscar_para_objetivo = AsyncMock(return_value=[])
+        buscador.buscar_para_tipo_objecao = AsyncMock(return_value=[])
+        mock_supabase = criar_mock_supabase()
+
+        with patch("app.services.supabase.supabase", mock_supabase):
+            stats = await PrecomputadorConhecimento(buscador).precomputar_todos()
+
+        assert stats["erros"] == 0
+        assert stats["consultas"] == len(listar_consultas())
+        buscador.buscar_para_perfil.assert_any_await("senior", usar_cache=False)
+
+        linhas = mock_supabase.insert.call_args[0][0]
+        assert len(linhas) == len(listar_consultas())
+        assert {linha["versao"] for linha in linhas} == {stats["versao"]}
+        mock_supabase.lt.assert_called_once_with("versao", stats["versao"])
+
+    @pytest.mark.asyncio
+    async def test_nao_publica_versao_com_erros(self):
+        buscador = MagicMock()
+        buscador.buscar_para_perfil = AsyncMock(side_effect=Exception("voyage fora"))
+        buscador.buscar_para_objetivo = AsyncMock(return_value=[])
+        buscador.buscar_para_tipo_objecao = AsyncMock(return_value=[])
+        mock_supabase = criar_mock_supabase()
+
+        with patch("app.services.supabase.supabase", mock_supabase):
+            stats = await PrecomputadorConhecimento(buscador).precomputar_todos()
+
+        assert stats["erros"] > 0
+        mock_supabase.insert.assert_not_called()
+
+
+class TestCatalogoPrecomputado:
+    @pytest.mark.asyncio
+    async def test_carrega_versao_mais_recente(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.order.return_value.limit.return_value.execute.return_value.data = [
+            {"versao": 42}
+        ]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {
+                "consulta": "perfil",
+                "chave": "senior",
+                "resultados": [_resultado().__dict__],
+            }
+        ]
+        catalogo = CatalogoPrecomputado()
+
+        with patch("app.services.supabase.supabase", mock_supabase):
+            resultados = await catalogo.obter("perfil", "senior")
+            ausente = await catalogo.obter("perfil", "recem_formado")
+
+        assert catalogo.versao == 42
+        assert resultados == [_resultado()]
+        assert ausente is None
+        # Segunda consulta usa memória
+        assert mock_supabase.table.return_value.select.return_value.eq.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_erro_no_banco_retorna_none(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = Exception("db fora")
+        catalogo = CatalogoPrecomputado()
+
+        with patch("app.services.supabase.supabase", mock_supabase):
+            assert await catalogo.obter("perfil", "senior") is None
+
+
+class TestOrquestradorComPrecomputado:
+    @pytest.mark.asyncio
+    async def test_serve_sem_embedding_quando_precomputado(self):
+        orquestrador = OrquestradorConhecimento()
+        orquestrador.precomputado = MagicMock(obter=AsyncMock(return_value=[_resultado()]))
+
+        with (
+            patch.object(orquestrador.buscador, "buscar", new_callable=AsyncMock) as mock_buscar,
+            patch.object(
+                orquestrador.buscador, "buscar_para_objecao", new_callable=AsyncMock
+            ) as mock_objecao,
+        ):
+            resultado = await orquestrador.analisar_situacao(
+                mensagem="Paga muito pouco",
+                historico=[],
+                dados_cliente={"anos_experiencia": 20},
+                stage="em_conversacao",
+            )
+
+        mock_buscar.assert_not_called()
+        mock_objecao.assert_not_called()
+        assert resultado.conhecimento
+        orquestrador.precomputado.obter.assert_any_await("objecao", "preco")
+        orquestrador.precomputado.obter.assert_any_await("perfil", "senior")
+
+    @pytest.mark.asyncio
+    async def test_categoria_sem_chunks_cai_na_busca_pela_mensagem(self):
+        """Risco não tem subtipo no catálogo: lista vazia não suprime a busca."""
+        from app.services.conhecimento.detector_objecao import ResultadoDeteccao
+        from app.services.conhecimento.detector_objetivo import (
+            ObjetivoConversa,
+            ResultadoObjetivo,
+        )
+        from app.services.conhecimento.detector_perfil import ResultadoPerfil
+
+        orquestrador = OrquestradorConhecimento()
+        orquestrador.precomputado = MagicMock(obter=AsyncMock(return_value=[]))
+
+        with patch.object(
+            orquestrador.buscador,
+            "buscar_para_objecao",
+            new_callable=AsyncMock,
+            return_value=[_resultado("risco-1")],
+        ) as mock_objecao:
+            conhecimento = await orquestrador._buscar_conhecimento(
+                ResultadoDeteccao(tem_objecao=True, tipo=TipoObjecao.RISCO, confianca=0.8),
+                ResultadoPerfil(perfil=PerfilMedico.DESCONHECIDO, confianca=0.0),
+                ResultadoObjetivo(
+                    objetivo=ObjetivoConversa.NEGOCIAR, confianca=0.5, indicadores=[]
+                ),
+                "e se o hospital nao pagar?",
+            )
+
+        mock_objecao.assert_awaited_once_with("e se o hospital nao pagar?")
+        assert [r.id for r in conhecimento] == ["risco-1"]
@@ -0,0 +1,97 @@
+"""
+Testes dos serviços com inicialização preguiçosa.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.lazy import ServicoLazy, servico_lazy, servicos_registrados
+
+
+class TestServicoLazy:
+    """Testes do proxy preguiçoso."""
+
+    def test_constroi_so_no_primeiro_acesso(self):
+        fabrica = MagicMock(return_value=MagicMock(table=MagicMock(return_value="tabela")))
+        proxy = ServicoLazy("teste", fabrica)
+
+        assert not proxy.inicializado
+        fabrica.assert_not_called()
+
+        assert proxy.table("clientes") == "tabela"
+        assert proxy.table("vagas") == "tabela"
+        fabrica.assert_called_once()
+        assert proxy.inicializado
+
+    def test_resetar_reconstroi(self):
+        fabrica = MagicMock(side_effect=[object(), object()])
+        proxy = ServicoLazy("teste", fabrica)
+
+        primeira = proxy.obter()
+        proxy.resetar()
+
+        assert proxy.obter() is not primeira
+        assert fabrica.call_count == 2
+
+    def test_construcao_unica_entre_threads(self):
+        chamadas = []
+        barreira = threading.Barrier(8)
+
+        def fabrica():
+            chamadas.append(1)
+            return object()
+
+        proxy = ServicoLazy("teste", fabrica)
+
+        def acessar():
+            barreira.wait()
+            proxy.obter()
+
+        threads = [threading.Thread(target=acessar) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(chamadas) == 1
+
+    def test_erro_da_fabrica_nao_marca_como_inicializado(self):
+        proxy = ServicoLazy("teste", MagicMock(side_effect=[ValueError("sem env"), "ok"]))
+
+        with pytest.raises(ValueError):
+            proxy.obter()
+
+        assert not proxy.inicializado
+        assert proxy.obter() == "ok"
+
+    def test_registro(self):
+        proxy = servico_lazy("teste_registro", lambda: "ok")
+
+        assert servicos_registrados()["teste_registro"] is False
+        proxy.obter()
+        assert servicos_registrados()["teste_registro"] is True
+
+
+class TestSingletonsPreguicosos:
+    """Os singletons podem ser substituídos por patch como antes."""
+
+    def test_patch_do_singleton_supabase(self):
+        mock = MagicMock()
+
+        with patch("app.services.supabase.supabase", mock):
+            from app.services.supabase import supabase
+
+            assert supabase is mock
+
+    def test_patch_object_atua_na_instancia(self):
+        instancia = MagicMock()
+        instancia.rpc.return_value = "real"
+        proxy = ServicoLazy("teste", lambda: instancia)
+
+        with patch.object(proxy, "rpc", return_value="mock"):
+            assert proxy.rpc() == "mock"
+            assert instancia.rpc() == "mock"
+
+        assert proxy.rpc() == "real"
@@ -857,15 +857,13 @@ class TestCacheInvalidacaoE2E:
 
         with (
             patch("app.services.campanhas.repository.supabase") as mock_supabase,
-            patch(
-                "app.services.redis.cache_delete",
-                new_callable=AsyncMock,
-            ) as mock_cache_delete,
+            patch("app.services.redis.redis_client") as mock_redis,
         ):
+            mock_redis.incr = AsyncMock(return_value=1)
             mock_supabase.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [
                 {"id": 20, "status": "concluida"}
             ]
 
             await campanha_repository.atualizar_status(20, StatusCampanha.CONCLUIDA)
 
-            mock_cache_delete.assert_called_once_with("campanha:contexto:20")
+            mock_redis.incr.assert_called_once_with("campanha:contexto:gen:campanha:20")
@@ -90,7 +90,7 @@ class TestClassificarComLLM:
     @pytest.fixture
     def mock_anthropic(self):
         """Mock do cliente AsyncAnthropic."""
-        with patch("app.services.grupos.classificador_llm.anthropic.AsyncAnthropic") as mock:
+        with patch("anthropic.AsyncAnthropic") as mock:
             yield mock.return_value
 
     @pytest.fixture
@@ -125,7 +125,7 @@ class TestBuscarHospitalWeb:
     @pytest.fixture
     def mock_anthropic(self):
         """Mock do cliente AsyncAnthropic."""
-        with patch("app.services.grupos.hospital_web.anthropic.AsyncAnthropic") as mock:
+        with patch("anthropic.AsyncAnthropic") as mock:
             instance = mock.return_value
             instance.messages = MagicMock()
             yield instance
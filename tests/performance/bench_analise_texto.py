@@ -0,0 +1,169 @@
+"""
+Microbenchmark do motor de análise de texto.
+
+Compara, sobre um corpus de mensagens reais (médicos e respostas da Julia),
+a varredura sequencial — cada detector normaliza o texto por conta própria
+e roda re.search padrão a padrão — com uma análise do motor compartilhado
+(normalização única, Aho-Corasick por variante e verificação só dos
+padrões cuja literal apareceu). As duas produzem as mesmas ocorrências
+para todos os detectores registrados; o benchmark confere isso antes de medir.
+
+Uso:
+    python -m tests.performance.bench_analise_texto --repeticoes 200
+    python -m tests.performance.bench_analise_texto --json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.analise_texto import MotorAnalise, motor_analise
+from app.services.analise_texto.motor import _variante
+
+CORPUS = Path(__file__).parent / "fixtures" / "corpus_mensagens.json"
+
+# Módulos que registram detectores no motor compartilhado
+DETECTORES = [
+    "app.services.deteccao_bot",
+    "app.services.optout",
+    "app.services.handoff_detector",
+    "app.services.conhecimento.detector_objecao",
+    "app.services.conhecimento.detector_perfil",
+    "app.services.conhecimento.detector_objetivo",
+    "app.services.message_context_classifier",
+    "app.services.conversation_mode.intents",
+    "app.services.validacao_output",
+]
+
+
+@dataclass
+class ConfigBenchmark:
+    repeticoes: int = 100
+    corpus: Path = CORPUS
+
+
+def carregar_corpus(caminho: Path = CORPUS) -> list[str]:
+    """Textos do corpus (inbound e respostas)."""
+    return [item["texto"] for item in json.loads(caminho.read_text(encoding="utf-8"))]
+
+
+def carregar_detectores() -> MotorAnalise:
+    """Importa os detectores (registro no import) e devolve o motor compartilhado."""
+    import importlib
+
+    for modulo in DETECTORES:
+        importlib.import_module(modulo)
+    return motor_analise
+
+
+def varredura_sequencial(motor: MotorAnalise, texto: str) -> dict[str, list[tuple]]:
+    """
+    Referência: cada detector normaliza e testa todos os seus padrões.
+
+    Returns:
+        detector -> [(indice, trecho)] dos padrões que casaram
+    """
+    resultado: dict[str, list[tuple]] = {}
+    for detector, padroes in motor._detectores.items():
+        alvo = _variante(texto, padroes[0].normalizacao) if padroes else texto
+        for padrao in padroes:
+            if padrao.regex is None:
+                inicio = alvo.find(padrao.padrao)
+                if inicio >= 0:
+                    trecho = alvo[inicio : inicio + len(padrao.padrao)]
+                    resultado.setdefault(detector, []).append((padrao.indice, trecho))
+                continue
+            match = padrao.regex.search(alvo)
+            if match:
+                resultado.setdefault(detector, []).append((padrao.indice, match.group()))
+    return resultado
+
+
+def analise_motor(motor: MotorAnalise, texto: str) -> dict[str, list[tuple]]:
+    """Análise do motor (sem cache) no mesmo formato da referência."""
+    analise = motor._analisar(texto)
+    return {
+        detector: [(o.indice, o.trecho) for o in analise.ocorrencias(detector)]
+        for detector in analise.detectores()
+    }
+
+
+def _medir(funcao, motor: MotorAnalise, textos: list[str], repeticoes: int) -> list[float]:
+    amostras = []
+    for _ in range(repeticoes):
+        for texto in textos:
+            inicio = time.perf_counter()
+            funcao(motor, texto)
+            amostras.append((time.perf_counter() - inicio) * 1_000_000)
+    return amostras
+
+
+def _resumo(amostras: list[float]) -> dict:
+    ordenadas = sorted(amostras)
+    return {
+        "media_us": round(statistics.fmean(ordenadas), 2),
+        "p50_us": round(ordenadas[len(ordenadas) // 2], 2),
+        "p95_us": round(ordenadas[int(len(ordenadas) * 0.95) - 1], 2),
+    }
+
+
+def executar_benchmark(config: ConfigBenchmark = ConfigBenchmark()) -> dict:
+    """
+    Confere equivalência e mede as duas estratégias.
+
+    Returns:
+        Relatório com padrões/detectores, divergências e tempos por mensagem
+    """
+    motor = carregar_detectores()
+    textos = carregar_corpus(config.corpus)
+
+    divergencias = [
+        texto
+        for texto in textos
+        if varredura_sequencial(motor, texto) != analise_motor(motor, texto)
+    ]
+
+    motor._analisar("")  # Compila fora da medição
+    sequencial = _resumo(_medir(varredura_sequencial, motor, textos, config.repeticoes))
+    com_motor = _resumo(_medir(analise_motor, motor, textos, config.repeticoes))
+
+    return {
+        "mensagens": len(textos),
+        "detectores": len(motor._detectores),
+        "padroes": len(motor._padroes),
+        "divergencias": divergencias,
+        "sequencial": sequencial,
+        "motor": com_motor,
+        "ganho_p50": round(sequencial["p50_us"] / com_motor["p50_us"], 2),
+    }
+
+
+def _formatar(relatorio: dict) -> str:
+    linhas = [
+        f"{relatorio['mensagens']} mensagens, {relatorio['detectores']} detectores, "
+        f"{relatorio['padroes']} padrões, {len(relatorio['divergencias'])} divergência(s)",
+        f"{'estratégia':<12}{'média µs':>12}{'p50 µs':>12}{'p95 µs':>12}",
+    ]
+    for nome in ("sequencial", "motor"):
+        r = relatorio[nome]
+        linhas.append(f"{nome:<12}{r['media_us']:>12}{r['p50_us']:>12}{r['p95_us']:>12}")
+    linhas.append(f"ganho p50: {relatorio['ganho_p50']}x")
+    return "\n".join(linhas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=100)
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    relatorio = executar_benchmark(ConfigBenchmark(repeticoes=args.repeticoes, corpus=args.corpus))
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2) if args.json else _formatar(relatorio))
+
+
+if __name__ == "__main__":
+    main()
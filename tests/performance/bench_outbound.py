@@ -0,0 +1,348 @@
+"""
+Benchmark ponta a ponta do envio outbound.
+
+Exercita o caminho real de `send_outbound_message` (DEV allowlist, dedupe,
+guardrails, ChipSelector, enviar_via_chip, _registrar_envio, finalização)
+com providers Evolution/Z-API/Meta falsos e Supabase/Redis em memória.
+
+Reporta envios por segundo, p50/p95/p99 por estágio e round-trips de
+banco por envio, para que regressões no caminho de envio apareçam como
+números.
+
+Uso:
+    python -m tests.performance.bench_outbound --envios 500 --concorrencia 20
+    python -m tests.performance.bench_outbound --latencia-db-ms 8 --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from tests.performance.harness import (
+    FakeEvolutionLegado,
+    FakeEvolutionProvider,
+    FakeMetaProvider,
+    FakeRedis,
+    FakeSupabase,
+    FakeZApiProvider,
+    MedidorEstagios,
+    instalar_standins,
+)
+from tests.performance.harness.metricas import formatar_relatorio
+from tests.performance.harness.providers import (
+    PERFIL_EVOLUTION,
+    PERFIL_META,
+    PERFIL_ZAPI,
+    PerfilLatencia,
+)
+
+# (módulo, atributo, estágio) — funções substituídas por versões medidas
+ESTAGIOS = [
+    ("app.services.outbound.sender", "_verificar_dev_allowlist", "dev_allowlist"),
+    ("app.services.outbound.sender", "verificar_e_reservar", "dedupe_reserva"),
+    ("app.services.outbound.sender", "check_outbound_guardrails", "guardrails"),
+    ("app.services.outbound.sender", "_enviar_via_multi_chip", "multi_chip"),
+    ("app.services.chips.sender", "enviar_via_chip", "enviar_via_chip"),
+    ("app.services.chips.sender", "_registrar_envio", "registrar_envio_chip"),
+    ("app.services.outbound.sender", "marcar_enviado", "dedupe_marcar"),
+    ("app.services.outbound.sender", "marcar_falha", "dedupe_marcar"),
+    ("app.services.outbound.sender", "_finalizar_envio", "finalizacao"),
+]
+
+# Métodos do singleton chip_selector medidos como estágio
+ESTAGIOS_SELETOR = [
+    ("selecionar_chip", "chip_selector"),
+    ("registrar_envio", "chip_selector_registro"),
+]
+
+ESTAGIO_TOTAL = "send_outbound_message"
+ESTAGIO_PROVIDER = "provider"
+ESTAGIO_FALLBACK = "fallback_evolution"
+
+
+@dataclass
+class ConfigBenchmark:
+    """
+    Parâmetros de uma execução.
+
+    Attributes:
+        envios: Total de mensagens
+        concorrencia: Envios simultâneos
+        chips_por_provider: Chips ativos de cada provider
+        latencia_db_ms: Latência por round-trip do Supabase (bloqueante)
+        latencia_redis_ms: Latência por comando/pipeline do Redis
+        escala_provider: Multiplicador da latência dos providers (0 = sem espera)
+        perfis: Perfil de latência/falhas por provider
+        metodo: 'reply' (com inbound proof) ou 'followup' (proativo)
+        seed: Semente dos sorteios
+    """
+
+    envios: int = 200
+    concorrencia: int = 10
+    chips_por_provider: int = 3
+    latencia_db_ms: float = 0.0
+    latencia_redis_ms: float = 0.0
+    escala_provider: float = 1.0
+    perfis: dict[str, PerfilLatencia] = field(
+        default_factory=lambda: {
+            "evolution": PERFIL_EVOLUTION,
+            "z-api": PERFIL_ZAPI,
+            "meta": PERFIL_META,
+        }
+    )
+    metodo: str = "reply"
+    seed: int = 42
+
+
+def _criar_chips(config: ConfigBenchmark) -> list[dict]:
+    chips = []
+    for provider in ("evolution", "z-api", "meta"):
+        for i in range(config.chips_por_provider):
+            chip = {
+                "id": str(uuid.uuid4()),
+                "telefone": f"5511900{len(chips):06d}",
+                "instance_name": f"bench-{provider}-{i}",
+                "provider": provider,
+                "status": "active",
+                "tipo": "julia",
+                "trust_score": 90,
+                "pode_prospectar": True,
+                "pode_followup": True,
+                "pode_responder": True,
+                "evolution_connected": True,
+                "limite_dia": 10**9,
+                "limite_hora": 10**9,
+                "msgs_enviadas_hoje": 0,
+            }
+            if provider == "z-api":
+                chip.update(zapi_instance_id=f"inst-{i}", zapi_token="token")
+            if provider == "meta":
+                chip.update(
+                    meta_phone_number_id=f"pn-{i}",
+                    meta_access_token="token",
+                    meta_waba_id="waba-bench",
+                    meta_quality_rating="GREEN",
+                )
+            chips.append(chip)
+    return chips
+
+
+def _criar_medicos(n: int) -> list[dict]:
+    return [{"id": str(uuid.uuid4()), "telefone": f"5521980{i:06d}"} for i in range(n)]
+
+
+def _semear(banco: FakeSupabase, redis: FakeRedis, chips: list[dict], medicos: list[dict]):
+    """Estado inicial: chips, doctor_state e janelas Meta abertas."""
+    from app.services.meta.window_tracker import _window_key
+
+    banco.definir_unico("outbound_dedupe", "dedupe_key")
+    banco.semear("pool_config", [{"limite_resposta_hora": 10**9}])
+    banco.semear("chips", chips)
+    banco.semear(
+        "doctor_state",
+        [{"cliente_id": m["id"], "permission_state": "active"} for m in medicos],
+    )
+    expira = int((datetime.now(timezone.utc) + timedelta(hours=24)).timestamp())
+    for chip in chips:
+        if chip["provider"] == "meta":
+            for medico in medicos:
+                redis._set(_window_key(chip["id"], medico["telefone"]), "user_initiated", exat=expira)
+
+
+def _contexto(config: ConfigBenchmark, medico: dict):
+    from app.services.guardrails import (
+        ActorType,
+        OutboundChannel,
+        OutboundContext,
+        OutboundMethod,
+    )
+
+    if config.metodo == "reply":
+        return OutboundContext(
+            cliente_id=medico["id"],
+            actor_type=ActorType.BOT,
+            channel=OutboundChannel.WHATSAPP,
+            method=OutboundMethod.REPLY,
+            is_proactive=False,
+            conversation_id=medico["conversa_id"],
+            inbound_interaction_id=1,
+            last_inbound_at=datetime.now(timezone.utc).isoformat(),
+        )
+    return OutboundContext(
+        cliente_id=medico["id"],
+        actor_type=ActorType.SYSTEM,
+        channel=OutboundChannel.JOB,
+        method=OutboundMethod.FOLLOWUP,
+        is_proactive=True,
+        conversation_id=medico["conversa_id"],
+    )
+
+
+async def executar_benchmark(config: ConfigBenchmark) -> dict:
+    """
+    Executa o benchmark e retorna o relatório.
+
+    Args:
+        config: Parâmetros da execução
+
+    Returns:
+        Relatório do MedidorEstagios acrescido de contagens por outcome/provider
+    """
+    import importlib
+
+    import app.services.outbound.sender as outbound_sender
+    from app.core.config import settings
+    from app.services.chips.circuit_breaker import ChipCircuitBreaker
+    from app.services.chips.selector import chip_selector
+    from app.services.meta.waba_selector import waba_selector
+
+    rng = random.Random(config.seed)
+    medidor = MedidorEstagios()
+    banco = FakeSupabase(medidor, latencia_ms=config.latencia_db_ms)
+    redis = FakeRedis(medidor, latencia_ms=config.latencia_redis_ms)
+
+    chips = _criar_chips(config)
+    medicos = _criar_medicos(max(1, min(config.envios, 1000)))
+    for medico in medicos:
+        medico["conversa_id"] = str(uuid.uuid4())
+    _semear(banco, redis, chips, medicos)
+
+    classes = {
+        "evolution": FakeEvolutionProvider,
+        "z-api": FakeZApiProvider,
+        "meta": FakeMetaProvider,
+    }
+    providers = {}
+    for chip in chips:
+        provider = classes[chip["provider"]](
+            config.perfis[chip["provider"]],
+            rng=random.Random(rng.random()),
+            escala=config.escala_provider,
+        )
+        provider.send_text = medidor.instrumentar(ESTAGIO_PROVIDER, provider.send_text)
+        providers[chip["id"]] = provider
+
+    legado = FakeEvolutionLegado(
+        FakeEvolutionProvider(
+            config.perfis["evolution"],
+            rng=random.Random(rng.random()),
+            escala=config.escala_provider,
+        )
+    )
+    legado.enviar_mensagem = medidor.instrumentar(ESTAGIO_FALLBACK, legado.enviar_mensagem)
+
+    allowlist = ",".join(m["telefone"] for m in medicos)
+
+    with ExitStack() as stack:
+        stack.enter_context(instalar_standins(banco, redis))
+        stack.enter_context(patch.object(settings, "OUTBOUND_ALLOWLIST", allowlist))
+        stack.enter_context(patch.object(settings, "MULTI_CHIP_ENABLED", True))
+        stack.enter_context(patch.object(ChipCircuitBreaker, "_circuits", {}))
+        stack.enter_context(patch.object(chip_selector, "config", None))
+        stack.enter_context(
+            patch(
+                "app.services.chips.sender.get_provider",
+                side_effect=lambda chip: providers[chip["id"]],
+            )
+        )
+        stack.enter_context(patch.object(outbound_sender, "evolution", legado))
+        for modulo, atributo, estagio in ESTAGIOS:
+            alvo = importlib.import_module(modulo)
+            original = getattr(alvo, atributo)
+            stack.enter_context(
+                patch.object(alvo, atributo, medidor.instrumentar(estagio, original))
+            )
+        for metodo, estagio in ESTAGIOS_SELETOR:
+            original = getattr(chip_selector, metodo)
+            stack.enter_context(
+                patch.object(chip_selector, metodo, medidor.instrumentar(estagio, original))
+            )
+        waba_selector.invalidar()
+        stack.callback(waba_selector.invalidar)
+
+        enviar = medidor.instrumentar(ESTAGIO_TOTAL, outbound_sender.send_outbound_message)
+        semaforo = asyncio.Semaphore(config.concorrencia)
+
+        async def _um_envio(i: int):
+            medico = medicos[i % len(medicos)]
+            async with semaforo:
+                return await enviar(
+                    telefone=medico["telefone"],
+                    texto=f"Oi Dr, mensagem de benchmark #{i}",
+                    ctx=_contexto(config, medico),
+                )
+
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*[_um_envio(i) for i in range(config.envios)])
+        duracao = time.perf_counter() - inicio
+
+    relatorio = medidor.relatorio(config.envios, duracao)
+    outcomes: dict[str, int] = {}
+    for resultado in resultados:
+        outcomes[resultado.outcome.value] = outcomes.get(resultado.outcome.value, 0) + 1
+    relatorio["outcomes"] = outcomes
+    relatorio["por_provider"] = {
+        tipo: {
+            "enviados": sum(p.enviados for p in providers.values() if p.provider_type.value == tipo),
+            "falhas": sum(p.falhas for p in providers.values() if p.provider_type.value == tipo),
+            "timeouts": sum(p.timeouts for p in providers.values() if p.provider_type.value == tipo),
+        }
+        for tipo in classes
+    }
+    return relatorio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do envio outbound")
+    parser.add_argument("--envios", type=int, default=200)
+    parser.add_argument("--concorrencia", type=int, default=10)
+    parser.add_argument("--chips-por-provider", type=int, default=3)
+    parser.add_argument("--latencia-db-ms", type=float, default=0.0)
+    parser.add_argument("--latencia-redis-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--escala-provider",
+        type=float,
+        default=1.0,
+        help="Multiplicador da latência dos providers (0 = sem espera)",
+    )
+    parser.add_argument("--metodo", choices=["reply", "followup"], default="reply")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Imprime o relatório em JSON")
+    parser.add_argument("--verbose", action="store_true", help="Mantém os logs INFO da aplicação")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Log por envio distorce o throughput medido
+        logging.disable(logging.WARNING)
+
+    config = ConfigBenchmark(
+        envios=args.envios,
+        concorrencia=args.concorrencia,
+        chips_por_provider=args.chips_por_provider,
+        latencia_db_ms=args.latencia_db_ms,
+        latencia_redis_ms=args.latencia_redis_ms,
+        escala_provider=args.escala_provider,
+        metodo=args.metodo,
+        seed=args.seed,
+    )
+    relatorio = asyncio.run(executar_benchmark(config))
+
+    if args.json:
+        print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+        return
+
+    print(formatar_relatorio(relatorio, titulo="Outbound"))
+    print(f"\nOutcomes: {relatorio['outcomes']}")
+    print(f"Providers: {relatorio['por_provider']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark de cold start dos pontos de entrada.
+
+Cada ponto de entrada (API e workers) é importado num interpretador novo
+com `python -X importtime`. O relatório traz, por ponto de entrada, o tempo
+de import (soma do self de todos os módulos), o tempo total do processo,
+os pacotes que mais pesam, quais bibliotecas pesadas foram carregadas e
+quais serviços preguiçosos (app.core.lazy) já foram construídos no import
+— o esperado é nenhum.
+
+Uso:
+    python -m tests.performance.bench_startup --repeticoes 5
+    python -m tests.performance.bench_startup --entrada app.main --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+# uvicorn app.main:app / python -m app.workers.fila_worker / python -m app.workers.scheduler
+ENTRADAS = ["app.main", "app.workers.fila_worker", "app.workers.scheduler"]
+
+# Bibliotecas que só devem carregar quando o subsistema é usado
+BIBLIOTECAS_PESADAS = [
+    "anthropic",
+    "voyageai",
+    "bs4",
+    "openpyxl",
+    "playwright",
+    "duckdb",
+    "supabase",
+    "redis",
+]
+
+_SONDA = """
+import json, sys
+import {modulo}
+from app.core.lazy import servicos_registrados
+print(json.dumps({{
+    "bibliotecas": [b for b in {bibliotecas!r} if b in sys.modules],
+    "servicos": servicos_registrados(),
+}}))
+"""
+
+
+@dataclass
+class ConfigBenchmark:
+    repeticoes: int = 3
+    entradas: list[str] = field(default_factory=lambda: list(ENTRADAS))
+    top: int = 8
+
+
+def parsear_importtime(saida: str) -> list[tuple[str, int, int]]:
+    """
+    Linhas do -X importtime.
+
+    Returns:
+        [(modulo, self_us, cumulativo_us)] na ordem em que terminaram de importar
+    """
+    modulos = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        self_us, cumulativo_us, nome = linha[len("import time:") :].split("|", 2)
+        modulos.append((nome.strip(), int(self_us), int(cumulativo_us)))
+    return modulos
+
+
+def por_pacote(modulos: list[tuple[str, int, int]]) -> dict[str, float]:
+    """Tempo de import (ms) agregado pelo pacote de topo."""
+    total: dict[str, int] = defaultdict(int)
+    for nome, self_us, _ in modulos:
+        total[nome.split(".")[0]] += self_us
+    return {pacote: round(us / 1000, 1) for pacote, us in total.items()}
+
+
+def medir_entrada(modulo: str) -> dict:
+    """Importa o módulo num processo novo e coleta tempos e estado final."""
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _SONDA.format(modulo=modulo, bibliotecas=BIBLIOTECAS_PESADAS),
+        ],
+        cwd=RAIZ,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    processo_ms = (time.perf_counter() - inicio) * 1000
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{processo.stderr[-2000:]}")
+
+    modulos = parsear_importtime(processo.stderr)
+    estado = json.loads(processo.stdout.strip().splitlines()[-1])
+    return {
+        "import_ms": round(sum(self_us for _, self_us, _ in modulos) / 1000, 1),
+        "processo_ms": round(processo_ms, 1),
+        "pacotes_ms": por_pacote(modulos),
+        "bibliotecas_pesadas": estado["bibliotecas"],
+        "servicos": estado["servicos"],
+    }
+
+
+def executar_benchmark(config: ConfigBenchmark = ConfigBenchmark()) -> dict:
+    """
+    Mede o cold start de cada ponto de entrada.
+
+    Returns:
+        Relatório por entrada com medianas das repetições
+    """
+    entradas = {}
+    for modulo in config.entradas:
+        amostras = [medir_entrada(modulo) for _ in range(config.repeticoes)]
+        ultima = amostras[-1]
+        pacotes = sorted(ultima["pacotes_ms"].items(), key=lambda item: item[1], reverse=True)
+        entradas[modulo] = {
+            "import_ms": round(statistics.median(a["import_ms"] for a in amostras), 1),
+            "processo_ms": round(statistics.median(a["processo_ms"] for a in amostras), 1),
+            "top_pacotes": pacotes[: config.top],
+            "bibliotecas_pesadas": ultima["bibliotecas_pesadas"],
+            "servicos_registrados": sorted(ultima["servicos"]),
+            "servicos_inicializados": sorted(
+                nome for nome, inicializado in ultima["servicos"].items() if inicializado
+            ),
+        }
+    return {"repeticoes": config.repeticoes, "entradas": entradas}
+
+
+def _formatar(relatorio: dict) -> str:
+    linhas = [
+        f"{relatorio['repeticoes']} repetição(ões) por entrada (mediana)",
+        f"{'entrada':<28}{'import ms':>12}{'processo ms':>14}",
+    ]
+    for modulo, r in relatorio["entradas"].items():
+        linhas.append(f"{modulo:<28}{r['import_ms']:>12}{r['processo_ms']:>14}")
+        top = ", ".join(f"{pacote} {ms}" for pacote, ms in r["top_pacotes"])
+        linhas.append(f"    pacotes: {top}")
+        linhas.append(
+            f"    pesadas carregadas: {', '.join(r['bibliotecas_pesadas']) or 'nenhuma'}"
+        )
+        linhas.append(
+            f"    serviços construídos no import: "
+            f"{', '.join(r['servicos_inicializados']) or 'nenhum'}"
+            f" (de {len(r['servicos_registrados'])})"
+        )
+    return "\n".join(linhas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--entrada", action="append", dest="entradas")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    relatorio = executar_benchmark(
+        ConfigBenchmark(
+            repeticoes=args.repeticoes, entradas=args.entradas or list(ENTRADAS), top=args.top
+        )
+    )
+    print(json.dumps(relatorio, ensure_ascii=False, indent=2) if args.json else _formatar(relatorio))
+
+
+if __name__ == "__main__":
+    main()
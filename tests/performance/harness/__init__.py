@@ -0,0 +1,33 @@
+"""
+Harness de benchmark dos hot paths.
+
+Stand-ins em memória para Supabase e Redis, providers WhatsApp falsos com
+latência configurável e medidor de tempo/round-trips por estágio.
+"""
+
+from tests.performance.harness.metricas import MedidorEstagios, estagio_atual
+from tests.performance.harness.providers import (
+    FakeEvolutionLegado,
+    FakeEvolutionProvider,
+    FakeMetaProvider,
+    FakeZApiProvider,
+    PerfilLatencia,
+)
+from tests.performance.harness.standins import (
+    FakeRedis,
+    FakeSupabase,
+    instalar_standins,
+)
+
+__all__ = [
+    "MedidorEstagios",
+    "estagio_atual",
+    "FakeEvolutionLegado",
+    "FakeEvolutionProvider",
+    "FakeMetaProvider",
+    "FakeZApiProvider",
+    "PerfilLatencia",
+    "FakeRedis",
+    "FakeSupabase",
+    "instalar_standins",
+]
@@ -0,0 +1,132 @@
+"""
+Cliente HTTP em memória para os serviços externos (Chatwoot, Evolution, Slack).
+
+Substitui o singleton de `app.services.http_client` por um httpx.AsyncClient
+sobre MockTransport: cada request conta um round-trip 'http' no estágio
+corrente, espera a latência configurada do host e é respondida por uma rota
+registrada (ou 200 com corpo vazio).
+"""
+
+import asyncio
+import itertools
+import re
+from contextlib import contextmanager
+from typing import Callable, Optional
+from unittest.mock import patch
+
+import httpx
+
+from tests.performance.harness.metricas import MedidorEstagios
+
+# Segmentos numéricos/ids viram ':id' para agrupar operações no relatório
+_RE_ID = re.compile(r"/(\d+|[0-9a-f]{8}-[0-9a-f-]{27,})(?=/|$)")
+
+Rota = Callable[[httpx.Request], httpx.Response]
+
+
+class FakeHttp:
+    """Transport httpx com latência e rotas por host."""
+
+    def __init__(self, medidor: MedidorEstagios, latencia_ms: float = 0.0):
+        """
+        Args:
+            medidor: Medidor que recebe os round-trips
+            latencia_ms: Latência default por request (não bloqueante)
+        """
+        self.medidor = medidor
+        self.latencia_ms = latencia_ms
+        self.latencia_por_host: dict[str, float] = {}
+        self._rotas: dict[str, Rota] = {}
+        self.requests: list[httpx.Request] = []
+
+    def rota(self, host: str, handler: Rota, latencia_ms: Optional[float] = None) -> None:
+        """
+        Registra o handler de um host.
+
+        Args:
+            host: Host sem porta (ex: 'chatwoot.fake')
+            handler: Função request -> httpx.Response
+            latencia_ms: Latência específica do host (default: a do FakeHttp)
+        """
+        self._rotas[host] = handler
+        if latencia_ms is not None:
+            self.latencia_por_host[host] = latencia_ms
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.requests.append(request)
+        self.medidor.registrar_io(
+            "http", f"{host} {request.method} {_RE_ID.sub('/:id', request.url.path)}"
+        )
+        latencia = self.latencia_por_host.get(host, self.latencia_ms)
+        if latencia:
+            await asyncio.sleep(latencia / 1000)
+        handler = self._rotas.get(host)
+        if handler is None:
+            return httpx.Response(200, json={})
+        return handler(request)
+
+    def cliente(self) -> httpx.AsyncClient:
+        """Cria um AsyncClient que usa este transport."""
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle), follow_redirects=True
+        )
+
+
+class FakeChatwoot:
+    """
+    Chatwoot mínimo: cada telefone tem um contato e uma conversa aberta.
+
+    Atende as rotas usadas por `app.services.chatwoot` (busca de contato,
+    conversas do contato, mensagens e labels).
+    """
+
+    base_url = "http://chatwoot.fake"
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.contatos: dict[str, int] = {}
+        self.mensagens = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/contacts/search"):
+            telefone = request.url.params.get("q", "")
+            if telefone not in self.contatos:
+                self.contatos[telefone] = next(self._ids)
+            return httpx.Response(200, json={"payload": [{"id": self.contatos[telefone]}]})
+        if path.endswith("/conversations") and "/contacts/" in path:
+            contact_id = int(path.split("/contacts/")[1].split("/")[0])
+            return httpx.Response(
+                200, json={"payload": [{"id": contact_id + 10_000, "status": "open"}]}
+            )
+        if path.endswith("/messages"):
+            self.mensagens += 1
+            return httpx.Response(200, json={"id": next(self._ids)})
+        return httpx.Response(200, json={"payload": []})
+
+
+@contextmanager
+def instalar_http(http: FakeHttp, chatwoot: Optional[FakeChatwoot] = None):
+    """
+    Troca o cliente HTTP singleton (e configura o Chatwoot falso).
+
+    Args:
+        http: Transport em memória
+        chatwoot: Chatwoot falso; se informado, `chatwoot_service` passa a
+            apontar para ele
+    """
+    import app.services.http_client as http_client
+    from app.services.chatwoot import chatwoot_service
+
+    cliente = http.cliente()
+    with patch.object(http_client, "_client", cliente):
+        if chatwoot is None:
+            yield cliente
+            return
+        http.rota(httpx.URL(chatwoot.base_url).host, chatwoot)
+        with (
+            patch.object(chatwoot_service, "base_url", chatwoot.base_url),
+            patch.object(chatwoot_service, "api_token", "fake-token"),
+        ):
+            yield cliente
@@ -0,0 +1,144 @@
+"""
+LLM falso com latência configurável.
+
+Usa o MockLLMProvider do app para produzir as respostas e expõe as
+funções legadas (`gerar_resposta`, `gerar_resposta_com_tools`,
+`continuar_apos_tool`) com as mesmas assinaturas e formatos de retorno,
+para substituí-las no namespace `app.services.agente` sem tocar no resto
+do caminho de geração (prompt, contexto, validação).
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import random
+from contextlib import contextmanager
+from typing import Any, Optional
+from unittest.mock import patch
+
+from app.services.llm.mock_provider import MockLLMProvider
+from app.services.llm.models import LLMRequest, LLMResponse, Message
+from tests.performance.harness.metricas import MedidorEstagios
+from tests.performance.harness.providers import _Z_P99, PerfilLatencia
+
+# Claude Sonnet com prompt de ~6k tokens (ordem de grandeza de produção)
+PERFIL_LLM = PerfilLatencia(p50_ms=1800, p99_ms=6000)
+
+RESPOSTA_PADRAO = "Oi Dr! Tudo bem sim, e vc? Tenho umas vagas boas essa semana, quer ver?"
+
+# Extração estruturada mínima aceita por _parsear_resposta
+EXTRACAO_PADRAO = json.dumps(
+    {"interesse": "incerto", "interesse_score": 0.5, "proximo_passo": "sem_acao", "confianca": 0.5}
+)
+
+
+class FakeLLM:
+    """Respostas do MockLLMProvider com latência lognormal por chamada."""
+
+    def __init__(
+        self,
+        medidor: MedidorEstagios,
+        perfil: PerfilLatencia = PERFIL_LLM,
+        rng: Optional[random.Random] = None,
+        escala: float = 1.0,
+        provider: Optional[MockLLMProvider] = None,
+    ):
+        """
+        Args:
+            medidor: Medidor que recebe as chamadas ('llm')
+            perfil: Latência da API
+            rng: Gerador (use seed fixa para execuções reprodutíveis)
+            escala: Multiplicador da latência (0 = sem espera)
+            provider: Mock configurado (default: RESPOSTA_PADRAO numerada, para
+                o dedupe de outbound não barrar respostas repetidas ao mesmo médico)
+        """
+        self.medidor = medidor
+        self.perfil = perfil
+        self.rng = rng or random.Random()
+        self.escala = escala
+        self._contador = itertools.count(1)
+        self.provider = provider or MockLLMProvider(response_callback=self._resposta_numerada)
+        self._mu = math.log(perfil.p50_ms)
+        self._sigma = max(math.log(perfil.p99_ms / perfil.p50_ms) / _Z_P99, 0.0)
+
+    def _resposta_numerada(self, request: LLMRequest) -> LLMResponse:
+        return LLMResponse(
+            content=f"{RESPOSTA_PADRAO} ({next(self._contador)})",
+            usage={"input_tokens": 10, "output_tokens": 20},
+            model_id="mock-model",
+        )
+
+    async def _esperar(self, operacao: str) -> None:
+        self.medidor.registrar_io("llm", operacao)
+        if self.escala:
+            await asyncio.sleep(self.rng.lognormvariate(self._mu, self._sigma) / 1000 * self.escala)
+
+    async def _gerar(self, operacao: str, mensagem: str, system_prompt: Optional[str]):
+        await self._esperar(operacao)
+        return await self.provider.generate(
+            LLMRequest(messages=[Message.user(mensagem or "")], system_prompt=system_prompt)
+        )
+
+    @staticmethod
+    def _formato_tools(resposta) -> dict[str, Any]:
+        return {
+            "text": resposta.content or None,
+            "tool_use": [
+                {"id": call.id, "name": call.name, "input": call.input}
+                for call in resposta.tool_calls
+            ],
+            "stop_reason": resposta.stop_reason.value,
+        }
+
+    async def gerar_resposta(
+        self,
+        mensagem: str,
+        historico: list[dict] | None = None,
+        system_prompt: str | None = None,
+        modelo: str | None = None,
+        max_tokens: int = 500,
+    ) -> str:
+        resposta = await self._gerar("gerar_resposta", mensagem, system_prompt)
+        return resposta.content
+
+    async def gerar_resposta_com_tools(
+        self,
+        mensagem: str,
+        historico: list[dict] | None = None,
+        system_prompt: str | None = None,
+        tools: list[dict] | None = None,
+        modelo: str | None = None,
+        max_tokens: int = 500,
+    ) -> dict[str, Any]:
+        resposta = await self._gerar("gerar_resposta_com_tools", mensagem, system_prompt)
+        return self._formato_tools(resposta)
+
+    async def continuar_apos_tool(
+        self,
+        historico: list[dict],
+        tool_results: list[dict],
+        system_prompt: str | None = None,
+        tools: list[dict] | None = None,
+        modelo: str | None = None,
+        max_tokens: int = 500,
+    ) -> dict[str, Any]:
+        resposta = await self._gerar("continuar_apos_tool", "", system_prompt)
+        return self._formato_tools(resposta)
+
+    async def chamar_llm_extracao(self, prompt: str) -> tuple[str, int, int]:
+        """Substituto de `app.services.extraction.extractor._chamar_llm`."""
+        await self._esperar("extracao")
+        return EXTRACAO_PADRAO, 10, 20
+
+
+@contextmanager
+def instalar_llm(llm: FakeLLM):
+    """Substitui as chamadas ao Claude do caminho inbound pelo FakeLLM."""
+    with (
+        patch("app.services.agente.gerar_resposta", llm.gerar_resposta),
+        patch("app.services.agente.gerar_resposta_com_tools", llm.gerar_resposta_com_tools),
+        patch("app.services.agente.continuar_apos_tool", llm.continuar_apos_tool),
+        patch("app.services.extraction.extractor._chamar_llm", llm.chamar_llm_extracao),
+    ):
+        yield llm
@@ -0,0 +1,168 @@
+"""
+Medição de latência e I/O por estágio.
+
+O estágio corrente fica em um ContextVar, então cada round-trip registrado
+pelos stand-ins é atribuído ao estágio mais interno em execução na task
+que o originou (funciona com envios concorrentes).
+"""
+
+import inspect
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Optional
+
+# Estágio em execução na task atual (None = fora de qualquer estágio medido)
+estagio_atual: ContextVar[Optional[str]] = ContextVar("estagio_atual", default=None)
+
+FORA_DE_ESTAGIO = "(fora)"
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """
+    Percentil por nearest-rank.
+
+    Args:
+        valores: Amostras (não precisam estar ordenadas)
+        p: Percentil entre 0 e 100
+
+    Returns:
+        Valor do percentil (0.0 se não houver amostras)
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    rank = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[rank - 1]
+
+
+class MedidorEstagios:
+    """Coleta durações e contagem de I/O por estágio."""
+
+    def __init__(self):
+        self.duracoes: dict[str, list[float]] = defaultdict(list)
+        self.io: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    @asynccontextmanager
+    async def medir(self, nome: str):
+        """Mede o bloco como o estágio `nome`."""
+        token = estagio_atual.set(nome)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duracoes[nome].append(time.perf_counter() - inicio)
+            estagio_atual.reset(token)
+
+    def instrumentar(self, nome: str, func: Callable) -> Callable:
+        """
+        Envolve uma coroutine function (ou função síncrona) como estágio.
+
+        Args:
+            nome: Nome do estágio no relatório
+            func: Função original
+
+        Returns:
+            Função com a mesma assinatura que mede cada chamada
+        """
+        if not inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            def sincrono(*args, **kwargs):
+                token = estagio_atual.set(nome)
+                inicio = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.duracoes[nome].append(time.perf_counter() - inicio)
+                    estagio_atual.reset(token)
+
+            return sincrono
+
+        @wraps(func)
+        async def assincrono(*args, **kwargs):
+            async with self.medir(nome):
+                return await func(*args, **kwargs)
+
+        return assincrono
+
+    def registrar_io(self, tipo: str, operacao: str) -> None:
+        """
+        Registra um round-trip de I/O no estágio corrente.
+
+        Args:
+            tipo: 'db' ou 'redis'
+            operacao: Identificação da operação (ex: 'chips.select')
+        """
+        estagio = estagio_atual.get() or FORA_DE_ESTAGIO
+        self.io[tipo][estagio] += 1
+        self.io[f"{tipo}_operacoes"][operacao] += 1
+
+    def total_io(self, tipo: str) -> int:
+        """Total de round-trips do tipo em todos os estágios."""
+        return sum(self.io[tipo].values())
+
+    def relatorio(self, envios: int, duracao_segundos: float) -> dict:
+        """
+        Consolida as medições.
+
+        Args:
+            envios: Número de operações executadas
+            duracao_segundos: Tempo de parede total
+
+        Returns:
+            Dict com throughput, percentis por estágio (ms) e I/O por operação
+        """
+        estagios = {}
+        for nome, valores in self.duracoes.items():
+            ms = [v * 1000 for v in valores]
+            estagios[nome] = {
+                "chamadas": len(ms),
+                "p50_ms": round(percentil(ms, 50), 3),
+                "p95_ms": round(percentil(ms, 95), 3),
+                "p99_ms": round(percentil(ms, 99), 3),
+                "media_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+            }
+
+        por_envio = max(envios, 1)
+        return {
+            "envios": envios,
+            "duracao_s": round(duracao_segundos, 3),
+            "envios_por_segundo": round(envios / duracao_segundos, 2)
+            if duracao_segundos > 0
+            else 0.0,
+            "estagios": estagios,
+            "db_round_trips_por_envio": round(self.total_io("db") / por_envio, 2),
+            "redis_ops_por_envio": round(self.total_io("redis") / por_envio, 2),
+            "db_por_estagio": dict(self.io["db"]),
+            "redis_por_estagio": dict(self.io["redis"]),
+            "db_operacoes": dict(self.io["db_operacoes"]),
+        }
+
+
+def formatar_relatorio(relatorio: dict, titulo: str = "Benchmark") -> str:
+    """Formata o relatório como tabela de texto."""
+    linhas = [
+        f"== {titulo} ==",
+        f"Operações: {relatorio['envios']} em {relatorio['duracao_s']}s "
+        f"({relatorio['envios_por_segundo']}/s)",
+        f"DB round-trips/op: {relatorio['db_round_trips_por_envio']}  "
+        f"Redis ops/op: {relatorio['redis_ops_por_envio']}",
+        "",
+        f"{'estágio':<32}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'db':>7}",
+    ]
+    for nome, s in relatorio["estagios"].items():
+        db = relatorio["db_por_estagio"].get(nome, 0)
+        linhas.append(
+            f"{nome:<32}{s['chamadas']:>7}{s['p50_ms']:>10.2f}"
+            f"{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{db:>7}"
+        )
+    if relatorio["db_operacoes"]:
+        linhas += ["", "Operações de banco:"]
+        for op, n in sorted(relatorio["db_operacoes"].items(), key=lambda x: -x[1]):
+            linhas.append(f"  {op:<48}{n:>7}")
+    return "\n".join(linhas)
+
@@ -0,0 +1,189 @@
+"""
+Providers WhatsApp falsos com latência e falhas realistas.
+
+A latência segue uma lognormal calibrada por p50/p99 (cauda longa, como
+as APIs reais). Falhas e timeouts retornam MessageResult com as mesmas
+mensagens de erro que os providers reais produzem, então o caminho de
+erro (circuit breaker, cooldown) também é exercitado.
+"""
+
+import asyncio
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from app.services.whatsapp_providers.base import (
+    ConnectionStatus,
+    MessageResult,
+    ProviderType,
+    WhatsAppProvider,
+)
+
+# z-score do percentil 99 na normal padrão
+_Z_P99 = 2.326
+
+
+@dataclass
+class PerfilLatencia:
+    """
+    Perfil de latência e falhas de um provider.
+
+    Attributes:
+        p50_ms: Mediana da latência
+        p99_ms: Percentil 99 da latência
+        taxa_falha: Fração de envios que retornam erro do provider
+        taxa_timeout: Fração de envios que estouram o timeout
+        timeout_ms: Tempo gasto antes de um timeout
+    """
+
+    p50_ms: float
+    p99_ms: float
+    taxa_falha: float = 0.0
+    taxa_timeout: float = 0.0
+    timeout_ms: float = 30_000
+
+
+# Perfis default (ordem de grandeza observada em produção)
+PERFIL_EVOLUTION = PerfilLatencia(p50_ms=180, p99_ms=1200, taxa_falha=0.01, taxa_timeout=0.002)
+PERFIL_ZAPI = PerfilLatencia(p50_ms=250, p99_ms=1500, taxa_falha=0.01, taxa_timeout=0.002)
+PERFIL_META = PerfilLatencia(p50_ms=120, p99_ms=600, taxa_falha=0.005, taxa_timeout=0.001)
+
+
+class _FakeProviderBase(WhatsAppProvider):
+    """Comportamento comum: sorteia latência/resultado e registra envios."""
+
+    erro_falha = "erro"
+    erro_timeout = "timeout"
+
+    def __init__(
+        self,
+        perfil: PerfilLatencia,
+        rng: Optional[random.Random] = None,
+        escala: float = 1.0,
+    ):
+        """
+        Args:
+            perfil: Latência e taxas de falha
+            rng: Gerador (use seed fixa para execuções reprodutíveis)
+            escala: Multiplicador da latência (0 = sem espera)
+        """
+        self.perfil = perfil
+        self.rng = rng or random.Random()
+        self.escala = escala
+        self.enviados = 0
+        self.falhas = 0
+        self.timeouts = 0
+        self._mu = math.log(perfil.p50_ms)
+        self._sigma = max(math.log(perfil.p99_ms / perfil.p50_ms) / _Z_P99, 0.0)
+
+    def _latencia_s(self) -> float:
+        return self.rng.lognormvariate(self._mu, self._sigma) / 1000 * self.escala
+
+    async def _simular(self) -> MessageResult:
+        sorteio = self.rng.random()
+        if sorteio < self.perfil.taxa_timeout:
+            await asyncio.sleep(self.perfil.timeout_ms / 1000 * self.escala)
+            self.timeouts += 1
+            return MessageResult(
+                success=False, error=self.erro_timeout, provider=self.provider_type.value
+            )
+
+        await asyncio.sleep(self._latencia_s())
+
+        if sorteio < self.perfil.taxa_timeout + self.perfil.taxa_falha:
+            self.falhas += 1
+            return MessageResult(
+                success=False, error=self.erro_falha, provider=self.provider_type.value
+            )
+
+        self.enviados += 1
+        return MessageResult(
+            success=True,
+            message_id=uuid.uuid4().hex.upper(),
+            provider=self.provider_type.value,
+        )
+
+    async def send_text(self, phone: str, message: str) -> MessageResult:
+        return await self._simular()
+
+    async def send_media(
+        self,
+        phone: str,
+        media_url: str,
+        caption: Optional[str] = None,
+        media_type: str = "image",
+    ) -> MessageResult:
+        return await self._simular()
+
+    async def get_status(self) -> ConnectionStatus:
+        return ConnectionStatus(connected=True, state="open")
+
+    async def is_connected(self) -> bool:
+        return True
+
+    async def disconnect(self) -> bool:
+        return True
+
+
+class FakeEvolutionProvider(_FakeProviderBase):
+    """Evolution API falsa (self-hosted, falha por conexão com o aparelho)."""
+
+    provider_type = ProviderType.EVOLUTION
+    erro_falha = 'HTTP 500: {"error":"Connection Closed"}'
+    erro_timeout = "ReadTimeout"
+
+    def __init__(self, perfil: PerfilLatencia = PERFIL_EVOLUTION, **kwargs):
+        super().__init__(perfil, **kwargs)
+        self.base_url = "http://evolution.fake"
+        self.instance_name = "fake"
+        self.headers = {}
+
+
+class FakeZApiProvider(_FakeProviderBase):
+    """Z-API falsa (SaaS, falha por rate limit)."""
+
+    provider_type = ProviderType.ZAPI
+    erro_falha = 'HTTP 429: {"error":"Too many requests"}'
+    erro_timeout = "Timeout ao enviar (>30s)"
+
+    def __init__(self, perfil: PerfilLatencia = PERFIL_ZAPI, **kwargs):
+        super().__init__(perfil, **kwargs)
+
+
+class FakeMetaProvider(_FakeProviderBase):
+    """Meta Cloud API falsa (falha por throughput da WABA)."""
+
+    provider_type = ProviderType.META
+    erro_falha = "meta_error_130429: Rate limit hit"
+    erro_timeout = "meta_timeout"
+
+    def __init__(self, perfil: PerfilLatencia = PERFIL_META, **kwargs):
+        super().__init__(perfil, **kwargs)
+
+    async def send_template(self, phone: str, template_name: str, *args, **kwargs):
+        return await self._simular()
+
+    async def send_text_mm_lite(self, phone: str, message: str, *args, **kwargs):
+        return await self._simular()
+
+
+class FakeEvolutionLegado:
+    """
+    Substituto do EvolutionClient legado (`app.services.whatsapp.evolution`).
+
+    Usado pelo fallback do outbound quando o multi-chip falha; levanta
+    exceção em falha, como o cliente real após esgotar os retries.
+    """
+
+    def __init__(self, provider: FakeEvolutionProvider):
+        self.provider = provider
+
+    async def enviar_mensagem(
+        self, telefone: str, texto: str, verificar_rate_limit: bool = True
+    ) -> dict:
+        result = await self.provider.send_text(telefone, texto)
+        if not result.success:
+            raise Exception(result.error)
+        return {"key": {"id": result.message_id}}
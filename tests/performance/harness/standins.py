@@ -0,0 +1,735 @@
+"""
+Stand-ins em memória para Supabase (PostgREST) e Redis.
+
+Implementam o subconjunto da API usado pelos hot paths, contam cada
+round-trip no MedidorEstagios e podem simular latência de rede:
+
+- FakeSupabase bloqueia a thread no `.execute()` (o cliente supabase-py
+  real é síncrono e também bloqueia o event loop).
+- FakeRedis cede o event loop (`asyncio.sleep`), como o redis.asyncio.
+
+Não é um banco de verdade: joins embutidos no select (`tabela(*)`) e
+projeção de colunas são ignorados, as linhas voltam completas.
+"""
+
+import asyncio
+import fnmatch
+import sys
+import time
+import uuid
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from unittest.mock import patch
+
+from tests.performance.harness.metricas import MedidorEstagios
+
+
+# =============================================================================
+# Supabase
+# =============================================================================
+
+
+class FakeAPIError(Exception):
+    """Erro no formato das mensagens do PostgREST."""
+
+
+@dataclass
+class RespostaFake:
+    """Equivalente ao APIResponse do postgrest."""
+
+    data: Any
+    count: Optional[int] = None
+
+
+def _normalizar(valor: Any) -> Any:
+    """Normaliza valores para comparação (PostgREST recebe tudo como texto)."""
+    if isinstance(valor, bool):
+        return str(valor).lower()
+    if valor is None:
+        return None
+    return str(valor)
+
+
+def _comparar(valor_linha: Any, valor_filtro: Any, op: str) -> bool:
+    if valor_linha is None or valor_filtro is None:
+        return False
+    try:
+        if isinstance(valor_linha, (int, float)) and not isinstance(valor_linha, bool):
+            a, b = float(valor_linha), float(valor_filtro)
+        else:
+            a, b = str(valor_linha), str(valor_filtro)
+    except (TypeError, ValueError):
+        a, b = str(valor_linha), str(valor_filtro)
+    return {
+        "gt": a > b,
+        "gte": a >= b,
+        "lt": a < b,
+        "lte": a <= b,
+    }[op]
+
+
+def _parse_valor_or(valor: str) -> Any:
+    if valor == "null":
+        return None
+    if valor in ("true", "false"):
+        return valor == "true"
+    return valor
+
+
+class _Negacao:
+    """Proxy de `query.not_` que nega o próximo filtro."""
+
+    def __init__(self, consulta: "ConsultaFake"):
+        self._consulta = consulta
+
+    def __getattr__(self, nome):
+        metodo = getattr(self._consulta, nome)
+
+        def negado(*args, **kwargs):
+            antes = len(self._consulta._filtros)
+            metodo(*args, **kwargs)
+            for i in range(antes, len(self._consulta._filtros)):
+                original = self._consulta._filtros[i]
+                self._consulta._filtros[i] = lambda linha, f=original: not f(linha)
+            return self._consulta
+
+        return negado
+
+
+class ConsultaFake:
+    """Query builder encadeável no estilo postgrest-py."""
+
+    def __init__(self, banco: "FakeSupabase", tabela: str):
+        self._banco = banco
+        self._tabela = tabela
+        self._operacao = "select"
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._filtros: list[Callable[[dict], bool]] = []
+        self._ordem: list[tuple[str, bool]] = []
+        self._limite: Optional[int] = None
+        self._intervalo: Optional[tuple[int, int]] = None
+        self._single = False
+        self._maybe_single = False
+        self._count: Optional[str] = None
+
+    # Operações ---------------------------------------------------------------
+
+    def select(self, *colunas, count: Optional[str] = None, **kwargs) -> "ConsultaFake":
+        if self._operacao == "select":
+            self._count = count
+        return self
+
+    def insert(self, payload, **kwargs) -> "ConsultaFake":
+        self._operacao, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict: Optional[str] = None, **kwargs) -> "ConsultaFake":
+        self._operacao, self._payload, self._on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def update(self, payload, **kwargs) -> "ConsultaFake":
+        self._operacao, self._payload = "update", payload
+        return self
+
+    def delete(self, **kwargs) -> "ConsultaFake":
+        self._operacao = "delete"
+        return self
+
+    # Filtros -----------------------------------------------------------------
+
+    def _filtro(self, predicado: Callable[[dict], bool]) -> "ConsultaFake":
+        self._filtros.append(predicado)
+        return self
+
+    def eq(self, coluna: str, valor: Any) -> "ConsultaFake":
+        alvo = _normalizar(valor)
+        return self._filtro(lambda linha: _normalizar(linha.get(coluna)) == alvo)
+
+    def neq(self, coluna: str, valor: Any) -> "ConsultaFake":
+        alvo = _normalizar(valor)
+        return self._filtro(
+            lambda linha: linha.get(coluna) is not None and _normalizar(linha.get(coluna)) != alvo
+        )
+
+    def gt(self, coluna: str, valor: Any) -> "ConsultaFake":
+        return self._filtro(lambda linha: _comparar(linha.get(coluna), valor, "gt"))
+
+    def gte(self, coluna: str, valor: Any) -> "ConsultaFake":
+        return self._filtro(lambda linha: _comparar(linha.get(coluna), valor, "gte"))
+
+    def lt(self, coluna: str, valor: Any) -> "ConsultaFake":
+        return self._filtro(lambda linha: _comparar(linha.get(coluna), valor, "lt"))
+
+    def lte(self, coluna: str, valor: Any) -> "ConsultaFake":
+        return self._filtro(lambda linha: _comparar(linha.get(coluna), valor, "lte"))
+
+    def in_(self, coluna: str, valores) -> "ConsultaFake":
+        alvos = {_normalizar(v) for v in valores}
+        return self._filtro(lambda linha: _normalizar(linha.get(coluna)) in alvos)
+
+    def is_(self, coluna: str, valor: Any) -> "ConsultaFake":
+        if valor in (None, "null"):
+            return self._filtro(lambda linha: linha.get(coluna) is None)
+        return self.eq(coluna, valor)
+
+    def like(self, coluna: str, padrao: str) -> "ConsultaFake":
+        glob = padrao.replace("%", "*")
+        return self._filtro(lambda linha: fnmatch.fnmatchcase(str(linha.get(coluna, "")), glob))
+
+    def ilike(self, coluna: str, padrao: str) -> "ConsultaFake":
+        glob = padrao.replace("%", "*").lower()
+        return self._filtro(
+            lambda linha: fnmatch.fnmatchcase(str(linha.get(coluna, "")).lower(), glob)
+        )
+
+    def contains(self, coluna: str, valores) -> "ConsultaFake":
+        if isinstance(valores, dict):
+            return self._filtro(
+                lambda linha: all(
+                    (linha.get(coluna) or {}).get(k) == v for k, v in valores.items()
+                )
+            )
+        return self._filtro(lambda linha: set(valores) <= set(linha.get(coluna) or []))
+
+    def or_(self, expressao: str, **kwargs) -> "ConsultaFake":
+        """Suporta a forma simples `col.op.valor,col.op.valor`."""
+        alternativas = []
+        for termo in expressao.split(","):
+            coluna, op, valor = termo.split(".", 2)
+            sub = ConsultaFake(self._banco, self._tabela)
+            if op == "is":
+                sub.is_(coluna, _parse_valor_or(valor))
+            elif op == "in":
+                sub.in_(coluna, valor.strip("()").split(","))
+            else:
+                getattr(sub, op)(coluna, _parse_valor_or(valor))
+            alternativas.append(sub._filtros[0])
+        return self._filtro(lambda linha: any(f(linha) for f in alternativas))
+
+    def match(self, filtros: dict) -> "ConsultaFake":
+        for coluna, valor in filtros.items():
+            self.eq(coluna, valor)
+        return self
+
+    def filter(self, coluna: str, op: str, valor: Any) -> "ConsultaFake":
+        return getattr(self, op)(coluna, valor)
+
+    @property
+    def not_(self) -> _Negacao:
+        return _Negacao(self)
+
+    # Modificadores -----------------------------------------------------------
+
+    def order(self, coluna: str, desc: bool = False, **kwargs) -> "ConsultaFake":
+        self._ordem.append((coluna, desc))
+        return self
+
+    def limit(self, n: int, **kwargs) -> "ConsultaFake":
+        self._limite = n
+        return self
+
+    def range(self, inicio: int, fim: int) -> "ConsultaFake":
+        self._intervalo = (inicio, fim)
+        return self
+
+    def single(self) -> "ConsultaFake":
+        self._single = True
+        return self
+
+    def maybe_single(self) -> "ConsultaFake":
+        self._maybe_single = True
+        return self
+
+    # Execução ----------------------------------------------------------------
+
+    def execute(self) -> RespostaFake:
+        self._banco._round_trip(f"{self._tabela}.{self._operacao}")
+        linhas = self._banco.tabelas[self._tabela]
+
+        if self._operacao == "insert":
+            return RespostaFake(data=self._banco._inserir(self._tabela, self._payload))
+        if self._operacao == "upsert":
+            return RespostaFake(
+                data=self._banco._upsert(self._tabela, self._payload, self._on_conflict)
+            )
+
+        alvo = [linha for linha in linhas if all(f(linha) for f in self._filtros)]
+
+        if self._operacao == "update":
+            for linha in alvo:
+                linha.update(self._payload)
+            return RespostaFake(data=[dict(linha) for linha in alvo])
+
+        if self._operacao == "delete":
+            ids = {id(linha) for linha in alvo}
+            self._banco.tabelas[self._tabela] = [l for l in linhas if id(l) not in ids]
+            return RespostaFake(data=[dict(linha) for linha in alvo])
+
+        total = len(alvo)
+        for coluna, desc in reversed(self._ordem):
+            alvo.sort(
+                key=lambda linha: (linha.get(coluna) is None, str(linha.get(coluna))),
+                reverse=desc,
+            )
+        if self._intervalo:
+            alvo = alvo[self._intervalo[0] : self._intervalo[1] + 1]
+        if self._limite is not None:
+            alvo = alvo[: self._limite]
+        dados = [dict(linha) for linha in alvo]
+
+        if self._single:
+            if len(dados) != 1:
+                raise FakeAPIError(
+                    "JSON object requested, multiple (or no) rows returned (PGRST116)"
+                )
+            return RespostaFake(data=dados[0], count=total if self._count else None)
+        if self._maybe_single:
+            return RespostaFake(data=dados[0] if dados else None)
+        return RespostaFake(data=dados, count=total if self._count else None)
+
+
+class ChamadaRpcFake:
+    """Resultado de `supabase.rpc(nome, params)`."""
+
+    def __init__(self, banco: "FakeSupabase", nome: str, params: Optional[dict]):
+        self._banco = banco
+        self._nome = nome
+        self._params = params or {}
+
+    def execute(self) -> RespostaFake:
+        self._banco._round_trip(f"rpc:{self._nome}")
+        handler = self._banco.rpcs.get(self._nome)
+        return RespostaFake(data=handler(self._params) if handler else None)
+
+
+class FakeSupabase:
+    """
+    Cliente Supabase em memória.
+
+    Exemplo:
+        banco = FakeSupabase(medidor, latencia_ms=2)
+        banco.definir_unico("outbound_dedupe", "dedupe_key")
+        banco.semear("chips", [{"id": "c1", "status": "active"}])
+    """
+
+    def __init__(self, medidor: Optional[MedidorEstagios] = None, latencia_ms: float = 0.0):
+        self.medidor = medidor or MedidorEstagios()
+        self.latencia_s = latencia_ms / 1000
+        self.tabelas: dict[str, list[dict]] = defaultdict(list)
+        self.unicos: dict[str, list[tuple[str, ...]]] = defaultdict(list)
+        self.rpcs: dict[str, Callable[[dict], Any]] = {}
+
+    def table(self, nome: str) -> ConsultaFake:
+        return ConsultaFake(self, nome)
+
+    from_ = table
+
+    def rpc(self, nome: str, params: Optional[dict] = None) -> ChamadaRpcFake:
+        return ChamadaRpcFake(self, nome, params)
+
+    def definir_unico(self, tabela: str, *colunas: str) -> None:
+        """Declara restrição UNIQUE (viola com erro 23505, como o Postgres)."""
+        self.unicos[tabela].append(tuple(colunas))
+
+    def registrar_rpc(self, nome: str, handler: Callable[[dict], Any]) -> None:
+        """Define o retorno de uma RPC (sem handler a RPC retorna None)."""
+        self.rpcs[nome] = handler
+
+    def semear(self, tabela: str, linhas: list[dict]) -> None:
+        """Insere linhas sem contar round-trips."""
+        self.tabelas[tabela].extend(dict(linha) for linha in linhas)
+
+    def _round_trip(self, operacao: str) -> None:
+        self.medidor.registrar_io("db", operacao)
+        if self.latencia_s:
+            time.sleep(self.latencia_s)
+
+    def _violacao(self, tabela: str, nova: dict, ignorar: Optional[dict] = None) -> bool:
+        for colunas in self.unicos.get(tabela, []):
+            chave = tuple(nova.get(c) for c in colunas)
+            for linha in self.tabelas[tabela]:
+                if linha is not ignorar and tuple(linha.get(c) for c in colunas) == chave:
+                    return True
+        return False
+
+    def _completar(self, linha: dict) -> dict:
+        nova = dict(linha)
+        nova.setdefault("id", str(uuid.uuid4()))
+        nova.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()))
+        return nova
+
+    def _inserir(self, tabela: str, payload) -> list[dict]:
+        novas = [self._completar(l) for l in (payload if isinstance(payload, list) else [payload])]
+        for nova in novas:
+            if self._violacao(tabela, nova):
+                raise FakeAPIError(
+                    f'duplicate key value violates unique constraint "{tabela}_key" (23505)'
+                )
+        self.tabelas[tabela].extend(novas)
+        return [dict(n) for n in novas]
+
+    def _upsert(self, tabela: str, payload, on_conflict: Optional[str]) -> list[dict]:
+        colunas = [c.strip() for c in on_conflict.split(",")] if on_conflict else ["id"]
+        gravadas = []
+        for linha in payload if isinstance(payload, list) else [payload]:
+            chave = tuple(_normalizar(linha.get(c)) for c in colunas)
+            existente = next(
+                (
+                    l
+                    for l in self.tabelas[tabela]
+                    if tuple(_normalizar(l.get(c)) for c in colunas) == chave
+                ),
+                None,
+            )
+            if existente is not None:
+                existente.update(linha)
+                gravadas.append(dict(existente))
+            else:
+                nova = self._completar(linha)
+                self.tabelas[tabela].append(nova)
+                gravadas.append(dict(nova))
+        return gravadas
+
+
+# =============================================================================
+# Redis
+# =============================================================================
+
+
+class _ZSet(dict):
+    """Sorted set: membro -> score."""
+
+
+class PipelineFake:
+    """Pipeline que executa os comandos enfileirados em um único round-trip."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._comandos: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, nome: str):
+        if not hasattr(FakeRedis, nome):
+            raise AttributeError(nome)
+
+        def enfileirar(*args, **kwargs):
+            self._comandos.append((nome, args, kwargs))
+            return self
+
+        return enfileirar
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        comandos, self._comandos = self._comandos, []
+        await self._redis._round_trip("pipeline")
+        resultados = []
+        for nome, args, kwargs in comandos:
+            resultados.append(getattr(self._redis, f"_{nome}")(*args, **kwargs))
+        return resultados
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _comando(func: Callable) -> Callable:
+    """Expõe `_nome` síncrono como comando async `nome` que conta um round-trip."""
+    nome = func.__name__.lstrip("_")
+
+    async def comando(self, *args, **kwargs):
+        await self._round_trip(nome)
+        return func(self, *args, **kwargs)
+
+    comando.__name__ = nome
+    return comando
+
+
+class FakeRedis:
+    """Redis em memória (decode_responses=True) com TTL."""
+
+    def __init__(self, medidor: Optional[MedidorEstagios] = None, latencia_ms: float = 0.0):
+        self.medidor = medidor or MedidorEstagios()
+        self.latencia_s = latencia_ms / 1000
+        self._dados: dict[str, Any] = {}
+        self._expira_em: dict[str, float] = {}
+
+    async def _round_trip(self, operacao: str) -> None:
+        self.medidor.registrar_io("redis", operacao)
+        await asyncio.sleep(self.latencia_s)
+
+    def pipeline(self, transaction: bool = True) -> PipelineFake:
+        return PipelineFake(self)
+
+    # Internos ----------------------------------------------------------------
+
+    def _vivo(self, chave: str) -> bool:
+        expira = self._expira_em.get(chave)
+        if expira is not None and expira <= time.time():
+            self._dados.pop(chave, None)
+            self._expira_em.pop(chave, None)
+        return chave in self._dados
+
+    def _valor(self, chave: str, tipo: type, criar: bool = False):
+        if not self._vivo(chave):
+            if not criar:
+                return None
+            self._dados[chave] = tipo()
+        return self._dados[chave]
+
+    # Strings -----------------------------------------------------------------
+
+    def _get(self, chave: str) -> Optional[str]:
+        return self._dados[chave] if self._vivo(chave) else None
+
+    def _set(
+        self,
+        chave: str,
+        valor: Any,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        exat: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False,
+        **kwargs,
+    ) -> Optional[bool]:
+        existe = self._vivo(chave)
+        if (nx and existe) or (xx and not existe):
+            return None
+        self._dados[chave] = str(valor)
+        self._expira_em.pop(chave, None)
+        if ex is not None:
+            self._expira_em[chave] = time.time() + ex
+        elif px is not None:
+            self._expira_em[chave] = time.time() + px / 1000
+        elif exat is not None:
+            self._expira_em[chave] = float(exat)
+        return True
+
+    def _setex(self, chave: str, ttl: int, valor: Any) -> bool:
+        return self._set(chave, valor, ex=ttl)
+
+    def _mget(self, *chaves) -> list:
+        if len(chaves) == 1 and isinstance(chaves[0], (list, tuple)):
+            chaves = chaves[0]
+        return [self._get(c) for c in chaves]
+
+    def _incrby(self, chave: str, n: int = 1) -> int:
+        valor = int(self._get(chave) or 0) + n
+        self._dados[chave] = str(valor)
+        return valor
+
+    def _incr(self, chave: str, n: int = 1) -> int:
+        return self._incrby(chave, n)
+
+    def _decr(self, chave: str, n: int = 1) -> int:
+        return self._incrby(chave, -n)
+
+    # Chaves ------------------------------------------------------------------
+
+    def _delete(self, *chaves: str) -> int:
+        removidas = 0
+        for chave in chaves:
+            if self._vivo(chave):
+                removidas += 1
+            self._dados.pop(chave, None)
+            self._expira_em.pop(chave, None)
+        return removidas
+
+    def _exists(self, *chaves: str) -> int:
+        return sum(1 for c in chaves if self._vivo(c))
+
+    def _expire(self, chave: str, segundos: int) -> bool:
+        if not self._vivo(chave):
+            return False
+        self._expira_em[chave] = time.time() + int(segundos)
+        return True
+
+    def _ttl(self, chave: str) -> int:
+        if not self._vivo(chave):
+            return -2
+        expira = self._expira_em.get(chave)
+        return -1 if expira is None else max(0, int(expira - time.time()))
+
+    def _keys(self, padrao: str = "*") -> list[str]:
+        return [c for c in list(self._dados) if self._vivo(c) and fnmatch.fnmatchcase(c, padrao)]
+
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        await self._round_trip("scan")
+        for chave in self._keys(match):
+            yield chave
+
+    def _ping(self) -> bool:
+        return True
+
+    def _publish(self, canal: str, mensagem: Any) -> int:
+        return 0
+
+    def _eval(self, script: str, numkeys: int, *args) -> Any:
+        """Suporta os scripts compare-and-del / compare-and-expire de lock."""
+        chaves, argv = args[:numkeys], args[numkeys:]
+        if self._get(chaves[0]) != str(argv[0]):
+            return 0
+        if '"del"' in script:
+            return self._delete(chaves[0])
+        if '"expire"' in script:
+            return int(self._expire(chaves[0], int(argv[1])))
+        raise NotImplementedError("Script Lua não suportado pelo FakeRedis")
+
+    # Hashes ------------------------------------------------------------------
+
+    def _hset(self, chave: str, campo=None, valor=None, mapping: Optional[dict] = None) -> int:
+        h = self._valor(chave, dict, criar=True)
+        novos = dict(mapping or {})
+        if campo is not None:
+            novos[campo] = valor
+        adicionados = sum(1 for c in novos if c not in h)
+        h.update({c: str(v) for c, v in novos.items()})
+        return adicionados
+
+    def _hget(self, chave: str, campo: str) -> Optional[str]:
+        return (self._valor(chave, dict) or {}).get(campo)
+
+    def _hgetall(self, chave: str) -> dict:
+        return dict(self._valor(chave, dict) or {})
+
+    def _hdel(self, chave: str, *campos: str) -> int:
+        h = self._valor(chave, dict) or {}
+        return sum(1 for c in campos if h.pop(c, None) is not None)
+
+    def _hincrby(self, chave: str, campo: str, n: int = 1) -> int:
+        h = self._valor(chave, dict, criar=True)
+        h[campo] = str(int(h.get(campo, 0)) + n)
+        return int(h[campo])
+
+    # Sets --------------------------------------------------------------------
+
+    def _sadd(self, chave: str, *membros) -> int:
+        s = self._valor(chave, set, criar=True)
+        novos = {str(m) for m in membros} - s
+        s.update(novos)
+        return len(novos)
+
+    def _srem(self, chave: str, *membros) -> int:
+        s = self._valor(chave, set) or set()
+        removidos = {str(m) for m in membros} & s
+        s.difference_update(removidos)
+        return len(removidos)
+
+    def _smembers(self, chave: str) -> set:
+        return set(self._valor(chave, set) or set())
+
+    def _sismember(self, chave: str, membro) -> bool:
+        return str(membro) in (self._valor(chave, set) or set())
+
+    # Sorted sets -------------------------------------------------------------
+
+    def _zadd(self, chave: str, mapping: dict, **kwargs) -> int:
+        z = self._valor(chave, _ZSet, criar=True)
+        novos = sum(1 for m in mapping if str(m) not in z)
+        z.update({str(m): float(s) for m, s in mapping.items()})
+        return novos
+
+    def _zrangebyscore(self, chave: str, minimo, maximo, withscores: bool = False, **kwargs):
+        z = self._valor(chave, _ZSet) or {}
+        lo, hi = float(minimo), float(maximo)
+        itens = sorted(((m, s) for m, s in z.items() if lo <= s <= hi), key=lambda x: x[1])
+        return itens if withscores else [m for m, _ in itens]
+
+    def _zremrangebyscore(self, chave: str, minimo, maximo) -> int:
+        z = self._valor(chave, _ZSet) or {}
+        lo, hi = float(minimo), float(maximo)
+        remover = [m for m, s in z.items() if lo <= s <= hi]
+        for m in remover:
+            del z[m]
+        return len(remover)
+
+    def _zcount(self, chave: str, minimo, maximo) -> int:
+        return len(self._zrangebyscore(chave, minimo, maximo))
+
+    def _zcard(self, chave: str) -> int:
+        return len(self._valor(chave, _ZSet) or {})
+
+    def _zrem(self, chave: str, *membros) -> int:
+        z = self._valor(chave, _ZSet) or {}
+        return sum(1 for m in membros if z.pop(str(m), None) is not None)
+
+    # Listas ------------------------------------------------------------------
+
+    def _lpush(self, chave: str, *valores) -> int:
+        lista = self._valor(chave, list, criar=True)
+        for v in valores:
+            lista.insert(0, str(v))
+        return len(lista)
+
+    def _rpush(self, chave: str, *valores) -> int:
+        lista = self._valor(chave, list, criar=True)
+        lista.extend(str(v) for v in valores)
+        return len(lista)
+
+    def _lrange(self, chave: str, inicio: int, fim: int) -> list:
+        lista = self._valor(chave, list) or []
+        return lista[inicio : None if fim == -1 else fim + 1]
+
+    def _ltrim(self, chave: str, inicio: int, fim: int) -> bool:
+        lista = self._valor(chave, list)
+        if lista is not None:
+            lista[:] = lista[inicio : None if fim == -1 else fim + 1]
+        return True
+
+    def _llen(self, chave: str) -> int:
+        return len(self._valor(chave, list) or [])
+
+    def _lpop(self, chave: str) -> Optional[str]:
+        lista = self._valor(chave, list)
+        return lista.pop(0) if lista else None
+
+    def _rpop(self, chave: str) -> Optional[str]:
+        lista = self._valor(chave, list)
+        return lista.pop() if lista else None
+
+
+# Comandos async públicos a partir das implementações síncronas `_nome`
+for _nome in [n for n in vars(FakeRedis) if n.startswith("_") and not n.startswith("__")]:
+    _impl = getattr(FakeRedis, _nome)
+    if _nome in ("_round_trip", "_vivo", "_valor") or not callable(_impl):
+        continue
+    setattr(FakeRedis, _nome[1:], _comando(_impl))
+
+
+# =============================================================================
+# Instalação
+# =============================================================================
+
+
+@contextmanager
+def instalar_standins(banco: FakeSupabase, redis: FakeRedis):
+    """
+    Substitui `supabase` e `redis_client` em todos os módulos `app.*` carregados.
+
+    Importe os módulos do caminho medido ANTES de entrar no contexto: módulos
+    importados depois passam a referenciar os stand-ins e não são restaurados.
+
+    Args:
+        banco: Stand-in do Supabase
+        redis: Stand-in do Redis
+    """
+    import app.services.redis as modulo_redis
+    import app.services.supabase as modulo_supabase
+
+    reais = {
+        "supabase": modulo_supabase.supabase,
+        "redis_client": modulo_redis.redis_client,
+    }
+    fakes = {"supabase": banco, "redis_client": redis}
+
+    with ExitStack() as stack:
+        for nome, modulo in list(sys.modules.items()):
+            if modulo is None or not (nome == "app" or nome.startswith("app.")):
+                continue
+            for atributo, real in reais.items():
+                if getattr(modulo, atributo, None) is real:
+                    stack.enter_context(patch.object(modulo, atributo, fakes[atributo]))
+        yield
@@ -0,0 +1,455 @@
+"""
+Load test do pipeline inbound com orçamento de latência por processador.
+
+Reproduz payloads `messages.upsert` gravados da Evolution em uma taxa
+configurável através de `evolution_webhook` (dedupe, agendamento em
+background, semáforo do pipeline e todos os processadores reais), com o
+Claude trocado pelo MockLLMProvider com latência configurável e Supabase,
+Redis, Chatwoot e providers WhatsApp em memória.
+
+Cada processador é medido individualmente; `verificar_orcamentos` compara
+o p95 de cada um com ORCAMENTO_P95_MS para que a regressão de um estágio
+quebre o CI em vez de se diluir no tempo total.
+
+Uso:
+    python -m tests.performance.loadtest_inbound --mensagens 300 --taxa 30
+    python -m tests.performance.loadtest_inbound --escala-llm 0 --latencia-db-ms 5 --json
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from unittest.mock import AsyncMock, patch
+
+from fastapi import BackgroundTasks
+
+from tests.performance.harness import (
+    FakeEvolutionLegado,
+    FakeEvolutionProvider,
+    FakeRedis,
+    FakeSupabase,
+    MedidorEstagios,
+    instalar_standins,
+)
+from tests.performance.harness.http import FakeChatwoot, FakeHttp, instalar_http
+from tests.performance.harness.llm import PERFIL_LLM, FakeLLM, instalar_llm
+from tests.performance.harness.metricas import formatar_relatorio
+from tests.performance.harness.providers import PERFIL_EVOLUTION, PerfilLatencia
+
+FIXTURE_PAYLOADS = Path(__file__).parent / "fixtures" / "evolution_messages_upsert.json"
+
+ESTAGIO_WEBHOOK = "evolution_webhook"
+ESTAGIO_PIPELINE = "pipeline_total"
+ESTAGIO_ESPERA = "fila_semaforo"
+
+# p95 máximo (ms) por estágio na configuração determinística
+# (ConfigCarga.para_orcamento): mensagens em série, 1ms por round-trip de
+# banco/HTTP, 0.5ms por comando Redis e LLM/provider sem espera. O p95 reflete
+# CPU + número de round-trips de cada processador, então uma query extra no
+# caminho da mensagem aparece aqui. Folga de ~3x sobre o pior p95 medido.
+ORCAMENTO_P95_MS: dict[str, float] = {
+    ESTAGIO_WEBHOOK: 15,
+    "parse_message": 5,
+    "presence": 40,
+    "load_entities": 50,
+    "chip_mapping": 5,
+    "business_event_inbound": 5,
+    "chatwoot_sync": 80,
+    "optout": 10,
+    "bot_detection": 5,
+    "media": 5,
+    "long_message": 5,
+    "handoff_trigger": 10,
+    "handoff_keyword": 30,
+    "human_control": 5,
+    "llm_core": 350,
+    "validate_output": 20,
+    "timing": 5,
+    "send_message": 120,
+    "save_interaction": 45,
+    "extraction": 5,
+    "metrics": 45,
+    ESTAGIO_PIPELINE: 550,
+}
+
+
+@dataclass
+class ConfigCarga:
+    """
+    Parâmetros de uma execução.
+
+    Attributes:
+        mensagens: Total de webhooks reproduzidos
+        taxa_por_segundo: Chegada de webhooks por segundo (0 = sem espaçamento)
+        max_concorrente: Mensagens simultâneas no pipeline (semáforo do webhook)
+        medicos: Telefones distintos entre os quais as mensagens são distribuídas
+        latencia_db_ms: Latência por round-trip do Supabase (bloqueante)
+        latencia_redis_ms: Latência por comando/pipeline do Redis
+        latencia_http_ms: Latência das APIs HTTP (Chatwoot, Evolution, Slack)
+        perfil_llm: Latência do Claude
+        escala_llm: Multiplicador da latência do LLM (0 = sem espera)
+        escala_provider: Multiplicador da latência do provider WhatsApp
+        delay_humano: Mantém o delay de digitação do TimingProcessor
+        seed: Semente dos sorteios
+    """
+
+    mensagens: int = 100
+    taxa_por_segundo: float = 20.0
+    max_concorrente: int = 10
+    medicos: int = 20
+    latencia_db_ms: float = 0.0
+    latencia_redis_ms: float = 0.0
+    latencia_http_ms: float = 0.0
+    perfil_llm: PerfilLatencia = field(default_factory=lambda: PERFIL_LLM)
+    escala_llm: float = 1.0
+    escala_provider: float = 1.0
+    delay_humano: bool = False
+    seed: int = 42
+
+    @classmethod
+    def para_orcamento(cls, mensagens: int = 40) -> "ConfigCarga":
+        """Configuração determinística usada pelo teste de orçamento."""
+        return cls(
+            mensagens=mensagens,
+            taxa_por_segundo=0,
+            max_concorrente=1,
+            latencia_db_ms=1.0,
+            latencia_redis_ms=0.5,
+            latencia_http_ms=1.0,
+            escala_llm=0,
+            escala_provider=0,
+        )
+
+
+class _RequestGravada:
+    """Request mínima com o corpo JSON de um webhook gravado."""
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    async def json(self) -> dict:
+        return self._payload
+
+
+def carregar_payloads(caminho: Path = FIXTURE_PAYLOADS) -> list[dict]:
+    """
+    Carrega os webhooks gravados.
+
+    Args:
+        caminho: Arquivo JSON com a lista de payloads
+
+    Returns:
+        Payloads `messages.upsert`
+    """
+    with open(caminho, encoding="utf-8") as f:
+        return [p for p in json.load(f) if p.get("event") == "messages.upsert"]
+
+
+def _reescrever(payload: dict, i: int, telefone: str, instance: str) -> dict:
+    """
+    Cópia do payload como uma mensagem nova de `telefone`.
+
+    Troca o message_id (senão o dedupe do webhook descarta as repetições),
+    o remetente, a instância e o timestamp.
+    """
+    novo = copy.deepcopy(payload)
+    novo["instance"] = instance
+    data = novo["data"]
+    data["key"]["id"] = f"LOAD{i:06d}{uuid.uuid4().hex[:14].upper()}"
+    data["key"]["remoteJid"] = f"{telefone}@s.whatsapp.net"
+    data["messageTimestamp"] = int(time.time())
+    return novo
+
+
+def _semear(banco: FakeSupabase, chip: dict, telefones: list[str]) -> None:
+    """Estado inicial: chip da instância, médicos já cadastrados e RPCs."""
+    banco.definir_unico("outbound_dedupe", "dedupe_key")
+    banco.semear("pool_config", [{"limite_resposta_hora": 10**9}])
+    banco.semear("chips", [chip])
+    # Busca vetorial (conhecimento/memórias) sem resultados
+    banco.registrar_rpc("buscar_conhecimento", lambda params: [])
+    banco.registrar_rpc("buscar_memorias_recentes", lambda params: [])
+    medicos = [
+        {
+            "id": str(uuid.uuid4()),
+            "telefone": telefone,
+            "primeiro_nome": f"Medico{n}",
+            "stage_jornada": "respondeu",
+            "opt_out": False,
+        }
+        for n, telefone in enumerate(telefones)
+    ]
+    banco.semear("clientes", medicos)
+    banco.semear(
+        "doctor_state",
+        [{"cliente_id": m["id"], "permission_state": "active"} for m in medicos],
+    )
+
+
+def _processadores(pipeline) -> list:
+    processadores = list(pipeline.pre_processors) + list(pipeline.post_processors)
+    if pipeline._core_processor:
+        processadores.append(pipeline._core_processor)
+    return processadores
+
+
+async def executar_carga(config: ConfigCarga, payloads: Optional[list[dict]] = None) -> dict:
+    """
+    Reproduz os webhooks e retorna o relatório.
+
+    Args:
+        config: Parâmetros da execução
+        payloads: Webhooks gravados (default: fixture do repositório)
+
+    Returns:
+        Relatório do MedidorEstagios acrescido de respostas do webhook,
+        mensagens enviadas e chamadas ao LLM
+    """
+    import app.api.routes.webhook as webhook
+    import app.services.outbound.sender as outbound_sender
+    from app.core.config import settings
+    from app.pipeline.setup import message_pipeline
+    from app.services.chips.circuit_breaker import ChipCircuitBreaker
+    from app.services.chips.selector import chip_selector
+
+    payloads = payloads or carregar_payloads()
+    rng = random.Random(config.seed)
+    medidor = MedidorEstagios()
+    banco = FakeSupabase(medidor, latencia_ms=config.latencia_db_ms)
+    redis = FakeRedis(medidor, latencia_ms=config.latencia_redis_ms)
+    http = FakeHttp(medidor, latencia_ms=config.latencia_http_ms)
+    chatwoot = FakeChatwoot()
+    llm = FakeLLM(
+        medidor,
+        config.perfil_llm,
+        rng=random.Random(rng.random()),
+        escala=config.escala_llm,
+    )
+
+    instance = "loadtest"
+    chip = {
+        "id": str(uuid.uuid4()),
+        "telefone": "5511900000001",
+        "instance_name": instance,
+        "provider": "evolution",
+        "status": "active",
+        "tipo": "julia",
+        "trust_score": 90,
+        "pode_prospectar": True,
+        "pode_followup": True,
+        "pode_responder": True,
+        "evolution_connected": True,
+        "limite_dia": 10**9,
+        "limite_hora": 10**9,
+        "msgs_enviadas_hoje": 0,
+    }
+    telefones = [f"55119{n:08d}" for n in range(max(1, config.medicos))]
+    _semear(banco, chip, telefones)
+
+    provider = FakeEvolutionProvider(
+        PERFIL_EVOLUTION, rng=random.Random(rng.random()), escala=config.escala_provider
+    )
+    legado = FakeEvolutionLegado(
+        FakeEvolutionProvider(
+            PERFIL_EVOLUTION, rng=random.Random(rng.random()), escala=config.escala_provider
+        )
+    )
+
+    respostas: dict[str, int] = {}
+    tarefas: list[asyncio.Task] = []
+
+    with ExitStack() as stack:
+        stack.enter_context(instalar_standins(banco, redis))
+        stack.enter_context(instalar_http(http, chatwoot))
+        stack.enter_context(instalar_llm(llm))
+        stack.enter_context(patch.object(settings, "OUTBOUND_ALLOWLIST", ",".join(telefones)))
+        stack.enter_context(patch.object(settings, "MULTI_CHIP_ENABLED", True))
+        stack.enter_context(patch.object(ChipCircuitBreaker, "_circuits", {}))
+        stack.enter_context(patch.object(chip_selector, "config", None))
+        stack.enter_context(
+            patch("app.services.chips.sender.get_provider", return_value=provider)
+        )
+        stack.enter_context(patch.object(outbound_sender, "evolution", legado))
+        stack.enter_context(
+            patch.object(
+                webhook, "_semaforo_processamento", asyncio.Semaphore(config.max_concorrente)
+            )
+        )
+        if not config.delay_humano:
+            # Delays de digitação são esperas deliberadas, não custo do pipeline
+            stack.enter_context(
+                patch(
+                    "app.pipeline.post_processors.get_delay_seconds",
+                    AsyncMock(return_value=0),
+                )
+            )
+            enviar_original = outbound_sender.send_outbound_message
+
+            async def _enviar_sem_digitacao(*args, **kwargs):
+                kwargs["simular_digitacao"] = False
+                return await enviar_original(*args, **kwargs)
+
+            stack.enter_context(
+                patch(
+                    "app.services.agente.delivery.send_outbound_message",
+                    _enviar_sem_digitacao,
+                )
+            )
+        for processador in _processadores(message_pipeline):
+            stack.enter_context(
+                patch.object(
+                    processador,
+                    "process",
+                    medidor.instrumentar(processador.name, processador.process),
+                )
+            )
+        processar_original = message_pipeline.process
+
+        async def _processar_medido(data: dict):
+            # Tempo na fila do semáforo = início do pipeline - chegada do webhook
+            medidor.duracoes[ESTAGIO_ESPERA].append(time.time() - data["_chegada"])
+            async with medidor.medir(ESTAGIO_PIPELINE):
+                return await processar_original(data)
+
+        stack.enter_context(patch.object(message_pipeline, "process", _processar_medido))
+        receber = medidor.instrumentar(ESTAGIO_WEBHOOK, webhook.evolution_webhook)
+
+        async def _entregar(i: int):
+            payload = _reescrever(
+                payloads[i % len(payloads)], i, telefones[i % len(telefones)], instance
+            )
+            payload["data"]["_chegada"] = time.time()
+            background = BackgroundTasks()
+            resposta = await receber(_RequestGravada(payload), background)
+            status = json.loads(resposta.body).get("status", "?")
+            respostas[status] = respostas.get(status, 0) + 1
+            if background.tasks:
+                tarefas.append(asyncio.create_task(background()))
+
+        inicio = time.perf_counter()
+        for i in range(config.mensagens):
+            if config.taxa_por_segundo > 0:
+                atraso = inicio + i / config.taxa_por_segundo - time.perf_counter()
+                if atraso > 0:
+                    await asyncio.sleep(atraso)
+            await _entregar(i)
+            if config.max_concorrente == 1 and tarefas:
+                # Execução sequencial: mede cada mensagem sem disputa por CPU
+                await tarefas[-1]
+        await asyncio.gather(*tarefas)
+        duracao = time.perf_counter() - inicio
+
+        # Tasks de background do app (extração, eventos) ainda usam os stand-ins
+        pendentes = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if pendentes:
+            await asyncio.wait(pendentes, timeout=5)
+
+    relatorio = medidor.relatorio(config.mensagens, duracao)
+    relatorio["respostas_webhook"] = respostas
+    relatorio["enviadas"] = provider.enviados + legado.provider.enviados
+    relatorio["chamadas_llm"] = medidor.total_io("llm")
+    relatorio["http_por_estagio"] = dict(medidor.io["http"])
+    return relatorio
+
+
+def verificar_orcamentos(
+    relatorio: dict, orcamentos: dict[str, float] = ORCAMENTO_P95_MS
+) -> list[str]:
+    """
+    Compara o p95 de cada estágio medido com o orçamento.
+
+    Args:
+        relatorio: Saída de `executar_carga`
+        orcamentos: p95 máximo em ms por estágio
+
+    Returns:
+        Descrição de cada estágio acima do orçamento (vazia se todos couberem)
+    """
+    violacoes = []
+    for nome, limite in orcamentos.items():
+        medido = relatorio["estagios"].get(nome)
+        if medido and medido["p95_ms"] > limite:
+            violacoes.append(f"{nome}: p95 {medido['p95_ms']:.1f}ms > orçamento {limite:.0f}ms")
+    return violacoes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test do pipeline inbound")
+    parser.add_argument("--mensagens", type=int, default=100)
+    parser.add_argument("--taxa", type=float, default=20.0, help="Webhooks por segundo (0 = rajada)")
+    parser.add_argument("--max-concorrente", type=int, default=10)
+    parser.add_argument("--medicos", type=int, default=20)
+    parser.add_argument("--latencia-db-ms", type=float, default=0.0)
+    parser.add_argument("--latencia-redis-ms", type=float, default=0.0)
+    parser.add_argument("--latencia-http-ms", type=float, default=0.0)
+    parser.add_argument("--llm-p50-ms", type=float, default=PERFIL_LLM.p50_ms)
+    parser.add_argument("--llm-p99-ms", type=float, default=PERFIL_LLM.p99_ms)
+    parser.add_argument(
+        "--escala-llm",
+        type=float,
+        default=1.0,
+        help="Multiplicador da latência do LLM (0 = sem espera)",
+    )
+    parser.add_argument("--escala-provider", type=float, default=1.0)
+    parser.add_argument(
+        "--delay-humano", action="store_true", help="Mantém o delay de digitação"
+    )
+    parser.add_argument(
+        "--orcamento",
+        action="store_true",
+        help="Roda a configuração determinística e sai com erro se algum estágio estourar",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Imprime o relatório em JSON")
+    parser.add_argument("--verbose", action="store_true", help="Mantém os logs INFO da aplicação")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Log por mensagem distorce a latência medida
+        logging.disable(logging.WARNING)
+
+    if args.orcamento:
+        config = ConfigCarga.para_orcamento(args.mensagens)
+    else:
+        config = ConfigCarga(
+            mensagens=args.mensagens,
+            taxa_por_segundo=args.taxa,
+            max_concorrente=args.max_concorrente,
+            medicos=args.medicos,
+            latencia_db_ms=args.latencia_db_ms,
+            latencia_redis_ms=args.latencia_redis_ms,
+            latencia_http_ms=args.latencia_http_ms,
+            perfil_llm=PerfilLatencia(p50_ms=args.llm_p50_ms, p99_ms=args.llm_p99_ms),
+            escala_llm=args.escala_llm,
+            escala_provider=args.escala_provider,
+            delay_humano=args.delay_humano,
+            seed=args.seed,
+        )
+    relatorio = asyncio.run(executar_carga(config))
+    violacoes = verificar_orcamentos(relatorio) if args.orcamento else []
+
+    if args.json:
+        print(json.dumps({**relatorio, "violacoes": violacoes}, indent=2, ensure_ascii=False))
+    else:
+        print(formatar_relatorio(relatorio, titulo="Inbound"))
+        print(f"\nWebhook: {relatorio['respostas_webhook']}")
+        print(f"Enviadas: {relatorio['enviadas']}  Chamadas LLM: {relatorio['chamadas_llm']}")
+        for violacao in violacoes:
+            print(f"ORÇAMENTO ESTOURADO  {violacao}")
+
+    if violacoes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
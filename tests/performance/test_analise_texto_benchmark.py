@@ -0,0 +1,21 @@
+"""
+Benchmark do motor de analise de texto em modo rapido.
+
+Trava a equivalencia com a varredura sequencial e que a analise
+compartilhada nao fica mais lenta que ela no corpus de mensagens.
+"""
+
+import pytest
+
+from tests.performance.bench_analise_texto import ConfigBenchmark, executar_benchmark
+
+pytestmark = pytest.mark.architectural
+
+
+class TestBenchmarkAnaliseTexto:
+    def test_motor_equivale_e_nao_regride(self):
+        relatorio = executar_benchmark(ConfigBenchmark(repeticoes=3))
+
+        assert relatorio["divergencias"] == []
+        assert relatorio["detectores"] >= 20
+        assert relatorio["motor"]["p50_us"] < relatorio["sequencial"]["p50_us"]
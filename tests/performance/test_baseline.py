@@ -625,67 +625,44 @@ class TestHttpClientBaseline:
 
 
 class TestTemperatureDecayBaseline:
-    """Epic 4.2: temperature decay uses _row_to_state directly."""
+    """Epic 4.2: temperature decay roda em lotes no banco, sem load por médico."""
 
     @pytest.mark.asyncio
-    async def test_decay_usa_row_to_state_direto(self):
+    async def test_decay_usa_rpc_em_lotes(self):
         """
-        OTIMIZADO (Epic 4.2): decay_all_temperatures usa _row_to_state ao invés
-        de load_doctor_state individual por médico.
-
-        Sprint 59: buscar_states_para_decay retorna SELECT * com LIMIT,
-        e o loop usa _row_to_state para converter diretamente.
+        OTIMIZADO: decay_all_temperatures aplica o decay via RPC set-based,
+        paginando por cliente_id, em vez de carregar e salvar médico a médico.
+        Processa a população inteira (sem o corte antigo de 100 linhas).
         """
         from app.workers.temperature_decay import decay_all_temperatures
 
-        fake_rows = [
-            {
-                "cliente_id": str(uuid4()),
-                "temperature": 0.8,
-                "permission_state": "active",
-                "temperature_trend": "stable",
-                "temperature_band": "warm",
-                "risk_tolerance": "unknown",
-                "lifecycle_stage": "novo",
-                "last_inbound_at": "2025-01-10T10:00:00+00:00",
-                "last_outbound_at": None,
-                "last_outbound_actor": None,
-                "next_allowed_at": None,
-                "contact_count_7d": 0,
-                "active_objection": None,
-                "objection_severity": None,
-                "objection_detected_at": None,
-                "objection_resolved_at": None,
-                "pending_action": None,
-                "current_intent": None,
-                "flags": {},
-                "last_decay_at": None,
-                "cooling_off_until": None,
-            }
-            for _ in range(3)
+        lotes = [
+            [{"cliente_id": str(uuid4())} for _ in range(10)],
+            [{"cliente_id": str(uuid4())} for _ in range(3)],
         ]
+        mock_rpc = MagicMock()
+        mock_rpc.return_value.execute.side_effect = [MagicMock(data=lote) for lote in lotes]
 
         with (
+            patch("app.workers.temperature_decay.supabase.rpc", mock_rpc),
             patch(
-                "app.workers.temperature_decay.buscar_states_para_decay",
-                new_callable=AsyncMock,
-                return_value=fake_rows,
-            ),
-            patch(
-                "app.workers.temperature_decay.save_doctor_state_updates",
+                "app.workers.temperature_decay.invalidar_cache_states",
                 new_callable=AsyncMock,
-            ),
+            ) as mock_invalidar,
         ):
-            await decay_all_temperatures(batch_size=10)
+            decayed = await decay_all_temperatures(batch_size=10)
 
-            # OTIMIZADO: load_doctor_state não é importado no módulo,
-            # confirmando que Epic 4.2 usa _row_to_state direto.
-            import app.workers.temperature_decay as td_module
+        assert decayed == 13
+        assert mock_rpc.call_count == 2
+        assert mock_invalidar.await_count == 2
 
-            assert not hasattr(td_module, "load_doctor_state"), (
-                "load_doctor_state não deve ser importado em temperature_decay. "
-                "Epic 4.2: usa _row_to_state direto."
-            )
+        import app.workers.temperature_decay as td_module
+
+        assert not hasattr(td_module, "load_doctor_state"), (
+            "load_doctor_state não deve ser importado em temperature_decay. "
+            "Epic 4.2: decay não carrega estado por médico."
+        )
+        assert not hasattr(td_module, "save_doctor_state_updates")
 
 
 # =============================================================================
@@ -0,0 +1,57 @@
+"""
+Load test do pipeline inbound na configuração determinística.
+
+Reproduz webhooks gravados da Evolution por todos os processadores e
+falha se o p95 de algum estágio passar do orçamento em ORCAMENTO_P95_MS.
+"""
+
+import pytest
+
+from tests.performance.loadtest_inbound import (
+    ORCAMENTO_P95_MS,
+    ConfigCarga,
+    carregar_payloads,
+    executar_carga,
+    verificar_orcamentos,
+)
+
+pytestmark = pytest.mark.architectural
+
+# Fixture: 4 mensagens de médicos + 1 mensagem própria (fromMe) a cada 5
+MENSAGENS = 40
+RESPONDIDAS = 32
+
+
+class TestLoadTestInbound:
+    def test_fixture_tem_apenas_messages_upsert(self):
+        payloads = carregar_payloads()
+
+        assert len(payloads) == 5
+        assert all(p["event"] == "messages.upsert" for p in payloads)
+
+    @pytest.mark.asyncio
+    async def test_mensagens_percorrem_pipeline_completo(self):
+        relatorio = await executar_carga(ConfigCarga.para_orcamento(MENSAGENS))
+
+        assert relatorio["respostas_webhook"] == {"received": MENSAGENS}
+        assert relatorio["estagios"]["pipeline_total"]["chamadas"] == MENSAGENS
+        assert relatorio["estagios"]["llm_core"]["chamadas"] == RESPONDIDAS
+        assert relatorio["enviadas"] == RESPONDIDAS
+        # Geração da resposta + extração em background
+        assert relatorio["chamadas_llm"] == 2 * RESPONDIDAS
+
+        violacoes = verificar_orcamentos(relatorio)
+        assert not violacoes, "\n".join(violacoes)
+
+    def test_verificar_orcamentos_aponta_estagio_lento(self):
+        relatorio = {
+            "estagios": {
+                "llm_core": {"p95_ms": ORCAMENTO_P95_MS["llm_core"] + 1},
+                "parse_message": {"p95_ms": 0.1},
+            }
+        }
+
+        violacoes = verificar_orcamentos(relatorio)
+
+        assert len(violacoes) == 1
+        assert violacoes[0].startswith("llm_core:")
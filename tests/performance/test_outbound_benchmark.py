@@ -0,0 +1,73 @@
+"""
+Benchmark do envio outbound em modo rápido (sem latência simulada).
+
+Trava o número de round-trips de banco por envio: uma regressão que
+adicione queries ao caminho de envio falha aqui.
+"""
+
+import pytest
+
+from tests.performance.bench_outbound import ConfigBenchmark, executar_benchmark
+from tests.performance.harness.providers import PerfilLatencia
+
+pytestmark = pytest.mark.architectural
+
+# Round-trips de Supabase por envio REPLY bem-sucedido: 16 no caminho atual,
+# mais a folga das cargas únicas de cache (pool_config, WABAs)
+ORCAMENTO_DB_POR_ENVIO = 16.5
+
+SEM_FALHAS = PerfilLatencia(p50_ms=1, p99_ms=1)
+
+
+def _config(**kwargs) -> ConfigBenchmark:
+    base = dict(
+        envios=30,
+        concorrencia=5,
+        escala_provider=0,
+        perfis={"evolution": SEM_FALHAS, "z-api": SEM_FALHAS, "meta": SEM_FALHAS},
+    )
+    base.update(kwargs)
+    return ConfigBenchmark(**base)
+
+
+class TestBenchmarkOutbound:
+    @pytest.mark.asyncio
+    async def test_relatorio_cobre_estagios_do_envio(self):
+        relatorio = await executar_benchmark(_config())
+
+        assert relatorio["outcomes"] == {"SENT": 30}
+        assert relatorio["envios_por_segundo"] > 0
+        for estagio in (
+            "dev_allowlist",
+            "dedupe_reserva",
+            "guardrails",
+            "chip_selector",
+            "enviar_via_chip",
+            "registrar_envio_chip",
+            "provider",
+            "finalizacao",
+            "send_outbound_message",
+        ):
+            assert relatorio["estagios"][estagio]["chamadas"] == 30
+            assert {"p50_ms", "p95_ms", "p99_ms"} <= set(relatorio["estagios"][estagio])
+
+    @pytest.mark.asyncio
+    async def test_round_trips_de_banco_por_envio(self):
+        relatorio = await executar_benchmark(_config())
+
+        assert relatorio["db_round_trips_por_envio"] <= ORCAMENTO_DB_POR_ENVIO, (
+            relatorio["db_operacoes"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_falha_do_provider_vira_outcome_de_erro(self):
+        sempre_falha = PerfilLatencia(p50_ms=1, p99_ms=1, taxa_falha=1.0)
+        relatorio = await executar_benchmark(
+            _config(
+                envios=5,
+                perfis={"evolution": sempre_falha, "z-api": sempre_falha, "meta": sempre_falha},
+            )
+        )
+
+        assert relatorio["outcomes"] == {"FAILED_PROVIDER": 5}
+        assert relatorio["estagios"]["fallback_evolution"]["chamadas"] == 5
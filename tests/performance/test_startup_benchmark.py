@@ -0,0 +1,49 @@
+"""
+Benchmark de cold start em modo rápido.
+
+Trava que importar a API e os workers não carrega bibliotecas pesadas
+(SDK Anthropic, bs4, Supabase, Redis...) nem constrói os serviços
+preguiçosos — isso só acontece no primeiro uso.
+"""
+
+import pytest
+
+from tests.performance.bench_startup import (
+    ConfigBenchmark,
+    executar_benchmark,
+    parsear_importtime,
+    por_pacote,
+)
+
+pytestmark = pytest.mark.architectural
+
+SAIDA_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   anthropic._types
+import time:       300 |        420 | anthropic
+import time:        50 |         50 |   app.core
+import time:        80 |        550 | app.main
+"""
+
+
+class TestParserImporttime:
+    def test_parseia_e_agrega_por_pacote(self):
+        modulos = parsear_importtime(SAIDA_IMPORTTIME)
+
+        assert modulos[0] == ("anthropic._types", 120, 120)
+        assert len(modulos) == 4
+        assert por_pacote(modulos) == {"anthropic": 0.4, "app": 0.1}
+
+
+class TestBenchmarkStartup:
+    def test_entradas_nao_carregam_servicos_nem_bibliotecas_pesadas(self):
+        relatorio = executar_benchmark(ConfigBenchmark(repeticoes=1))
+
+        api = relatorio["entradas"]["app.main"]
+        assert {"supabase", "redis", "message_pipeline", "anthropic"} <= set(
+            api["servicos_registrados"]
+        )
+        for modulo, entrada in relatorio["entradas"].items():
+            assert entrada["bibliotecas_pesadas"] == [], modulo
+            assert entrada["servicos_inicializados"] == [], modulo
+            assert entrada["import_ms"] > 0
@@ -13,6 +13,7 @@ from app.services.policy.types import (
     LifecycleStage,
     ObjectionSeverity,
 )
+from app.services.policy.repository import aplicar_updates_em_memoria
 from app.services.policy.state_update import StateUpdate
 
 
@@ -338,3 +339,28 @@ class TestOnObjectionResolved:
         updates = updater.on_objection_resolved(state)
 
         assert updates == {}
+
+
+class TestAplicarUpdatesEmMemoria:
+    """Testes para aplicar_updates_em_memoria."""
+
+    def test_inbound_updates_mantem_tipos_do_state(self):
+        """Updates no formato do banco viram enums/datetimes no state."""
+        state = DoctorState(cliente_id="123", temperature=0.5)
+        updates = StateUpdate().on_inbound_message(state, "Oi, tudo bem!", None)
+
+        aplicar_updates_em_memoria(state, updates)
+
+        assert state.temperature == 0.6
+        assert state.temperature_trend == TemperatureTrend.WARMING
+        assert state.permission_state == PermissionState.ACTIVE
+        assert isinstance(state.last_inbound_at, datetime)
+
+    def test_valor_invalido_de_enum_mantem_valor_atual(self):
+        """Enum desconhecido não corrompe o state."""
+        state = DoctorState(cliente_id="123", lifecycle_stage=LifecycleStage.NOVO)
+
+        aplicar_updates_em_memoria(state, {"lifecycle_stage": "inexistente", "campo_extra": 1})
+
+        assert state.lifecycle_stage == LifecycleStage.NOVO
+        assert not hasattr(state, "campo_extra")
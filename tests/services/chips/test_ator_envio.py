@@ -0,0 +1,179 @@
+"""
+Testes do ator de envio por chip.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.chips.ator_envio import AtorEnvioChip, RegistroAtores
+from app.services.whatsapp_providers import MessageResult
+
+CHIP = {"id": "chip-1", "telefone": "5511988880001", "provider": "evolution"}
+
+
+@pytest.fixture
+def eventos():
+    """Registra (tempo, evento, telefone) de presence e envio."""
+    registro = []
+
+    async def enviar_via_chip(chip, telefone, texto, template_info=None):
+        registro.append((asyncio.get_running_loop().time(), "envio", telefone))
+        await asyncio.sleep(0.02)
+        return MessageResult(success=True, message_id=f"id-{telefone}", provider="evolution")
+
+    async def send_presence(telefone, presence, delay_ms):
+        registro.append((asyncio.get_running_loop().time(), presence, telefone))
+        return True
+
+    provider = MagicMock(send_presence=AsyncMock(side_effect=send_presence))
+    with (
+        patch("app.services.chips.sender.enviar_via_chip", side_effect=enviar_via_chip),
+        patch("app.services.whatsapp_providers.get_provider", return_value=provider),
+    ):
+        yield registro
+
+
+class TestAtorEnvioChip:
+    @pytest.mark.asyncio
+    async def test_presence_agendada_antes_do_envio(self, eventos):
+        ator = AtorEnvioChip("chip-1", max_em_voo=2, intervalo_minimo=0)
+
+        result = await ator.enviar(CHIP, "5511999990001", "Oi", tempo_digitacao=0.05)
+        await ator.encerrar()
+
+        assert result.message_id == "id-5511999990001"
+        (t_presenca, presenca, _), (t_envio, envio, _) = eventos
+        assert (presenca, envio) == ("composing", "envio")
+        assert t_envio - t_presenca >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_destinatarios_em_paralelo_no_mesmo_chip(self, eventos):
+        ator = AtorEnvioChip("chip-1", max_em_voo=3, intervalo_minimo=0)
+        loop = asyncio.get_event_loop()
+        inicio = loop.time()
+
+        resultados = await asyncio.gather(
+            *(ator.enviar(CHIP, f"551199999000{i}", "Oi", tempo_digitacao=0.1) for i in range(3))
+        )
+        duracao = loop.time() - inicio
+        await ator.encerrar()
+
+        assert all(r.success for r in resultados)
+        # Digitacao sobreposta: ~0.1s + envio, e nao 3 x 0.1s
+        assert duracao < 0.25
+
+    @pytest.mark.asyncio
+    async def test_espacamento_minimo_entre_envios(self, eventos):
+        ator = AtorEnvioChip("chip-1", max_em_voo=5, intervalo_minimo=0.04)
+
+        await asyncio.gather(*(ator.enviar(CHIP, f"551199999000{i}", "Oi") for i in range(3)))
+        await ator.encerrar()
+
+        envios = [t for t, evento, _ in eventos if evento == "envio"]
+        assert all(b - a >= 0.035 for a, b in zip(envios, envios[1:]))
+
+    @pytest.mark.asyncio
+    async def test_limite_de_envios_em_voo(self):
+        ator = AtorEnvioChip("chip-1", max_em_voo=2, intervalo_minimo=0)
+        em_voo = 0
+        pico = 0
+
+        async def enviar_via_chip(chip, telefone, texto, template_info=None):
+            nonlocal em_voo, pico
+            em_voo += 1
+            pico = max(pico, em_voo)
+            await asyncio.sleep(0.02)
+            em_voo -= 1
+            return MessageResult(success=True)
+
+        with patch("app.services.chips.sender.enviar_via_chip", side_effect=enviar_via_chip):
+            await asyncio.gather(*(ator.enviar(CHIP, f"55119999900{i}", "Oi") for i in range(6)))
+        await ator.encerrar()
+
+        assert pico == 2
+        assert ator.pendentes == 0
+
+    @pytest.mark.asyncio
+    async def test_erro_do_envio_chega_a_quem_pediu(self):
+        ator = AtorEnvioChip("chip-1", max_em_voo=1, intervalo_minimo=0)
+
+        with patch(
+            "app.services.chips.sender.enviar_via_chip",
+            AsyncMock(side_effect=RuntimeError("provider fora")),
+        ):
+            with pytest.raises(RuntimeError):
+                await ator.enviar(CHIP, "5511999990001", "Oi")
+        await ator.encerrar()
+
+    @pytest.mark.asyncio
+    async def test_encerrar_falha_pedidos_agendados_e_na_fila(self, eventos):
+        ator = AtorEnvioChip("chip-1", max_em_voo=1, intervalo_minimo=10)
+        agendados = [
+            asyncio.create_task(ator.enviar(CHIP, f"551199999000{i}", "Oi", tempo_digitacao=5))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        na_fila = asyncio.create_task(ator.enviar(CHIP, "5511999990009", "Oi"))
+        await asyncio.sleep(0)
+
+        await ator.encerrar()
+        resultados = await asyncio.wait_for(asyncio.gather(*agendados, na_fila), timeout=1)
+
+        assert [r.success for r in resultados] == [False, False, False]
+        assert [e for e in eventos if e[1] == "envio"] == []
+        assert ator.pendentes == 0
+
+
+class TestRegistroAtores:
+    @pytest.mark.asyncio
+    async def test_um_ator_por_chip_e_meta_sem_espacamento(self):
+        registro = RegistroAtores()
+
+        evolution = registro.obter(CHIP)
+        meta = registro.obter({"id": "chip-meta", "provider": "meta"})
+
+        assert registro.obter(CHIP) is evolution
+        assert meta.intervalo_minimo == 0.0
+        assert meta.max_em_voo > evolution.max_em_voo
+        await registro.encerrar()
+
+    @pytest.mark.asyncio
+    async def test_encerrar_libera_quem_aguarda_envio(self, eventos):
+        registro = RegistroAtores()
+        envio = asyncio.create_task(registro.enviar(CHIP, "5511999990001", "Oi", tempo_digitacao=5))
+        await asyncio.sleep(0.01)
+
+        await registro.encerrar()
+        result = await asyncio.wait_for(envio, timeout=1)
+
+        assert result.success is False
+        assert [e for e in eventos if e[1] == "envio"] == []
+
+
+class TestMultiChipComAtor:
+    @pytest.mark.asyncio
+    async def test_digitacao_sem_sleep_no_worker(self):
+        from app.services.outbound.multi_chip import _enviar_via_multi_chip
+
+        ctx = MagicMock(conversation_id=None, metadata={})
+        mock_selector = MagicMock()
+        mock_selector.selecionar_chip = AsyncMock(return_value=CHIP)
+        mock_atores = MagicMock()
+        mock_atores.enviar = AsyncMock(
+            return_value=MessageResult(success=True, message_id="evo.1", provider="evolution")
+        )
+
+        with (
+            patch("app.services.chips.selector.chip_selector", mock_selector),
+            patch("app.services.chips.ator_envio.atores_envio", mock_atores),
+            patch("asyncio.sleep", AsyncMock()) as sleep,
+        ):
+            result = await _enviar_via_multi_chip(
+                "5511999999999", "Ola", ctx, simular_digitacao=True, tempo_digitacao=3.0
+            )
+
+        assert result["success"] is True
+        assert mock_atores.enviar.call_args.kwargs["tempo_digitacao"] == 3.0
+        sleep.assert_not_called()
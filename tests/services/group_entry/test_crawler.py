@@ -0,0 +1,216 @@
+"""Testes do crawler de fontes de grupos.
+
+Sprint 26 - E12
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.group_entry.crawler import CrawlerManager
+from app.services.group_entry.extrator_links import extrair_links_whatsapp
+from app.services.group_entry.limitador import LimitadorPorHost
+
+CODIGO_A = "AAAAAAAAAAAAAAAAAAAAA1"
+CODIGO_B = "BBBBBBBBBBBBBBBBBBBBB2"
+CODIGO_C = "CCCCCCCCCCCCCCCCCCCCC3"
+
+HTML = f"""
+<html><body>
+  <div class="card">
+    <h3>Plant&otilde;es Cl&iacute;nica <em>SP</em></h3>
+    <a class="btn" href="https://chat.whatsapp.com/{CODIGO_A}?utm=1">Entrar</a>
+  </div>
+  <li><a href='https://chat.whatsapp.com/{CODIGO_B}'><span>Médicos RJ</span></a></li>
+  <a href="https://chat.whatsapp.com/{CODIGO_B}">Médicos RJ (repetido)</a>
+  <p>Cole no navegador: https://chat.whatsapp.com/{CODIGO_C}</p>
+  <a href="https://outro.site/grupo">Outro</a>
+</body></html>
+"""
+
+
+def _fronteira():
+    fronteira = MagicMock()
+    fronteira.obter_validadores = AsyncMock(return_value=None)
+    fronteira.salvar_validadores = AsyncMock()
+    fronteira.enfileirar = AsyncMock()
+    fronteira.pendentes = AsyncMock(return_value=[])
+    fronteira.reservar = AsyncMock(return_value=True)
+    fronteira.concluir = AsyncMock()
+    return fronteira
+
+
+def _crawler(fronteira=None, pool=None):
+    return CrawlerManager(
+        limitador=LimitadorPorHost(max_concorrentes=1, intervalo_minimo=0),
+        pool=pool or MagicMock(fechar=AsyncMock()),
+        fronteira=fronteira or _fronteira(),
+    )
+
+
+def _resposta(status=200, texto="", headers=None):
+    resp = MagicMock(status_code=status, text=texto, content=texto.encode(), headers=headers or {})
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+class TestExtrairLinksWhatsapp:
+    def test_ancoras_titulo_e_links_soltos(self):
+        links = extrair_links_whatsapp(HTML)
+
+        assert links == [
+            {
+                "invite_code": CODIGO_A,
+                "invite_url": f"https://chat.whatsapp.com/{CODIGO_A}?utm=1",
+                "nome": "Entrar",
+            },
+            {
+                "invite_code": CODIGO_B,
+                "invite_url": f"https://chat.whatsapp.com/{CODIGO_B}",
+                "nome": "Médicos RJ",
+            },
+            {
+                "invite_code": CODIGO_C,
+                "invite_url": f"https://chat.whatsapp.com/{CODIGO_C}",
+                "nome": None,
+            },
+        ]
+
+    def test_nome_curto_usa_titulo_anterior(self):
+        html = (
+            "<h3>Plant&otilde;es <b>SP</b></h3>"
+            f'<a href="https://chat.whatsapp.com/{CODIGO_A}">&gt;</a>'
+        )
+
+        assert extrair_links_whatsapp(html)[0]["nome"] == "Plantões SP"
+
+    def test_pagina_sem_links(self):
+        assert extrair_links_whatsapp("<html><a href='/x'>x</a></html>") == []
+
+
+class TestRequisicaoCondicional:
+    FONTE = {"id": "s1", "url": "https://grupos.exemplo.com/medicos", "dominio": "exemplo.com"}
+
+    @pytest.mark.asyncio
+    async def test_envia_validadores_e_304_nao_reprocessa(self):
+        client = MagicMock(get=AsyncMock(return_value=_resposta(status=304)))
+        anteriores = {"etag": '"v1"', "last_modified": "Mon, 19 Oct 2026 10:00:00 GMT"}
+
+        with patch(
+            "app.services.group_entry.crawler.get_http_client", AsyncMock(return_value=client)
+        ):
+            links, validadores = await _crawler()._crawl_requests(self.FONTE, anteriores)
+
+        headers = client.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 19 Oct 2026 10:00:00 GMT"
+        assert links is None
+        assert validadores == anteriores
+
+    @pytest.mark.asyncio
+    async def test_conteudo_igual_sem_etag_nao_reprocessa(self):
+        client = MagicMock(get=AsyncMock(return_value=_resposta(texto=HTML)))
+
+        with patch(
+            "app.services.group_entry.crawler.get_http_client", AsyncMock(return_value=client)
+        ):
+            crawler = _crawler()
+            links, validadores = await crawler._crawl_requests(self.FONTE)
+            repetido, _ = await crawler._crawl_requests(self.FONTE, validadores)
+
+        assert len(links) == 3
+        assert validadores["etag"] is None
+        assert repetido is None
+
+    @pytest.mark.asyncio
+    async def test_crawl_fonte_nao_modificada_salva_validadores(self):
+        fronteira = _fronteira()
+        fronteira.obter_validadores.return_value = {"etag": '"v1"'}
+        client = MagicMock(get=AsyncMock(return_value=_resposta(status=304)))
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = {
+            **self.FONTE,
+            "metodo_crawl": "requests",
+            "frequencia_dias": 7,
+        }
+
+        with (
+            patch("app.services.group_entry.crawler.supabase", mock_supabase),
+            patch(
+                "app.services.group_entry.crawler.get_http_client",
+                AsyncMock(return_value=client),
+            ),
+            patch.object(CrawlerManager, "_processar_links", AsyncMock()) as processar,
+        ):
+            resultado = await _crawler(fronteira).crawl_fonte("s1")
+
+        assert resultado["status"] == "sucesso"
+        assert resultado["nao_modificado"] is True
+        processar.assert_not_awaited()
+        fronteira.salvar_validadores.assert_awaited_once_with("s1", {"etag": '"v1"'})
+
+
+class TestExecutarCrawlsPendentes:
+    def _supabase(self, fontes):
+        mock = MagicMock()
+        mock.table.return_value.select.return_value.eq.return_value.lte.return_value.limit.return_value.execute.return_value.data = fontes
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_fontes_em_paralelo_e_fila_retomada(self):
+        fronteira = _fronteira()
+        # s0 ficou na fila de uma rodada interrompida
+        fronteira.pendentes.return_value = ["s0", "s1", "s2"]
+        pool = MagicMock(fechar=AsyncMock())
+        crawler = _crawler(fronteira, pool)
+        ativos = 0
+        pico = 0
+
+        async def crawl_fonte(source_id):
+            nonlocal ativos, pico
+            ativos += 1
+            pico = max(pico, ativos)
+            await asyncio.sleep(0.01)
+            ativos -= 1
+            return {"links_novos": 2, "nao_modificado": source_id == "s2"}
+
+        with (
+            patch(
+                "app.services.group_entry.crawler.supabase",
+                self._supabase([{"id": "s1"}, {"id": "s2"}]),
+            ),
+            patch.object(crawler, "crawl_fonte", side_effect=crawl_fonte),
+        ):
+            total = await crawler.executar_crawls_pendentes(limite=3)
+
+        fronteira.enfileirar.assert_awaited_once_with(["s1", "s2"])
+        assert total == {
+            "fontes_processadas": 3,
+            "fontes_nao_modificadas": 1,
+            "total_links_novos": 6,
+        }
+        assert pico == 3
+        assert fronteira.concluir.await_count == 3
+        pool.fechar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fonte_reservada_por_outro_worker_e_ignorada(self):
+        fronteira = _fronteira()
+        fronteira.reservar.side_effect = lambda source_id: source_id != "s1"
+        crawler = _crawler(fronteira)
+
+        with (
+            patch(
+                "app.services.group_entry.crawler.supabase",
+                self._supabase([{"id": "s1"}, {"id": "s2"}]),
+            ),
+            patch.object(
+                crawler, "crawl_fonte", AsyncMock(return_value={"links_novos": 1})
+            ) as crawl,
+        ):
+            total = await crawler.executar_crawls_pendentes()
+
+        crawl.assert_awaited_once_with("s2")
+        assert total["fontes_processadas"] == 1
+        fronteira.concluir.assert_awaited_once_with("s2")
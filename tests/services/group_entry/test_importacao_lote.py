@@ -0,0 +1,263 @@
+"""Testes da importacao em lote de links de grupos.
+
+Sprint 26 - E12
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.group_entry.importacao_lote import (
+    ImportadorLinks,
+    importar_arquivo,
+    montar_link,
+)
+from app.services.group_entry.limitador import LimitadorPorHost, host_de
+
+PATCH_SUPABASE = "app.services.group_entry.importacao_lote.supabase"
+
+CODIGO = "ABCDEFGHIJKLMNOPQRSTU{}"
+
+
+def _codigo(i: int) -> str:
+    return CODIGO.format(i % 10) + chr(ord("a") + i // 10)
+
+
+def _linhas(n: int, inicio: int = 1):
+    return [(i, {"url": f"https://chat.whatsapp.com/{_codigo(i)}"}) for i in range(inicio, n + 1)]
+
+
+def _mock_supabase(existentes=()):
+    mock = MagicMock()
+    tabela = mock.table.return_value
+    tabela.select.return_value.in_.return_value.execute.return_value.data = [
+        {"invite_code": c} for c in existentes
+    ]
+    tabela.upsert.return_value.execute.side_effect = lambda: MagicMock(
+        data=[{"id": f"id-{i}", **link} for i, link in enumerate(tabela.upsert.call_args.args[0])]
+    )
+    return mock
+
+
+class TestMontarLink:
+    def test_url_completa(self):
+        link, erro = montar_link(
+            {"url": f"https://chat.whatsapp.com/{_codigo(1)}?x=1", "name": " Plantões SP "},
+            fonte="grupos.csv",
+            categoria="medicos",
+        )
+
+        assert erro is None
+        assert link["invite_code"] == _codigo(1)
+        assert link["nome"] == "Plantões SP"
+        assert link["categoria"] == "medicos"
+        assert link["fonte"] == "grupos.csv"
+
+    def test_invalido(self):
+        link, erro = montar_link({"url": "https://exemplo.com"}, fonte="x")
+
+        assert link is None
+        assert erro == "invite_code inválido"
+
+
+class TestImportadorLinks:
+    @pytest.mark.asyncio
+    async def test_uma_query_in_e_um_upsert_por_lote(self):
+        mock = _mock_supabase(existentes=[_codigo(1)])
+
+        with patch(PATCH_SUPABASE, mock):
+            progresso = await ImportadorLinks(tamanho_lote=2).importar(_linhas(5), fonte="f.csv")
+
+        tabela = mock.table.return_value
+        assert tabela.select.return_value.in_.call_count == 3
+        assert [len(c.args[0]) for c in tabela.upsert.call_args_list] == [1, 2, 1]
+        assert tabela.upsert.call_args.kwargs == {
+            "on_conflict": "invite_code",
+            "ignore_duplicates": True,
+        }
+        assert progresso.importados == 4
+        assert progresso.duplicados == 1
+        assert progresso.linhas_lidas == 5
+
+    @pytest.mark.asyncio
+    async def test_duplicados_no_proprio_arquivo_e_invalidos(self):
+        mock = _mock_supabase()
+        linhas = _linhas(2) + [(3, {"invite_code": _codigo(1)}), (4, {"url": "lixo"})]
+
+        with patch(PATCH_SUPABASE, mock):
+            progresso = await ImportadorLinks().importar(linhas, fonte="f.csv")
+
+        assert progresso.importados == 2
+        assert progresso.duplicados == 1
+        assert progresso.invalidos == 1
+        assert progresso.erros == ["Linha 4: invite_code inválido"]
+        assert mock.table.return_value.upsert.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retoma_do_checkpoint(self):
+        mock = _mock_supabase()
+        salvo = {"fonte": "f.csv", "linhas_lidas": 3, "importados": 3, "ultima_linha": 3}
+
+        with (
+            patch(PATCH_SUPABASE, mock),
+            patch(
+                "app.services.group_entry.importacao_lote.cache_get_json",
+                AsyncMock(return_value=salvo),
+            ),
+            patch("app.services.group_entry.importacao_lote.cache_set_json", AsyncMock()),
+            patch(
+                "app.services.group_entry.importacao_lote.cache_delete", AsyncMock()
+            ) as delete,
+        ):
+            progresso = await ImportadorLinks().importar(
+                _linhas(5), fonte="f.csv", chave_checkpoint="ck"
+            )
+
+        inseridos = mock.table.return_value.upsert.call_args.args[0]
+        assert [link["invite_code"] for link in inseridos] == [_codigo(4), _codigo(5)]
+        assert progresso.importados == 5
+        assert progresso.linhas_lidas == 5
+        delete.assert_awaited_once_with("ck")
+
+    @pytest.mark.asyncio
+    async def test_erro_no_banco_mantem_checkpoint(self):
+        mock = _mock_supabase()
+        mock.table.return_value.upsert.return_value.execute.side_effect = Exception("timeout")
+
+        with (
+            patch(PATCH_SUPABASE, mock),
+            patch(
+                "app.services.group_entry.importacao_lote.cache_get_json",
+                AsyncMock(return_value=None),
+            ),
+            patch("app.services.group_entry.importacao_lote.cache_set_json", AsyncMock()),
+            patch(
+                "app.services.group_entry.importacao_lote.cache_delete", AsyncMock()
+            ) as delete,
+        ):
+            progresso = await ImportadorLinks().importar(
+                _linhas(2), fonte="f.csv", chave_checkpoint="ck"
+            )
+
+        assert progresso.ultima_linha == 0
+        assert progresso.erros == ["Erro no banco: timeout"]
+        delete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_callback_de_progresso_e_validacao(self):
+        mock = _mock_supabase()
+        chamadas = []
+
+        with (
+            patch(PATCH_SUPABASE, mock),
+            patch(
+                "app.services.group_entry.validator.validar_links_em_lote",
+                AsyncMock(return_value={"validados": 1, "invalidos": 1, "erros": 0}),
+            ) as validar,
+        ):
+            progresso = await ImportadorLinks(
+                tamanho_lote=2,
+                validar=True,
+                ao_progresso=lambda p: chamadas.append(p.ultima_linha),
+            ).importar(_linhas(2), fonte="f.csv")
+
+        assert chamadas == [2, 2]
+        validar.assert_awaited_once()
+        assert progresso.validados == 1
+        assert progresso.invalidos_validacao == 1
+
+    @pytest.mark.asyncio
+    async def test_importar_arquivo_csv(self, tmp_path):
+        arquivo = tmp_path / "grupos.csv"
+        arquivo.write_text(
+            "name,url\nG1,https://chat.whatsapp.com/{}\nG2,invalido\n".format(_codigo(1)),
+            encoding="utf-8",
+        )
+        mock = _mock_supabase()
+
+        with patch(PATCH_SUPABASE, mock):
+            progresso = await importar_arquivo(arquivo, retomar=False)
+
+        assert progresso.como_resultado() == {
+            "total_linhas": 2,
+            "importados": 1,
+            "duplicados": 0,
+            "invalidos": 1,
+            "erros": ["Linha 2: invite_code inválido"],
+        }
+
+
+class TestLimitadorPorHost:
+    def test_host_de(self):
+        assert host_de("https://Grupos.Exemplo.com/pagina") == "grupos.exemplo.com"
+        assert host_de("chip-01") == "chip-01"
+
+    @pytest.mark.asyncio
+    async def test_limita_concorrencia_por_host(self):
+        limitador = LimitadorPorHost(max_concorrentes=2, intervalo_minimo=0)
+        ativos = {"a": 0, "b": 0}
+        pico = {"a": 0, "b": 0}
+
+        async def tarefa(host):
+            async with limitador.slot(host):
+                ativos[host] += 1
+                pico[host] = max(pico[host], ativos[host])
+                await asyncio.sleep(0.01)
+                ativos[host] -= 1
+
+        await asyncio.gather(*(tarefa(h) for h in ["a"] * 5 + ["b"] * 5))
+
+        assert pico == {"a": 2, "b": 2}
+
+    @pytest.mark.asyncio
+    async def test_espaca_inicios_no_mesmo_host(self):
+        limitador = LimitadorPorHost(max_concorrentes=5, intervalo_minimo=0.05)
+        loop = asyncio.get_event_loop()
+        inicios = []
+
+        async def tarefa():
+            async with limitador.slot("a"):
+                inicios.append(loop.time())
+
+        await asyncio.gather(*(tarefa() for _ in range(3)))
+
+        intervalos = [b - a for a, b in zip(inicios, inicios[1:])]
+        assert all(i >= 0.045 for i in intervalos)
+
+
+class TestValidarLinksEmLote:
+    @pytest.mark.asyncio
+    async def test_distribui_entre_chips_e_agrupa_invalidos(self):
+        from app.services.group_entry.validator import validar_links_em_lote
+
+        links = [{"id": f"l{i}", "invite_code": _codigo(i)} for i in range(4)]
+        clientes = {}
+
+        def _cliente(instance):
+            cliente = MagicMock(instance=instance)
+            cliente.buscar_info_grupo_por_invite = AsyncMock(
+                side_effect=lambda code: {"subject": "G"} if code == _codigo(0) else None
+            )
+            clientes[instance] = cliente
+            return cliente
+
+        mock = MagicMock()
+        with (
+            patch("app.services.group_entry.validator.supabase", mock),
+            patch(
+                "app.services.group_entry.validator._buscar_chips_validacao",
+                return_value=[{"instance_name": "c1"}, {"instance_name": "c2"}],
+            ),
+            patch("app.services.group_entry.validator.EvolutionClient", side_effect=_cliente),
+        ):
+            resultado = await validar_links_em_lote(
+                links, limitador=LimitadorPorHost(intervalo_minimo=0)
+            )
+
+        assert resultado == {"validados": 1, "invalidos": 3, "erros": 0}
+        assert clientes["c1"].buscar_info_grupo_por_invite.await_count == 2
+        assert clientes["c2"].buscar_info_grupo_por_invite.await_count == 2
+        mock.table.return_value.update.return_value.in_.assert_called_once_with(
+            "id", ["l1", "l2", "l3"]
+        )
@@ -59,17 +59,14 @@ class TestAgenteHelena:
     @pytest.mark.asyncio
     async def test_processar_mensagem_erro_api(self, agente):
         """Testa tratamento de erro da API."""
-        import anthropic
+        from app.services.llm import LLMError
 
         with patch.object(agente, '_chamar_llm', new_callable=AsyncMock) as mock_llm:
-            mock_llm.side_effect = anthropic.APIError(
-                message="Rate limit",
-                request=MagicMock(),
-                body=None
-            )
+            mock_llm.side_effect = LLMError("Rate limit", provider="anthropic", retryable=True)
 
             with patch.object(agente.session, 'carregar', new_callable=AsyncMock):
-                resposta = await agente.processar_mensagem("teste")
+                with patch.object(agente.session, 'salvar', new_callable=AsyncMock):
+                    resposta = await agente.processar_mensagem("teste")
 
         assert "problema técnico" in resposta.lower()
 
@@ -80,11 +77,89 @@ class TestAgenteHelena:
             mock_llm.side_effect = Exception("Erro inesperado")
 
             with patch.object(agente.session, 'carregar', new_callable=AsyncMock):
-                resposta = await agente.processar_mensagem("teste")
+                with patch.object(agente.session, 'salvar', new_callable=AsyncMock):
+                    resposta = await agente.processar_mensagem("teste")
 
         assert "deu errado" in resposta.lower()
 
 
+class TestAgenteHelenaComProvider:
+    """Loop de tools sobre o provider assíncrono."""
+
+    @pytest.mark.asyncio
+    async def test_tools_em_paralelo_parcial_e_sessao_uma_vez(self):
+        """Tools da mesma resposta rodam juntas; parcial enviado; sessão salva 1x."""
+        import asyncio
+
+        from app.services.llm import LLMResponse, StopReason, ToolCall
+
+        provider = MagicMock()
+        provider.generate = AsyncMock(
+            side_effect=[
+                LLMResponse(
+                    content="Vou consultar as métricas...",
+                    tool_calls=[
+                        ToolCall(id="t1", name="metricas_periodo", input={"periodo": "hoje"}),
+                        ToolCall(id="t2", name="status_sistema", input={}),
+                    ],
+                    stop_reason=StopReason.TOOL_USE,
+                ),
+                LLMResponse(content="Hoje: 50 conversas, sistema ok."),
+            ]
+        )
+        agente = AgenteHelena("U123", "C456", provider=provider)
+
+        em_execucao = 0
+        pico = 0
+
+        async def executar_tool(nome, params, user_id, channel_id):
+            nonlocal em_execucao, pico
+            em_execucao += 1
+            pico = max(pico, em_execucao)
+            await asyncio.sleep(0.01)
+            em_execucao -= 1
+            if nome == "status_sistema":
+                raise RuntimeError("timeout")
+            return {"success": True, "tool": nome}
+
+        parciais = []
+
+        async def ao_parcial(texto):
+            parciais.append(texto)
+
+        with patch("app.tools.helena.executar_tool", side_effect=executar_tool), patch.object(
+            agente.session, "carregar", new_callable=AsyncMock
+        ) as carregar, patch.object(agente.session, "salvar", new_callable=AsyncMock) as salvar:
+            agente.session.session = None
+            from app.services.helena.session import HelenaSession
+
+            carregar.side_effect = lambda: setattr(
+                agente.session, "session", HelenaSession("U123", "C456")
+            )
+            resposta = await agente.processar_mensagem("Como foi hoje?", ao_parcial=ao_parcial)
+
+        assert resposta == "Hoje: 50 conversas, sistema ok."
+        assert pico == 2
+        assert parciais == ["Vou consultar as métricas..."]
+        carregar.assert_awaited_once()
+        salvar.assert_awaited_once()
+
+        mensagens = agente.session.mensagens
+        assert mensagens[1]["content"][1] == {
+            "type": "tool_use",
+            "id": "t1",
+            "name": "metricas_periodo",
+            "input": {"periodo": "hoje"},
+        }
+        resultados = mensagens[2]["content"]
+        assert [r["tool_use_id"] for r in resultados] == ["t1", "t2"]
+        assert "timeout" in resultados[1]["content"]
+
+        segunda_chamada = provider.generate.await_args_list[1].args[0]
+        assert segunda_chamada.max_tokens == 2048
+        assert len(segunda_chamada.messages) == 3
+
+
 class TestSessionManager:
     """Testes para SessionManager."""
 
@@ -0,0 +1,187 @@
+"""
+Testes do resumo incremental de conversas.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.julia.summarizer import (
+    MSGS_RECENTES,
+    THRESHOLD_MSGS,
+    atualizar_resumo_conversa,
+    sumarizar_se_necessario,
+)
+
+
+def _historico(n: int, primeiro_id: int = 1) -> list[dict]:
+    return [
+        {
+            "id": primeiro_id + i,
+            "conteudo": f"msg {primeiro_id + i}",
+            "autor_tipo": "medico" if i % 2 == 0 else "julia",
+        }
+        for i in range(n)
+    ]
+
+
+def _mock_interacoes(linhas: list[dict]) -> MagicMock:
+    mock_sb = MagicMock()
+    query = mock_sb.table.return_value.select.return_value.eq.return_value
+    query.gt.return_value = query
+    query.order.return_value.limit.return_value.execute.return_value.data = linhas
+    return mock_sb
+
+
+class TestSumarizarSeNecessario:
+    """Caminho da resposta: só lê o resumo persistido."""
+
+    @pytest.mark.asyncio
+    async def test_abaixo_do_threshold_retorna_historico(self):
+        historico = _historico(THRESHOLD_MSGS)
+
+        with patch(
+            "app.services.julia.summarizer.carregar_resumo", new_callable=AsyncMock
+        ) as mock_carregar:
+            resumo, recentes = await sumarizar_se_necessario(historico, "conv-1")
+
+        assert resumo == ""
+        assert recentes == historico
+        mock_carregar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_usa_resumo_persistido_e_mensagens_posteriores(self):
+        historico = _historico(20)
+        persistido = {"resumo": "Médico quer plantão no ABC", "ultima_interacao_id": 13}
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=persistido,
+            ),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo", new_callable=AsyncMock
+            ) as mock_llm,
+        ):
+            resumo, recentes = await sumarizar_se_necessario(historico, "conv-1")
+
+        assert resumo == "Médico quer plantão no ABC"
+        assert [m["id"] for m in recentes] == list(range(14, 21))
+        mock_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sem_resumo_persistido_usa_fallback_sem_llm(self):
+        historico = _historico(15)
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo", new_callable=AsyncMock
+            ) as mock_llm,
+        ):
+            resumo, recentes = await sumarizar_se_necessario(historico, "conv-1")
+
+        assert "Resumo de 10 mensagens anteriores" in resumo
+        assert recentes == historico[-MSGS_RECENTES:]
+        mock_llm.assert_not_called()
+
+
+class TestAtualizarResumoConversa:
+    """Atualização em background após a resposta."""
+
+    @pytest.mark.asyncio
+    async def test_incorpora_apenas_mensagens_fora_da_janela(self):
+        persistido = {"resumo": "Resumo antigo", "ultima_interacao_id": 10, "msgs_resumidas": 10}
+        novas = _historico(10, primeiro_id=11)
+        mock_sb = _mock_interacoes(novas)
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=persistido,
+            ),
+            patch("app.services.julia.summarizer.supabase", mock_sb),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo",
+                new_callable=AsyncMock,
+                return_value="Resumo novo",
+            ) as mock_llm,
+        ):
+            assert await atualizar_resumo_conversa("conv-1") is True
+
+        mensagens, _, resumo_anterior = mock_llm.call_args.args
+        assert [m["id"] for m in mensagens] == [11, 12, 13, 14, 15]
+        assert resumo_anterior == "Resumo antigo"
+        mock_sb.table.return_value.select.return_value.eq.return_value.gt.assert_called_with(
+            "id", 10
+        )
+
+        salvo = mock_sb.table.return_value.upsert.call_args.args[0]
+        assert salvo["resumo"] == "Resumo novo"
+        assert salvo["ultima_interacao_id"] == 15
+        assert salvo["msgs_resumidas"] == 15
+
+    @pytest.mark.asyncio
+    async def test_poucas_mensagens_novas_nao_chama_llm(self):
+        persistido = {"resumo": "Resumo", "ultima_interacao_id": 10, "msgs_resumidas": 10}
+        mock_sb = _mock_interacoes(_historico(MSGS_RECENTES + 2, primeiro_id=11))
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=persistido,
+            ),
+            patch("app.services.julia.summarizer.supabase", mock_sb),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo", new_callable=AsyncMock
+            ) as mock_llm,
+        ):
+            assert await atualizar_resumo_conversa("conv-1") is False
+
+        mock_llm.assert_not_called()
+        mock_sb.table.return_value.upsert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_conversa_curta_nao_gera_primeiro_resumo(self):
+        mock_sb = _mock_interacoes(_historico(THRESHOLD_MSGS))
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch("app.services.julia.summarizer.supabase", mock_sb),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo", new_callable=AsyncMock
+            ) as mock_llm,
+        ):
+            assert await atualizar_resumo_conversa("conv-1") is False
+
+        mock_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falha_do_llm_nao_persiste(self):
+        mock_sb = _mock_interacoes(_historico(THRESHOLD_MSGS + 5))
+
+        with (
+            patch(
+                "app.services.julia.summarizer.carregar_resumo",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch("app.services.julia.summarizer.supabase", mock_sb),
+            patch(
+                "app.services.julia.summarizer._gerar_resumo",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+        ):
+            assert await atualizar_resumo_conversa("conv-1") is False
+
+        mock_sb.table.return_value.upsert.assert_not_called()
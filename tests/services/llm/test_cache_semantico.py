@@ -0,0 +1,238 @@
+"""
+Testes do cache semântico de respostas LLM.
+"""
+
+import math
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.conversation_mode.types import ConversationMode
+from app.services.llm import cache_semantico
+from app.services.llm.cache_semantico import (
+    _para_template,
+    buscar_resposta,
+    classificar_intencao,
+    salvar_resposta,
+)
+from app.services.policy.flags import LLMCacheSemanticoFlags
+
+
+def _vetor(*componentes):
+    norma = math.sqrt(sum(c * c for c in componentes))
+    return [c / norma for c in componentes]
+
+
+@pytest.fixture
+def ambiente():
+    """Redis em memória, flag ligada e embeddings controlados."""
+    cache = {}
+    embeddings = {}
+
+    async def get_json(chave):
+        return cache.get(chave)
+
+    async def set_json(chave, valor, ttl=300):
+        cache[chave] = valor
+        return True
+
+    async def embedding(texto, input_type="query"):
+        return embeddings.get(texto)
+
+    flags = LLMCacheSemanticoFlags(enabled=True)
+    cache_semantico._embeddings_recentes.clear()
+    with (
+        patch.object(cache_semantico, "cache_get_json", side_effect=get_json),
+        patch.object(cache_semantico, "cache_set_json", side_effect=set_json),
+        patch.object(cache_semantico, "gerar_embedding", side_effect=embedding),
+        patch.object(
+            cache_semantico, "get_llm_cache_semantico_flags", AsyncMock(return_value=flags)
+        ),
+        patch.object(cache_semantico, "_registrar", new_callable=AsyncMock) as registrar,
+    ):
+        yield {"cache": cache, "embeddings": embeddings, "flags": flags, "registrar": registrar}
+    cache_semantico._embeddings_recentes.clear()
+
+
+MODO = MagicMock(mode=ConversationMode.DISCOVERY)
+ANA = {"id": "m1", "primeiro_nome": "Ana"}
+BRUNO = {"id": "m2", "primeiro_nome": "Bruno"}
+
+
+class TestClassificacao:
+    def test_turnos_de_template(self):
+        assert classificar_intencao("Oi, tudo bem?") == "saudacao"
+        assert classificar_intencao("Quem é você?") == "quem_e"
+        assert classificar_intencao("ok, obrigado!") == "confirmacao"
+
+    def test_mensagens_especificas_ficam_de_fora(self):
+        assert classificar_intencao("quero o plantão de sexta no Hospital X") is None
+        assert classificar_intencao("oi, quanto paga o plantão noturno?") is None
+        # Resposta depende de buscar_vagas e da situação do médico
+        assert classificar_intencao("manda as vagas aí") is None
+
+    def test_template_descarta_dados_especificos(self):
+        assert _para_template("Oi Ana! Tudo bem?", ANA) == "Oi {nome}! Tudo bem?"
+        assert _para_template("Tenho 3 vagas por R$ 1500", ANA) is None
+        assert _para_template("Oi Dra Souza", {**ANA, "sobrenome": "Souza"}) is None
+
+
+@pytest.mark.asyncio
+async def test_hit_entre_medicos_por_similaridade(ambiente):
+    ambiente["embeddings"]["oi tudo bem"] = _vetor(1, 0.1, 0)
+    ambiente["embeddings"]["oi tudo bom"] = _vetor(1, 0.12, 0.01)
+
+    salvo = await salvar_resposta(
+        "Oi, tudo bem?", {}, ANA, "Oi Ana! Tudo ótimo e vc?", latencia_ms=1800, mode_info=MODO
+    )
+    resposta = await buscar_resposta("oi tudo bom", {}, BRUNO, mode_info=MODO)
+
+    assert salvo is True
+    assert resposta == "Oi Bruno! Tudo ótimo e vc?"
+    ambiente["registrar"].assert_awaited_with("saudacao", "hits", 1800)
+
+
+@pytest.mark.asyncio
+async def test_abaixo_do_limiar_e_outro_estado_sao_miss(ambiente):
+    ambiente["embeddings"]["oi"] = _vetor(1, 0, 0)
+    ambiente["embeddings"]["bom dia"] = _vetor(0, 1, 0)
+    await salvar_resposta("oi", {}, ANA, "Oi Ana, tudo bem?", mode_info=MODO)
+
+    assert await buscar_resposta("bom dia", {}, BRUNO, mode_info=MODO) is None
+    # Primeira mensagem é outro estado (outra chave)
+    assert await buscar_resposta("oi", {"primeira_msg": True}, BRUNO, mode_info=MODO) is None
+    assert await buscar_resposta("oi", {"controlled_by": "human"}, BRUNO) is None
+    ambiente["registrar"].assert_any_await("saudacao", "misses")
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_por_intencao(ambiente):
+    ambiente["flags"].intents_desligadas = ["saudacao"]
+    await salvar_resposta("oi", {}, ANA, "Oi Ana, tudo bem?", mode_info=MODO)
+
+    assert ambiente["cache"] == {}
+    assert await buscar_resposta("oi", {}, BRUNO, mode_info=MODO) is None
+    ambiente["registrar"].assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sem_embedding_usa_texto_normalizado(ambiente):
+    await salvar_resposta("Quem é?", {}, ANA, "Sou a Julia, da Revoluna!", mode_info=MODO)
+
+    assert await buscar_resposta("quem e", {}, BRUNO, mode_info=MODO) == (
+        "Sou a Julia, da Revoluna!"
+    )
+    assert await buscar_resposta("quem fala", {}, BRUNO, mode_info=MODO) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("usar_tools", [True, False])
+async def test_geracao_consulta_cache_semantico_em_turno_de_template(usar_tools):
+    from app.services.agente import gerar_resposta_julia
+
+    with (
+        patch(
+            "app.services.agente._gerar_resposta_julia_impl",
+            AsyncMock(return_value="Oi Ana, tudo bem?"),
+        ),
+        patch(
+            "app.services.conversation_mode.response_validator.validar_resposta_julia",
+            return_value=(True, None),
+        ),
+        patch("app.services.llm.cache.get_cached_response", AsyncMock(return_value=None)),
+        patch("app.services.llm.cache.cache_response", new_callable=AsyncMock),
+        patch.object(cache_semantico, "buscar_resposta", AsyncMock(return_value=None)) as buscar,
+        patch.object(cache_semantico, "salvar_resposta", new_callable=AsyncMock) as salvar,
+    ):
+        resposta = await gerar_resposta_julia("oi", {}, ANA, {"id": "c1"}, usar_tools=usar_tools)
+        await gerar_resposta_julia("tem vaga sabado?", {}, ANA, {"id": "c1"}, usar_tools=usar_tools)
+
+    assert resposta == "Oi Ana, tudo bem?"
+    assert buscar.await_count == salvar.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_turno_com_tool_executada_nao_e_salvo():
+    from app.services.agente import gerar_resposta_julia
+    from app.services.agente import generation
+
+    async def impl(**kwargs):
+        await generation._executar_tool_calls(
+            [{"id": "t1", "name": "reservar_plantao", "input": {}}], ANA, {"id": "c1"}
+        )
+        return "Reservado!"
+
+    with (
+        patch("app.services.agente._gerar_resposta_julia_impl", side_effect=impl),
+        patch.object(generation, "processar_tool_call", AsyncMock(return_value={"ok": True})),
+        patch(
+            "app.services.conversation_mode.response_validator.validar_resposta_julia",
+            return_value=(True, None),
+        ),
+        patch.object(cache_semantico, "buscar_resposta", AsyncMock(return_value=None)),
+        patch.object(cache_semantico, "salvar_resposta", new_callable=AsyncMock) as salvar,
+    ):
+        assert await gerar_resposta_julia("combinado", {}, ANA, {"id": "c1"}) == "Reservado!"
+
+    salvar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_inbound_com_tools_salva_e_reaproveita_template(ambiente):
+    """Fluxo real do orchestrator: o 2º médico recebe o template sem chamar o LLM."""
+    from app.services.agente import processar_mensagem_completo
+    from app.services.policy import PolicyDecision, PrimaryAction
+    from app.services.policy.types import Tone
+
+    ambiente["embeddings"].update({"oi tudo bem": _vetor(1, 0), "oi td bem": _vetor(1, 0.05)})
+    decisao = PolicyDecision(
+        primary_action=PrimaryAction.DISCOVERY,
+        allowed_actions=[],
+        forbidden_actions=[],
+        tone=Tone.LEVE,
+        requires_human=False,
+        constraints_text="",
+        reasoning="normal",
+    )
+    situacao = MagicMock(resumo="")
+    situacao.objecao.tem_objecao = False
+    contexto = {"historico_raw": [], "primeira_msg": False, "campanha": None}
+
+    with (
+        patch(
+            "app.services.contexto.montar_contexto_completo",
+            AsyncMock(side_effect=lambda *a, **k: dict(contexto)),
+        ),
+        patch("app.services.agente.load_doctor_state", new_callable=AsyncMock),
+        patch("app.services.agente.save_doctor_state_updates", new_callable=AsyncMock),
+        patch("app.services.agente.StateUpdate"),
+        patch("app.services.agente.PolicyDecide") as mock_policy,
+        patch("app.services.agente.log_policy_decision", return_value="pd-1"),
+        patch("app.services.agente.log_policy_effect"),
+        patch("app.services.agente.get_mode_router") as mock_router,
+        patch("app.services.agente.OrquestradorConhecimento") as mock_orq,
+        patch("app.services.agente.safe_create_task", side_effect=lambda coro, **_: coro.close()),
+        patch("app.services.agente.montar_prompt_julia", AsyncMock(return_value="prompt")),
+        patch("app.services.agente.gerar_resposta_com_tools", new_callable=AsyncMock) as llm,
+        patch(
+            "app.services.conversation_mode.response_validator.validar_resposta_julia",
+            return_value=(True, None),
+        ),
+    ):
+        mock_policy.return_value.decide = AsyncMock(return_value=decisao)
+        mock_router.return_value.process = AsyncMock(
+            return_value=MagicMock(mode=ConversationMode.DISCOVERY, pending_transition=None)
+        )
+        mock_orq.return_value.analisar_situacao = AsyncMock(return_value=situacao)
+        llm.return_value = {"text": "Oi Ana! Tudo otimo e vc?", "tool_use": []}
+
+        primeira = await processar_mensagem_completo(
+            "Oi, tudo bem?", ANA, {"id": "c1", "controlled_by": "ai"}
+        )
+        segunda = await processar_mensagem_completo(
+            "oi td bem", BRUNO, {"id": "c2", "controlled_by": "ai"}
+        )
+
+    assert primeira.resposta == "Oi Ana! Tudo otimo e vc?"
+    assert segunda.resposta == "Oi Bruno! Tudo otimo e vc?"
+    llm.assert_awaited_once()
@@ -128,3 +128,116 @@ class TestWabaSelector:
         )
         assert stats.active_chips == 2
         assert not stats.has_red
+
+
+class TestWabaSelectorCache:
+    """Agregados em memória e afinidade telefone -> WABA."""
+
+    @staticmethod
+    def _mock_chips(chips):
+        mock_sb = MagicMock()
+        resp = MagicMock()
+        resp.data = chips
+        mock_sb.table.return_value.select.return_value.not_.is_.return_value.execute.return_value = resp
+        return mock_sb
+
+    @pytest.mark.asyncio
+    async def test_segunda_selecao_nao_consulta_banco(self):
+        mock_sb = self._mock_chips(
+            [{"id": "c1", "meta_waba_id": "waba_1", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 80}]
+        )
+
+        with patch("app.services.meta.waba_selector.supabase", mock_sb):
+            from app.services.meta.waba_selector import WabaSelector
+
+            selector = WabaSelector()
+            await selector.selecionar_waba()
+            await selector.selecionar_waba()
+
+        assert mock_sb.table.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_atualizar_chip_recalcula_apenas_waba_afetada(self):
+        mock_sb = self._mock_chips(
+            [
+                {"id": "c1", "meta_waba_id": "waba_1", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 95},
+                {"id": "c2", "meta_waba_id": "waba_2", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 50},
+            ]
+        )
+
+        with patch("app.services.meta.waba_selector.supabase", mock_sb):
+            from app.services.meta.waba_selector import WabaSelector
+
+            selector = WabaSelector()
+            result = await selector.selecionar_waba(intent="discovery")
+            assert result.waba_id == "waba_1"
+
+            # Chip da waba_1 vai para RED: seleção muda sem recarregar
+            selector.atualizar_chip("c1", meta_quality_rating="RED")
+            result = await selector.selecionar_waba(intent="discovery")
+
+        assert result.waba_id == "waba_2"
+        assert mock_sb.table.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_chip_inativo_remove_waba_do_pool(self):
+        mock_sb = self._mock_chips(
+            [{"id": "c1", "meta_waba_id": "waba_1", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 80}]
+        )
+
+        with patch("app.services.meta.waba_selector.supabase", mock_sb):
+            from app.services.meta.waba_selector import WabaSelector
+
+            selector = WabaSelector()
+            await selector.selecionar_waba()
+            selector.atualizar_chip("c1", status="cooldown", trust_score=0)
+            result = await selector.selecionar_waba()
+
+        assert result is None
+
+    def test_atualizar_chip_sem_cache_carregado_ignora(self):
+        from app.services.meta.waba_selector import WabaSelector
+
+        selector = WabaSelector()
+        selector.atualizar_chip("c1", trust_score=10)
+        assert selector._chips == {}
+
+    @pytest.mark.asyncio
+    async def test_afinidade_em_cache_evita_query_de_historico(self):
+        mock_sb = self._mock_chips(
+            [
+                {"id": "c1", "meta_waba_id": "waba_1", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 95},
+                {"id": "c2", "meta_waba_id": "waba_2", "status": "active", "meta_quality_rating": "GREEN", "trust_score": 50},
+            ]
+        )
+
+        with patch("app.services.meta.waba_selector.supabase", mock_sb):
+            from app.services.meta.waba_selector import WabaSelector
+
+            selector = WabaSelector()
+            selector.registrar_afinidade("5511999", "waba_2")
+            result = await selector.selecionar_waba(
+                intent="discovery", medico_context={"telefone": "5511999"}
+            )
+
+        assert result.waba_id == "waba_2"
+        assert "afinidade" in result.reason
+        tabelas = [c.args[0] for c in mock_sb.table.call_args_list]
+        assert "chip_interactions" not in tabelas
+
+    @pytest.mark.asyncio
+    async def test_afinidade_negativa_fica_em_cache(self):
+        from app.services.meta.waba_selector import WabaSelector, WabaStats
+
+        mock_sb = MagicMock()
+        resp = MagicMock()
+        resp.data = []
+        mock_sb.table.return_value.select.return_value.eq.return_value.order.return_value.limit.return_value.execute.return_value = resp
+        wabas = [WabaStats("waba_1", 1, 1, 80.0, "GREEN", False)]
+
+        with patch("app.services.meta.waba_selector.supabase", mock_sb):
+            selector = WabaSelector()
+            assert await selector._buscar_waba_historico("5511999", wabas) is None
+            assert await selector._buscar_waba_historico("5511999", wabas) is None
+
+        assert mock_sb.table.call_count == 1
@@ -6,27 +6,40 @@ Sprint 70+ — Chunk 27.
 
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 
 class TestMetaWindowKeeper:
 
     @pytest.mark.asyncio
     async def test_identificar_janelas_expirando(self):
-        mock_sb = MagicMock()
-        resp = MagicMock()
-        resp.data = [
+        janelas_mock = [
             {"chip_id": "c1", "telefone": "5511999", "window_type": "user_initiated", "expires_at": "2026-02-21T16:00:00Z"},
         ]
-        mock_sb.table.return_value.select.return_value.gte.return_value.lte.return_value.execute.return_value = resp
 
-        with patch("app.services.meta.window_keeper.supabase", mock_sb):
+        with patch("app.services.meta.window_tracker.window_tracker") as mock_tracker:
+            mock_tracker.limpar_janelas_expiradas = AsyncMock(return_value=0)
+            mock_tracker.listar_janelas_expirando = AsyncMock(return_value=janelas_mock)
             from app.services.meta.window_keeper import MetaWindowKeeper
 
             keeper = MetaWindowKeeper()
             janelas = await keeper.identificar_janelas_expirando()
             assert len(janelas) == 1
 
+        inicio, fim = mock_tracker.listar_janelas_expirando.call_args[0]
+        assert fim - inicio == timedelta(hours=2)
+        mock_tracker.limpar_janelas_expiradas.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_identificar_janelas_erro_retorna_vazio(self):
+        with patch("app.services.meta.window_tracker.window_tracker") as mock_tracker:
+            mock_tracker.limpar_janelas_expiradas = AsyncMock(return_value=0)
+            mock_tracker.listar_janelas_expirando = AsyncMock(side_effect=Exception("Redis down"))
+            from app.services.meta.window_keeper import MetaWindowKeeper
+
+            keeper = MetaWindowKeeper()
+            assert await keeper.identificar_janelas_expirando() == []
+
     @pytest.mark.asyncio
     async def test_executar_check_in_fora_horario(self):
         mock_now = MagicMock()
@@ -69,14 +82,12 @@ class TestMetaWindowKeeper:
         mock_now.hour = 10
         mock_now.weekday.return_value = 1
 
-        mock_sb = MagicMock()
-        resp = MagicMock()
-        resp.data = []
-        mock_sb.table.return_value.select.return_value.gte.return_value.lte.return_value.execute.return_value = resp
-
         with (
             patch("app.core.timezone.agora_brasilia", return_value=mock_now),
-            patch("app.services.meta.window_keeper.supabase", mock_sb),
+            patch(
+                "app.services.meta.window_keeper.MetaWindowKeeper.identificar_janelas_expirando",
+                AsyncMock(return_value=[]),
+            ),
             patch("app.services.meta.window_keeper.settings") as mock_s,
         ):
             mock_s.HORARIO_INICIO = "08:00"
@@ -5,7 +5,7 @@ Sprint 66 — Janela 24h para free-form vs template.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta, timezone
 
 from app.services.meta.window_tracker import MetaWindowTracker, window_tracker
@@ -21,140 +21,273 @@ class TestEstaNaJanela:
 
     @pytest.mark.asyncio
     async def test_janela_ativa_retorna_true(self, tracker):
-        mock_result = MagicMock()
-        mock_result.data = [{"id": "some-id"}]
-
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.gt.return_value.limit.return_value.execute.return_value = (
-                mock_result
-            )
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.exists = AsyncMock(return_value=1)
             result = await tracker.esta_na_janela("chip-1", "5511999999999")
 
         assert result is True
+        mock_redis.exists.assert_awaited_once_with("meta:window:chip-1:5511999999999")
 
     @pytest.mark.asyncio
     async def test_janela_expirada_retorna_false(self, tracker):
-        mock_result = MagicMock()
-        mock_result.data = []
-
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.gt.return_value.limit.return_value.execute.return_value = (
-                mock_result
-            )
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.exists = AsyncMock(return_value=0)
             result = await tracker.esta_na_janela("chip-1", "5511999999999")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_sem_registro_retorna_false(self, tracker):
+    async def test_nao_consulta_banco_quando_redis_ok(self, tracker):
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.exists = AsyncMock(return_value=0)
+            await tracker.esta_na_janela("chip-1", "5511999999999")
+
+        mock_sb.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_fora_usa_banco(self, tracker):
         mock_result = MagicMock()
-        mock_result.data = None
+        mock_result.data = [{"id": "some-id"}]
 
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.gt.return_value.limit.return_value.execute.return_value = (
-                mock_result
-            )
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.exists = AsyncMock(side_effect=Exception("Redis down"))
+            mock_sb.table.return_value.select.return_value.eq.return_value.eq.return_value.gt.return_value.limit.return_value.execute.return_value = mock_result
             result = await tracker.esta_na_janela("chip-1", "5511999999999")
 
-        assert result is False
+        assert result is True
 
     @pytest.mark.asyncio
     async def test_erro_retorna_false_conservador(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.exists = AsyncMock(side_effect=Exception("Redis down"))
             mock_sb.table.side_effect = Exception("DB error")
             result = await tracker.esta_na_janela("chip-1", "5511999999999")
 
         assert result is False
 
 
+@pytest.fixture
+def mock_pipe():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, 1])
+    return pipe
+
+
 class TestAbrirJanela:
     """Testes para abertura/renovação de janela."""
 
     @pytest.mark.asyncio
-    async def test_abrir_janela_user_initiated(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_upsert = MagicMock()
-            mock_sb.table.return_value.upsert.return_value.execute = mock_upsert
-
+    async def test_abrir_janela_grava_chave_com_ttl_e_indice(self, tracker, mock_pipe):
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.safe_create_task") as mock_task,
+        ):
+            mock_redis.pipeline = MagicMock(return_value=mock_pipe)
             await tracker.abrir_janela("chip-1", "5511999999999", "user_initiated")
+            mock_task.call_args[0][0].close()
+
+        key, tipo = mock_pipe.set.call_args[0]
+        assert key == "meta:window:chip-1:5511999999999"
+        assert tipo == "user_initiated"
+        expira_em = mock_pipe.set.call_args.kwargs["exat"]
+        esperado = datetime.now(timezone.utc) + timedelta(hours=24)
+        assert abs(expira_em - esperado.timestamp()) < 5
+
+        index_key, membros = mock_pipe.zadd.call_args[0]
+        assert index_key == "meta:window:expiry"
+        assert "chip-1|5511999999999" in membros
+
+    @pytest.mark.asyncio
+    async def test_abrir_janela_click_to_whatsapp(self, tracker, mock_pipe):
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.safe_create_task") as mock_task,
+        ):
+            mock_redis.pipeline = MagicMock(return_value=mock_pipe)
+            await tracker.abrir_janela("chip-1", "5511999999999", "click_to_whatsapp")
+            mock_task.call_args[0][0].close()
+
+        expira_em = mock_pipe.set.call_args.kwargs["exat"]
+        esperado = datetime.now(timezone.utc) + timedelta(hours=72)
+        assert abs(expira_em - esperado.timestamp()) < 5
+
+    @pytest.mark.asyncio
+    async def test_auditoria_upsert_on_conflict(self, tracker):
+        agora = datetime.now(timezone.utc)
+        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
+            await tracker._registrar_auditoria(
+                "chip-1", "5511999999999", "user_initiated", agora, agora + timedelta(hours=24)
+            )
 
             call_args = mock_sb.table.return_value.upsert.call_args
             row = call_args[0][0]
             assert row["chip_id"] == "chip-1"
             assert row["telefone"] == "5511999999999"
             assert row["window_type"] == "user_initiated"
+            assert call_args.kwargs.get("on_conflict") == "chip_id,telefone"
 
     @pytest.mark.asyncio
-    async def test_abrir_janela_click_to_whatsapp(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_upsert = MagicMock()
-            mock_sb.table.return_value.upsert.return_value.execute = mock_upsert
-
-            await tracker.abrir_janela(
-                "chip-1", "5511999999999", "click_to_whatsapp"
+    async def test_abrir_janela_erro_nao_propaga(self, tracker):
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.pipeline.side_effect = Exception("Redis down")
+            mock_sb.table.side_effect = Exception("DB error")
+            # Não deve levantar exceção
+            await tracker.abrir_janela("chip-1", "5511999999999")
+            await tracker._registrar_auditoria(
+                "chip-1",
+                "5511999999999",
+                "user_initiated",
+                datetime.now(timezone.utc),
+                datetime.now(timezone.utc),
             )
 
-            call_args = mock_sb.table.return_value.upsert.call_args
-            row = call_args[0][0]
-            assert row["window_type"] == "click_to_whatsapp"
 
-    @pytest.mark.asyncio
-    async def test_abrir_janela_upsert_on_conflict(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_upsert = MagicMock()
-            mock_sb.table.return_value.upsert.return_value.execute = mock_upsert
+class TestListarJanelasExpirando:
+    """Testes para o range scan do índice de expiração."""
 
-            await tracker.abrir_janela("chip-1", "5511999999999")
+    @pytest.mark.asyncio
+    async def test_lista_janelas_do_indice(self, tracker):
+        expira = datetime.now(timezone.utc) + timedelta(hours=3)
+
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.zrangebyscore = AsyncMock(
+                return_value=[
+                    ("chip-1|5511999", expira.timestamp()),
+                    ("chip-2|5511888", expira.timestamp()),
+                ]
+            )
+            mock_redis.mget = AsyncMock(return_value=["user_initiated", None])
+            janelas = await tracker.listar_janelas_expirando(
+                expira - timedelta(hours=1), expira + timedelta(hours=1)
+            )
 
-            upsert_kwargs = mock_sb.table.return_value.upsert.call_args
-            assert upsert_kwargs.kwargs.get("on_conflict") == "chip_id,telefone"
+        # Segunda chave já expirou: ignorada
+        assert len(janelas) == 1
+        assert janelas[0]["chip_id"] == "chip-1"
+        assert janelas[0]["telefone"] == "5511999"
+        assert janelas[0]["window_type"] == "user_initiated"
 
     @pytest.mark.asyncio
-    async def test_abrir_janela_erro_nao_propaga(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.side_effect = Exception("DB error")
-            # Não deve levantar exceção
-            await tracker.abrir_janela("chip-1", "5511999999999")
+    async def test_indice_vazio(self, tracker):
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.zrangebyscore = AsyncMock(return_value=[])
+            mock_redis.mget = AsyncMock()
+            janelas = await tracker.listar_janelas_expirando(
+                datetime.now(timezone.utc), datetime.now(timezone.utc)
+            )
+
+        assert janelas == []
+        mock_redis.mget.assert_not_called()
 
 
 class TestLimparJanelasExpiradas:
-    """Testes para limpeza de janelas expiradas."""
+    """Testes para poda do índice de expiração."""
 
     @pytest.mark.asyncio
     async def test_limpar_remove_expiradas(self, tracker):
-        mock_result = MagicMock()
-        mock_result.data = [{"id": "1"}, {"id": "2"}]
-
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.return_value.delete.return_value.lt.return_value.execute.return_value = (
-                mock_result
-            )
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.zremrangebyscore = AsyncMock(return_value=2)
             count = await tracker.limpar_janelas_expiradas()
 
         assert count == 2
+        # Postgres é histórico: não apaga
+        mock_sb.table.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_limpar_sem_expiradas(self, tracker):
-        mock_result = MagicMock()
-        mock_result.data = []
-
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.return_value.delete.return_value.lt.return_value.execute.return_value = (
-                mock_result
-            )
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.zremrangebyscore = AsyncMock(return_value=0)
             count = await tracker.limpar_janelas_expiradas()
 
         assert count == 0
 
     @pytest.mark.asyncio
     async def test_limpar_erro_retorna_zero(self, tracker):
-        with patch("app.services.meta.window_tracker.supabase") as mock_sb:
-            mock_sb.table.side_effect = Exception("DB error")
+        with patch("app.services.meta.window_tracker.redis_client") as mock_redis:
+            mock_redis.zremrangebyscore = AsyncMock(side_effect=Exception("Redis down"))
             count = await tracker.limpar_janelas_expiradas()
 
         assert count == 0
 
 
+class TestReidratarDoBanco:
+    """Testes para carga das janelas ativas do Postgres no Redis."""
+
+    @pytest.mark.asyncio
+    async def test_reidrata_janelas_ativas(self, tracker, mock_pipe):
+        expira = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+        mock_result = MagicMock()
+        mock_result.data = [
+            {
+                "chip_id": "chip-1",
+                "telefone": "5511999",
+                "window_type": "user_initiated",
+                "window_expires_at": expira,
+            },
+        ]
+
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+        ):
+            mock_redis.pipeline = MagicMock(return_value=mock_pipe)
+            query = mock_sb.table.return_value.select.return_value.gt.return_value
+            query.order.return_value.range.return_value.execute.return_value = mock_result
+            count = await tracker.reidratar_do_banco()
+
+        assert count == 1
+        mock_pipe.set.assert_not_called()
+        mock_pipe.eval.assert_called_once()
+        args = mock_pipe.eval.call_args.args
+        assert args[1:4] == (2, "meta:window:chip-1:5511999", "meta:window:expiry")
+        assert args[6] == "chip-1|5511999"
+        mock_pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reidratacao_pagina_o_banco(self, tracker, mock_pipe):
+        expira = (datetime.now(timezone.utc) + timedelta(hours=10)).isoformat()
+        pagina_cheia = MagicMock()
+        pagina_cheia.data = [
+            {"chip_id": "chip-1", "telefone": f"55{i}", "window_expires_at": expira}
+            for i in range(2)
+        ]
+        ultima_pagina = MagicMock()
+        ultima_pagina.data = [{"chip_id": "chip-1", "telefone": "553", "window_expires_at": expira}]
+
+        with (
+            patch("app.services.meta.window_tracker.redis_client") as mock_redis,
+            patch("app.services.meta.window_tracker.supabase") as mock_sb,
+            patch("app.services.meta.window_tracker.PAGINA_REIDRATACAO", 2),
+        ):
+            mock_redis.pipeline = MagicMock(return_value=mock_pipe)
+            query = mock_sb.table.return_value.select.return_value.gt.return_value
+            query.order.return_value.range.return_value.execute.side_effect = [
+                pagina_cheia,
+                ultima_pagina,
+            ]
+            count = await tracker.reidratar_do_banco()
+
+        assert count == 3
+        ranges = [c.args for c in query.order.return_value.range.call_args_list]
+        assert ranges == [(0, 1), (2, 3)]
+        assert mock_pipe.eval.call_count == 3
+
+
 class TestSingleton:
     """Teste que singleton existe."""
 
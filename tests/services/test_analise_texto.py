@@ -0,0 +1,131 @@
+"""
+Testes do motor de analise de texto compartilhado pelos detectores.
+"""
+
+import re
+
+import pytest
+
+from app.services.analise_texto import (
+    ORIGINAL,
+    SEM_ACENTO,
+    AutomatoAhoCorasick,
+    MotorAnalise,
+    literais_obrigatorias,
+    remover_acentos,
+)
+
+
+class TestAutomato:
+    """Busca de varias literais em uma passada."""
+
+    def test_encontra_literais_sobrepostas(self):
+        automato = AutomatoAhoCorasick(["he", "she", "his", "hers"])
+
+        assert automato.buscar("ushers") == {0, 1, 3}
+
+    def test_texto_sem_literais(self):
+        automato = AutomatoAhoCorasick(["plantao", "vaga"])
+
+        assert automato.buscar("bom dia") == set()
+
+    def test_literal_contida_em_outra(self):
+        automato = AutomatoAhoCorasick(["nao quero", "quero"])
+
+        assert automato.buscar("quero sim") == {1}
+        assert automato.buscar("eu nao quero") == {0, 1}
+
+
+class TestLiteraisObrigatorias:
+    """Extracao das literais usadas como pre-filtro."""
+
+    @pytest.mark.parametrize(
+        "padrao,esperado",
+        [
+            (r"\bchatbot\b", ("chatbot",)),
+            (r"\bvoce\s+e\s+(um\s+)?rob[oô]\b", ("voce",)),
+            (r"\b(muito\s+)?(caro|barato)\b", ("caro", "barato")),
+            (r"para\s+de\s+me\s+mandar", ("mandar",)),
+            (r"Julia", ("julia",)),
+        ],
+    )
+    def test_extrai_literal(self, padrao, esperado):
+        assert literais_obrigatorias(padrao) == esperado
+
+    @pytest.mark.parametrize("padrao", [r"\?", r"`[^`]+`", r"^\s*\d+[.)]\s+", r"(ab)?c"])
+    def test_sem_literal_aproveitavel(self, padrao):
+        assert literais_obrigatorias(padrao) == ()
+
+    def test_ramo_sem_literal_invalida_alternancia(self):
+        assert literais_obrigatorias(r"valor\s+(ok|\d+)") == ("valor",)
+
+    def test_sem_parser_interno_verifica_sempre(self, monkeypatch):
+        monkeypatch.setattr("app.services.analise_texto.motor.sre_parse", None)
+        motor = MotorAnalise()
+        motor.registrar_padroes("d", [r"\bplant[aã]o\b"])
+
+        assert literais_obrigatorias(r"\bchatbot\b") == ()
+        assert motor.analisar("tem plantao hoje?").primeira("d").trecho == "plantao"
+
+
+class TestMotorAnalise:
+    """Equivalencia com a varredura padrao a padrao."""
+
+    @pytest.fixture
+    def motor(self):
+        motor = MotorAnalise()
+        motor.registrar_padroes("bot", [r"\bchatbot\b", r"\brob[oô]\b"], flags=re.IGNORECASE)
+        motor.registrar_padroes(
+            "optout", [r"\bnao\s+quero\b", r"\bpara\s+de\b"], normalizacao=SEM_ACENTO
+        )
+        motor.registrar_literais("perfil", ["plantao", "vaga", "valor"])
+        motor.registrar_padroes(
+            "saida", [r"^\s*[-•*]\s+", r"Julia"], normalizacao=ORIGINAL, flags=re.MULTILINE
+        )
+        return motor
+
+    def test_ocorrencias_por_detector_na_ordem_registrada(self, motor):
+        analise = motor.analisar("Não quero mais, é um ROBÔ? Qual o valor da vaga?")
+
+        assert analise.primeira("bot").trecho == "robô"
+        assert analise.primeira("optout").indice == 0
+        assert [o.trecho for o in analise.ocorrencias("perfil")] == ["vaga", "valor"]
+        assert not analise.tem("saida")
+
+    def test_normalizacao_original_respeita_caixa(self, motor):
+        assert not motor.analisar("julia aqui").tem("saida")
+        assert motor.analisar("Julia aqui").primeira("saida").indice == 1
+        assert motor.analisar("texto\n- item").primeira("saida").indice == 0
+
+    def test_reregistro_substitui_padroes_e_limpa_cache(self, motor):
+        assert motor.analisar("um chatbot").tem("bot")
+
+        motor.registrar_padroes("bot", [r"\bassistente\b"])
+
+        assert not motor.analisar("um chatbot").tem("bot")
+        assert motor.analisar("um assistente").tem("bot")
+
+    def test_literal_vazia_sempre_casa(self):
+        motor = MotorAnalise()
+        motor.registrar_literais("vazio", [""])
+
+        assert motor.analisar("qualquer").primeira("vazio").inicio == 0
+
+    def test_cache_reaproveita_analise(self, motor):
+        assert motor.analisar("bom dia") is motor.analisar("bom dia")
+
+    def test_equivale_a_varredura_sequencial_no_corpus(self):
+        from tests.performance.bench_analise_texto import (
+            analise_motor,
+            carregar_corpus,
+            carregar_detectores,
+            varredura_sequencial,
+        )
+
+        motor = carregar_detectores()
+        for texto in carregar_corpus():
+            assert analise_motor(motor, texto) == varredura_sequencial(motor, texto), texto
+
+
+def test_remover_acentos():
+    assert remover_acentos("NÃO, Obrigação") == "nao, obrigacao"
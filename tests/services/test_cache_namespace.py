@@ -0,0 +1,102 @@
+"""
+Testes dos namespaces de cache versionados por geração.
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.redis import CacheNamespace
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("app.services.redis.redis_client") as mock:
+        mock.mget = AsyncMock(return_value=[None, None])
+        mock.incr = AsyncMock(return_value=1)
+        mock.keys = AsyncMock()
+        yield mock
+
+
+class TestCacheNamespace:
+    """Chaves versionadas e invalidação por INCR."""
+
+    @pytest.mark.asyncio
+    async def test_chave_embute_geracoes(self, mock_redis):
+        mock_redis.mget.return_value = ["2", "5"]
+        ns = CacheNamespace("vagas")
+
+        chave = await ns.chave("especialidade:e1:limite:5", tags=["especialidade:e1"])
+
+        assert chave == "vagas:v2.5:especialidade:e1:limite:5"
+        mock_redis.mget.assert_called_once_with(["vagas:gen", "vagas:gen:especialidade:e1"])
+
+    @pytest.mark.asyncio
+    async def test_invalidar_tag_muda_a_chave(self, mock_redis):
+        geracoes = {}
+
+        async def mget(chaves):
+            return [geracoes.get(c) for c in chaves]
+
+        async def incr(chave):
+            geracoes[chave] = geracoes.get(chave, 0) + 1
+            return geracoes[chave]
+
+        mock_redis.mget.side_effect = mget
+        mock_redis.incr.side_effect = incr
+        ns = CacheNamespace("prompt")
+
+        antes = await ns.chave("julia_base:ativo", tags=["nome:julia_base"])
+        outra = await ns.chave("julia_tools:ativo", tags=["nome:julia_tools"])
+        await ns.invalidar_tag("nome:julia_base")
+
+        assert await ns.chave("julia_base:ativo", tags=["nome:julia_base"]) != antes
+        assert await ns.chave("julia_tools:ativo", tags=["nome:julia_tools"]) == outra
+
+        await ns.invalidar_tudo()
+        assert await ns.chave("julia_tools:ativo", tags=["nome:julia_tools"]) != outra
+
+    @pytest.mark.asyncio
+    async def test_falha_no_redis_pula_o_cache(self, mock_redis):
+        mock_redis.mget.side_effect = ConnectionError("redis down")
+        mock_redis.incr.side_effect = ConnectionError("redis down")
+        ns = CacheNamespace("vagas")
+
+        assert await ns.chave("x", tags=["t"]) is None
+        assert await ns.invalidar_tag("t") is False
+
+    @pytest.mark.asyncio
+    async def test_vagas_sem_geracao_nao_le_nem_grava(self, mock_redis):
+        from app.services.vagas import cache
+
+        mock_redis.mget.side_effect = ConnectionError("redis down")
+
+        with (
+            patch.object(cache, "cache_get_json", new=AsyncMock()) as mock_get,
+            patch.object(cache, "cache_set_json", new=AsyncMock()) as mock_set,
+        ):
+            assert await cache.get_cached("e1", 5) is None
+            await cache.set_cached("e1", 5, [{"id": "v1"}])
+
+        mock_get.assert_not_awaited()
+        mock_set.assert_not_awaited()
+
+
+class TestInvalidarCacheVagas:
+    """Cache de vagas não usa mais KEYS."""
+
+    @pytest.mark.asyncio
+    async def test_invalidar_especialidade_e_um_incr(self, mock_redis):
+        from app.services.vagas.cache import invalidar
+
+        await invalidar("esp-1")
+
+        mock_redis.incr.assert_called_once_with("vagas:gen:especialidade:esp-1")
+        mock_redis.keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidar_tudo(self, mock_redis):
+        from app.services.vagas.cache import invalidar
+
+        await invalidar()
+
+        mock_redis.incr.assert_called_once_with("vagas:gen")
+        mock_redis.keys.assert_not_called()
@@ -0,0 +1,255 @@
+"""
+Testes do cache de IDs/labels e do espelho assincrono do Chatwoot.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.pipeline.base import ProcessorContext
+from app.pipeline.post_processors import ChatwootResponseProcessor
+from app.pipeline.processors.chatwoot import ChatwootSyncProcessor
+from app.services.chatwoot import (
+    ChatwootService,
+    EspelhoChatwoot,
+    sincronizar_ids_chatwoot,
+)
+
+
+@pytest.fixture
+def service():
+    svc = ChatwootService()
+    svc.base_url = "http://chatwoot.fake"
+    svc.api_token = "token"
+    svc.account_id = 1
+    return svc
+
+
+@pytest.fixture
+def mock_http():
+    client = MagicMock()
+    client.get = AsyncMock()
+    client.post = AsyncMock()
+    with patch("app.services.chatwoot.get_http_client", AsyncMock(return_value=client)):
+        yield client
+
+
+@pytest.fixture
+def mock_cache():
+    cache = {}
+
+    async def get_json(chave):
+        return cache.get(chave)
+
+    async def set_json(chave, valor, ttl=300):
+        cache[chave] = valor
+        return True
+
+    async def delete(chave):
+        cache.pop(chave, None)
+        return True
+
+    with (
+        patch("app.services.chatwoot.cache_get_json", side_effect=get_json),
+        patch("app.services.chatwoot.cache_set_json", side_effect=set_json),
+        patch("app.services.chatwoot.cache_delete", side_effect=delete),
+    ):
+        yield cache
+
+
+class TestLabelsComCache:
+    """Mudanca de label sem GET previo na conversa."""
+
+    @pytest.mark.asyncio
+    async def test_label_com_cache_e_um_post(self, service, mock_http, mock_cache):
+        mock_cache["chatwoot:labels:42"] = {"labels": ["vip"]}
+
+        assert await service.adicionar_label(42, "humano") is True
+
+        mock_http.get.assert_not_called()
+        mock_http.post.assert_awaited_once()
+        assert mock_http.post.call_args.kwargs["json"] == {"labels": ["vip", "humano"]}
+        assert mock_cache["chatwoot:labels:42"] == {"labels": ["vip", "humano"]}
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_busca_conversa_uma_vez(self, service, mock_http, mock_cache):
+        mock_http.get.return_value = MagicMock(
+            json=MagicMock(return_value={"id": 42, "labels": ["humano"]})
+        )
+
+        await service.remover_label(42, "humano")
+        await service.adicionar_label(42, "humano")
+
+        mock_http.get.assert_awaited_once()
+        assert mock_http.post.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_falha_no_post_invalida_cache(self, service, mock_http, mock_cache):
+        mock_cache["chatwoot:labels:42"] = {"labels": []}
+        mock_http.post.side_effect = Exception("502")
+
+        assert await service.adicionar_label(42, "humano") is False
+        assert "chatwoot:labels:42" not in mock_cache
+
+
+    @pytest.mark.asyncio
+    async def test_nao_configurado_nao_chama_chatwoot(self, mock_http, mock_cache):
+        svc = ChatwootService()
+        svc.base_url = ""
+
+        assert await svc.atualizar_labels(42, adicionar=["humano"]) is False
+        mock_http.get.assert_not_called()
+        mock_http.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_de_labels_tem_ttl_curto(self, service, mock_http):
+        mock_http.get.return_value = MagicMock(
+            json=MagicMock(return_value={"id": 42, "labels": []})
+        )
+
+        with (
+            patch("app.services.chatwoot.cache_get_json", AsyncMock(return_value=None)),
+            patch("app.services.chatwoot.cache_set_json", new_callable=AsyncMock) as set_json,
+        ):
+            await service.adicionar_label(42, "humano")
+
+        assert set_json.call_args.args[2] <= 300
+
+
+@pytest.mark.asyncio
+async def test_sincronizar_ids_com_cache_resolve_conversa_atual(mock_http, mock_cache):
+    mock_cache["chatwoot:ids:5511999999999"] = {"contact_id": 7}
+    mock_http.get.return_value = MagicMock(
+        json=MagicMock(return_value={"payload": [{"id": 120}, {"id": 99}]})
+    )
+
+    with (
+        patch("app.services.chatwoot.supabase") as mock_sb,
+        patch.object(ChatwootService, "configurado", True),
+    ):
+        ids = await sincronizar_ids_chatwoot("cliente-1", "5511999999999")
+
+    assert ids == {"chatwoot_contact_id": 7, "chatwoot_conversation_id": 120}
+    # Contato do cache: so a listagem de conversas vai ao Chatwoot
+    mock_http.get.assert_awaited_once()
+    assert mock_http.get.call_args.args[0].endswith("/contacts/7/conversations")
+    mock_sb.table.return_value.update.assert_called_once_with(
+        {"chatwoot_conversation_id": "120"}
+    )
+    assert mock_cache["chatwoot:ids:5511999999999"] == {"contact_id": 7}
+
+
+class TestEspelhoChatwoot:
+    """Operacoes agrupadas por conversa."""
+
+    @pytest.mark.asyncio
+    async def test_flush_agrupa_mensagens_e_labels(self):
+        espelho = EspelhoChatwoot(intervalo_ms=60_000)
+        espelho.iniciar()
+        mock_service = MagicMock(enviar_mensagem=AsyncMock(), atualizar_labels=AsyncMock())
+        try:
+            await espelho.enviar_mensagem(42, "oi", "incoming")
+            await espelho.adicionar_label("42", "humano")
+            await espelho.enviar_mensagem(42, "ola!", "outgoing")
+            await espelho.remover_label(42, "humano")
+            await espelho.adicionar_label(42, "vip")
+            await espelho.sincronizar_ids("cliente-1", "5511")
+            await espelho.sincronizar_ids("cliente-1", "5511")
+
+            with (
+                patch("app.services.chatwoot.chatwoot_service", mock_service),
+                patch(
+                    "app.services.chatwoot.sincronizar_ids_chatwoot", new_callable=AsyncMock
+                ) as mock_sync,
+            ):
+                processados = await espelho.flush()
+        finally:
+            await espelho.parar()
+
+        assert processados == 2
+        assert [c.kwargs["content"] for c in mock_service.enviar_mensagem.call_args_list] == [
+            "oi",
+            "ola!",
+        ]
+        mock_service.atualizar_labels.assert_awaited_once()
+        kwargs = mock_service.atualizar_labels.call_args.kwargs
+        assert list(kwargs["adicionar"]) == ["vip"]
+        assert list(kwargs["remover"]) == ["humano"]
+        mock_sync.assert_awaited_once_with("cliente-1", "5511")
+
+    @pytest.mark.asyncio
+    async def test_conversa_nova_espelha_turno_apos_sincronizar(self):
+        """Mensagens do 1o turno saem na conversa que a sincronizacao achar."""
+        espelho = EspelhoChatwoot(intervalo_ms=60_000)
+        espelho.iniciar()
+        context = ProcessorContext(
+            mensagem_raw={},
+            mensagem_texto="oi, quero plantao",
+            telefone="5511",
+            conversa={"id": "conv-1"},
+            medico={"id": "cliente-1"},
+        )
+        context.metadata.update({"chatwoot_sincronizacao_agendada": True, "message_sent": True})
+        mock_service = MagicMock(enviar_mensagem=AsyncMock())
+        try:
+            with patch("app.services.chatwoot.espelho_chatwoot", espelho):
+                await ChatwootResponseProcessor().process(context, "Oi! Tenho sim")
+
+            with (
+                patch("app.services.chatwoot.chatwoot_service", mock_service),
+                patch(
+                    "app.services.chatwoot.sincronizar_ids_chatwoot",
+                    AsyncMock(return_value={"chatwoot_conversation_id": 77}),
+                ) as mock_sync,
+            ):
+                await espelho.flush()
+        finally:
+            await espelho.parar()
+
+        mock_sync.assert_awaited_once_with("cliente-1", "5511")
+        assert [
+            (c.kwargs["conversation_id"], c.kwargs["content"], c.kwargs["message_type"])
+            for c in mock_service.enviar_mensagem.call_args_list
+        ] == [(77, "oi, quero plantao", "incoming"), (77, "Oi! Tenho sim", "outgoing")]
+
+    @pytest.mark.asyncio
+    async def test_inativo_aplica_direto(self):
+        espelho = EspelhoChatwoot()
+
+        with patch("app.services.chatwoot.chatwoot_service") as mock_service:
+            mock_service.enviar_mensagem = AsyncMock()
+            await espelho.enviar_mensagem(42, "oi", "incoming")
+
+        mock_service.enviar_mensagem.assert_awaited_once_with(
+            conversation_id=42, content="oi", message_type="incoming"
+        )
+
+
+@pytest.mark.asyncio
+async def test_sync_processor_fora_do_caminho_critico(mock_cache):
+    """Com o espelho ativo, o pre-processador so agenda a sincronizacao."""
+    mock_cache["chatwoot:ids:5511999999999"] = {"contact_id": 7, "conversation_id": 99}
+    espelho = EspelhoChatwoot(intervalo_ms=60_000)
+    espelho.iniciar()
+    context = ProcessorContext(
+        mensagem_raw={},
+        telefone="5511999999999",
+        conversa={"id": "conv-1", "chatwoot_conversation_id": None},
+        medico={"id": "cliente-1"},
+    )
+
+    try:
+        with (
+            patch("app.services.chatwoot.espelho_chatwoot", espelho),
+            patch(
+                "app.services.chatwoot.sincronizar_ids_chatwoot", new_callable=AsyncMock
+            ) as mock_sync,
+        ):
+            await ChatwootSyncProcessor().process(context)
+            mock_sync.assert_not_called()
+            assert espelho._sincronizacoes == {"cliente-1": "5511999999999"}
+            assert context.metadata["chatwoot_sincronizacao_agendada"] is True
+    finally:
+        espelho._sincronizacoes.clear()
+        await espelho.parar()
+
+    # Conversa nova: nao herda a conversa antiga do Chatwoot
+    assert context.conversa["chatwoot_conversation_id"] is None
@@ -10,7 +10,7 @@ from app.services.delivery_status import (
     atualizar_delivery_status,
     atualizar_status_lote,
     _normalizar_status,
-    DeliveryStatusResult,
+    IngestaoDeliveryStatus,
 )
 
 
@@ -203,21 +203,23 @@ class TestAtualizarStatusLote:
     """Testes para atualização de status em lote."""
 
     @pytest.mark.asyncio
-    @patch("app.services.delivery_status.atualizar_delivery_status")
-    async def test_lote_vazio(self, mock_atualizar):
+    @patch("app.services.delivery_status.supabase")
+    async def test_lote_vazio(self, mock_supabase):
         """Lote vazio retorna zeros."""
         result = await atualizar_status_lote([])
 
         assert result["total"] == 0
         assert result["atualizados"] == 0
         assert result["erros"] == 0
-        mock_atualizar.assert_not_called()
+        mock_supabase.rpc.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("app.services.delivery_status.atualizar_delivery_status")
-    async def test_lote_com_sucesso(self, mock_atualizar):
-        """Lote com atualizações bem sucedidas."""
-        mock_atualizar.return_value = DeliveryStatusResult(atualizado=True)
+    @patch("app.services.delivery_status.supabase")
+    async def test_lote_com_sucesso(self, mock_supabase):
+        """Lote inteiro aplicado com uma única RPC."""
+        mock_supabase.rpc.return_value.execute.return_value.data = [
+            {"provider_message_id": f"msg{i}", "atualizado": True} for i in (1, 2, 3)
+        ]
 
         updates = [
             ("msg1", "delivered", None),
@@ -230,38 +232,36 @@ class TestAtualizarStatusLote:
         assert result["total"] == 3
         assert result["atualizados"] == 3
         assert result["erros"] == 0
+        mock_supabase.rpc.assert_called_once()
+        nome, params = mock_supabase.rpc.call_args.args
+        assert nome == "interacao_atualizar_delivery_status_lote"
+        assert len(params["p_updates"]) == 3
 
     @pytest.mark.asyncio
-    @patch("app.services.delivery_status.atualizar_delivery_status")
-    async def test_lote_com_erros(self, mock_atualizar):
-        """Lote com alguns erros."""
-        mock_atualizar.side_effect = [
-            DeliveryStatusResult(atualizado=True),
-            DeliveryStatusResult(atualizado=False, erro="Falha"),
-            DeliveryStatusResult(atualizado=True),
-        ]
+    @patch("app.services.delivery_status.supabase")
+    async def test_lote_com_erros(self, mock_supabase):
+        """Status não reconhecido conta como erro; falha da RPC conta o lote todo."""
+        mock_supabase.rpc.return_value.execute.side_effect = Exception("timeout")
 
         updates = [
             ("msg1", "delivered", None),
-            ("msg2", "read", None),
+            ("msg2", "QUEUED", None),
             ("msg3", "delivered", None),
         ]
 
         result = await atualizar_status_lote(updates)
 
         assert result["total"] == 3
-        assert result["atualizados"] == 2
-        assert result["erros"] == 1
+        assert result["atualizados"] == 0
+        assert result["erros"] == 3
 
     @pytest.mark.asyncio
-    @patch("app.services.delivery_status.atualizar_delivery_status")
-    async def test_lote_nao_atualizados_sem_erro(self, mock_atualizar):
+    @patch("app.services.delivery_status.supabase")
+    async def test_lote_nao_atualizados_sem_erro(self, mock_supabase):
         """Não atualizados sem erro não contam como erro."""
-        mock_atualizar.return_value = DeliveryStatusResult(
-            atualizado=False,
-            interacao_id="int123",  # Encontrado mas não atualizado
-            erro=None,
-        )
+        mock_supabase.rpc.return_value.execute.return_value.data = [
+            {"provider_message_id": "msg1", "interacao_id": "int123", "atualizado": False}
+        ]
 
         updates = [("msg1", "delivered", None)]
 
@@ -270,3 +270,175 @@ class TestAtualizarStatusLote:
         assert result["total"] == 1
         assert result["atualizados"] == 0
         assert result["erros"] == 0  # Não é erro, apenas não precisou atualizar
+
+    @pytest.mark.asyncio
+    @patch("app.services.delivery_status.supabase")
+    async def test_lote_colapsa_status_por_mensagem(self, mock_supabase):
+        """Vários callbacks da mesma mensagem viram o status mais avançado."""
+        mock_supabase.rpc.return_value.execute.return_value.data = []
+
+        await atualizar_status_lote(
+            [
+                ("msg1", "SENT", None),
+                ("msg1", "READ", None),
+                ("msg1", "DELIVERY_ACK", "chip1"),
+                ("msg2", "failed", None),
+                ("msg2", "delivered", None),
+            ]
+        )
+
+        params = mock_supabase.rpc.call_args.args[1]
+        assert params["p_updates"] == [
+            {"provider_message_id": "msg1", "status": "read", "chip_id": "chip1"},
+            {"provider_message_id": "msg2", "status": "delivered", "chip_id": None},
+        ]
+
+
+class TestIngestaoDeliveryStatus:
+    """Buffer dos callbacks dos webhooks."""
+
+    @pytest.mark.asyncio
+    async def test_inativa_aplica_direto(self):
+        """Sem o loop (workers/testes) o callback é aplicado na hora."""
+        ingestao = IngestaoDeliveryStatus()
+
+        with (
+            patch("app.services.delivery_status.supabase") as mock_supabase,
+            patch(
+                "app.services.delivery_status.atualizar_delivery_status",
+                new_callable=AsyncMock,
+            ) as mock_atualizar,
+        ):
+            await ingestao.registrar(
+                "msg1", "read", "chip1", metrica_chip={"chip_id": "chip1", "tipo": "msg_lida"}
+            )
+
+        mock_supabase.table.assert_called_once_with("chip_interactions")
+        mock_atualizar.assert_awaited_once_with(
+            provider_message_id="msg1", status="read", chip_id="chip1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_inativa_callback_repetido_deduplicado_pelo_banco(self):
+        """Caminho direto também grava com a chave do índice único."""
+        ingestao = IngestaoDeliveryStatus()
+
+        with (
+            patch("app.services.delivery_status.supabase") as mock_supabase,
+            patch(
+                "app.services.delivery_status.atualizar_delivery_status",
+                new_callable=AsyncMock,
+            ),
+        ):
+            for _ in range(2):
+                await ingestao.registrar(
+                    "msg1", "read", "chip1", metrica_chip={"chip_id": "chip1", "tipo": "msg_lida"}
+                )
+
+        upsert = mock_supabase.table.return_value.upsert
+        assert upsert.call_count == 2
+        for chamada in upsert.call_args_list:
+            assert chamada.args[0] == [
+                {"chip_id": "chip1", "tipo": "msg_lida", "provider_message_id": "msg1"}
+            ]
+            assert chamada.kwargs["on_conflict"] == "chip_id,tipo,provider_message_id"
+            assert chamada.kwargs["ignore_duplicates"] is True
+
+    @pytest.mark.asyncio
+    async def test_buffer_de_metricas_cheio_grava_direto(self):
+        ingestao = IngestaoDeliveryStatus(intervalo_ms=60_000, max_pendentes=1)
+        ingestao.iniciar()
+        try:
+            with patch("app.services.delivery_status.supabase") as mock_supabase:
+                for msg in ("msg1", "msg2"):
+                    await ingestao.registrar(
+                        msg, "read", None, metrica_chip={"chip_id": "chip1", "tipo": "msg_lida"}
+                    )
+
+                assert len(ingestao._metricas_chip) == 1
+                upsert = mock_supabase.table.return_value.upsert
+                upsert.assert_called_once()
+                assert upsert.call_args.args[0][0]["provider_message_id"] == "msg2"
+        finally:
+            ingestao._status.clear()
+            ingestao._metricas_chip.clear()
+            await ingestao.parar()
+
+    @pytest.mark.asyncio
+    async def test_flush_aplica_lote_e_metricas_juntos(self):
+        """Status e métricas de chip do mesmo lote: uma RPC e um INSERT."""
+        ingestao = IngestaoDeliveryStatus(intervalo_ms=60_000)
+        ingestao.iniciar()
+        try:
+            for status, tipo in (("delivered", "msg_entregue"), ("read", "msg_lida")):
+                for msg in ("msg1", "msg2"):
+                    await ingestao.registrar(
+                        msg, status, "chip1", metrica_chip={"chip_id": "chip1", "tipo": tipo}
+                    )
+            # Callback repetido não duplica a métrica
+            await ingestao.registrar(
+                "msg1", "read", "chip1", metrica_chip={"chip_id": "chip1", "tipo": "msg_lida"}
+            )
+
+            with patch("app.services.delivery_status.supabase") as mock_supabase:
+                mock_supabase.rpc.return_value.execute.return_value.data = [
+                    {"atualizado": True},
+                    {"atualizado": True},
+                ]
+                resultado = await ingestao.flush()
+        finally:
+            await ingestao.parar()
+
+        assert resultado["total"] == 5
+        assert resultado["atualizados"] == 2
+        assert resultado["metricas_chip"] == 4
+        mock_supabase.rpc.assert_called_once()
+        assert {u["status"] for u in mock_supabase.rpc.call_args.args[1]["p_updates"]} == {"read"}
+        upsert = mock_supabase.table.return_value.upsert
+        upsert.assert_called_once()
+        assert len(upsert.call_args.args[0]) == 4
+
+    @pytest.mark.asyncio
+    async def test_metricas_deduplicadas_entre_lotes_pelo_banco(self):
+        """Callback repetido em outro lote é descartado pelo ON CONFLICT."""
+        ingestao = IngestaoDeliveryStatus(intervalo_ms=60_000)
+        ingestao.iniciar()
+        try:
+            with patch("app.services.delivery_status.supabase") as mock_supabase:
+                for _ in range(2):
+                    await ingestao.registrar(
+                        "msg1",
+                        "read",
+                        "chip1",
+                        metrica_chip={"chip_id": "chip1", "tipo": "msg_lida"},
+                    )
+                    await ingestao.flush()
+        finally:
+            await ingestao.parar()
+
+        upsert = mock_supabase.table.return_value.upsert
+        assert upsert.call_count == 2
+        for chamada in upsert.call_args_list:
+            assert chamada.args[0] == [
+                {"chip_id": "chip1", "tipo": "msg_lida", "provider_message_id": "msg1"}
+            ]
+            assert chamada.kwargs["on_conflict"] == "chip_id,tipo,provider_message_id"
+            assert chamada.kwargs["ignore_duplicates"] is True
+
+    @pytest.mark.asyncio
+    async def test_flush_grava_interacoes_pendentes_antes(self):
+        """Interação de saída no write-behind é gravada antes do UPDATE."""
+        ingestao = IngestaoDeliveryStatus(intervalo_ms=60_000)
+        ingestao.iniciar()
+        mock_write_behind = MagicMock(ativo=True, flush=AsyncMock())
+        try:
+            await ingestao.registrar("msg1", "delivered")
+            with (
+                patch("app.services.delivery_status.supabase"),
+                patch("app.services.delivery_status.write_behind", mock_write_behind),
+            ):
+                await ingestao.flush()
+        finally:
+            await ingestao.parar()
+
+        mock_write_behind.flush.assert_awaited_once_with("interacoes")
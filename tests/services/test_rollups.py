@@ -0,0 +1,170 @@
+"""
+Testes dos rollups de metricas e do job incremental.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.rollups import (
+    FONTE_EVENTOS,
+    FONTE_HANDOFFS,
+    LinhaRollup,
+    contar_por_dimensao,
+    contar_por_metrica,
+    somar_rollup,
+)
+
+INICIO = datetime(2026, 3, 2, 3, 0, tzinfo=timezone.utc)
+FIM = INICIO + timedelta(days=1)
+
+
+def _rpc(*paginas):
+    mock = MagicMock()
+    consulta = mock.rpc.return_value.order.return_value.order.return_value.range.return_value
+    consulta.execute.side_effect = [MagicMock(data=dados) for dados in paginas]
+    return mock
+
+
+class TestLeitura:
+    """rollup_somar e agregacoes no cliente."""
+
+    @pytest.mark.asyncio
+    async def test_somar_envia_janela_e_filtros(self):
+        mock = _rpc([{"metrica": "offer_made", "valor_dimensao": "h1", "contagem": 4, "soma": 0}])
+
+        with patch("app.services.rollups.repository.supabase", mock):
+            linhas = await somar_rollup(
+                FONTE_EVENTOS, INICIO, FIM, dimensao="hospital", valor="h1", metricas=["offer_made"]
+            )
+
+        assert linhas == [LinhaRollup("offer_made", "h1", 4, 0.0)]
+        nome, params = mock.rpc.call_args.args
+        assert nome == "rollup_somar"
+        assert params["p_inicio"] == INICIO.isoformat()
+        assert params["p_fim"] == FIM.isoformat()
+        assert params["p_valor"] == "h1"
+        assert params["p_metricas"] == ["offer_made"]
+
+    @pytest.mark.asyncio
+    async def test_somar_pagina_a_resposta_do_rpc(self):
+        paginas = (
+            [{"metrica": "offer_made", "valor_dimensao": "h1", "contagem": 1}],
+            [{"metrica": "offer_made", "valor_dimensao": "h2", "contagem": 2}],
+            [],
+        )
+        mock = _rpc(*paginas)
+
+        with (
+            patch("app.services.rollups.repository.supabase", mock),
+            patch("app.services.rollups.repository.PAGINA_ROLLUP", 1),
+        ):
+            linhas = await somar_rollup(FONTE_EVENTOS, INICIO, FIM, dimensao="hospital")
+
+        assert [linha.valor_dimensao for linha in linhas] == ["h1", "h2"]
+        ranges = mock.rpc.return_value.order.return_value.order.return_value.range
+        assert [c.args for c in ranges.call_args_list] == [(0, 0), (1, 1), (2, 2)]
+
+    @pytest.mark.asyncio
+    async def test_erro_devolve_none_para_fallback(self):
+        mock = MagicMock()
+        mock.rpc.side_effect = Exception("function rollup_somar does not exist")
+
+        with patch("app.services.rollups.repository.supabase", mock):
+            assert await somar_rollup(FONTE_EVENTOS, INICIO, FIM) is None
+            assert await contar_por_metrica(FONTE_EVENTOS, INICIO, FIM) is None
+
+    @pytest.mark.asyncio
+    async def test_contagens_por_metrica_e_dimensao(self):
+        dados = [
+            {"metrica": "criados", "valor_dimensao": "pedido_humano", "contagem": 3},
+            {"metrica": "criados", "valor_dimensao": "juridico", "contagem": 1},
+        ]
+
+        with patch("app.services.rollups.repository.supabase", _rpc(dados, dados)):
+            por_tipo = await contar_por_dimensao(FONTE_HANDOFFS, INICIO, FIM, "tipo")
+            total = await contar_por_metrica(FONTE_HANDOFFS, INICIO, FIM, dimensao="tipo")
+
+        assert por_tipo == {"pedido_humano": {"criados": 3}, "juridico": {"criados": 1}}
+        assert total == {"criados": 4}
+
+
+class TestJobIncremental:
+    """app.workers.rollup_metricas."""
+
+    @pytest.mark.asyncio
+    async def test_fonte_com_erro_nao_para_as_demais(self):
+        from app.workers import rollup_metricas
+
+        async def atualizar(fonte, atraso_minutos):
+            if fonte == "handoffs":
+                raise RuntimeError("timeout")
+            return {"fonte": fonte, "linhas_hora": 2, "linhas_dia": 1}
+
+        with patch.object(rollup_metricas, "atualizar_fonte", side_effect=atualizar):
+            resultado = await rollup_metricas.atualizar_rollups(
+                fontes=("interacoes", "handoffs", "conversations")
+            )
+
+        assert resultado["handoffs"] == {"erro": "timeout"}
+        assert resultado["interacoes"]["linhas_hora"] == 2
+        assert "duracao_s" in resultado["conversations"]
+        assert "conversations" in rollup_metricas.ultimas_execucoes
+
+
+class TestRelatorioDiario:
+    """Relatorio diario servido pelos rollups."""
+
+    @pytest.mark.asyncio
+    async def test_relatorio_sem_linhas_brutas(self):
+        from app.services.relatorios import diario
+
+        respostas = {
+            "conversations": [LinhaRollup("criadas", "", 10)],
+            "interacoes": [LinhaRollup("entrada", "", 40), LinhaRollup("saida", "", 60)],
+            "handoffs": [LinhaRollup("criados", "", 2)],
+            "avaliacoes_qualidade": [
+                LinhaRollup("avaliacoes", "", 5),
+                LinhaRollup("pontuadas", "", 4, soma=30.0),
+            ],
+        }
+
+        async def somar(fonte, inicio, fim):
+            assert fim - inicio == timedelta(days=1)
+            return respostas[fonte]
+
+        with (
+            patch.object(diario, "somar_rollup", side_effect=somar),
+            patch.object(diario, "supabase") as mock_supabase,
+        ):
+            relatorio = await diario.gerar_relatorio_diario()
+
+        mock_supabase.table.assert_not_called()
+        assert relatorio["conversas"]["total"] == 10
+        assert relatorio["mensagens"] == {"recebidas": 40, "enviadas": 60}
+        assert relatorio["handoffs"]["taxa"] == 0.2
+        assert relatorio["qualidade"] == {"score_medio": 7.5, "avaliacoes": 5}
+
+
+class TestResumoMetricas:
+    """/metricas/resumo limita a janela pedida."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.api.routes.metricas import router
+
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    @pytest.mark.parametrize("dias", [0, 91, 100000])
+    def test_dias_fora_do_limite_rejeitado(self, client, dias):
+        with patch("app.api.routes.metricas._totais_resumo_rollup") as mock_rollup:
+            response = client.get("/metricas/resumo", params={"dias": dias})
+
+        assert response.status_code == 422
+        mock_rollup.assert_not_called()
@@ -0,0 +1,343 @@
+"""
+Testes do snapshot analitico local (DuckDB) usado pelas tools da Helena.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.snapshot_analitico import (
+    FONTE_PRODUCAO,
+    FONTE_SNAPSHOT,
+    TABELAS_POR_NOME,
+    ConsultorAnalitico,
+    SnapshotAnalitico,
+    exportar_tabela,
+    inicio_da_janela,
+    normalizar_sql,
+    tabelas_referenciadas,
+)
+
+
+class TestNormalizarSql:
+    def test_colapsa_espacos_e_caixa_fora_de_literais(self):
+        sql = "SELECT  COUNT(*)\n  FROM Interacoes\tWHERE tipo = 'Entrada  X' ;"
+        assert normalizar_sql(sql) == "select count(*) from interacoes where tipo = 'Entrada  X'"
+
+    def test_queries_equivalentes_tem_mesma_chave(self):
+        a = "select status, count(*) from handoffs group by 1 limit 10"
+        b = "SELECT status,\n       COUNT(*)\nFROM handoffs\nGROUP BY 1\nLIMIT 10;"
+        assert normalizar_sql(a) == normalizar_sql(b)
+
+    def test_tabelas_referenciadas_ignora_ctes_funcoes_e_literais(self):
+        sql = normalizar_sql(
+            "WITH vagas AS (SELECT 1) SELECT * FROM conversations c "
+            "JOIN interacoes i ON i.conversation_id = c.id "
+            "CROSS JOIN generate_series(1, 2) "
+            "WHERE extract(epoch from c.created_at) > 0 AND c.status <> 'from hospitais' "
+            "AND c.id IN (SELECT conversation_id FROM vagas)"
+        )
+        assert tabelas_referenciadas(sql) == {"conversations", "interacoes"}
+
+
+class TestConsultorFallback:
+    @pytest.mark.asyncio
+    async def test_sem_snapshot_usa_producao(self):
+        snapshot = MagicMock()
+        snapshot.existe.return_value = False
+        consultor = ConsultorAnalitico(snapshot)
+
+        resultado = await consultor.consultar("SELECT 1 LIMIT 1", fallback=lambda: [{"x": 1}])
+
+        assert resultado.fonte == FONTE_PRODUCAO
+        assert resultado.linhas == [{"x": 1}]
+        assert resultado.frescor()["fonte"] == FONTE_PRODUCAO
+        snapshot.consultar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tabela_nao_exportada_usa_producao(self):
+        snapshot = MagicMock(versao=1)
+        snapshot.existe.return_value = True
+        snapshot.watermarks.return_value = {"interacoes": datetime.now(timezone.utc)}
+        consultor = ConsultorAnalitico(snapshot)
+
+        resultado = await consultor.consultar(
+            "SELECT COUNT(*) FROM handoffs LIMIT 1", fallback=lambda: [{"count": 3}]
+        )
+
+        assert resultado.fonte == FONTE_PRODUCAO
+        snapshot.consultar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_defasado_usa_producao(self):
+        snapshot = MagicMock(versao=1)
+        snapshot.existe.return_value = True
+        snapshot.watermarks.return_value = {
+            "handoffs": datetime.now(timezone.utc) - timedelta(hours=3)
+        }
+        consultor = ConsultorAnalitico(snapshot)
+
+        resultado = await consultor.consultar(
+            "SELECT COUNT(*) FROM handoffs LIMIT 1",
+            fallback=lambda: [{"count": 3}],
+            defasagem_maxima_min=60,
+        )
+
+        assert resultado.fonte == FONTE_PRODUCAO
+
+    @pytest.mark.asyncio
+    async def test_erro_no_duckdb_usa_producao(self):
+        snapshot = MagicMock(versao=1)
+        snapshot.existe.return_value = True
+        snapshot.watermarks.return_value = {"handoffs": datetime.now(timezone.utc)}
+        snapshot.consultar.side_effect = Exception("Binder Error: column not found")
+        consultor = ConsultorAnalitico(snapshot)
+
+        resultado = await consultor.consultar(
+            "SELECT telefone FROM handoffs LIMIT 1", fallback=lambda: [{"telefone": "x"}]
+        )
+
+        assert resultado.fonte == FONTE_PRODUCAO
+        assert resultado.linhas == [{"telefone": "x"}]
+
+    @pytest.mark.asyncio
+    async def test_cache_por_sql_normalizado_invalidado_por_versao(self):
+        agora = datetime.now(timezone.utc)
+        snapshot = MagicMock(versao=1)
+        snapshot.existe.return_value = True
+        snapshot.watermarks.return_value = {"handoffs": agora}
+        snapshot.consultar.return_value = [{"pendentes": 2}]
+        consultor = ConsultorAnalitico(snapshot)
+        producao = MagicMock()
+
+        primeiro = await consultor.consultar("SELECT COUNT(*) FROM handoffs LIMIT 1", producao)
+        segundo = await consultor.consultar("select count(*)\nfrom handoffs limit 1;", producao)
+
+        assert primeiro.fonte == segundo.fonte == FONTE_SNAPSHOT
+        assert primeiro.cache is False and segundo.cache is True
+        assert segundo.dados_ate == agora
+        assert snapshot.consultar.call_count == 1
+
+        snapshot.versao = 2
+        terceiro = await consultor.consultar("SELECT COUNT(*) FROM handoffs LIMIT 1", producao)
+
+        assert terceiro.cache is False
+        assert snapshot.consultar.call_count == 2
+        producao.assert_not_called()
+
+
+class TestHistoricoParcial:
+    """Tabelas exportadas so em parte nao respondem fora do seu historico."""
+
+    def test_inicio_da_janela(self):
+        agora = datetime.now(timezone.utc)
+
+        assert inicio_da_janela("select count(*) from clientes") is None
+        assert inicio_da_janela("where ts >= '2026-10-01'::date") == datetime(
+            2026, 10, 1, tzinfo=timezone.utc
+        )
+        assert inicio_da_janela(
+            "where ts >= '2026-10-18'::date - interval '1 day'"
+        ) == datetime(2026, 10, 17, tzinfo=timezone.utc)
+        inicio = inicio_da_janela("where ts >= now() - interval '7 days'")
+        assert abs(inicio - (agora - timedelta(days=7))) < timedelta(minutes=1)
+
+    @pytest.fixture
+    def consultor(self):
+        agora = datetime.now(timezone.utc)
+        snapshot = MagicMock(versao=1)
+        snapshot.existe.return_value = True
+        snapshot.watermarks.return_value = {"interacoes": agora, "clientes": agora}
+        snapshot.limites_inferiores.return_value = {"interacoes": agora - timedelta(days=90)}
+        snapshot.consultar.return_value = [{"count": 1}]
+        return ConsultorAnalitico(snapshot)
+
+    @pytest.mark.asyncio
+    async def test_janela_dentro_do_historico_usa_snapshot(self, consultor):
+        inicio = (datetime.now(timezone.utc) - timedelta(days=30)).date()
+
+        resultado = await consultor.consultar(
+            f"SELECT COUNT(*) FROM interacoes WHERE created_at >= '{inicio}'", MagicMock()
+        )
+
+        assert resultado.fonte == FONTE_SNAPSHOT
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT COUNT(*) FROM interacoes",
+            "SELECT COUNT(*) FROM interacoes WHERE created_at >= '2020-01-01'",
+            "SELECT COUNT(*) FROM interacoes WHERE created_at >= now() - interval '180 days'",
+        ],
+    )
+    async def test_fora_do_historico_usa_producao(self, consultor, sql):
+        resultado = await consultor.consultar(sql, lambda: [{"count": 9}])
+
+        assert resultado.fonte == FONTE_PRODUCAO
+        consultor.snapshot.consultar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tabela_com_historico_completo_responde_sem_janela(self, consultor):
+        resultado = await consultor.consultar("SELECT COUNT(*) FROM clientes", MagicMock())
+
+        assert resultado.fonte == FONTE_SNAPSHOT
+
+
+class TestSnapshotDuckDB:
+    """Roundtrip real no DuckDB (pula se o extra opcional nao estiver instalado)."""
+
+    @pytest.fixture
+    def snapshot(self, tmp_path):
+        pytest.importorskip("duckdb")
+        return SnapshotAnalitico(str(tmp_path / "snapshot.duckdb"))
+
+    def test_upsert_pela_chave_e_sql_da_helena(self, snapshot):
+        tabela = TABELAS_POR_NOME["business_events"]
+        snapshot.gravar(
+            tabela,
+            [
+                {
+                    "id": "e1",
+                    "event_type": "offer_made",
+                    "hospital_id": "h1",
+                    "event_props": {"campaign_id": "10"},
+                    "ts": "2026-10-18T10:00:00+00:00",
+                },
+                {
+                    "id": "e2",
+                    "event_type": "offer_accepted",
+                    "hospital_id": "h1",
+                    "event_props": None,
+                    "ts": "2026-10-18T11:30:00-03:00",
+                },
+            ],
+        )
+        # Reexportacao dentro da margem reescreve a linha
+        snapshot.gravar(
+            tabela,
+            [
+                {
+                    "id": "e1",
+                    "event_type": "offer_made",
+                    "hospital_id": "h2",
+                    "event_props": {"campaign_id": "11"},
+                    "ts": "2026-10-18T10:00:00+00:00",
+                }
+            ],
+        )
+
+        linhas = snapshot.consultar(
+            """
+            SELECT ts::date AS dia,
+                   COUNT(*) FILTER (WHERE event_type = 'offer_made') AS ofertas,
+                   COUNT(*) FILTER (WHERE event_type = 'offer_accepted') AS aceites,
+                   MAX(event_props->>'campaign_id') AS campanha,
+                   MIN(ts) AS primeiro
+            FROM business_events
+            WHERE ts >= '2026-10-18'::date - INTERVAL '1 day'
+            GROUP BY 1
+            LIMIT 10;
+            """
+        )
+
+        assert linhas == [
+            {
+                "dia": "2026-10-18",
+                "ofertas": 1,
+                "aceites": 1,
+                "campanha": "11",
+                "primeiro": "2026-10-18 10:00:00+00",
+            }
+        ]
+
+    def test_recarga_completa_e_watermark(self, snapshot):
+        tabela = TABELAS_POR_NOME["hospitais"]
+        snapshot.gravar(tabela, [{"id": "h1", "nome": "A"}, {"id": "h2", "nome": "B"}])
+        snapshot.gravar(tabela, [{"id": "h3", "nome": "C"}], substituir=True)
+        ate = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        snapshot.registrar_watermark("hospitais", ate, 1)
+
+        assert snapshot.consultar("SELECT id FROM hospitais") == [{"id": "h3"}]
+        assert snapshot.watermarks() == {"hospitais": ate}
+
+    def test_limite_inferior_registrado(self, snapshot):
+        ate = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        desde = ate - timedelta(days=90)
+        snapshot.registrar_watermark("interacoes", ate, 10, desde)
+        snapshot.registrar_watermark("clientes", ate, 5)
+
+        assert snapshot.limites_inferiores() == {"interacoes": desde}
+        assert snapshot.limite_inferior("clientes") is None
+
+    def test_sem_acesso_a_arquivos(self, snapshot):
+        snapshot.gravar(TABELAS_POR_NOME["hospitais"], [])
+
+        with pytest.raises(Exception):
+            snapshot.consultar("SELECT * FROM read_csv('/etc/hostname')")
+
+
+class TestExportador:
+    @pytest.mark.asyncio
+    async def test_janela_incremental_a_partir_do_watermark(self):
+        tabela = TABELAS_POR_NOME["interacoes"]
+        watermark = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        agora = datetime(2026, 10, 18, 12, 10, tzinfo=timezone.utc)
+        limite = datetime(2026, 7, 20, 12, 0, tzinfo=timezone.utc)
+        snapshot = MagicMock()
+        snapshot.watermark.return_value = watermark
+        snapshot.limite_inferior.return_value = limite
+        snapshot.gravar.side_effect = lambda t, linhas: len(linhas)
+
+        with patch(
+            "app.services.snapshot_analitico.exportador._buscar_pagina",
+            side_effect=[[{"id": str(i)} for i in range(1000)], [{"id": "x"}]],
+        ) as buscar:
+            resultado = await exportar_tabela(tabela, snapshot, agora=agora)
+
+        assert resultado["linhas"] == 1001
+        assert resultado["paginas"] == 2
+        desde = buscar.call_args_list[0].args[1]
+        assert desde == watermark - tabela.margem
+        assert [c.args[3] for c in buscar.call_args_list] == [0, 1000]
+        # O limite inferior da primeira carga e preservado
+        snapshot.registrar_watermark.assert_called_once_with("interacoes", agora, 1001, limite)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "nome,completo", [("clientes", True), ("vagas", True), ("interacoes", False)]
+    )
+    async def test_primeira_carga(self, nome, completo):
+        agora = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        snapshot = MagicMock()
+        snapshot.watermark.return_value = None
+        snapshot.gravar.side_effect = lambda t, linhas: len(linhas)
+
+        with patch(
+            "app.services.snapshot_analitico.exportador._buscar_pagina",
+            return_value=[{"id": "1"}],
+        ) as buscar:
+            await exportar_tabela(TABELAS_POR_NOME[nome], snapshot, agora=agora)
+
+        desde = buscar.call_args.args[1]
+        limite = snapshot.registrar_watermark.call_args.args[3]
+        if completo:
+            # Entidade mutavel vem inteira: count(*) no snapshot bate com a producao
+            assert desde is None and limite is None
+        else:
+            assert desde == limite == agora - timedelta(days=90)
+
+    @pytest.mark.asyncio
+    async def test_falha_na_pagina_nao_avanca_watermark(self):
+        snapshot = MagicMock()
+        snapshot.watermark.return_value = None
+
+        with patch(
+            "app.services.snapshot_analitico.exportador._buscar_pagina",
+            side_effect=Exception("timeout"),
+        ):
+            with pytest.raises(Exception):
+                await exportar_tabela(TABELAS_POR_NOME["business_events"], snapshot)
+
+        snapshot.registrar_watermark.assert_not_called()
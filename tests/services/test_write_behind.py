@@ -0,0 +1,286 @@
+"""
+Testes do write-behind de interações e eventos.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from postgrest.exceptions import APIError
+
+from app.services.business_events import BusinessEvent, EventSource, EventType, emit_event
+from app.services.interacao import salvar_interacao
+from app.services.policy.events_repository import update_effect_interaction_id
+from app.services.write_behind import DEAD_LETTER_PREFIX, SPILL_PREFIX, WriteBehindBuffer
+
+
+@pytest.fixture
+async def buffer():
+    """Buffer ativo com intervalo longo (flush só quando o teste pede)."""
+    buf = WriteBehindBuffer(intervalo_ms=60_000, max_linhas=2)
+    buf.iniciar()
+    yield buf
+    if buf._task:
+        buf._task.cancel()
+
+
+class TestFlush:
+    """Gravação em lote e spill."""
+
+    @pytest.mark.asyncio
+    async def test_lote_usa_upsert_on_conflict(self, buffer):
+        buffer.enfileirar("business_events", {"id": "e1", "dedupe_key": "k1"})
+        buffer.enfileirar("business_events", {"id": "e2", "dedupe_key": None})
+        buffer.enfileirar("business_events", {"id": "e3", "dedupe_key": "k3"})
+
+        with patch("app.services.write_behind.supabase") as mock_sb:
+            gravados = await buffer.flush()
+
+        assert gravados == 3
+        upsert = mock_sb.table.return_value.upsert
+        assert upsert.call_count == 2  # max_linhas=2
+        assert [r["id"] for r in upsert.call_args_list[0].args[0]] == ["e1", "e2"]
+        kwargs = upsert.call_args_list[0].kwargs
+        assert kwargs["on_conflict"] == "dedupe_key"
+        assert kwargs["ignore_duplicates"] is True
+        assert kwargs["default_to_null"] is False
+
+    @pytest.mark.asyncio
+    async def test_interacoes_recebem_write_id(self, buffer):
+        buffer.enfileirar("interacoes", {"conteudo": "oi"})
+        buffer.enfileirar("interacoes", {"conteudo": "oi de novo"})
+
+        with patch("app.services.write_behind.supabase") as mock_sb:
+            await buffer.flush()
+
+        mock_sb.table.assert_called_with("interacoes")
+        upsert = mock_sb.table.return_value.upsert
+        linhas = upsert.call_args.args[0]
+        assert upsert.call_args.kwargs["on_conflict"] == "write_id"
+        assert all(linha["write_id"] for linha in linhas)
+        assert linhas[0]["write_id"] != linhas[1]["write_id"]
+
+    @pytest.mark.asyncio
+    async def test_falha_no_banco_vai_para_spill(self, buffer):
+        buffer.enfileirar("policy_events", {"event_id": "p1"})
+
+        with (
+            patch("app.services.write_behind.supabase") as mock_sb,
+            patch("app.services.write_behind.redis_client") as mock_redis,
+        ):
+            mock_sb.table.return_value.upsert.return_value.execute.side_effect = Exception("down")
+            mock_redis.rpush = AsyncMock()
+            gravados = await buffer.flush()
+
+        assert gravados == 0
+        chave, linha = mock_redis.rpush.call_args.args
+        assert chave == f"{SPILL_PREFIX}policy_events"
+        assert json.loads(linha) == {"event_id": "p1"}
+
+    @pytest.mark.asyncio
+    async def test_drenar_spill_remove_so_apos_gravar(self, buffer):
+        brutos = [json.dumps({"event_id": "p1"}), json.dumps({"event_id": "p2"})]
+        mock_lock = MagicMock()
+        mock_lock.acquire = AsyncMock(return_value=True)
+        mock_lock.release = AsyncMock()
+
+        with (
+            patch("app.services.write_behind.supabase") as mock_sb,
+            patch("app.services.write_behind.redis_client") as mock_redis,
+            patch("app.services.write_behind.DistributedLock", return_value=mock_lock),
+        ):
+            mock_redis.llen = AsyncMock(return_value=2)
+            mock_redis.lrange = AsyncMock(side_effect=[brutos, []])
+            mock_redis.ltrim = AsyncMock()
+            regravados = await buffer.drenar_spill("policy_events")
+
+        assert regravados == 2
+        mock_sb.table.return_value.upsert.assert_called_once()
+        mock_redis.ltrim.assert_called_once_with(f"{SPILL_PREFIX}policy_events", 2, -1)
+        mock_lock.release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_drenar_spill_linha_recusada_vai_para_dead_letter(self, buffer):
+        brutos = [json.dumps({"event_id": "p1"}), json.dumps({"event_id": "ruim"})]
+        mock_lock = MagicMock()
+        mock_lock.acquire = AsyncMock(return_value=True)
+        mock_lock.release = AsyncMock()
+
+        def executar(linhas):
+            resultado = MagicMock()
+            if any(linha["event_id"] == "ruim" for linha in linhas):
+                resultado.execute.side_effect = APIError({"message": "violates check"})
+            return resultado
+
+        with (
+            patch("app.services.write_behind.supabase") as mock_sb,
+            patch("app.services.write_behind.redis_client") as mock_redis,
+            patch("app.services.write_behind.DistributedLock", return_value=mock_lock),
+        ):
+            mock_sb.table.return_value.upsert.side_effect = lambda linhas, **_: executar(linhas)
+            mock_redis.llen = AsyncMock(return_value=2)
+            mock_redis.lrange = AsyncMock(side_effect=[brutos, []])
+            mock_redis.ltrim = AsyncMock()
+            mock_redis.rpush = AsyncMock()
+            regravados = await buffer.drenar_spill("policy_events")
+
+        assert regravados == 1
+        mock_redis.rpush.assert_awaited_once_with(
+            f"{DEAD_LETTER_PREFIX}policy_events", brutos[1]
+        )
+        mock_redis.ltrim.assert_called_once_with(f"{SPILL_PREFIX}policy_events", 2, -1)
+
+    @pytest.mark.asyncio
+    async def test_drenar_spill_banco_fora_mantem_lote(self, buffer):
+        mock_lock = MagicMock()
+        mock_lock.acquire = AsyncMock(return_value=True)
+        mock_lock.release = AsyncMock()
+
+        with (
+            patch("app.services.write_behind.supabase") as mock_sb,
+            patch("app.services.write_behind.redis_client") as mock_redis,
+            patch("app.services.write_behind.DistributedLock", return_value=mock_lock),
+        ):
+            mock_sb.table.return_value.upsert.return_value.execute.side_effect = (
+                ConnectionError("down")
+            )
+            mock_redis.llen = AsyncMock(return_value=1)
+            mock_redis.lrange = AsyncMock(return_value=[json.dumps({"event_id": "p1"})])
+            mock_redis.ltrim = AsyncMock()
+            mock_redis.rpush = AsyncMock()
+            regravados = await buffer.drenar_spill("policy_events")
+
+        assert regravados == 0
+        mock_redis.ltrim.assert_not_called()
+        mock_redis.rpush.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parar_faz_flush_final(self, buffer):
+        buffer.enfileirar("interacoes", {"conteudo": "tchau"})
+
+        with patch("app.services.write_behind.supabase") as mock_sb:
+            await buffer.parar()
+
+        assert buffer.ativo is False
+        mock_sb.table.return_value.upsert.assert_called_once()
+
+
+class TestRepositoriosComBufferAtivo:
+    """Repositórios passam a enfileirar quando o buffer está ativo."""
+
+    @pytest.mark.asyncio
+    async def test_emit_event_sem_dedupe_key_enfileira(self, buffer):
+        evento = BusinessEvent(
+            event_type=EventType.OUTBOUND_BLOCKED,
+            source=EventSource.BACKEND,
+            cliente_id="c1",
+        )
+
+        with (
+            patch("app.services.business_events.repository.write_behind", buffer),
+            patch("app.services.business_events.repository.supabase") as mock_sb,
+        ):
+            event_id = await emit_event(evento)
+
+        assert event_id == buffer._pendentes["business_events"][0]["id"]
+        assert buffer._pendentes["business_events"][0]["ts"]
+        mock_sb.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_emit_event_com_dedupe_key_retorna_id_existente(self, buffer):
+        evento = BusinessEvent(
+            event_type=EventType.OUTBOUND_BLOCKED,
+            source=EventSource.BACKEND,
+            cliente_id="c1",
+            dedupe_key="outbound_blocked:c1:x",
+        )
+
+        with (
+            patch("app.services.business_events.repository.write_behind", buffer),
+            patch("app.services.business_events.repository.supabase") as mock_sb,
+        ):
+            tabela = mock_sb.table.return_value
+            tabela.upsert.return_value.execute.return_value = MagicMock(data=[])
+            tabela.select.return_value.eq.return_value.limit.return_value.execute.return_value = (
+                MagicMock(data=[{"id": "evt-existente"}])
+            )
+            event_id = await emit_event(evento)
+
+        assert event_id == "evt-existente"
+        assert not buffer._pendentes["business_events"]
+
+    @pytest.mark.asyncio
+    async def test_emit_event_reaproveita_pendente_com_mesma_dedupe_key(self, buffer):
+        buffer.enfileirar(
+            "business_events", {"id": "evt-pendente", "dedupe_key": "outbound_blocked:c1:x"}
+        )
+        evento = BusinessEvent(
+            event_type=EventType.OUTBOUND_BLOCKED,
+            source=EventSource.BACKEND,
+            cliente_id="c1",
+            dedupe_key="outbound_blocked:c1:x",
+        )
+
+        with (
+            patch("app.services.business_events.repository.write_behind", buffer),
+            patch("app.services.business_events.repository.supabase") as mock_sb,
+        ):
+            event_id = await emit_event(evento)
+
+        assert event_id == "evt-pendente"
+        mock_sb.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_interaction_id_em_effect_pendente(self, buffer):
+        buffer.enfileirar(
+            "policy_events",
+            {"policy_decision_id": "d1", "effect_type": "message_sent", "interaction_id": None},
+        )
+
+        with (
+            patch("app.services.policy.events_repository.write_behind", buffer),
+            patch("app.services.policy.events_repository.supabase") as mock_sb,
+        ):
+            assert await update_effect_interaction_id("d1", "message_sent", 99) is True
+
+        assert buffer._pendentes["policy_events"][0]["interaction_id"] == 99
+        mock_sb.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_salvar_interacao_sem_aguardar(self, buffer):
+        with (
+            patch("app.services.interacao.write_behind", buffer),
+            patch("app.services.interacao.supabase") as mock_sb,
+        ):
+            resultado = await salvar_interacao(
+                "conv-1", "c1", "saida", "oi", "julia", aguardar=False
+            )
+            await salvar_interacao("conv-1", "c1", "entrada", "oi", "medico")
+
+        assert resultado is None
+        assert buffer._pendentes["interacoes"][0]["tipo"] == "saida"
+        # Quem precisa do ID continua gravando direto
+        mock_sb.table.return_value.insert.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_emit_event_dedupe_sem_select_previo():
+    """Sem buffer: dedupe via upsert ON CONFLICT, SELECT só se duplicado."""
+    evento = BusinessEvent(
+        event_type=EventType.OFFER_MADE,
+        source=EventSource.BACKEND,
+        dedupe_key="offer_made:v1:c1",
+    )
+
+    with patch("app.services.business_events.repository.supabase") as mock_sb:
+        mock_sb.table.return_value.upsert.return_value.execute.return_value.data = [
+            {"id": "novo-id-123"}
+        ]
+        event_id = await emit_event(evento)
+
+    assert event_id == "novo-id-123"
+    mock_sb.table.return_value.select.assert_not_called()
+    assert mock_sb.table.return_value.upsert.call_args.kwargs == {
+        "on_conflict": "dedupe_key",
+        "ignore_duplicates": True,
+    }
@@ -0,0 +1,180 @@
+"""
+Testes do indice em memoria de vagas abertas.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.vagas.indice import IndiceVagas
+from app.services.vagas.repository import listar_turnos_reservados
+from app.services.vagas.service import buscar_vagas_indexadas
+
+
+def _vaga(vaga_id, data="2099-03-10", periodo_id="p-noite", esp="esp1", regiao="abc", **extra):
+    return {
+        "id": vaga_id,
+        "status": "aberta",
+        "especialidade_id": esp,
+        "data": data,
+        "periodo_id": periodo_id,
+        "hospitais": {"nome": f"Hospital {vaga_id}", "regiao": regiao},
+        **extra,
+    }
+
+
+@pytest.fixture
+def vagas_abertas():
+    return [
+        _vaga("v1", data="2099-03-10", periodo_id="p-noite"),
+        _vaga("v2", data="2099-03-10", periodo_id="p-dia", regiao="zona_sul"),
+        _vaga("v3", data="2099-03-11", periodo_id="p-noite", criticidade="critica"),
+        _vaga("v4", esp="esp2"),
+        _vaga("v5", data="2000-01-01"),
+    ]
+
+
+def _patch_listar_abertas(vagas):
+    return patch(
+        "app.services.vagas.indice.repository.listar_abertas",
+        new_callable=AsyncMock,
+        return_value=vagas,
+    )
+
+
+class TestIndiceVagas:
+    """Consulta e manutencao do indice."""
+
+    @pytest.mark.asyncio
+    async def test_consulta_por_especialidade_sem_turnos_ocupados(self, vagas_abertas):
+        indice = IndiceVagas()
+
+        with _patch_listar_abertas(vagas_abertas) as mock_listar:
+            vagas, _ = await indice.consultar("esp1", turnos_ocupados={("2099-03-10", "p-noite")})
+            await indice.consultar("esp1")
+
+        assert sorted(v["id"] for v in vagas) == ["v2", "v3"]
+        # Carga unica dentro do TTL; vaga com data passada expira
+        mock_listar.assert_awaited_once()
+        assert "v5" not in {v["id"] for v in (await indice.consultar("esp1"))[0]}
+
+    @pytest.mark.asyncio
+    async def test_ids_da_regiao(self, vagas_abertas):
+        indice = IndiceVagas()
+
+        with _patch_listar_abertas(vagas_abertas):
+            _, ids_regiao = await indice.consultar("esp1", regiao="ABC")
+
+        assert ids_regiao == {"v1", "v3"}
+
+    @pytest.mark.asyncio
+    async def test_notificacoes_de_reserva_e_cancelamento(self, vagas_abertas):
+        indice = IndiceVagas()
+
+        with _patch_listar_abertas(vagas_abertas):
+            await indice.garantir_atualizado()
+            indice.notificar_reserva("v1")
+            vagas, _ = await indice.consultar("esp1")
+            assert "v1" not in {v["id"] for v in vagas}
+
+            indice.notificar_abertura(vagas_abertas[0])
+            vagas, _ = await indice.consultar("esp1")
+            assert "v1" in {v["id"] for v in vagas}
+
+    @pytest.mark.asyncio
+    async def test_vagas_criadas_carregadas_em_uma_query(self, vagas_abertas):
+        indice = IndiceVagas()
+        novas = [_vaga("n1"), _vaga("n2")]
+
+        with (
+            _patch_listar_abertas(vagas_abertas),
+            patch(
+                "app.services.vagas.indice.repository.listar_por_ids",
+                new_callable=AsyncMock,
+                return_value=novas,
+            ) as mock_por_ids,
+        ):
+            await indice.garantir_atualizado()
+            indice.notificar_criacao(["n1", "n2"])
+            vagas, _ = await indice.consultar("esp1")
+
+        assert sorted(mock_por_ids.await_args.args[0]) == ["n1", "n2"]
+        assert {"n1", "n2"} <= {v["id"] for v in vagas}
+
+    @pytest.mark.asyncio
+    async def test_falha_na_recarga_mantem_versao_atual(self, vagas_abertas):
+        indice = IndiceVagas(ttl_segundos=0)
+
+        with _patch_listar_abertas(vagas_abertas):
+            await indice.garantir_atualizado()
+
+        with patch(
+            "app.services.vagas.indice.repository.listar_abertas",
+            new_callable=AsyncMock,
+            side_effect=Exception("timeout"),
+        ):
+            vagas, _ = await indice.consultar("esp1")
+
+        assert len(vagas) == 3
+
+    @pytest.mark.asyncio
+    async def test_falha_na_primeira_carga_propaga(self):
+        indice = IndiceVagas()
+
+        with patch(
+            "app.services.vagas.indice.repository.listar_abertas",
+            new_callable=AsyncMock,
+            side_effect=Exception("timeout"),
+        ):
+            with pytest.raises(Exception, match="timeout"):
+                await indice.consultar("esp1")
+
+
+class TestBuscarVagasIndexadas:
+    """Ordenacao e preferencias sobre o indice."""
+
+    @pytest.mark.asyncio
+    async def test_regiao_pedida_antes_de_criticidade(self, vagas_abertas):
+        indice = IndiceVagas()
+        medico = {"especialidade_id": "esp1", "telefone": "5511999999999"}
+
+        with (
+            _patch_listar_abertas(vagas_abertas),
+            patch("app.services.vagas.service.indice_vagas", indice),
+        ):
+            vagas = await buscar_vagas_indexadas(medico, regiao="zona_sul")
+            sem_regiao = await buscar_vagas_indexadas(medico)
+
+        assert [v["id"] for v in vagas] == ["v2", "v3", "v1"]
+        assert sem_regiao[0]["id"] == "v3"
+
+    @pytest.mark.asyncio
+    async def test_aplica_preferencias(self, vagas_abertas):
+        indice = IndiceVagas()
+        medico = {
+            "especialidade_id": "esp1",
+            "preferencias_detectadas": {"hospitais_bloqueados": ["h-bloq"]},
+        }
+        vagas_abertas[0]["hospital_id"] = "h-bloq"
+
+        with (
+            _patch_listar_abertas(vagas_abertas),
+            patch("app.services.vagas.service.indice_vagas", indice),
+        ):
+            vagas = await buscar_vagas_indexadas(medico)
+
+        assert "v1" not in {v["id"] for v in vagas}
+
+
+@pytest.mark.asyncio
+async def test_listar_turnos_reservados_uma_query():
+    mock_sb = MagicMock()
+    query = mock_sb.table.return_value.select.return_value.eq.return_value.in_.return_value
+    query.gte.return_value.execute.return_value.data = [
+        {"data": "2099-03-10", "periodo_id": "p-noite"},
+        {"data": "2099-03-12", "periodo_id": None},
+    ]
+
+    with patch("app.services.vagas.repository.supabase", mock_sb):
+        turnos = await listar_turnos_reservados("medico-1")
+
+    assert turnos == {("2099-03-10", "p-noite")}
+    mock_sb.table.assert_called_once_with("vagas")
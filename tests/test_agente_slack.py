@@ -214,6 +214,106 @@ class TestConfirmacao:
         assert resposta is None  # Não era confirmação
 
 
+class TestLoopAssincrono:
+    """Agente sobre o provider assíncrono: tools em paralelo e sessão por turno."""
+
+    def _agente(self, respostas):
+        provider = MagicMock()
+        provider.generate = AsyncMock(side_effect=respostas)
+        agente = AgenteSlack(user_id="U123", channel_id="C456", provider=provider)
+        agente.session.carregar = AsyncMock(
+            side_effect=lambda: setattr(agente.session, "sessao", {"contexto": {}})
+        )
+        agente.session.salvar = AsyncMock()
+        return agente
+
+    @pytest.mark.asyncio
+    async def test_tools_em_paralelo_com_parcial(self):
+        """Consultas da mesma resposta rodam juntas e o texto parcial é repassado."""
+        import asyncio
+
+        from app.services.llm import LLMResponse, StopReason, ToolCall
+
+        agente = self._agente(
+            [
+                LLMResponse(
+                    content="Vou buscar...",
+                    tool_calls=[
+                        ToolCall(id="a", name="buscar_metricas", input={"periodo": "hoje"}),
+                        ToolCall(id="b", name="buscar_vagas", input={}),
+                    ],
+                    stop_reason=StopReason.TOOL_USE,
+                ),
+                LLMResponse(content="10 respostas e 3 vagas"),
+            ]
+        )
+        iniciadas = []
+
+        async def executar(nome, params):
+            iniciadas.append(nome)
+            await asyncio.sleep(0.01)
+            # Ambas começaram antes de qualquer uma terminar
+            assert len(iniciadas) == 2
+            return {"success": True, "total": 3}
+
+        parciais = []
+
+        async def ao_parcial(texto):
+            parciais.append(texto)
+
+        with patch.object(agente.executor, "executar", side_effect=executar):
+            resposta = await agente.processar_mensagem("como tá hoje?", ao_parcial=ao_parcial)
+
+        assert resposta == "10 respostas e 3 vagas"
+        assert parciais == ["Vou buscar..."]
+        assert agente.session.mensagens[1]["content"][0] == {"type": "text", "text": "Vou buscar..."}
+        agente.session.carregar.assert_awaited_once()
+        agente.session.salvar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_tool_critica_nao_executa_nada(self):
+        """Com ação crítica na resposta, nada é executado antes da confirmação."""
+        from app.services.llm import LLMResponse, StopReason, ToolCall
+
+        agente = self._agente(
+            [
+                LLMResponse(
+                    content="",
+                    tool_calls=[
+                        ToolCall(id="a", name="buscar_metricas", input={}),
+                        ToolCall(id="b", name="bloquear_medico", input={"telefone": "11999"}),
+                    ],
+                    stop_reason=StopReason.TOOL_USE,
+                )
+            ]
+        )
+
+        with patch.object(agente.executor, "executar", new_callable=AsyncMock) as executar:
+            await agente.processar_mensagem("bloqueia o 11999")
+
+        executar.assert_not_called()
+        assert agente.session.get_acao_pendente()["tool_name"] == "bloquear_medico"
+        agente.session.salvar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_confirmacao_persiste_sessao(self):
+        """Caminho de confirmação também salva a sessão (ação pendente limpa)."""
+        agente = self._agente([])
+        agente.session.carregar = AsyncMock(
+            side_effect=lambda: setattr(
+                agente.session,
+                "sessao",
+                {"contexto": {}, "acao_pendente": {"tool_name": "x", "tool_input": {}}},
+            )
+        )
+
+        resposta = await agente.processar_mensagem("cancela")
+
+        assert "cancelado" in resposta.lower()
+        agente.session.salvar.assert_awaited_once()
+        assert agente.session.get_acao_pendente() is None
+
+
 class TestToolExecution:
     """Testes de execução de tools."""
 
@@ -357,3 +457,28 @@ class TestInterpretacaoIntencao:
             "para de contatar esse numero",
         ]
         assert len(variacoes) > 0
+
+
+class TestRespostaProgressiva:
+    """Parciais e resposta final na mesma mensagem do Slack."""
+
+    @pytest.mark.asyncio
+    async def test_publica_depois_edita(self):
+        from app.services.slack_comandos import RespostaProgressiva
+
+        with patch(
+            "app.services.slack_comandos._responder_slack",
+            new_callable=AsyncMock,
+            return_value="1700.01",
+        ) as responder:
+            saida = RespostaProgressiva("C456")
+            await saida.atualizar("Vou buscar...")
+            await saida.atualizar("Vou buscar...")
+            await saida.atualizar("10 respostas hoje")
+
+        assert [c.args for c in responder.await_args_list] == [
+            ("C456", "Vou buscar..."),
+            ("C456", "10 respostas hoje"),
+        ]
+        assert responder.await_args_list[0].kwargs["ts"] is None
+        assert responder.await_args_list[1].kwargs["ts"] == "1700.01"
@@ -220,3 +220,32 @@ class TestHandleConsultaSql:
         assert result["success"] is True
         assert result["data"] == []
         assert result["row_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_usa_snapshot_analitico_com_frescor(self):
+        """Query coberta pelo snapshot não vai à produção e informa o frescor."""
+        from datetime import datetime, timezone
+        from unittest.mock import AsyncMock
+
+        from app.services.snapshot_analitico import ResultadoAnalitico
+
+        resultado = ResultadoAnalitico(
+            [{"count": 7}], "snapshot", datetime(2026, 10, 18, 17, 35, tzinfo=timezone.utc)
+        )
+
+        with patch('app.tools.helena.sql.supabase') as mock_db, patch(
+            'app.tools.helena.sql.consultar_analitico', AsyncMock(return_value=resultado)
+        ):
+            result = await handle_consulta_sql(
+                {
+                    "query": "SELECT COUNT(*) as count FROM handoffs LIMIT 1",
+                    "explicacao": "Contagem de handoffs",
+                },
+                "U123",
+                "C456",
+            )
+
+        mock_db.rpc.assert_not_called()
+        assert result["data"] == [{"count": 7}]
+        assert result["frescor"]["fonte"] == "snapshot"
+        assert result["frescor"]["dados_ate"] == "2026-10-18T17:35:00+00:00"
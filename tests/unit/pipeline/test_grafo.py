@@ -0,0 +1,195 @@
+"""
+Testes do grafo de dependencias e da execucao concorrente do pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from app.pipeline.base import PostProcessor, PreProcessor, ProcessorContext, ProcessorResult
+from app.pipeline.grafo import montar_niveis
+from app.pipeline.processor import MessageProcessor
+
+
+class Pre(PreProcessor):
+    """Pre-processador declarativo para testes."""
+
+    def __init__(
+        self,
+        name,
+        priority,
+        leituras=frozenset(),
+        escritas=frozenset(),
+        pode_interromper=False,
+        result=None,
+        espera=None,
+        log=None,
+    ):
+        self.name = name
+        self.priority = priority
+        self.leituras = frozenset(leituras) if leituras is not None else None
+        self.escritas = frozenset(escritas)
+        self.pode_interromper = pode_interromper
+        self._result = result or ProcessorResult(success=True)
+        self._espera = espera
+        self._log = log if log is not None else []
+
+    async def process(self, context: ProcessorContext) -> ProcessorResult:
+        self._log.append(f"inicio:{self.name}")
+        if self._espera:
+            await self._espera()
+        self._log.append(f"fim:{self.name}")
+        return self._result
+
+
+class Post(PostProcessor):
+    """Pos-processador declarativo para testes."""
+
+    def __init__(self, name, priority, leituras=frozenset(), escritas=frozenset(), resposta=None):
+        self.name = name
+        self.priority = priority
+        self.leituras = frozenset(leituras)
+        self.escritas = frozenset(escritas)
+        self._resposta = resposta
+        self.recebida = None
+
+    async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
+        self.recebida = response
+        return ProcessorResult(success=True, response=self._resposta)
+
+
+class Core:
+    async def process(self, context):
+        return ProcessorResult(success=True, response="resposta")
+
+
+def _nomes(niveis):
+    return [[p.name for p in nivel] for nivel in niveis]
+
+
+class TestMontarNiveis:
+    """Dependencias por leitura/escrita, interrupcao e barreira."""
+
+    def test_conflitos_de_dados_e_interrupcao(self):
+        processadores = [
+            Pre("parse", 10, escritas={"telefone"}, pode_interromper=True),
+            Pre("presence", 15, leituras={"telefone"}),
+            Pre("entities", 20, leituras={"telefone"}, escritas={"conversa"}, pode_interromper=True),
+            Pre("chip", 21, leituras={"conversa.id"}),
+            Pre("sync", 25, escritas={"conversa.chatwoot_conversation_id"}),
+            Pre("human", 60, leituras={"conversa"}),
+        ]
+
+        assert _nomes(montar_niveis(processadores)) == [
+            ["parse"],
+            ["presence", "entities"],
+            ["chip", "sync"],
+            ["human"],
+        ]
+
+    def test_processador_sem_declaracao_e_barreira(self):
+        processadores = [
+            Pre("a", 1),
+            Pre("legado", 2, leituras=None),
+            Pre("b", 3),
+        ]
+
+        assert _nomes(montar_niveis(processadores)) == [["a"], ["legado"], ["b"]]
+
+    def test_pipeline_real(self):
+        from app.pipeline.setup import criar_pipeline
+
+        pipeline = criar_pipeline()
+
+        niveis_pre = _nomes(montar_niveis(pipeline.pre_processors))
+        assert ["presence", "load_entities"] in niveis_pre
+        assert ["chip_mapping", "business_event_inbound", "chatwoot_sync", "optout"] in niveis_pre
+        assert niveis_pre[-1] == ["human_control"]
+        assert _nomes(montar_niveis(pipeline.post_processors)) == [
+            ["validate_output"],
+            ["timing"],
+            ["send_message"],
+            ["save_interaction", "metrics"],
+            ["extraction"],
+        ]
+
+
+@pytest.mark.unit
+class TestExecucaoConcorrente:
+    """MessageProcessor roda cada nivel concorrentemente."""
+
+    @pytest.mark.asyncio
+    async def test_independentes_rodam_juntos(self):
+        log = []
+        liberar = asyncio.Event()
+
+        async def espera_liberar():
+            await liberar.wait()
+
+        async def libera():
+            liberar.set()
+
+        pipeline = MessageProcessor().set_core_processor(Core())
+        pipeline.add_pre_processor(Pre("lento", 10, espera=espera_liberar, log=log))
+        pipeline.add_pre_processor(Pre("rapido", 20, espera=libera, log=log))
+
+        # Sequencial travaria: "lento" so termina depois de "rapido" comecar
+        result = await asyncio.wait_for(pipeline.process({}), timeout=1)
+
+        assert result.success is True
+        assert log.index("inicio:rapido") < log.index("fim:lento")
+
+    @pytest.mark.asyncio
+    async def test_interrupcao_completa_anteriores_e_nao_roda_posteriores(self):
+        log = []
+        pipeline = MessageProcessor().set_core_processor(Core())
+        pipeline.add_pre_processor(Pre("parse", 10, escritas={"telefone"}, pode_interromper=True))
+        # Depende de "x" (nivel 2); o interruptor abaixo fica no nivel 1
+        pipeline.add_pre_processor(Pre("escreve_x", 11, escritas={"x"}, log=log))
+        pipeline.add_pre_processor(Pre("le_x", 12, leituras={"x"}, log=log))
+        pipeline.add_pre_processor(
+            Pre(
+                "optout",
+                30,
+                pode_interromper=True,
+                result=ProcessorResult(success=True, should_continue=False),
+                log=log,
+            )
+        )
+        pipeline.add_pre_processor(Pre("depois", 40, log=log))
+
+        result = await pipeline.process({})
+
+        assert result.should_continue is False
+        assert "fim:le_x" in log  # rodaria antes do optout na ordem sequencial
+        assert "inicio:depois" not in log
+
+    @pytest.mark.asyncio
+    async def test_primeira_interrupcao_por_prioridade_vence(self):
+        pipeline = MessageProcessor().set_core_processor(Core())
+        # Contrato violado (declarado sem interrupcao), mas a prioridade desempata
+        pipeline.add_pre_processor(
+            Pre("a", 10, result=ProcessorResult(success=False, error="falha a"))
+        )
+        pipeline.add_pre_processor(
+            Pre("b", 20, result=ProcessorResult(success=False, error="falha b"))
+        )
+
+        result = await pipeline.process({})
+
+        assert result.error == "falha a"
+
+    @pytest.mark.asyncio
+    async def test_pos_no_mesmo_nivel_recebem_mesma_resposta(self):
+        pipeline = MessageProcessor().set_core_processor(Core())
+        validar = Post("validar", 5, leituras={"resposta"}, escritas={"resposta"}, resposta="ok")
+        salvar = Post("salvar", 30, leituras={"resposta"})
+        metricas = Post("metricas", 40, leituras={"resposta"})
+        for p in (validar, salvar, metricas):
+            pipeline.add_post_processor(p)
+
+        result = await pipeline.process({})
+
+        assert validar.recebida == "resposta"
+        assert salvar.recebida == metricas.recebida == "ok"
+        assert result.response == "ok"
@@ -0,0 +1,208 @@
+"""
+Testes do executor pos-envio e da integracao com o pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from app.pipeline.base import PostProcessor, ProcessorContext, ProcessorResult
+from app.pipeline.pos_envio import ExecutorPosEnvio
+from app.pipeline.processor import MessageProcessor
+
+
+@pytest.fixture
+async def executor():
+    exe = ExecutorPosEnvio(max_concorrencia=1, max_pendentes=10, tentativas=3, backoff_s=0)
+    exe.iniciar()
+    yield exe
+    await exe.parar(timeout=1)
+
+
+class TestExecutor:
+    """Prioridade, retry, backpressure e chave."""
+
+    @pytest.mark.asyncio
+    async def test_prioridade_menor_roda_antes(self, executor):
+        ordem = []
+        bloqueio = asyncio.Event()
+
+        async def bloqueia():
+            await bloqueio.wait()
+
+        def registra(nome):
+            async def rodar():
+                ordem.append(nome)
+
+            return rodar
+
+        await executor.submeter("ocupa", bloqueia, prioridade=0)
+        await asyncio.sleep(0)  # worker pega a primeira
+        await executor.submeter("metrics", registra("metrics"), prioridade=40)
+        await executor.submeter("save", registra("save"), prioridade=30)
+        bloqueio.set()
+        await executor.parar(timeout=1)
+
+        assert ordem == ["save", "metrics"]
+        assert executor.estatisticas()["concluidas"] == 3
+
+    @pytest.mark.asyncio
+    async def test_retry_em_excecao(self, executor):
+        chamadas = []
+
+        async def instavel():
+            chamadas.append(1)
+            if len(chamadas) < 3:
+                raise RuntimeError("timeout")
+
+        await executor.submeter("instavel", instavel, chave="conv-1")
+        await executor.aguardar_chave("conv-1", timeout=1)
+
+        stats = executor.estatisticas()
+        assert len(chamadas) == 3
+        assert stats["retentativas"] == 2
+        assert stats["concluidas"] == 1
+        assert stats["falhas"] == 0
+
+    @pytest.mark.asyncio
+    async def test_backpressure_espera_vaga(self):
+        exe = ExecutorPosEnvio(max_concorrencia=1, max_pendentes=1, backoff_s=0)
+        exe.iniciar()
+        bloqueio = asyncio.Event()
+
+        async def bloqueia():
+            await bloqueio.wait()
+
+        async def nada():
+            pass
+
+        try:
+            await exe.submeter("a", bloqueia)
+            segunda = asyncio.create_task(exe.submeter("b", nada))
+            await asyncio.sleep(0.01)
+            assert not segunda.done()
+
+            bloqueio.set()
+            await asyncio.wait_for(segunda, timeout=1)
+            assert exe.estatisticas()["esperas_backpressure"] == 1
+        finally:
+            await exe.parar(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_inativo_roda_inline(self):
+        exe = ExecutorPosEnvio()
+        chamadas = []
+
+        async def rodar():
+            chamadas.append(1)
+
+        await exe.submeter("x", rodar)
+
+        assert chamadas == [1]
+
+
+class Post(PostProcessor):
+    def __init__(self, name, priority, leituras, escritas=(), pos_envio=False, espera=None):
+        self.name = name
+        self.priority = priority
+        self.leituras = frozenset(leituras)
+        self.escritas = frozenset(escritas)
+        self.pos_envio = pos_envio
+        self._espera = espera
+        self.rodou = asyncio.Event()
+
+    async def process(self, context: ProcessorContext, response: str) -> ProcessorResult:
+        if self._espera:
+            await self._espera.wait()
+        context.metadata[self.name] = True
+        self.rodou.set()
+        return ProcessorResult(success=True, response=response)
+
+
+class Core:
+    async def process(self, context):
+        context.conversa = {"id": "conv-1"}
+        return ProcessorResult(success=True, response="oi")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_libera_apos_envio(monkeypatch, executor):
+    monkeypatch.setattr("app.pipeline.processor.executor_pos_envio", executor)
+    liberar_save = asyncio.Event()
+    send = Post("send", 20, {"resposta"}, {"metadata.message_sent"})
+    save = Post(
+        "save",
+        30,
+        {"metadata.message_sent"},
+        {"metadata.campanha_id"},
+        pos_envio=True,
+        espera=liberar_save,
+    )
+    extraction = Post("extraction", 35, {"metadata.campanha_id"}, pos_envio=True)
+    pipeline = MessageProcessor().set_core_processor(Core())
+    for p in (send, save, extraction):
+        pipeline.add_post_processor(p)
+
+    result = await asyncio.wait_for(pipeline.process({}), timeout=1)
+
+    # Retornou com o save ainda pendente
+    assert result.response == "oi"
+    assert send.rodou.is_set()
+    assert not save.rodou.is_set()
+
+    liberar_save.set()
+    await executor.aguardar_chave("conv-1", timeout=1)
+    assert save.rodou.is_set()
+    assert extraction.rodou.is_set()  # nivel seguinte submetido ao fim do save
+
+
+@pytest.mark.asyncio
+async def test_save_interaction_com_erro_e_retentado_no_executor(monkeypatch, executor):
+    from unittest.mock import AsyncMock
+
+    from app.pipeline.post_processors import SaveInteractionProcessor
+
+    monkeypatch.setattr("app.pipeline.processor.executor_pos_envio", executor)
+    monkeypatch.setattr(SaveInteractionProcessor, "_agendar_atualizacao_resumo", lambda *_: None)
+    salvar = AsyncMock(side_effect=[{"id": 1}, RuntimeError("db fora"), {"id": 2}])
+    monkeypatch.setattr("app.pipeline.post_processors.salvar_interacao", salvar)
+
+    class Envio:
+        async def process(self, context):
+            context.conversa = {"id": "conv-1"}
+            context.medico = {"id": "med-1"}
+            context.mensagem_texto = "tem vaga?"
+            context.metadata["message_sent"] = True
+            return ProcessorResult(success=True, response="tenho sim")
+
+    pipeline = MessageProcessor().set_core_processor(Envio())
+    pipeline.add_post_processor(SaveInteractionProcessor())
+
+    await asyncio.wait_for(pipeline.process({}), timeout=1)
+    await executor.aguardar_chave("conv-1", timeout=1)
+
+    # Entrada gravada na 1a tentativa; so a saida e repetida
+    assert [c.kwargs["tipo"] for c in salvar.await_args_list] == ["entrada", "saida", "saida"]
+    stats = executor.estatisticas()
+    assert stats["retentativas"] == 1
+    assert stats["concluidas"] == 1
+
+
+@pytest.mark.asyncio
+async def test_save_interaction_com_erro_inline_nao_para_pipeline(monkeypatch):
+    from unittest.mock import AsyncMock
+
+    from app.pipeline.post_processors import SaveInteractionProcessor
+
+    monkeypatch.setattr(
+        "app.pipeline.post_processors.salvar_interacao",
+        AsyncMock(side_effect=RuntimeError("db fora")),
+    )
+    context = ProcessorContext(mensagem_raw={})
+    context.conversa = {"id": "conv-1"}
+    context.medico = {"id": "med-1"}
+
+    result = await SaveInteractionProcessor().process(context, "oi")
+
+    assert result.success is False
+    assert result.response == "oi"
@@ -254,7 +254,9 @@ class TestCarregarContextoCampanha:
                 "app.services.contexto.cache_get_json", new_callable=AsyncMock, return_value=cached
             ),
             patch("app.services.campanhas.repository.campanha_repository") as mock_repo,
+            patch("app.services.redis.redis_client") as mock_redis,
         ):
+            mock_redis.mget = AsyncMock(return_value=[None, None])
             resultado = await carregar_contexto_campanha(campaign_id=20)
 
             assert resultado is not None
@@ -273,11 +275,42 @@ class TestCarregarContextoCampanha:
             "_concluida_em": None,
         }
 
-        with patch(
-            "app.services.contexto.cache_get_json", new_callable=AsyncMock, return_value=cached
+        with (
+            patch(
+                "app.services.contexto.cache_get_json", new_callable=AsyncMock, return_value=cached
+            ),
+            patch("app.services.campanhas.repository.campanha_repository") as mock_repo,
+            patch("app.services.redis.redis_client") as mock_redis,
         ):
+            mock_redis.mget = AsyncMock(return_value=[None, None])
             resultado = await carregar_contexto_campanha(campaign_id=20)
             assert resultado is None
+            mock_repo.buscar_por_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sem_geracao_do_cache_busca_no_banco(self):
+        """Redis fora ao ler as gerações: não lê nem grava cache."""
+        campanha = CampanhaData(
+            id=25,
+            nome_template="Sem Cache",
+            tipo_campanha=TipoCampanha.DISCOVERY,
+            status=StatusCampanha.ATIVA,
+        )
+
+        with (
+            patch("app.services.contexto.cache_get_json", new_callable=AsyncMock) as mock_get,
+            patch("app.services.contexto.cache_set_json", new_callable=AsyncMock) as mock_set,
+            patch("app.services.campanhas.repository.campanha_repository") as mock_repo,
+            patch("app.services.redis.redis_client") as mock_redis,
+        ):
+            mock_repo.buscar_por_id = AsyncMock(return_value=campanha)
+            mock_redis.mget = AsyncMock(side_effect=ConnectionError("redis down"))
+
+            resultado = await carregar_contexto_campanha(campaign_id=25)
+
+            assert resultado is not None
+            mock_get.assert_not_called()
+            mock_set.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_cache_salvo_apos_busca(self):
@@ -297,14 +330,20 @@ class TestCarregarContextoCampanha:
                 "app.services.contexto.cache_set_json", new_callable=AsyncMock, return_value=True
             ) as mock_set,
             patch("app.services.campanhas.repository.campanha_repository") as mock_repo,
+            patch("app.services.redis.redis_client") as mock_redis,
         ):
             mock_repo.buscar_por_id = AsyncMock(return_value=campanha)
+            # Geração global 0, tag da campanha já invalidada 3 vezes
+            mock_redis.mget = AsyncMock(return_value=[None, "3"])
 
             await carregar_contexto_campanha(campaign_id=23)
 
             mock_set.assert_called_once()
             call_args = mock_set.call_args
-            assert call_args[0][0] == "campanha:contexto:23"
+            assert call_args[0][0] == "campanha:contexto:v0.3:23"
+            mock_redis.mget.assert_called_once_with(
+                ["campanha:contexto:gen", "campanha:contexto:gen:campanha:23"]
+            )
             assert call_args[0][2] == 300  # TTL 5min
 
     @pytest.mark.asyncio
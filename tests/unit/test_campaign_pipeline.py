@@ -719,13 +719,14 @@ class TestCacheInvalidationRepository:
 
         with (
             patch("app.services.campanhas.repository.supabase") as mock_supabase,
-            patch("app.services.redis.cache_delete", new_callable=AsyncMock) as mock_cache_del,
+            patch("app.services.redis.redis_client") as mock_redis,
         ):
+            mock_redis.incr = AsyncMock(return_value=1)
             mock_supabase.table.return_value.update.return_value.eq.return_value.execute.return_value = MagicMock()
 
             await repo.atualizar_status(42, StatusCampanha.CONCLUIDA)
 
-            mock_cache_del.assert_called_once_with("campanha:contexto:42")
+            mock_redis.incr.assert_called_once_with("campanha:contexto:gen:campanha:42")
 
 
 # =============================================================================
@@ -16,7 +16,7 @@ class TestGestorComandaInterpretar:
         """Deve interpretar comando de contato com médicos."""
         from app.services.gestor_comanda import GestorComanda
 
-        with patch("app.services.gestor_comanda.anthropic.Anthropic") as mock_anthropic:
+        with patch("anthropic.Anthropic") as mock_anthropic:
             # Mock resposta do Claude
             mock_response = MagicMock()
             mock_response.content = [MagicMock(text=json.dumps({
@@ -57,7 +57,7 @@ class TestGestorComandaInterpretar:
         """Deve interpretar comando de criação de margem."""
         from app.services.gestor_comanda import GestorComanda
 
-        with patch("app.services.gestor_comanda.anthropic.Anthropic") as mock_anthropic:
+        with patch("anthropic.Anthropic") as mock_anthropic:
             mock_response = MagicMock()
             mock_response.content = [MagicMock(text=json.dumps({
                 "interpretacao": "Definir margem de 15% para vaga específica",
@@ -94,7 +94,7 @@ class TestGestorComandaAjustar:
         """Deve ajustar plano baseado em feedback do gestor."""
         from app.services.gestor_comanda import GestorComanda
 
-        with patch("app.services.gestor_comanda.anthropic.Anthropic") as mock_anthropic:
+        with patch("anthropic.Anthropic") as mock_anthropic:
             mock_response = MagicMock()
             mock_response.content = [MagicMock(text=json.dumps({
                 "interpretacao": "Contatar apenas 10 médicos mais ativos",
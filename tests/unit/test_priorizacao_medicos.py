@@ -3,6 +3,8 @@ Testes para serviço de priorização de médicos.
 
 Sprint 32 E07 - Algoritmo de Priorização.
 """
+import time
+
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime, timedelta, timezone
@@ -234,8 +236,8 @@ class TestPriorizarMedicos:
 
         vaga = {"id": "v1", "especialidades": {"nome": "cardiologia"}}
 
-        with patch("app.services.priorizacao_medicos.verificar_historico_positivo") as mock_historico:
-            mock_historico.return_value = {"tem_historico": False, "total_plantoes": 0}
+        with patch("app.services.priorizacao_medicos.buscar_historico_lote") as mock_historico:
+            mock_historico.return_value = {}
 
             resultado = await priorizar_medicos(medicos, vaga, limite=3)
 
@@ -254,8 +256,8 @@ class TestPriorizarMedicos:
 
         vaga = {"id": "v1", "especialidades": {"nome": "cardiologia"}}
 
-        with patch("app.services.priorizacao_medicos.verificar_historico_positivo") as mock_historico:
-            mock_historico.return_value = {"tem_historico": False, "total_plantoes": 0}
+        with patch("app.services.priorizacao_medicos.buscar_historico_lote") as mock_historico:
+            mock_historico.return_value = {}
 
             resultado = await priorizar_medicos(medicos, vaga, limite=5)
 
@@ -425,3 +427,98 @@ class TestSelecionarMedicosParaOferta:
             resultado = await selecionar_medicos_para_oferta(vaga)
 
             assert resultado == []
+
+
+class TestMatrizPriorizacao:
+    """Testes para a priorização em lote (MatrizPriorizacao)."""
+
+    @staticmethod
+    def _medicos(n):
+        agora = datetime.now(timezone.utc)
+        especialidades = ["Cardiologia", "cardiologia clínica", "Pediatria", None, "clinica"]
+        return [
+            {
+                "id": f"m{i}",
+                "qualification_score": (i % 10) / 10,
+                "total_interacoes": i % 3,
+                "especialidade": especialidades[i % len(especialidades)],
+                "ultima_mensagem_data": (
+                    None if i % 4 == 0 else (agora - timedelta(days=i % 45)).isoformat()
+                ),
+            }
+            for i in range(n)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_scores_iguais_a_versao_unitaria(self):
+        """Scores em lote devem bater com calcular_score_priorizacao."""
+        from app.services.priorizacao_medicos import (
+            calcular_score_priorizacao,
+            montar_matriz_priorizacao,
+        )
+
+        medicos = self._medicos(40)
+        vaga = {"id": "v1", "especialidades": {"nome": "cardiologia"}}
+        com_historico = {"m3": 2, "m7": 1}
+
+        async def historico_unitario(cliente_id, hospital_id=None):
+            return {"tem_historico": cliente_id in com_historico}
+
+        with (
+            patch(
+                "app.services.priorizacao_medicos.buscar_historico_lote",
+                AsyncMock(return_value=com_historico),
+            ),
+            patch(
+                "app.services.priorizacao_medicos.verificar_historico_positivo",
+                side_effect=historico_unitario,
+            ),
+        ):
+            matriz = await montar_matriz_priorizacao(medicos)
+            esperados = [await calcular_score_priorizacao(m, vaga) for m in medicos]
+
+        assert matriz.pontuar(vaga).tolist() == pytest.approx(esperados)
+
+    @pytest.mark.asyncio
+    async def test_historico_em_uma_chamada_por_lote(self):
+        """Histórico deve vir de uma RPC agregada por lote de IDs."""
+        from app.services.priorizacao_medicos import buscar_historico_lote
+
+        with patch("app.services.priorizacao_medicos.supabase") as mock_supabase:
+            mock_supabase.rpc.return_value.execute.return_value.data = [
+                {"cliente_id": "m1", "total_plantoes": 3}
+            ]
+
+            resultado = await buscar_historico_lote([f"m{i}" for i in range(1200)])
+
+        assert mock_supabase.rpc.call_count == 3
+        assert mock_supabase.rpc.call_args[0][0] == "historico_plantoes_por_medico"
+        assert resultado == {"m1": 3}
+
+    @pytest.mark.asyncio
+    async def test_matriz_reutilizada_entre_vagas(self):
+        """Uma matriz serve várias vagas, com filtro de especialidade por vaga."""
+        from app.services.gatilhos_autonomos import buscar_medicos_compativeis_para_vaga
+        from app.services.priorizacao_medicos import montar_matriz_priorizacao
+
+        medicos = self._medicos(5000)
+        vagas = [
+            {"id": f"v{i}", "especialidade_id": "e", "especialidades": {"nome": nome}}
+            for i, nome in enumerate(["cardiologia", "pediatria", "clinica"] * 10)
+        ]
+
+        with patch(
+            "app.services.priorizacao_medicos.buscar_historico_lote",
+            AsyncMock(return_value={}),
+        ) as mock_historico:
+            inicio = time.perf_counter()
+            matriz = await montar_matriz_priorizacao(medicos)
+            resultados = [
+                await buscar_medicos_compativeis_para_vaga(vaga, matriz=matriz) for vaga in vagas
+            ]
+            duracao = time.perf_counter() - inicio
+
+        mock_historico.assert_awaited_once()
+        assert all(len(r) == 5 for r in resultados)
+        assert all("pediatria" in m["especialidade"].lower() for m in resultados[1])
+        assert duracao < 1.0
@@ -0,0 +1,92 @@
+"""
+Testes dos registros tipados (medico, conversa, chip).
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.models.registros import Chip, Conversa, Medico
+
+
+def _linha_medico(**extra):
+    return {
+        "id": "m1",
+        "primeiro_nome": "Ana",
+        "telefone": "5511999999999",
+        "preferencias_detectadas": {"turnos": ["noite"]},
+        **extra,
+    }
+
+
+class TestCompatibilidadeDict:
+    """Consumidores existentes continuam usando acesso de dict."""
+
+    def test_leitura_e_escrita(self):
+        medico = Medico.de_linha(_linha_medico())
+
+        assert medico["id"] == medico.id == "m1"
+        assert medico.get("crm") is None
+        assert medico.get("inexistente", "x") == "x"
+        assert "preferencias_detectadas" in medico
+
+        medico["especialidade_id"] = "esp-1"
+        assert medico.get("especialidade_id") == "esp-1"
+        assert {**medico}["especialidade_id"] == "esp-1"
+        with pytest.raises(KeyError):
+            medico["outra"]
+
+    def test_extras_da_linha_e_copia_independente(self):
+        chip = Chip.de_linha({"id": "c1", "trust_score": 90, "coluna_nova": 1})
+        copia = chip.copy()
+        copia["_uso_hora"] = 3
+
+        assert chip["coluna_nova"] == 1
+        assert "_uso_hora" not in chip
+        assert copia == {**chip.para_dict(), "_uso_hora": 3}
+
+    def test_sem_dict_por_instancia(self):
+        conversa = Conversa.de_linha({"id": "conv-1", "controlled_by": "ai"})
+
+        assert not hasattr(conversa, "__dict__")
+        assert Conversa.projecao().startswith("id, cliente_id, status, controlled_by")
+
+
+class TestSerializacao:
+    """Formato compacto do cache."""
+
+    def test_ida_e_volta(self):
+        medico = Medico.de_linha(_linha_medico())
+
+        texto = medico.serializar()
+
+        assert Medico.desserializar(texto) == medico
+        assert len(texto) < len(json.dumps(medico.para_dict(), ensure_ascii=False))
+
+    def test_versao_diferente_vira_miss(self):
+        texto = Medico.de_linha(_linha_medico()).serializar()
+
+        assert Conversa.desserializar(texto) is None
+        assert Medico.desserializar(json.dumps(_linha_medico())) is None  # formato antigo
+        assert Medico.desserializar("nao-json") is None
+        assert Medico.desserializar(None) is None
+
+
+@pytest.mark.asyncio
+async def test_buscar_medico_projecao_e_cache_compacto():
+    from app.services.medico import buscar_medico_por_telefone
+
+    with (
+        patch("app.services.medico.supabase") as mock_sb,
+        patch("app.services.medico.cache_get", new_callable=AsyncMock, return_value=None),
+        patch("app.services.medico.cache_set", new_callable=AsyncMock) as mock_set,
+    ):
+        query = mock_sb.table.return_value.select.return_value
+        query.eq.return_value.limit.return_value.execute.return_value.data = [_linha_medico()]
+        medico = await buscar_medico_por_telefone("5511999999999")
+
+    mock_sb.table.return_value.select.assert_called_once_with(Medico.projecao())
+    assert isinstance(medico, Medico)
+    chave, texto, _ = mock_set.call_args.args
+    assert chave == "medico:telefone:5511999999999"
+    assert Medico.desserializar(texto) == medico
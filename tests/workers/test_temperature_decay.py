@@ -0,0 +1,92 @@
+"""
+Testes dos jobs de manutencao do doctor_state em lotes.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.workers import temperature_decay
+from app.workers.temperature_decay import (
+    expire_cooling_off,
+    run_weekly_maintenance,
+    update_lifecycle_stages,
+)
+
+
+def _ids(*sufixos):
+    return [{"cliente_id": f"00000000-0000-0000-0000-{s:012d}"} for s in sufixos]
+
+
+@pytest.fixture
+def rpc():
+    """supabase.rpc devolvendo lotes configurados por nome de RPC."""
+    respostas = {}
+    chamadas = []
+
+    def fake_rpc(nome, params):
+        chamadas.append((nome, dict(params)))
+        fila = respostas.get(nome, [])
+        dados = fila.pop(0) if fila else []
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=dados)))
+
+    with (
+        patch.object(temperature_decay.supabase, "rpc", side_effect=fake_rpc),
+        patch.object(
+            temperature_decay, "invalidar_cache_states", new_callable=AsyncMock
+        ) as invalidar,
+    ):
+        yield {"respostas": respostas, "chamadas": chamadas, "invalidar": invalidar}
+
+
+class TestLotes:
+    """Paginacao por chave, invalidacao em bloco e vazao."""
+
+    @pytest.mark.asyncio
+    async def test_pagina_ate_lote_incompleto(self, rpc):
+        rpc["respostas"]["doctor_state_expirar_cooling_off_lote"] = [
+            _ids(3, 1),
+            _ids(5),
+        ]
+
+        expirados = await expire_cooling_off(batch_size=2)
+
+        assert expirados == 3
+        cursores = [params["p_cursor"] for _, params in rpc["chamadas"]]
+        assert cursores == [None, "00000000-0000-0000-0000-000000000003"]
+        assert all(params["p_limite"] == 2 for _, params in rpc["chamadas"])
+        rpc["invalidar"].assert_any_await(
+            ["00000000-0000-0000-0000-000000000003", "00000000-0000-0000-0000-000000000001"]
+        )
+        assert temperature_decay.ultimas_execucoes["expire_cooling_off"]["lotes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_nada_a_fazer_nao_invalida_cache(self, rpc):
+        churned = await update_lifecycle_stages()
+
+        assert churned == 0
+        assert len(rpc["chamadas"]) == 1
+        assert "p_corte" in rpc["chamadas"][0][1]
+        rpc["invalidar"].assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_manutencao_semanal_reporta_vazao(self, rpc):
+        rpc["respostas"]["doctor_state_decay_lote"] = [_ids(1, 2)]
+        rpc["respostas"]["doctor_state_resetar_contagem_lote"] = [_ids(7)]
+
+        result = await run_weekly_maintenance()
+
+        assert result["decayed"] == 2
+        assert result["reset_contact_count"] == 1
+        assert set(result["throughput"]) == {
+            "decay",
+            "expire_cooling_off",
+            "churn",
+            "reset_contact_count",
+        }
+        assert "linhas_por_s" in result["throughput"]["decay"]
+
+    @pytest.mark.asyncio
+    async def test_erro_da_rpc_propaga(self, rpc):
+        with patch.object(temperature_decay.supabase, "rpc", side_effect=RuntimeError("db")):
+            with pytest.raises(RuntimeError):
+                await expire_cooling_off()